@@ -0,0 +1,9 @@
+if __name__ == "__main__":
+	import os
+	import sys
+	from importlib import util
+
+	sys.path.append(os.path.join(os.path.dirname(__file__), "NeonOcean.S4.Main"))
+	Persistence = util.find_spec("Mod_NeonOcean_S4_Main.Benchmarking.Persistence").loader.load_module()
+
+	sys.exit(Persistence.Main(sys.argv[1:]))
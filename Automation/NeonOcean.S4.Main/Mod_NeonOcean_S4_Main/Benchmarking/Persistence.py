@@ -0,0 +1,388 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+from Mod_NeonOcean_S4_Main import Paths
+from Mod_NeonOcean_S4_Main.Benchmarking import Stubs
+from Mod_NeonOcean_S4_Main.Tools import Exceptions
+
+ResultsFormatVersion = 1  # type: int
+
+DefaultKeyCounts = (10, 100, 1000, 10000, 100000)  # type: typing.Tuple[int, ...]
+DefaultBranchCounts = (1, 10, 100)  # type: typing.Tuple[int, ...]
+DefaultMaximumValues = 1000000  # type: int
+DefaultRepeats = 3  # type: int
+
+Operations = ("Setup", "Set", "Get", "Save", "Load")  # type: typing.Tuple[str, ...]
+
+class Target:
+	"""
+	A persistence class to be benchmarked, along with the knowledge of how to create, save and load it.
+	"""
+
+	Name = None  # type: str
+	Branched = False  # type: bool
+
+	def __init__ (self, workingPath: str):
+		self.WorkingPath = workingPath  # type: str
+
+	def Create (self) -> typing.Any:
+		raise NotImplementedError()
+
+	def Save (self, persistence) -> typing.Any:
+		"""
+		Save the persistence object and return anything the load method will need to load that data back.
+		"""
+
+		raise NotImplementedError()
+
+	def Load (self, persistence, savedData: typing.Any) -> None:
+		raise NotImplementedError()
+
+class _DirectTarget(Target):
+	Name = "PersistentDirect"  # type: str
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main.Data import Persistence
+		return Persistence.PersistentDirect(_GetVersion())
+
+	def Save (self, persistence) -> typing.Any:
+		return persistence.Save()[1]
+
+	def Load (self, persistence, savedData: typing.Any) -> None:
+		persistence.Load(savedData)
+
+class _JsonTarget(_DirectTarget):
+	Name = "PersistentJson"  # type: str
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main.Data import Persistence
+		return Persistence.PersistentJson(_GetVersion())
+
+class _FileTarget(Target):
+	Name = "PersistentFile"  # type: str
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main.Data import Persistence
+		return Persistence.PersistentFile(os.path.join(self.WorkingPath, self.Name + ".json"), _GetVersion())
+
+	def Save (self, persistence) -> typing.Any:
+		persistence.Save()
+
+	def Load (self, persistence, savedData: typing.Any) -> None:
+		persistence.Load()
+
+class _SectionTarget(Target):
+	Name = "PersistentSection"  # type: str
+
+	def __init__ (self, workingPath: str):
+		super().__init__(workingPath)
+
+		self.SaveFilePath = os.path.join(self.WorkingPath, self.Name + ".json")  # type: str
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main import This
+		from NeonOcean.S4.Main.Data import Persistence
+		from NeonOcean.S4.Main.Saving import SaveShared, SectionStandard
+
+		savingObject = SaveShared.Save(This.Mod, self.Name)  # type: SaveShared.Save
+		section = SectionStandard.SectionStandard("Benchmark", savingObject)  # type: SectionStandard.SectionStandard
+		savingObject.RegisterSection(section)
+
+		return Persistence.PersistentSection(section, "Values", _GetVersion())
+
+	def Save (self, persistence) -> typing.Any:
+		persistence.LinkedSection.SavingObject.Save(self.SaveFilePath)
+
+	def Load (self, persistence, savedData: typing.Any) -> None:
+		persistence.LinkedSection.SavingObject.Load(self.SaveFilePath)
+
+class _BranchedDirectTarget(_DirectTarget):
+	Name = "PersistentBranchedDirect"  # type: str
+	Branched = True  # type: bool
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main.Data import PersistenceBranched
+		return PersistenceBranched.PersistentBranchedDirect(_GetVersion())
+
+class _BranchedJsonTarget(_DirectTarget):
+	Name = "PersistentBranchedJson"  # type: str
+	Branched = True  # type: bool
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main.Data import PersistenceBranched
+		return PersistenceBranched.PersistentBranchedJson(_GetVersion())
+
+class _BranchedFileTarget(_FileTarget):
+	Name = "PersistentBranchedFile"  # type: str
+	Branched = True  # type: bool
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main.Data import PersistenceBranched
+		return PersistenceBranched.PersistentBranchedFile(os.path.join(self.WorkingPath, self.Name + ".json"), _GetVersion())
+
+class _BranchedSectionTarget(_SectionTarget):
+	Name = "PersistentBranchedSection"  # type: str
+	Branched = True  # type: bool
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main import This
+		from NeonOcean.S4.Main.Data import PersistenceBranched
+		from NeonOcean.S4.Main.Saving import SaveShared, SectionBranched
+
+		savingObject = SaveShared.Save(This.Mod, self.Name)  # type: SaveShared.Save
+		section = SectionBranched.SectionBranched("Benchmark", savingObject)  # type: SectionBranched.SectionBranched
+		savingObject.RegisterSection(section)
+
+		return PersistenceBranched.PersistentBranchedSection(section, "Values", _GetVersion())
+
+class _BranchedShardedSectionTarget(_SectionTarget):
+	Name = "PersistentBranchedShardedSection"  # type: str
+	Branched = True  # type: bool
+
+	ShardBuckets = 16  # type: int
+
+	def Create (self) -> typing.Any:
+		from NeonOcean.S4.Main import This
+		from NeonOcean.S4.Main.Data import PersistenceBranched
+		from NeonOcean.S4.Main.Saving import SaveShared, SectionBranched
+
+		savingObject = SaveShared.Save(This.Mod, self.Name)  # type: SaveShared.Save
+		section = SectionBranched.SectionBranched("Benchmark", savingObject, shardBuckets = self.ShardBuckets)  # type: SectionBranched.SectionBranched
+		savingObject.RegisterSection(section)
+
+		return PersistenceBranched.PersistentBranchedSection(section, "Values", _GetVersion())
+
+Targets = (
+	_DirectTarget,
+	_JsonTarget,
+	_FileTarget,
+	_SectionTarget,
+	_BranchedDirectTarget,
+	_BranchedJsonTarget,
+	_BranchedFileTarget,
+	_BranchedSectionTarget,
+	_BranchedShardedSectionTarget
+)  # type: typing.Tuple[typing.Type[Target], ...]
+
+def Main (arguments: typing.List[str]) -> int:
+	argumentParser = argparse.ArgumentParser(description = "Time the main mod's persistence classes and record how many operations they can complete per second.")
+	argumentParser.add_argument("-o", "--output", default = os.path.join(Paths.BenchmarkPath, "Persistence.json"), help = "The file the results are written to, as json.")
+	argumentParser.add_argument("-k", "--keys", type = int, nargs = "+", default = list(DefaultKeyCounts), help = "The key counts to benchmark.")
+	argumentParser.add_argument("-b", "--branches", type = int, nargs = "+", default = list(DefaultBranchCounts), help = "The branch counts to benchmark branched persistence classes with.")
+	argumentParser.add_argument("-t", "--targets", nargs = "+", default = [target.Name for target in Targets], help = "The persistence classes to benchmark.")
+	argumentParser.add_argument("-r", "--repeats", type = int, default = DefaultRepeats, help = "How many times each save and load should be repeated, only the fastest run is recorded.")
+	argumentParser.add_argument("-m", "--maximum-values", type = int, default = DefaultMaximumValues, help = "Skip branched cases where the keys multiplied by the branches exceed this.")
+	argumentParser.add_argument("--no-memory", action = "store_true", help = "Do not run the extra pass that traces memory use.")
+
+	parsedArguments = argumentParser.parse_args(arguments)
+
+	targetNames = [target.Name for target in Targets]  # type: typing.List[str]
+
+	for targetName in parsedArguments.targets:  # type: str
+		if not targetName in targetNames:
+			print("Unknown benchmark target '" + targetName + "', valid targets are: " + ", ".join(targetNames), file = sys.stderr)
+			return 1
+
+	selectedTargets = [target for target in Targets if target.Name in parsedArguments.targets]  # type: typing.List[typing.Type[Target]]
+
+	results = RunBenchmarks(selectedTargets, parsedArguments.keys, parsedArguments.branches, repeats = parsedArguments.repeats,
+							maximumValues = parsedArguments.maximum_values, traceMemory = not parsedArguments.no_memory)  # type: dict
+
+	outputDirectoryPath = os.path.dirname(os.path.abspath(parsedArguments.output))  # type: str
+
+	if not os.path.exists(outputDirectoryPath):
+		os.makedirs(outputDirectoryPath)
+
+	with open(parsedArguments.output, "w+") as outputFile:
+		outputFile.write(json.JSONEncoder(indent = "\t").encode(results))
+
+	print("Wrote benchmark results to '" + parsedArguments.output + "'.")
+	return 0
+
+def RunBenchmarks (targets: typing.Iterable[typing.Type[Target]], keyCounts: typing.Iterable[int], branchCounts: typing.Iterable[int],
+				   repeats: int = DefaultRepeats, maximumValues: int = DefaultMaximumValues, traceMemory: bool = True) -> dict:
+	"""
+	Benchmark every combination of these targets, key counts and branch counts. Branch counts are ignored for targets that are not branched.
+
+	:return: A json encodable dictionary containing information on the environment and a list of results, one for each target, case and operation.
+	:rtype: dict
+	"""
+
+	userDataPath = tempfile.mkdtemp(prefix = "NeonOcean-Benchmark-")  # type: str
+
+	try:
+		Stubs.InstallStubs(userDataPath)
+
+		results = list()  # type: typing.List[dict]
+
+		for target in targets:  # type: typing.Type[Target]
+			for keyCount in keyCounts:  # type: int
+				for branchCount in (branchCounts if target.Branched else (1,)):  # type: int
+					if target.Branched and keyCount * branchCount > maximumValues:
+						continue
+
+					workingPath = tempfile.mkdtemp(dir = userDataPath)  # type: str
+
+					try:
+						print("Benchmarking '" + target.Name + "' with " + str(keyCount) + " keys" + (" and " + str(branchCount) + " branches" if target.Branched else "") + ".")
+						results.extend(RunCase(target(workingPath), keyCount, branchCount, repeats = repeats, traceMemory = traceMemory))
+					except Exception as e:
+						print("Failed to benchmark '" + target.Name + "' with " + str(keyCount) + " keys and " + str(branchCount) + " branches.\n" +
+							  Exceptions.FormatException(e), file = sys.stderr)
+					finally:
+						shutil.rmtree(workingPath, ignore_errors = True)
+	finally:
+		shutil.rmtree(userDataPath, ignore_errors = True)
+
+	return {
+		"FormatVersion": ResultsFormatVersion,
+		"Time": datetime.datetime.now().isoformat(),
+		"Python": platform.python_version(),
+		"Platform": platform.platform(),
+		"MemoryTraced": traceMemory,
+		"Repeats": repeats,
+		"Results": results
+	}
+
+def RunCase (target: Target, keyCount: int, branchCount: int, repeats: int = DefaultRepeats, traceMemory: bool = True) -> typing.List[dict]:
+	"""
+	Benchmark each operation on a fresh persistence object. The set and get operations touch every key in every branch once, save and load are repeated and
+	the fastest run is kept. Operations are timed without memory tracing, if memory is traced the whole case is run a second time on another new object to find
+	the most memory allocated at any point during each operation, relative to what was allocated before it started.
+	"""
+
+	valueCount = keyCount * branchCount if target.Branched else keyCount  # type: int
+	operationCounts = {
+		"Setup": keyCount,
+		"Set": valueCount,
+		"Get": valueCount,
+		"Save": 1,
+		"Load": 1
+	}  # type: typing.Dict[str, int]
+
+	warningCount = len(Stubs.Logs)  # type: int
+	operationSeconds = _RunPass(target, keyCount, branchCount, repeats, False)  # type: typing.Dict[str, float]
+	warningCount = len(Stubs.Logs) - warningCount
+
+	operationPeakMemory = _RunPass(target, keyCount, branchCount, 1, True) if traceMemory else dict()  # type: typing.Dict[str, int]
+
+	results = list()  # type: typing.List[dict]
+
+	for operationName in Operations:  # type: str
+		seconds = operationSeconds[operationName]  # type: float
+
+		results.append({
+			"Target": target.Name,
+			"Keys": keyCount,
+			"Branches": branchCount if target.Branched else None,
+			"Values": valueCount,
+			"Operation": operationName,
+			"Operations": operationCounts[operationName],
+			"Seconds": seconds,
+			"OperationsPerSecond": operationCounts[operationName] / seconds if seconds > 0 else None,
+			"ValuesPerSecond": valueCount / seconds if seconds > 0 else None,
+			"PeakMemory": operationPeakMemory.get(operationName, None),
+			"Warnings": warningCount
+		})
+
+	return results
+
+def _RunPass (target: Target, keyCount: int, branchCount: int, repeats: int, traceMemory: bool) -> typing.Dict[str, typing.Union[float, int]]:
+	keys = ["Key" + str(keyIndex) for keyIndex in range(keyCount)]  # type: typing.List[str]
+	branches = ["Branch" + str(branchIndex) for branchIndex in range(branchCount)]  # type: typing.List[str]
+
+	persistence = target.Create()
+	savedData = None  # type: typing.Any
+
+	def SetupOperation () -> None:
+		for key in keys:  # type: str
+			persistence.Setup(key, int, 0, _Verify)
+
+	def SetOperation () -> None:
+		if target.Branched:
+			for branch in branches:  # type: str
+				for keyIndex in range(keyCount):  # type: int
+					persistence.Set(branch, keys[keyIndex], keyIndex + 1, autoSave = False, autoUpdate = False)
+		else:
+			for keyIndex in range(keyCount):  # type: int
+				persistence.Set(keys[keyIndex], keyIndex + 1, autoSave = False, autoUpdate = False)
+
+	def GetOperation () -> None:
+		if target.Branched:
+			for branch in branches:  # type: str
+				for key in keys:  # type: str
+					persistence.Get(branch, key)
+		else:
+			for key in keys:  # type: str
+				persistence.Get(key)
+
+	def SaveOperation () -> None:
+		nonlocal savedData
+		savedData = target.Save(persistence)
+
+	def LoadOperation () -> None:
+		target.Load(persistence, savedData)
+
+	operations = (
+		("Setup", SetupOperation, 1),
+		("Set", SetOperation, 1),
+		("Get", GetOperation, 1),
+		("Save", SaveOperation, repeats),
+		("Load", LoadOperation, repeats)
+	)  # type: typing.Tuple[typing.Tuple[str, typing.Callable, int], ...]
+
+	measurements = dict()  # type: typing.Dict[str, typing.Union[float, int]]
+
+	for operationName, operation, operationRepeats in operations:  # type: str, typing.Callable, int
+		measurements[operationName] = _Measure(operation, max(operationRepeats, 1), traceMemory)
+
+	return measurements
+
+def _Measure (operation: typing.Callable, repeats: int, traceMemory: bool) -> typing.Union[float, int]:
+	"""
+	Get the fastest time of this operation in seconds, or the highest peak memory in bytes if memory is being traced.
+	"""
+
+	bestMeasurement = None  # type: typing.Union[float, int, None]
+
+	for _ in range(repeats):
+		if traceMemory:
+			tracemalloc.start()
+
+			try:
+				startingMemory = tracemalloc.get_traced_memory()[0]  # type: int
+				operation()
+				measurement = tracemalloc.get_traced_memory()[1] - startingMemory  # type: typing.Union[float, int]
+			finally:
+				tracemalloc.stop()
+
+			if bestMeasurement is None or measurement > bestMeasurement:
+				bestMeasurement = measurement
+		else:
+			startingTime = time.perf_counter()  # type: float
+			operation()
+			measurement = time.perf_counter() - startingTime
+
+			if bestMeasurement is None or measurement < bestMeasurement:
+				bestMeasurement = measurement
+
+	return bestMeasurement
+
+def _GetVersion ():
+	from NeonOcean.S4.Main.Tools import Version
+	return Version.Version("1.0.0")
+
+def _Verify (value: int, *args) -> int:
+	if not isinstance(value, int):
+		raise Exception("Expected an integer value.")
+
+	return value
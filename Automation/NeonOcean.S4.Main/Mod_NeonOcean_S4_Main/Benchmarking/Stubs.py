@@ -0,0 +1,100 @@
+import enum
+import os
+import sys
+import types
+import typing
+
+from Mod_NeonOcean_S4_Main import Paths
+
+MainNamespace = "NeonOcean.S4.Main"  # type: str
+MainSourcePath = os.path.join(Paths.PythonPath, MainNamespace)  # type: str
+
+GUID = 1  # type: int
+GameTick = 0  # type: int
+
+Logs = list()  # type: typing.List[typing.Tuple[typing.Any, typing.Any]]
+
+class LogLevels(enum.IntEnum):
+	Exception = 0  # type: LogLevels
+	Error = 1  # type: LogLevels
+	Warning = 2  # type: LogLevels
+	Info = 3  # type: LogLevels
+	Debug = 4  # type: LogLevels
+
+class Mod:
+	def __init__ (self, namespace: str, version: str, persistentPath: str):
+		self.Namespace = namespace  # type: str
+		self.Version = version  # type: str
+		self.PersistentPath = persistentPath  # type: str
+
+	def IsLoaded (self) -> bool:
+		return True
+
+class _Logger:
+	def __init__ (self, *args, **kwargs):
+		pass
+
+	def __getattr__ (self, name: str) -> typing.Callable:
+		return lambda *args, **kwargs: None
+
+class _GameplayData:
+	@property
+	def world_game_time (self) -> int:
+		return GameTick
+
+class _SaveSlotProto:
+	def __init__ (self):
+		self.gameplay_data = _GameplayData()  # type: _GameplayData
+
+class _PersistenceService:
+	def get_save_slot_proto_guid (self) -> int:
+		return GUID
+
+	def get_save_slot_proto_buff (self) -> _SaveSlotProto:
+		return _SaveSlotProto()
+
+_persistenceService = _PersistenceService()  # type: _PersistenceService
+
+def InstallStubs (userDataPath: str) -> None:
+	"""
+	Make the main mod's persistence and saving modules importable outside of the game. The game's own modules and the parts of the main mod that need a running
+	game to be imported are replaced with stand-ins, everything else is imported from the mod's python source. The stand-ins are only placed in this process's
+	module table, nothing is written to the source directory.
+
+	:param userDataPath: A directory that should stand in for the Sims 4 user data directory. Persistent files, saves and temporary files will be written here.
+	:type userDataPath: str
+	"""
+
+	if MainSourcePath not in sys.path:
+		sys.path.insert(0, MainSourcePath)
+
+	sys.modules["enum_lib"] = enum
+
+	_AddModule("sims4", log = _AddModule("sims4.log", Logger = _Logger))
+	_AddModule("services", get_persistence_service = lambda: _persistenceService)
+
+	import NeonOcean.S4.Main as Main
+
+	mainMod = Mod(MainNamespace, "1.0.0", os.path.join(userDataPath, "Mods", "NeonOcean", "Persistent"))  # type: Mod
+
+	Main.Debug = _AddModule(MainNamespace + ".Debug", Log = _Log, LogLevels = LogLevels)
+	Main.Mods = _AddModule(MainNamespace + ".Mods", Mod = Mod, GetMod = lambda namespace: mainMod)
+	Main.This = _AddModule(MainNamespace + ".This", Mod = mainMod)
+	Main.Paths = _AddModule(MainNamespace + ".Paths",
+							UserDataPath = userDataPath,
+							ModsPath = os.path.join(userDataPath, "Mods"),
+							SavesPath = os.path.join(userDataPath, "Saves", "NeonOcean"),
+							DebugPath = os.path.join(userDataPath, "Debug"),
+							PersistentPath = mainMod.PersistentPath,
+							TemporaryPath = os.path.join(userDataPath, "Temporary"),
+							StripUserDataPath = lambda filePath: filePath)
+
+def _AddModule (name: str, **attributes) -> types.ModuleType:
+	module = types.ModuleType(name)  # type: types.ModuleType
+	module.__dict__.update(attributes)
+	sys.modules[name] = module
+	return module
+
+def _Log (message, namespace, level, *args, **kwargs) -> None:
+	if level <= LogLevels.Warning:
+		Logs.append((level, message))
@@ -29,6 +29,7 @@ LoosePath = os.path.join(RootPath, "Loose")  # type: str
 InformationPath = os.path.join(RootPath, "Information")  # type: str
 InformationBuildPath = os.path.join(InformationPath, "Build")  # type: str
 InformationSourcesPath = os.path.join(InformationPath, "Sources")  # type: str
+BenchmarkPath = os.path.join(RootPath, "Benchmark")  # type: str
 MiscPath = os.path.join(RootPath, "Misc")  # type: str
 PackagePath = os.path.join(RootPath, "Packages")  # type: str
 
@@ -1,28 +1,36 @@
-from NeonOcean.S4.Main import Debug, LoadingShared, This
+from NeonOcean.S4.Main import Debug, LoadingShared, Saving, This
 from NeonOcean.S4.Main.Console import Command
-from NeonOcean.S4.Main.Saving import SelectSave
+from NeonOcean.S4.Main.Saving import SaveProfiler, SelectSave
 from sims4 import commands
 
 SelectSaveCommand: Command.ConsoleCommand
+SaveTimingsCommand: Command.ConsoleCommand
+StrictSaveValidationCommand: Command.ConsoleCommand
 
 def _Setup () -> None:
-	global SelectSaveCommand
+	global SelectSaveCommand, SaveTimingsCommand, StrictSaveValidationCommand
 
 	commandPrefix = This.Mod.Namespace.lower()
 
 	SelectSaveCommand = Command.ConsoleCommand(_ShowSelectSaveDialog, commandPrefix + ".debug.show_select_save_dialog")
+	SaveTimingsCommand = Command.ConsoleCommand(_SaveTimings, commandPrefix + ".debug.save_timings", showHelp = True, helpInput = "{ enable | disable | clear | number of components to print }")
+	StrictSaveValidationCommand = Command.ConsoleCommand(_StrictSaveValidation, commandPrefix + ".debug.strict_save_validation", showHelp = True, helpInput = "{ enable | disable }")
 
 def _OnStart (cause: LoadingShared.LoadingCauses) -> None:
 	if cause:
 		pass
 
 	SelectSaveCommand.RegisterCommand()
+	SaveTimingsCommand.RegisterCommand()
+	StrictSaveValidationCommand.RegisterCommand()
 
 def _OnStop (cause: LoadingShared.UnloadingCauses) -> None:
 	if cause:
 		pass
 
 	SelectSaveCommand.UnregisterCommand()
+	SaveTimingsCommand.UnregisterCommand()
+	StrictSaveValidationCommand.UnregisterCommand()
 
 def _ShowSelectSaveDialog (_connection: int = None) -> None:
 	try:
@@ -33,4 +41,49 @@ def _ShowSelectSaveDialog (_connection: int = None) -> None:
 
 		Debug.Log("Failed to show the select save dialog.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, exception = e)
 
+def _SaveTimings (action: str = "10", _connection: int = None) -> None:
+	try:
+		action = str(action).lower()
+
+		if action == "enable":
+			SaveProfiler.SetEnabled(True)
+			commands.cheat_output("Started recording load, save and commit timings.\n", _connection)
+		elif action == "disable":
+			SaveProfiler.SetEnabled(False)
+			commands.cheat_output("Stopped recording load, save and commit timings.\n", _connection)
+		elif action == "clear":
+			SaveProfiler.ClearRecords()
+			commands.cheat_output("Cleared the recorded timings.\n", _connection)
+		else:
+			try:
+				componentCount = int(action)  # type: int
+			except ValueError:
+				commands.cheat_output("Unknown input '" + action + "', expected enable, disable, clear or a number of components to print.\n", _connection)
+				return
+
+			commands.cheat_output(SaveProfiler.FormatSlowestComponents(componentCount) + "\n", _connection)
+	except Exception as e:
+		output = commands.CheatOutput(_connection)
+		output("Failed to run the save timings command.")
+
+		Debug.Log("Failed to run the save timings command.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, exception = e)
+
+def _StrictSaveValidation (action: str = "enable", _connection: int = None) -> None:
+	try:
+		action = str(action).lower()
+
+		if action == "enable":
+			Saving.SetStrictValidation(True)
+			commands.cheat_output("Save values will now be checked as soon as they are set.\n", _connection)
+		elif action == "disable":
+			Saving.SetStrictValidation(False)
+			commands.cheat_output("Save values will now be checked when they are saved.\n", _connection)
+		else:
+			commands.cheat_output("Unknown input '" + action + "', expected enable or disable.\n", _connection)
+	except Exception as e:
+		output = commands.CheatOutput(_connection)
+		output("Failed to run the strict save validation command.")
+
+		Debug.Log("Failed to run the strict save validation command.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, exception = e)
+
 _Setup()
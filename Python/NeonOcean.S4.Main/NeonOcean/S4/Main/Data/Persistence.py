@@ -1,56 +1,154 @@
 from __future__ import annotations
 
 import abc
+import atexit
+import contextlib
 import copy
 import json
 import os
+import threading
+import time
 import typing
+import weakref
+import zlib
 
-from NeonOcean.S4.Main import Debug, Paths, This
+from NeonOcean.S4.Main import Debug, LoadingShared, Paths, This
 from NeonOcean.S4.Main.Saving import SectionStandard
-from NeonOcean.S4.Main.Tools import Events, Exceptions, Types, Version
+from NeonOcean.S4.Main.Tools import Events, Exceptions, FileSystem, Frozen, Serialization, Types, Version
+
+_persistentFiles = weakref.WeakSet()  # type: weakref.WeakSet
+
+_writeBehindQueue = dict()  # type: typing.Dict[PersistentFile, float]  # The time each persistent file with a pending write should be written at.
+_writeBehindCondition = threading.Condition()  # type: threading.Condition
+_writeBehindThread = None  # type: typing.Optional[threading.Thread]
+_jsonEncoder = json.JSONEncoder(indent = "\t")  # type: json.JSONEncoder
+
+class UpdateEventArguments(Events.EventArguments):
+	def __init__ (self, changedKeys: typing.Optional[typing.Set[str]] = None):
+		"""
+		Event arguments for persistence object update events.
+		:param changedKeys: The keys of the persistent data that have changed since the last update. This will be None if it is not known which keys have changed.
+		:type changedKeys: typing.Set[str] | None
+		"""
+
+		self.ChangedKeys = changedKeys  # type: typing.Optional[typing.Set[str]]
+
+	def Changed (self, key: str) -> bool:
+		"""
+		Get whether or not the persistent data specified by the key may have changed between the last update and this one.
+		"""
+
+		if self.ChangedKeys is None:
+			return True
+
+		return key in self.ChangedKeys
 
 class Persistent(abc.ABC):
 	"""
 	A class for handling persistent data. This is an incomplete class, you would need to implement the load and save functions.
 	"""
 
+	PrewarmDelay = 5  # type: float  # The time in seconds to wait after values are loaded before verifying any lazily verified values that have not yet been used.
+
 	class Value:
-		def __init__ (self, value: typing.Any, valueType: type, default: typing.Any, verify: typing.Callable, isSet: bool):
+		def __init__ (self, value: typing.Any, valueType: type, default: typing.Any, verify: typing.Callable, isSet: bool, copyOnWrite: bool = False,
+					  lazyVerification: bool = False):
 			"""
 			Used for storage of persistent data.
+
+			Values stored in copy on write mode are frozen when they are set, then handed out without being copied. A real copy is only made when a mutable
+			version is asked for or the value is saved.
+
+			Values stored in lazy verification mode are not verified when they are loaded, they are marked as pending verification instead. The persistence object
+			is responsible for verifying them before they are handed out or saved.
 			"""
 
+			if copyOnWrite:
+				value = Frozen.Freeze(value)
+				default = Frozen.Freeze(default)
+
 			self.Value = value  # type: typing.Any
 			self.ValueType = valueType  # type: type
 			self.Default = default  # type: typing.Any
 			self.Verify = verify  # type: typing.Callable
+			self.CopyOnWrite = copyOnWrite  # type: bool
+			self.Generation = 0  # type: int  # Incremented every time the stored value changes.
+			self.LazyVerification = lazyVerification  # type: bool
+			self.PendingVerification = None  # type: typing.Optional[Version.Version]  # The version the stored value needs to be verified against, or None if it has been verified.
 			self._isSet = isSet  # type: bool
 
 		def IsSet (self) -> bool:
 			return self._isSet
 
 		def Save (self) -> typing.Any:
+			if self.CopyOnWrite:
+				return Frozen.Thaw(self.Value)
+
 			return copy.deepcopy(self.Value)
 
 		def Get (self) -> typing.Any:
+			if self.CopyOnWrite or Frozen.IsImmutable(self.Value):
+				return self.Value
+
+			return copy.deepcopy(self.Value)
+
+		def GetMutable (self) -> typing.Any:
+			if self.CopyOnWrite:
+				return Frozen.Thaw(self.Value)
+
 			return copy.deepcopy(self.Value)
 
-		def Set (self, value, version: Version.Version, verify: bool = True) -> None:
+		def GetMutableDefault (self) -> typing.Any:
+			if self.CopyOnWrite:
+				return Frozen.Thaw(self.Default)
+
+			return copy.deepcopy(self.Default)
+
+		def Set (self, value, version: Version.Version, verify: bool = True) -> bool:
+			# Returns whether or not the stored value is now different.
+
 			if verify:
-				copiedValue = copy.deepcopy(self.Verify(value, version))  # type: typing.Any
+				value = self.Verify(value, version)  # type: typing.Any
+
+			if self.CopyOnWrite:
+				copiedValue = Frozen.Freeze(value)  # type: typing.Any
 			else:
 				copiedValue = copy.deepcopy(value)  # type: typing.Any
 
+			changed = copiedValue != self.Value  # type: bool
+
 			self.Value = copiedValue
+			self.Generation += 1
+			self.PendingVerification = None
+
+			return changed
+
+		def Reset (self) -> bool:
+			# Returns whether or not the stored value is now different.
+
+			changed = self.Value != self.Default  # type: bool
 
-		def Reset (self) -> None:
 			self.Value = self.Default
+			self.Generation += 1
+			self.PendingVerification = None
 			self._isSet = False
 
+			return changed
+
 		def Commit (self) -> None:
 			self._isSet = True
 
+		def Restore (self, value: typing.Any, isSet: bool) -> None:
+			# Put back a value previously taken from this object, the value is expected to have already been copied or frozen.
+			self.Value = value
+			self.Generation += 1
+			self.PendingVerification = None
+			self._isSet = isSet
+
+		def MarkUnverified (self, version: Version.Version) -> None:
+			# Mark the stored value as being loaded without verification, it will need to be verified against this version before it is used.
+			self.PendingVerification = version
+
 	def __init__ (self, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False):
 		"""
 		:param currentVersion: The current version of what ever will be controlling this persistence object.
@@ -76,11 +174,23 @@ class Persistent(abc.ABC):
 		self.OnLoad = Events.EventHandler()  # type: Events.EventHandler  # An event that is triggered when new data is loaded.
 
 		self._loadedData = dict()  # type: typing.Dict[str, typing.Any]
+		self._loadedDataGeneration = 0  # type: int  # Incremented every time new data is loaded.
 		self._loadedLastVersion = None  # type: typing.Optional[Version.Version]
+		self._loadedValueVersions = dict()  # type: typing.Dict[str, Version.Version]  # The versions of loaded values that were saved in a different version than the rest of the loaded data.
 
 		self._alwaysSaveValues = alwaysSaveValues  # type: bool
 
 		self._storage = dict()  # type: typing.Dict[str, Persistent.Value]
+		self._changedKeys = set()  # type: typing.Set[str]  # The keys of values that have changed since the last update event.
+		self._changedKeysLock = threading.Lock()  # type: threading.Lock  # Values verified on the prewarm thread can be marked as changed while an update is taking the changed keys.
+
+		self._verificationLock = threading.RLock()  # type: threading.RLock
+		self._prewarmTimer = None  # type: typing.Optional[threading.Timer]
+
+		self._batchSnapshots = list()  # type: typing.List[typing.Dict[str, typing.Tuple[typing.Any, bool]]]  # One entry for each active batch, the innermost batch is last.
+		self._batchUnverifiedKeys = list()  # type: typing.List[typing.Set[str]]
+		self._batchSaveRequested = False  # type: bool
+		self._batchUpdateRequested = False  # type: bool
 
 	@property
 	def LoadedLastVersion (self) -> typing.Optional[Version.Version]:
@@ -106,7 +216,7 @@ class Persistent(abc.ABC):
 	def Save (self, *args, **kwargs) -> typing.Any:
 		raise NotImplementedError()
 
-	def Setup (self, key: str, valueType: type, default, verify: typing.Callable) -> None:
+	def Setup (self, key: str, valueType: type, default, verify: typing.Callable, copyOnWrite: bool = False, lazyVerification: bool = False) -> None:
 		"""
 		Setup persistent data for this persistence object. All persistent data must be setup before it can be used. Persistent data can be loaded before being
 		setup but will remain dormant until setup. Persistent data also cannot be setup twice, an exception will be raised if this is tried.
@@ -128,6 +238,15 @@ class Persistent(abc.ABC):
 					   If the value cannot be corrected the verify function should raise an exception, the persistent data may then revert to its default if necessary.
 		:type verify: typing.Callable
 
+		:param copyOnWrite: If true, this persistent data's value will be frozen into an immutable object when set and will be handed out by the get method without
+		being copied. Dictionaries, lists and sets will be returned as read-only versions of themselves, use the get mutable method to get a copy that can be changed.
+		This should only be used for values made of python's basic types.
+		:type copyOnWrite: bool
+
+		:param lazyVerification: If true, loaded values for this persistent data will not be verified until they are first retrieved or saved. Values that are not used
+		soon after being loaded will be verified on a background thread, the verify callback must be safe to call from another thread if this is enabled.
+		:type lazyVerification: bool
+
 		:rtype: None
 		"""
 
@@ -148,6 +267,14 @@ class Persistent(abc.ABC):
 		if not isinstance(verify, typing.Callable):
 			raise Exceptions.IncorrectTypeException(verify, "verify", ("Callable",))
 
+		if not isinstance(copyOnWrite, bool):
+			raise Exceptions.IncorrectTypeException(copyOnWrite, "copyOnWrite", (bool,))
+
+		if not isinstance(lazyVerification, bool):
+			raise Exceptions.IncorrectTypeException(lazyVerification, "lazyVerification", (bool,))
+
+		self._LoadPending()
+
 		try:
 			verifiedDefault = verify(default)
 		except Exception as e:
@@ -156,12 +283,16 @@ class Persistent(abc.ABC):
 		if verifiedDefault != default:
 			Debug.Log("Verification of default value for persistent data '" + key + "' changed it.\n" + persistenceInformation, self.HostNamespace, level = Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 
-		version = self.LoadedLastVersion
+		version = self._loadedValueVersions.get(key, self.LoadedLastVersion)
 
 		if version is None:
 			version = self.CurrentVersion
 
-		if key in self._loadedData:
+		if key in self._loadedData and lazyVerification:
+			self._storage[key] = self.Value(self._loadedData[key], valueType, default, verify, True, copyOnWrite = copyOnWrite, lazyVerification = lazyVerification)
+			self._storage[key].MarkUnverified(version)
+			self._SchedulePrewarm()
+		elif key in self._loadedData:
 			value = self._loadedData[key]
 
 			try:
@@ -170,9 +301,11 @@ class Persistent(abc.ABC):
 				Debug.Log("Verify callback found fault with the value that was stored for persistent data '" + key + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 				value = verifiedDefault
 
-			self._storage[key] = self.Value(value, valueType, default, verify, True)
+			self._storage[key] = self.Value(value, valueType, default, verify, True, copyOnWrite = copyOnWrite, lazyVerification = lazyVerification)
 		else:
-			self._storage[key] = self.Value(verifiedDefault, valueType, default, verify, False)
+			self._storage[key] = self.Value(verifiedDefault, valueType, default, verify, False, copyOnWrite = copyOnWrite, lazyVerification = lazyVerification)
+
+		self._MarkChanged(key)
 
 	def IsSetup (self, key: str) -> bool:
 		"""
@@ -188,7 +321,8 @@ class Persistent(abc.ABC):
 	def Get (self, key: str):
 		"""
 		Gets the value of the persistent data specified by the key. The value returned will be a deep copy of what is stored, modifying it should never change
-		anything unless you set it with the set function.
+		anything unless you set it with the set function. If the persistent data was setup in copy on write mode, the stored value will be returned without being
+		copied, it will have been frozen so it cannot be modified. Immutable values such as strings, numbers and tuples are never copied.
 
 		:param key: The name of the persistent data, is case sensitive.
 		:type key: str
@@ -201,8 +335,30 @@ class Persistent(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending()
+		self._VerifyPending(key)
 		return self._storage[key].Get()
 
+	def GetMutable (self, key: str):
+		"""
+		Gets a copy of the value of the persistent data specified by the key that can be freely modified. Modifying it should never change anything unless you set
+		it with the set function.
+
+		:param key: The name of the persistent data, is case sensitive.
+		:type key: str
+		:return: The return object will always be of the type specified for the target persistent data during setup.
+		"""
+
+		if not isinstance(key, str):
+			raise Exceptions.IncorrectTypeException(key, "key", (str,))
+
+		if not self.IsSetup(key):
+			raise Exception("Persistent data '" + key + "' is not setup.")
+
+		self._LoadPending()
+		self._VerifyPending(key)
+		return self._storage[key].GetMutable()
+
 	def Set (self, key: str, value, autoSave: bool = True, autoUpdate: bool = True) -> None:
 		"""
 		Set the value of the persistent data specified by the key. The value is deep copied before being but into storage, modifying the value after setting
@@ -226,6 +382,8 @@ class Persistent(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending()
+
 		valueStorage = self._storage[key]
 
 		if not isinstance(value, valueStorage.ValueType):
@@ -237,7 +395,22 @@ class Persistent(abc.ABC):
 		if not isinstance(autoUpdate, bool):
 			raise Exceptions.IncorrectTypeException(autoUpdate, "autoUpdate", (bool,))
 
-		valueStorage.Set(value, self.CurrentVersion)
+		if self.InBatch:
+			self._BatchTakeSnapshot(key)
+
+			with self._verificationLock:
+				valueStorage.Set(value, self.CurrentVersion, verify = False)
+
+			self._batchUnverifiedKeys[-1].add(key)
+			self._batchSaveRequested = self._batchSaveRequested or autoSave
+			self._batchUpdateRequested = self._batchUpdateRequested or autoUpdate
+			return
+
+		with self._verificationLock:
+			valueChanged = valueStorage.Set(value, self.CurrentVersion)  # type: bool
+
+		if valueChanged:
+			self._MarkChanged(key)
 
 		if autoSave:
 			self.Save()
@@ -258,6 +431,8 @@ class Persistent(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending()
+
 		valueStorage = self._storage[key]  # type: Persistent.Value
 		return valueStorage.IsSet()
 
@@ -277,15 +452,30 @@ class Persistent(abc.ABC):
 		if not isinstance(key, str) and key is not None:
 			raise Exceptions.IncorrectTypeException(key, "key", (str,))
 
-		if key is None:
-			for valueStorage in self._storage.values():  # type: str, Persistent.Value
-				valueStorage.Reset()
-		else:
-			if not self.IsSetup(key):
-				raise Exception("Persistent data '" + key + "' is not setup.")
+		if key is not None and not self.IsSetup(key):
+			raise Exception("Persistent data '" + key + "' is not setup.")
+
+		self._LoadPending()
+
+		resettingKeys = list(self._storage.keys()) if key is None else [key]  # type: typing.List[str]
+
+		for resettingKey in resettingKeys:  # type: str
+			if self.InBatch:
+				self._BatchTakeSnapshot(resettingKey)
+				self._batchUnverifiedKeys[-1].discard(resettingKey)
 
-			valueStorage = self._storage[key]  # type: Persistent.Value
-			valueStorage.Reset()
+			valueStorage = self._storage[resettingKey]  # type: Persistent.Value
+
+			with self._verificationLock:
+				valueChanged = valueStorage.Reset()  # type: bool
+
+			if valueChanged and not self.InBatch:
+				self._MarkChanged(resettingKey)
+
+		if self.InBatch:
+			self._batchSaveRequested = self._batchSaveRequested or autoSave
+			self._batchUpdateRequested = self._batchUpdateRequested or autoUpdate
+			return
 
 		if autoSave:
 			self.Save()
@@ -301,6 +491,8 @@ class Persistent(abc.ABC):
 		:type key: str
 		"""
 
+		self._LoadPending()
+
 		if key is None:
 			for valueStorage in self._storage.values():  # type: Persistent.Value
 				valueStorage.Commit()
@@ -310,26 +502,159 @@ class Persistent(abc.ABC):
 			if valueStorage is not None:
 				valueStorage.Commit()
 
-	def Update (self) -> None:
+	def Update (self, changedKeys: typing.Optional[typing.Iterable[str]] = None) -> None:
 		"""
 		Triggers the 'OnUpdate' event.
-		This should be called after any persistent data change where you elected not to allow for auto-updating.
+		This should be called after any persistent data change where you elected not to allow for auto-updating. If a batch is active the event will be triggered
+		once the batch ends. The event arguments will list the keys of every value that has changed since the last update.
 
+		:param changedKeys: Additional keys to list as changed, for values whose effective value was changed by something other than this persistence object.
+		:type changedKeys: typing.Iterable[str] | None
 		:rtype: None
 		"""
 
-		self._InvokeOnUpdateEvent()
+		if changedKeys is not None:
+			with self._changedKeysLock:
+				self._changedKeys.update(changedKeys)
+
+		if self.InBatch:
+			self._batchUpdateRequested = True
+			return
+
+		with self._changedKeysLock:
+			changedKeys = self._changedKeys  # type: typing.Set[str]
+			self._changedKeys = set()
+
+		self._InvokeOnUpdateEvent(changedKeys = changedKeys)
 
-	def _LoadSetData (self, persistentData: dict, lastVersion: typing.Optional[Version.Version] = None) -> bool:
+	def ClearChangedKeys (self) -> None:
+		"""
+		Forget which values have changed since the last update, without triggering the 'OnUpdate' event.
+		"""
+
+		with self._changedKeysLock:
+			self._changedKeys = set()
+
+	@property
+	def InBatch (self) -> bool:
+		"""
+		Whether or not a batch is currently active in this persistence object.
+		"""
+
+		return len(self._batchSnapshots) > 0
+
+	@contextlib.contextmanager
+	def Batch (self):
+		"""
+		Get a context manager that groups changes to multiple values together. Inside the 'with' block, values set through this object will not be verified,
+		saved or cause update events. When the block exits, every changed value will be verified, then the data will be saved and the 'OnUpdate' event triggered
+		once, with the event arguments listing every changed key. Saving or updating only happens if at least one of the changes in the batch asked for it.
+
+		If an exception escapes the block, or a value fails verification, every change made in the batch will be rolled back and the exception will be raised
+		again. Batches can be nested, each nested batch keeps its own snapshot. If an exception escapes a nested batch only the changes made inside it will be
+		rolled back, otherwise its changes are handed to the enclosing batch. Only the outermost batch will verify, save or update.
+		"""
+
+		self._batchSnapshots.append(dict())
+		self._batchUnverifiedKeys.append(set())
+
+		try:
+			yield self
+		except BaseException:
+			self._BatchRollback()
+			raise
+
+		if len(self._batchSnapshots) == 1:
+			self._BatchCommit()
+		else:
+			self._BatchMerge()
+
+	def _BatchTakeSnapshot (self, key: str) -> None:
+		levelSnapshots = self._batchSnapshots[-1]  # type: typing.Dict[str, typing.Tuple[typing.Any, bool]]
+
+		if key in levelSnapshots:
+			return
+
+		self._VerifyPending(key)
+		valueStorage = self._storage[key]  # type: Persistent.Value
+		levelSnapshots[key] = (valueStorage.Value, valueStorage.IsSet())
+
+	def _BatchMerge (self) -> None:
+		# Hand the changes of the innermost batch to the batch enclosing it. The enclosing batch's snapshots are older, so they are kept where both exist.
+
+		levelSnapshots = self._batchSnapshots.pop()  # type: typing.Dict[str, typing.Tuple[typing.Any, bool]]
+		levelUnverifiedKeys = self._batchUnverifiedKeys.pop()  # type: typing.Set[str]
+
+		for snapshotKey, snapshot in levelSnapshots.items():  # type: str, typing.Tuple[typing.Any, bool]
+			self._batchSnapshots[-1].setdefault(snapshotKey, snapshot)
+
+			if snapshotKey in levelUnverifiedKeys:
+				self._batchUnverifiedKeys[-1].add(snapshotKey)
+			else:
+				self._batchUnverifiedKeys[-1].discard(snapshotKey)  # The value was reset after being set.
+
+	def _BatchCommit (self) -> None:
+		try:
+			for unverifiedKey in self._batchUnverifiedKeys[-1]:  # type: str
+				valueStorage = self._storage[unverifiedKey]  # type: Persistent.Value
+				verifiedValue = valueStorage.Verify(valueStorage.GetMutable(), self.CurrentVersion)  # type: typing.Any
+				valueStorage.Set(verifiedValue, self.CurrentVersion, verify = False)
+		except:
+			self._BatchRollback()
+			raise
+
+		for snapshotKey, snapshot in self._batchSnapshots[-1].items():  # type: str, typing.Tuple[typing.Any, bool]
+			valueStorage = self._storage[snapshotKey]  # type: Persistent.Value
+
+			if snapshot[0] != valueStorage.Value:
+				self._MarkChanged(snapshotKey)
+
+		saveRequested = self._batchSaveRequested  # type: bool
+		updateRequested = self._batchUpdateRequested  # type: bool
+
+		self._BatchClear()
+
+		if saveRequested:
+			self.Save()
+
+		if updateRequested:
+			self.Update()
+
+	def _BatchRollback (self) -> None:
+		# Only the changes made in the innermost batch are rolled back, the batches enclosing it are left alone.
+
+		levelSnapshots = self._batchSnapshots.pop()  # type: typing.Dict[str, typing.Tuple[typing.Any, bool]]
+		self._batchUnverifiedKeys.pop()
+
+		for snapshotKey, snapshot in levelSnapshots.items():  # type: str, typing.Tuple[typing.Any, bool]
+			valueStorage = self._storage[snapshotKey]  # type: Persistent.Value
+			valueStorage.Restore(snapshot[0], snapshot[1])
+
+		if not self.InBatch:
+			self._BatchClear()
+
+	def _BatchClear (self) -> None:
+		self._batchSnapshots = list()
+		self._batchUnverifiedKeys = list()
+		self._batchSaveRequested = False
+		self._batchUpdateRequested = False
+
+	def _LoadSetData (self, persistentData: dict, lastVersion: typing.Optional[Version.Version] = None,
+					  valueVersions: typing.Optional[typing.Dict[str, Version.Version]] = None) -> bool:
 		"""
 		:param persistentData: The persistent data to be loaded. This should just be a dictionary with every key paired with its value.
 		:type persistentData: dict
 		:param lastVersion: The last version this data was saved successfully in.
 		:type lastVersion: Version.Version
+		:param valueVersions: The versions of any values that were saved in a different version than the rest of the data, paired with their keys.
+		:type valueVersions: typing.Dict[str, Version.Version] | None
 		:return: True if this completed without incident, False if not.
 		:rtype: bool
 		"""
 
+		if valueVersions is None:
+			valueVersions = dict()
+
 		operationSuccess = True  # type: bool
 
 		persistenceInformation = self.PersistenceInformation  # type: str
@@ -350,6 +675,7 @@ class Persistent(abc.ABC):
 				continue
 
 			valueStorage = self._storage[persistentKey]  # type: Persistent.Value
+			valueVersion = valueVersions.get(persistentKey, lastVersion)  # type: typing.Optional[Version.Version]
 
 			if not isinstance(persistentValue, valueStorage.ValueType):
 				Debug.Log("Invalid type in persistent data.\n" + Exceptions.GetIncorrectTypeExceptionText(persistentKey, "PersistentData[%s]" % persistentKey, (valueStorage.ValueType,)) + "\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
@@ -358,8 +684,19 @@ class Persistent(abc.ABC):
 				operationSuccess = False
 				continue
 
+			if valueStorage.LazyVerification:
+				with self._verificationLock:
+					if valueStorage.Set(persistentValue, valueVersion, verify = False):
+						self._MarkChanged(persistentKey)
+
+					valueStorage.MarkUnverified(valueVersion if valueVersion is not None else self.CurrentVersion)
+
+				self._SchedulePrewarm()
+				continue
+
 			try:
-				valueStorage.Set(persistentValue, lastVersion)
+				if valueStorage.Set(persistentValue, valueVersion):
+					self._MarkChanged(persistentKey)
 			except Exception:
 				Debug.Log("Cannot set value '" + str(persistentValue) + "' for persistent data '" + persistentKey + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 				persistentData.pop(persistentKey, None)
@@ -368,7 +705,9 @@ class Persistent(abc.ABC):
 				continue
 
 		self._loadedData = persistentData
+		self._loadedDataGeneration += 1
 		self._loadedLastVersion = lastVersion
+		self._loadedValueVersions = valueVersions
 
 		if changed:
 			self.Save()
@@ -387,6 +726,10 @@ class Persistent(abc.ABC):
 
 		persistenceInformation = self.PersistenceInformation  # type: str
 
+		self._LoadPending()
+
+		self._VerifyAllPending()
+
 		persistentData = copy.deepcopy(self._loadedData)  # type: typing.Dict[str, typing.Any]
 
 		for persistentKey, persistentValueStorage in self._storage.items():  # type: str, Persistent.Value
@@ -400,8 +743,73 @@ class Persistent(abc.ABC):
 
 		return operationSuccess, persistentData
 
-	def _InvokeOnUpdateEvent (self) -> Events.EventArguments:
-		eventArguments = Events.EventArguments()  # type: Events.EventArguments
+	def _VerifyPending (self, key: str) -> None:
+		valueStorage = self._storage[key]  # type: Persistent.Value
+
+		if valueStorage.PendingVerification is None:
+			return
+
+		with self._verificationLock:
+			verificationVersion = valueStorage.PendingVerification  # type: typing.Optional[Version.Version]
+
+			if verificationVersion is None:
+				return  # Another thread got to this value first.
+
+			try:
+				verifiedValue = valueStorage.Verify(valueStorage.GetMutable(), verificationVersion)  # type: typing.Any
+
+				if valueStorage.PendingVerification is None:
+					return  # The value was replaced while it was being verified.
+
+				valueChanged = valueStorage.Set(verifiedValue, verificationVersion, verify = False)  # type: bool
+			except Exception:
+				Debug.Log("Verify callback found fault with the value that was stored for persistent data '" + key + "'.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+
+				if valueStorage.PendingVerification is None:
+					return  # The value was replaced while it was being verified.
+
+				# Store the verified default as a set value, the same as when a faulty value is found while being setup without lazy verification.
+				verifiedDefault = valueStorage.Verify(valueStorage.GetMutableDefault())  # type: typing.Any
+				valueChanged = valueStorage.Set(verifiedDefault, verificationVersion, verify = False)  # type: bool
+				valueStorage.Commit()
+
+			if valueChanged:
+				self._MarkChanged(key)
+
+	def _LoadPending (self) -> None:
+		# Persistence objects that are given their data lazily should load it here, this is called before any value is used.
+		pass
+
+	def _MarkChanged (self, key: str) -> None:
+		with self._changedKeysLock:
+			self._changedKeys.add(key)
+
+	def _GetStorageState (self) -> tuple:
+		# Get a value that will only be equal to a previous state if no value has been setup, set, reset or loaded since then.
+		return self._loadedDataGeneration, tuple((storageKey, valueStorage.Generation) for storageKey, valueStorage in self._storage.items())
+
+	def _VerifyAllPending (self) -> None:
+		for key in list(self._storage.keys()):  # type: str
+			self._VerifyPending(key)
+
+	def _SchedulePrewarm (self) -> None:
+		if self._prewarmTimer is not None:
+			return
+
+		self._prewarmTimer = threading.Timer(self.PrewarmDelay, self._PrewarmTimerCallback)
+		self._prewarmTimer.daemon = True
+		self._prewarmTimer.start()
+
+	def _PrewarmTimerCallback (self) -> None:
+		self._prewarmTimer = None
+
+		try:
+			self._VerifyAllPending()
+		except Exception:
+			Debug.Log("Failed to verify lazily loaded values in the background.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+
+	def _InvokeOnUpdateEvent (self, changedKeys: typing.Optional[typing.Set[str]] = None) -> UpdateEventArguments:
+		eventArguments = UpdateEventArguments(changedKeys = changedKeys)  # type: UpdateEventArguments
 
 		for updateCallback in self.OnUpdate:  # type: typing.Callable[[Persistent, Events.EventArguments], None]
 			try:
@@ -535,9 +943,26 @@ class PersistentJson(PersistentDirect):
 
 		return operationSuccess
 
+	def __init__ (self, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False):
+		"""
+		:param currentVersion: The current version of what ever will be controlling this persistence object.
+							   This value can allow you to correct outdated persistent data.
+		:type currentVersion: Version.Version
+		:param hostNamespace: Errors made by this persistent object will show up under this namespace.
+		:type hostNamespace: str
+		:param alwaysSaveValues: If this value is true this persistence object will save all values. Otherwise this object will not save values that have not been
+		set or were reset at some point.
+		:type alwaysSaveValues: bool
+		"""
+
+		super().__init__(currentVersion, hostNamespace = hostNamespace, alwaysSaveValues = alwaysSaveValues)
+
+		self._encodedFragments = dict()  # type: typing.Dict[str, typing.Tuple[tuple, str]]
+
 	def Save (self) -> typing.Tuple[bool, str]:
 		"""
 		Encodes the persistent data container to a json string. This method can handle cases in which any persistent data's key or value cannot be encoded.
+		The encoded text of each value is kept between saves, values will only be encoded again if they have changed since the last save.
 
 		:return: The first value indicates if this method completed without incident. The second is the save data.
 		:rtype: typing.Tuple[bool, dict]
@@ -547,17 +972,37 @@ class PersistentJson(PersistentDirect):
 
 		persistenceInformation = self.PersistenceInformation  # type: str
 
-		saveSuccess, persistentDataContainer = super().Save()  # type: bool, dict
+		self._VerifyAllPending()
+
+		encodedFragments = dict()  # type: typing.Dict[str, typing.Tuple[tuple, str]]
+
+		for persistentKey, persistentValueStorage in self._SaveGetSources().items():  # type: str, typing.Optional[Persistent.Value]
+			if persistentValueStorage is None:
+				fragmentToken = (None, self._loadedDataGeneration)  # type: tuple
+			else:
+				fragmentToken = (persistentValueStorage, persistentValueStorage.Generation)  # type: tuple
+
+			cachedFragment = self._encodedFragments.get(persistentKey)  # type: typing.Optional[typing.Tuple[tuple, str]]
+
+			if cachedFragment is not None and cachedFragment[0] == fragmentToken:
+				encodedFragments[persistentKey] = cachedFragment
+				continue
 
-		persistentData = persistentDataContainer[self._valuesKey]  # type: dict
-		persistentDataValuesString = ""  # type: str
+			if persistentValueStorage is None:
+				persistentValue = self._loadedData[persistentKey]  # type: typing.Any
+			else:
+				try:
+					persistentValue = persistentValueStorage.Save()  # type: typing.Any
+				except Exception:
+					Debug.Log("Failed to save value of '" + persistentKey + "'. This entry may be reset the next time this persistent data is loaded.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+					operationSuccess = False
+					continue
 
-		for persistentKey, persistentValue in persistentData.items():  # type: str, typing.Any
 			keyInformation = "Key: " + persistentKey  # type: str
 
 			try:
 				assert isinstance(persistentKey, str)
-				persistentKeyString = json.JSONEncoder(indent = "\t").encode(persistentKey)  # type: str
+				persistentKeyString = _jsonEncoder.encode(persistentKey)  # type: str
 				assert "\n" not in persistentKeyString and "\r" not in persistentKeyString
 			except Exception:
 				Debug.Log("Failed to encode a persistence key to a json string.\n" + keyInformation + "\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
@@ -567,46 +1012,51 @@ class PersistentJson(PersistentDirect):
 			valueInformation = "Value Type: " + Types.GetFullName(persistentKey) + "\nValue Value: " + persistentKey  # type: str
 
 			try:
-				persistentValueString = json.JSONEncoder(indent = "\t").encode(persistentValue)  # type: str
+				persistentValueString = _jsonEncoder.encode(persistentValue)  # type: str
 			except Exception:
 				Debug.Log("Failed to encode a persistence value to a json string.\n" + keyInformation + "\n" + valueInformation + "\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
 				operationSuccess = False
 				continue
 
-			persistentValueString = persistentValueString.replace("\n", "\n\t\t")
+			encodedFragments[persistentKey] = (fragmentToken, "\t\t" + persistentKeyString + ": " + persistentValueString.replace("\n", "\n\t\t"))
 
-			if persistentDataValuesString != "":
-				persistentDataValuesString += ",\n"
+		self._encodedFragments = encodedFragments
 
-			persistentDataValuesString += "\t\t" + persistentKeyString + ": " + persistentValueString
-
-		persistentDataString = "\t\"" + self._valuesKey + "\": {"  # type: str
-
-		if persistentDataValuesString != "":
-			persistentDataString += "\n" + persistentDataValuesString + "\n\t}"
+		if len(encodedFragments) != 0:
+			persistentDataString = "\t\"" + self._valuesKey + "\": {\n" + ",\n".join(encodedFragment[1] for encodedFragment in encodedFragments.values()) + "\n\t}"  # type: str
 		else:
-			persistentDataString += "}"
-
-		lastVersion = persistentDataContainer[self._lastVersionKey]  # type: str
+			persistentDataString = "\t\"" + self._valuesKey + "\": {}"  # type: str
 
 		try:
-			lastVersionString = "\t\"" + self._lastVersionKey + "\": " + json.JSONEncoder(indent = "\t").encode(lastVersion)  # type: str
+			lastVersionString = "\t\"" + self._lastVersionKey + "\": " + _jsonEncoder.encode(str(self.CurrentVersion))  # type: str
 		except Exception as e:
 			raise Exception("Failed to encode a persistence last version to a json string.") from e
 
 		persistentDataContainerString = "{\n" + persistentDataString + ",\n" + lastVersionString + "\n}"  # type: str
 
-		if not saveSuccess:
-			return False, persistentDataContainerString
-
 		return operationSuccess, persistentDataContainerString
 
+	def _SaveGetSources (self) -> typing.Dict[str, typing.Optional[Persistent.Value]]:
+		"""
+		Get every key that would be written by a save, in the order they would be written. Each key is paired with the value storage object it will be saved from
+		or None if it will be saved straight from the loaded data.
+		"""
+
+		persistentSources = dict.fromkeys(self._loadedData.keys())  # type: typing.Dict[str, typing.Optional[Persistent.Value]]
+
+		for persistentKey, persistentValueStorage in self._storage.items():  # type: str, Persistent.Value
+			if self._alwaysSaveValues or persistentValueStorage.IsSet:
+				persistentSources[persistentKey] = persistentValueStorage
+
+		return persistentSources
+
 class PersistentFile(PersistentJson):
 	"""
 	A class for handling persistent data. This version will read and write the data to a file through the load and save methods.
 	"""
 
-	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False):
+	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False,
+				  writeBehind: bool = False, writeBehindDelay: typing.Union[float, int] = 1, serializer: typing.Optional[Serialization.Serializer] = None):
 		"""
 		:param filePath: The file path this persistence object will be written to and read from.
 		:type filePath: str
@@ -618,22 +1068,61 @@ class PersistentFile(PersistentJson):
 		:param alwaysSaveValues: If this value is true this persistence object will save all values. Otherwise this object will not save values that have not been
 		set or were reset at some point.
 		:type alwaysSaveValues: bool
+		:param writeBehind: If this value is true, saving will only encode the data and the file will be written in the background once the write behind delay
+		has passed since the first save that has not been written. Any number of saves made in that time will only cause the file to be written once, with the
+		most recently saved data.
+		Pending writes are forced through when this object is loaded, when the flush method is called, when this mod unloads and when the game exits.
+		:type writeBehind: bool
+		:param writeBehindDelay: The amount of time in seconds to wait after the first unwritten save before writing the file, when in write behind mode.
+		:type writeBehindDelay: float | int
+		:param serializer: The serializer used to write the file. If this is None the file will be written as json text. Files written by any registered serializer
+		can be loaded no matter which serializer is selected.
+		:type serializer: Serialization.Serializer | None
 		"""
 
 		if not isinstance(filePath, str):
 			raise Exceptions.IncorrectTypeException(filePath, "path", (str,))
 
+		if not isinstance(writeBehind, bool):
+			raise Exceptions.IncorrectTypeException(writeBehind, "writeBehind", (bool,))
+
+		if not isinstance(writeBehindDelay, (float, int)):
+			raise Exceptions.IncorrectTypeException(writeBehindDelay, "writeBehindDelay", (float, int))
+
+		if writeBehindDelay < 0:
+			raise ValueError("The parameter 'writeBehindDelay' cannot be less than 0.")
+
+		if not isinstance(serializer, Serialization.Serializer) and serializer is not None:
+			raise Exceptions.IncorrectTypeException(serializer, "serializer", (Serialization.Serializer, None))
+
 		super().__init__(currentVersion, hostNamespace = hostNamespace, alwaysSaveValues = alwaysSaveValues)
 
 		self.FilePath = filePath  # type: str
+		self.Serializer = serializer  # type: typing.Optional[Serialization.Serializer]
+
+		self.WriteBehind = writeBehind  # type: bool
+		self.WriteBehindDelay = writeBehindDelay  # type: typing.Union[float, int]
+
+		self._writeLock = threading.RLock()  # type: threading.RLock
+		self._pendingWrite = None  # type: typing.Optional[typing.Union[str, bytes]]  # Encoded data that has been saved but not yet written.
+
+		_persistentFiles.add(self)
 
 	@property
 	def PersistenceInformation (self) -> str:
 		return "%s | File %s" % (self.__class__.__name__, Paths.StripUserDataPath(self.FilePath))
 
+	@property
+	def Dirty (self) -> bool:
+		"""
+		Whether or not this object has changes that have been saved but not yet written to the file.
+		"""
+
+		return self._pendingWrite is not None
+
 	def Load (self, *args) -> bool:
 		"""
-		Load persistent data from the file path specified when initiating this object, if it exists.
+		Load persistent data from the file path specified when initiating this object, if it exists. Any pending write will be completed first.
 		:rtype: None
 		"""
 
@@ -641,16 +1130,33 @@ class PersistentFile(PersistentJson):
 
 		persistenceInformation = self.PersistenceInformation  # type: str
 
+		self.Flush()
+
 		persistentDataContainerString = "{}"  # type: str
+		persistentDataContainer = None  # type: typing.Optional[dict]
 
 		if os.path.exists(self.FilePath):
 			try:
-				with open(self.FilePath) as persistentFile:
-					persistentDataContainerString = persistentFile.read()
+				fileSerializer = Serialization.DetectFileSerializer(self.FilePath)  # type: typing.Optional[Serialization.Serializer]
+
+				if fileSerializer is None:
+					with open(self.FilePath) as persistentFile:
+						persistentDataContainerString = persistentFile.read()
+				else:
+					with open(self.FilePath, "rb") as persistentFile:
+						persistentDataContainer = fileSerializer.Decode(persistentFile.read())
+
+					if not isinstance(persistentDataContainer, dict):
+						Debug.Log("Could not convert persistent data container to a dictionary.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+						persistentDataContainer = dict()
 			except Exception:
 				Debug.Log("Failed to read from '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				persistentDataContainer = None
 
-		loadSuccessful = super().Load(persistentDataContainerString)  # type: bool
+		if persistentDataContainer is not None:
+			loadSuccessful = PersistentDirect.Load(self, persistentDataContainer)  # type: bool
+		else:
+			loadSuccessful = super().Load(persistentDataContainerString)  # type: bool
 
 		if not loadSuccessful:
 			return False
@@ -660,7 +1166,157 @@ class PersistentFile(PersistentJson):
 	def Save (self) -> bool:
 		"""
 		Saves the currently stored persistent data to the file path specified when initiating this object.
-		If the directory the save file is in doesn't exist one will be created.
+		If the directory the save file is in doesn't exist one will be created. In write behind mode the data is encoded immediately but only written later by
+		the write behind thread, problems writing the file will then be logged but not reported through the return value.
+		:rtype: None
+		"""
+
+		if not self.WriteBehind:
+			return self._WriteFile()
+
+		with self._writeLock:
+			saveSuccessful, persistentDataContainerString = self._EncodeFile()  # type: bool, typing.Union[str, bytes, None]
+
+			if persistentDataContainerString is None:
+				return False
+
+			self._pendingWrite = persistentDataContainerString
+
+		_ScheduleWriteBehind(self, time.monotonic() + self.WriteBehindDelay)
+
+		return saveSuccessful
+
+	def Flush (self) -> bool:
+		"""
+		Immediately write any changes that are waiting to be written to the file. Nothing will happen if there are no pending changes.
+		:return: True if this completed without incident, False if not.
+		:rtype: bool
+		"""
+
+		with _writeBehindCondition:
+			_writeBehindQueue.pop(self, None)
+
+		with self._writeLock:
+			if self._pendingWrite is None:
+				return True
+
+			persistentDataContainerString = self._pendingWrite  # type: typing.Union[str, bytes]
+			self._pendingWrite = None
+
+			return self._WriteEncoded(persistentDataContainerString)
+
+	def _WriteFile (self) -> bool:
+		with self._writeLock:
+			saveSuccessful, persistentDataContainerString = self._EncodeFile()  # type: bool, typing.Union[str, bytes, None]
+
+			if persistentDataContainerString is None:
+				return False
+
+			self._pendingWrite = None  # Anything waiting to be written is older than what is about to be written.
+			writeSuccessful = self._WriteEncoded(persistentDataContainerString)  # type: bool
+
+		if not saveSuccessful:
+			return False
+
+		return writeSuccessful
+
+	def _EncodeFile (self) -> typing.Tuple[bool, typing.Union[str, bytes, None]]:
+		# This reads the stored values, it must be called from the thread that changes them.
+
+		try:
+			if self.Serializer is None:
+				return super().Save()
+			else:
+				saveSuccessful, persistentDataContainer = PersistentDirect.Save(self)  # type: bool, dict
+				return saveSuccessful, self.Serializer.Encode(persistentDataContainer)
+		except Exception:
+			Debug.Log("Failed to encode persistent data for '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
+			return False, None
+
+	def _WriteEncoded (self, persistentDataContainerString: typing.Union[str, bytes]) -> bool:
+		with self._writeLock:
+			try:
+				FileSystem.WriteFileAtomically(self.FilePath, persistentDataContainerString)
+			except Exception:
+				Debug.Log("Failed to write to '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + self.PersistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				return False
+
+		return True
+
+class PersistentJournal(PersistentJson):
+	"""
+	A class for handling persistent data. This version will read and write the data to a file through the load and save methods, like the persistent file class,
+	but saving only appends a record for each value changed since the last save to a journal file next to it. The journal is replayed on top of the main file
+	when loading and is folded back into the main file once it grows past the compaction threshold.
+	"""
+
+	CompactionThreshold = 65536  # type: int  # The size in bytes the journal file can grow to before it is compacted into the main file.
+
+	_journalKeyKey = "Key"
+	_journalValueKey = "Value"
+	_journalResetKey = "Reset"
+	_journalVersionKey = "Version"
+
+	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, alwaysSaveValues: bool = False):
+		"""
+		:param filePath: The file path this persistence object will be written to and read from. The journal will be kept in the same directory, at this path with
+		'.journal' added to the end.
+		:type filePath: str
+		:param currentVersion: The current version of what ever will be controlling this persistence object.
+							   This value can allow you to correct outdated persistent data.
+		:type currentVersion: Version.Version
+		:param hostNamespace: Errors made by this persistent object will show up under this namespace.
+		:type hostNamespace: str
+		:param alwaysSaveValues: If this value is true this persistence object will save all values. Otherwise this object will not save values that have not been
+		set or were reset at some point.
+		:type alwaysSaveValues: bool
+		"""
+
+		if not isinstance(filePath, str):
+			raise Exceptions.IncorrectTypeException(filePath, "path", (str,))
+
+		super().__init__(currentVersion, hostNamespace = hostNamespace, alwaysSaveValues = alwaysSaveValues)
+
+		self.FilePath = filePath  # type: str
+		self.JournalFilePath = filePath + ".journal"  # type: str
+
+		self._writeLock = threading.RLock()  # type: threading.RLock
+		self._journalSize = 0  # type: int
+		self._journalPendingKeys = dict()  # type: typing.Dict[str, bool]  # The keys of values that have been set or reset since the last save, in the order they were changed. Each is paired with whether the last change was a reset.
+		self._journalValueVersions = dict()  # type: typing.Dict[str, Version.Version]  # The versions replayed journal records were written in, values from the main file keep the main file's version.
+		self._loading = False  # type: bool
+
+		_persistentFiles.add(self)
+
+	@property
+	def PersistenceInformation (self) -> str:
+		return "%s | File %s" % (self.__class__.__name__, Paths.StripUserDataPath(self.FilePath))
+
+	@property
+	def Dirty (self) -> bool:
+		"""
+		Whether or not this object has changes that have not yet been written to the journal.
+		"""
+
+		return len(self._journalPendingKeys) != 0
+
+	def Set (self, key: str, value, autoSave: bool = True, autoUpdate: bool = True) -> None:
+		self._JournalMarkPending(key, False)
+		super().Set(key, value, autoSave = autoSave, autoUpdate = autoUpdate)
+
+	def Reset (self, key: str = None, autoSave: bool = True, autoUpdate: bool = True) -> None:
+		if key is None:
+			for resettingKey in self._storage.keys():  # type: str
+				self._JournalMarkPending(resettingKey, True)
+		else:
+			self._JournalMarkPending(key, True)
+
+		super().Reset(key = key, autoSave = autoSave, autoUpdate = autoUpdate)
+
+	def Load (self, *args) -> bool:
+		"""
+		Load persistent data from the file path specified when initiating this object and replay the journal on top of it, if they exist. A torn record at the end
+		of the journal, left by a write that was interrupted, will be dropped and cut off the journal file. Corrupted records before the end are skipped.
 		:rtype: None
 		"""
 
@@ -668,23 +1324,248 @@ class PersistentFile(PersistentJson):
 
 		persistenceInformation = self.PersistenceInformation  # type: str
 
-		saveSuccessful, persistentDataContainerString = super().Save()  # type: bool, str
+		with self._writeLock:
+			persistentDataContainer = dict()  # type: dict
 
-		try:
-			if not os.path.exists(os.path.dirname(self.FilePath)):
-				os.makedirs(os.path.dirname(self.FilePath))
+			if os.path.exists(self.FilePath):
+				try:
+					with open(self.FilePath) as persistentFile:
+						persistentDataContainer = json.JSONDecoder().decode(persistentFile.read())
+				except Exception:
+					Debug.Log("Failed to read from '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
 
-			with open(self.FilePath, mode = "w+") as persistentFile:
-				persistentFile.write(persistentDataContainerString)
-		except Exception:
-			Debug.Log("Failed to read to '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
-			operationSuccess = False
+			if not isinstance(persistentDataContainer, dict):
+				Debug.Log("Could not convert persistent data container string to a dictionary.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+				persistentDataContainer = dict()
+
+			self._JournalReplay(persistentDataContainer)
+
+			self._journalPendingKeys = dict()
+			self._loading = True
+
+			try:
+				loadSuccessful = PersistentDirect.Load(self, persistentDataContainer)  # type: bool
+			finally:
+				self._loading = False
+				self._journalPendingKeys = dict()
+				self._journalValueVersions = dict()
+
+		if not loadSuccessful:
+			return False
+
+		return operationSuccess
+
+	def Save (self) -> bool:
+		"""
+		Append a record for every value changed since the last save to the journal. The journal will be compacted into the main file if it has grown past the
+		compaction threshold. If the directory the files are in doesn't exist one will be created.
+		:rtype: None
+		"""
+
+		if self._loading:
+			return True  # Corrections made while loading will be written by the next compaction, there is no point journaling them.
+
+		with self._writeLock:
+			if len(self._journalPendingKeys) == 0:
+				return True
+
+			persistenceInformation = self.PersistenceInformation  # type: str
+			journalRecords = list()  # type: typing.List[str]
+
+			savingKeys = self._journalPendingKeys  # type: typing.Dict[str, bool]
+			self._journalPendingKeys = dict()
+
+			for pendingKey, pendingReset in savingKeys.items():  # type: str, bool
+				try:
+					journalRecords.append(self._JournalEncodeRecord(pendingKey, pendingReset))
+				except Exception:
+					Debug.Log("Failed to encode a journal record for '" + pendingKey + "'. This entry may be reset the next time this persistent data is loaded.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+
+			journalBytes = "".join(journalRecords).encode("utf-8")  # type: bytes
+
+			try:
+				journalDirectoryPath = os.path.dirname(self.JournalFilePath)  # type: str
+
+				if journalDirectoryPath and not os.path.exists(journalDirectoryPath):
+					os.makedirs(journalDirectoryPath)
+
+				with open(self.JournalFilePath, "ab") as journalFile:
+					journalFile.write(journalBytes)
+					journalFile.flush()
+					os.fsync(journalFile.fileno())
+			except Exception:
+				Debug.Log("Failed to write to '" + Paths.StripUserDataPath(self.JournalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+
+				# Put the keys back so the next save tries again, values changed again since this save started are already pending and keep their newer state.
+				for pendingKey, pendingReset in self._journalPendingKeys.items():  # type: str, bool
+					savingKeys.pop(pendingKey, None)
+					savingKeys[pendingKey] = pendingReset
+
+				self._journalPendingKeys = savingKeys
+				return False
+
+			self._journalSize += len(journalBytes)
+
+			if self._journalSize > self.CompactionThreshold:
+				return self.Compact()
+
+		return True
+
+	def Compact (self) -> bool:
+		"""
+		Write every value to the main file and empty the journal.
+		:return: True if this completed without incident, False if not.
+		:rtype: bool
+		"""
+
+		operationSuccess = True  # type: bool
+
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		with self._writeLock:
+			self._journalPendingKeys = dict()
+
+			try:
+				saveSuccessful, persistentDataContainerString = super().Save()  # type: bool, str
+			except Exception:
+				Debug.Log("Failed to encode persistent data for '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
+				return False
+
+			try:
+				FileSystem.WriteFileAtomically(self.FilePath, persistentDataContainerString)
+			except Exception:
+				Debug.Log("Failed to write to '" + Paths.StripUserDataPath(self.FilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				return False
+
+			# Replaying the journal over the new main file would not change anything, so a crash before this point loses nothing.
+			try:
+				FileSystem.WriteFileAtomically(self.JournalFilePath, b"")
+				self._journalSize = 0
+			except Exception:
+				Debug.Log("Failed to clear '" + Paths.StripUserDataPath(self.JournalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				operationSuccess = False
 
 		if not saveSuccessful:
 			return False
 
 		return operationSuccess
 
+	def Flush (self) -> bool:
+		"""
+		Write any changes that have not yet been saved to the journal.
+		:return: True if this completed without incident, False if not.
+		:rtype: bool
+		"""
+
+		return self.Save()
+
+	def _JournalMarkPending (self, key: str, reset: bool) -> None:
+		if self._loading:
+			return
+
+		self._journalPendingKeys.pop(key, None)
+		self._journalPendingKeys[key] = reset
+
+	def _JournalEncodeRecord (self, key: str, reset: bool) -> str:
+		if not self.IsSetup(key):
+			raise Exception("Persistent data '" + key + "' is not setup.")
+
+		self._VerifyPending(key)
+		valueStorage = self._storage[key]  # type: Persistent.Value
+
+		if not reset:
+			journalRecord = {
+				self._journalKeyKey: key,
+				self._journalValueKey: valueStorage.Save(),
+				self._journalVersionKey: str(self.CurrentVersion)
+			}
+		else:
+			journalRecord = {
+				self._journalKeyKey: key,
+				self._journalResetKey: True,
+				self._journalVersionKey: str(self.CurrentVersion)
+			}
+
+		journalRecordString = json.dumps(journalRecord, separators = (",", ":"))  # type: str
+
+		return "%08x %s\n" % (zlib.crc32(journalRecordString.encode("utf-8")), journalRecordString)
+
+	def _JournalReplay (self, persistentDataContainer: dict) -> None:
+		persistenceInformation = self.PersistenceInformation  # type: str
+
+		self._journalSize = 0
+		self._journalValueVersions = dict()
+
+		if not os.path.exists(self.JournalFilePath):
+			return
+
+		try:
+			with open(self.JournalFilePath, "rb") as journalFile:
+				journalBytes = journalFile.read()  # type: bytes
+		except Exception:
+			Debug.Log("Failed to read from '" + Paths.StripUserDataPath(self.JournalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+			return
+
+		persistentData = persistentDataContainer.get(self._valuesKey)  # type: typing.Optional[dict]
+
+		if not isinstance(persistentData, dict):
+			persistentData = dict()
+
+		validLength = 0  # type: int
+		skippedRecords = 0  # type: int
+
+		while validLength < len(journalBytes):
+			recordEnd = journalBytes.find(b"\n", validLength)  # type: int
+
+			if recordEnd == -1:
+				break  # The last record was cut off before it was finished.
+
+			try:
+				recordChecksum, recordString = journalBytes[validLength:recordEnd].decode("utf-8").split(" ", 1)  # type: str, str
+
+				if int(recordChecksum, 16) != zlib.crc32(recordString.encode("utf-8")):
+					raise Exception("Journal record checksum mismatch.")
+
+				journalRecord = json.loads(recordString)  # type: dict
+				recordKey = journalRecord[self._journalKeyKey]  # type: str
+
+				if journalRecord.get(self._journalResetKey, False):
+					persistentData.pop(recordKey, None)
+					self._journalValueVersions.pop(recordKey, None)
+				else:
+					persistentData[recordKey] = journalRecord[self._journalValueKey]
+					self._journalValueVersions[recordKey] = Version.Version(journalRecord[self._journalVersionKey])
+			except Exception:
+				if recordEnd + 1 == len(journalBytes):
+					break  # Only the last record can have been torn by an interrupted write, it will be cut off.
+
+				skippedRecords += 1
+
+			validLength = recordEnd + 1
+
+		if skippedRecords != 0:
+			Debug.Log("Skipped " + str(skippedRecords) + " corrupted record(s) in '" + Paths.StripUserDataPath(self.JournalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+
+		if validLength != len(journalBytes):
+			Debug.Log("Dropped a torn record at the end of '" + Paths.StripUserDataPath(self.JournalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+
+			try:
+				os.truncate(self.JournalFilePath, validLength)
+			except Exception:
+				Debug.Log("Failed to cut the torn record off of '" + Paths.StripUserDataPath(self.JournalFilePath) + "'.\n" + persistenceInformation, self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+
+		self._journalSize = validLength
+
+		if validLength != 0:
+			persistentDataContainer[self._valuesKey] = persistentData
+
+	def _LoadSetData (self, persistentData: dict, lastVersion: typing.Optional[Version.Version] = None,
+					  valueVersions: typing.Optional[typing.Dict[str, Version.Version]] = None) -> bool:
+		if valueVersions is None:
+			valueVersions = dict(self._journalValueVersions)
+
+		return super()._LoadSetData(persistentData, lastVersion = lastVersion, valueVersions = valueVersions)
+
 class PersistentSection(PersistentDirect):
 	"""
 	A class for writing branched persistent data to a branched saving section.
@@ -705,8 +1586,9 @@ class PersistentSection(PersistentDirect):
 
 		self._linkedSection = linkedSection
 		self._sectionKey = sectionKey
+		self._sectionStorageState = None  # type: typing.Optional[tuple]  # The state of the stored values and the section's generation when the values were last written to the section.
 
-		self._linkedSection.RegisterLoadCallback(self._SectionLoadCallback)
+		self._linkedSection.RegisterLoadCallback(self._SectionLoadCallback, lazy = True)
 		self._linkedSection.RegisterSaveCallback(self._SectionSaveCallback)
 		self._linkedSection.RegisterResetCallback(self._SectionResetCallback)
 
@@ -724,19 +1606,28 @@ class PersistentSection(PersistentDirect):
 	def SectionKey (self) -> str:
 		return self._sectionKey
 
+	def _LoadPending (self) -> None:
+		# The load callback is lazy, the section will only decode its data and call it once the data is asked for.
+		self.LinkedSection.LoadPendingData()
+
 	def _SectionLoadCallback (self, section: SectionStandard.SectionStandard) -> bool:
 		persistentDataContainer = {
 			self._valuesKey: section.GetValue(self.SectionKey, default = dict()),
 			self._lastVersionKey: section.SavingObject.DataHostVersion
 		}  # type: dict
 
+		self._sectionStorageState = None
 		loadSuccessful = self.Load(persistentDataContainer = persistentDataContainer)  # type: bool
 		return loadSuccessful
 
 	def _SectionSaveCallback (self, section: SectionStandard.SectionStandard) -> bool:
+		if self._sectionStorageState is not None and self._sectionStorageState == (self._GetStorageState(), section.Generation):
+			return True  # Nothing has changed in this object or the section since the values were last written to it.
+
 		saveSuccessful, persistentDataContainer = self.Save()  # type: bool, dict
 		section.SetValue(self.SectionKey, persistentDataContainer[self._valuesKey])
 
+		self._sectionStorageState = (self._GetStorageState(), section.Generation) if saveSuccessful else None
 		return saveSuccessful
 
 	def _SectionResetCallback (self, section: SectionStandard.SectionStandard) -> bool:
@@ -745,5 +1636,67 @@ class PersistentSection(PersistentDirect):
 			self._lastVersionKey: section.SavingObject.DataHostVersion
 		}
 
+		self._sectionStorageState = None
 		loadSuccessful = self.Load(persistentDataContainer = persistentDataContainer)  # type: bool
 		return loadSuccessful
+
+def FlushAll () -> None:
+	"""
+	Immediately write every persistent file's pending changes.
+	"""
+
+	for persistentFile in list(_persistentFiles):  # type: typing.Union[PersistentFile, PersistentJournal]
+		try:
+			persistentFile.Flush()
+		except Exception:
+			Debug.Log("Failed to flush the persistent file at '" + Paths.StripUserDataPath(persistentFile.FilePath) + "'.", persistentFile.HostNamespace, Debug.LogLevels.Exception, group = persistentFile.HostNamespace, owner = __name__)
+
+def _ScheduleWriteBehind (persistentFile: PersistentFile, writeTime: float) -> None:
+	global _writeBehindThread
+
+	with _writeBehindCondition:
+		# Keep the earliest pending write time, otherwise a file saved more often than the delay would never be written.
+		queuedWriteTime = _writeBehindQueue.get(persistentFile)  # type: typing.Optional[float]
+
+		if queuedWriteTime is not None and queuedWriteTime <= writeTime:
+			return
+
+		_writeBehindQueue[persistentFile] = writeTime
+
+		if _writeBehindThread is None or not _writeBehindThread.is_alive():
+			_writeBehindThread = threading.Thread(target = _WriteBehindThread, name = __name__ + ".WriteBehind", daemon = True)
+			_writeBehindThread.start()
+
+		_writeBehindCondition.notify_all()
+
+def _WriteBehindThread () -> None:
+	while True:
+		with _writeBehindCondition:
+			while len(_writeBehindQueue) == 0:
+				_writeBehindCondition.wait()
+
+			persistentFile, writeTime = min(_writeBehindQueue.items(), key = lambda queueItem: queueItem[1])  # type: PersistentFile, float
+			waitTime = writeTime - time.monotonic()  # type: float
+
+			if waitTime > 0:
+				# Files saved while waiting can be queued to be written sooner, so check the queue again after waking up.
+				_writeBehindCondition.wait(waitTime)
+				continue
+
+			_writeBehindQueue.pop(persistentFile, None)
+
+		try:
+			persistentFile.Flush()
+		except Exception:
+			Debug.Log("Failed to write a persistent file in the background.\n" + persistentFile.PersistenceInformation, persistentFile.HostNamespace, Debug.LogLevels.Exception, group = persistentFile.HostNamespace, owner = __name__)
+
+def _OnUnload (cause: LoadingShared.UnloadingCauses) -> None:
+	if cause:
+		pass
+
+	FlushAll()
+
+def _Setup () -> None:
+	atexit.register(FlushAll)
+
+_Setup()
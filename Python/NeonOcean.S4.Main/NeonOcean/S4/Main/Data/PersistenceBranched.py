@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import abc
+import collections.abc
+import contextlib
 import copy
 import json
 import os
+import threading
 import typing
 
 from NeonOcean.S4.Main import Debug, Paths, This
+from NeonOcean.S4.Main.Data import Persistence
 from NeonOcean.S4.Main.Saving import SectionBranched
-from NeonOcean.S4.Main.Tools import Events, Exceptions, Types, Version
+from NeonOcean.S4.Main.Tools import Events, Exceptions, FileSystem, Frozen, Serialization, Types, Version
+
+_jsonEncoder = json.JSONEncoder(indent = "\t")  # type: json.JSONEncoder
 
 class PersistentBranched(abc.ABC):
 	"""
@@ -16,57 +22,267 @@ class PersistentBranched(abc.ABC):
 	load and save functions.
 	"""
 
+	PrewarmDelay = 5  # type: float  # The time in seconds to wait after values are loaded before verifying any lazily verified values that have not yet been used.
+
 	class Value:
-		def __init__ (self, values: typing.Dict[str, typing.Any], valueType: type, default, verify: typing.Callable):
+		def __init__ (self, values: typing.Dict[str, typing.Any], valueType: type, default, verify: typing.Callable, copyOnWrite: bool = False,
+					  key: typing.Optional[str] = None, branchIndex: typing.Optional[typing.Dict[str, typing.Set[str]]] = None, lazyVerification: bool = False):
 			"""
 			Used for storage of persistent data.
+
+			Values stored in copy on write mode are frozen when they are set, then handed out without being copied. A real copy is only made when a mutable
+			version is asked for or the values are saved.
+
+			If a branch index is given, this value storage object will add its key to the index's set for every branch it has a value in, and remove it once the
+			branch's value is reset. The index is meant to be shared by every value in a persistence object.
+
+			Values stored in lazy verification mode are not verified when they are loaded, each branch's value is marked as pending verification instead. The
+			persistence object is responsible for verifying them before they are handed out or saved.
 			"""
 
+			if copyOnWrite:
+				values = { branch: Frozen.Freeze(value) for branch, value in values.items() }
+				default = Frozen.Freeze(default)
+
 			self.Values = values  # type: typing.Dict[str, typing.Any]
 			self.ValueType = valueType  # type: type
 			self.Default = default  # type: typing.Any
 			self.Verify = verify  # type: typing.Callable
+			self.CopyOnWrite = copyOnWrite  # type: bool
+			self.Generation = 0  # type: int  # Incremented every time any of the stored values change.
+			self.BranchGenerations = dict.fromkeys(values.keys(), 0)  # type: typing.Dict[str, int]  # The generation in which each branch's value last changed.
+			self.Key = key  # type: typing.Optional[str]
+			self.BranchIndex = branchIndex  # type: typing.Optional[typing.Dict[str, typing.Set[str]]]
+			self.LazyVerification = lazyVerification  # type: bool
+			self.PendingVerification = dict()  # type: typing.Dict[str, Version.Version]  # The version each unverified branch value needs to be verified against.
+
+			self._frozenValues = dict()  # type: typing.Dict[str, typing.Tuple[int, typing.Any]]  # Frozen versions of stored values, paired with the branch generation they were frozen in.
+			self._frozenDefault = default if copyOnWrite else None  # type: typing.Any
+
+			for branch in values.keys():  # type: str
+				self._IndexBranch(branch)
 
 		def IsSet (self, branch: str) -> bool:
 			return branch in self.Values
 
 		def Save (self) -> typing.Dict[str, typing.Any]:
+			if self.CopyOnWrite:
+				return Frozen.Thaw(self.Values)
+
 			return copy.deepcopy(self.Values)
 
+		def SaveBranch (self, branch: str) -> typing.Any:
+			if self.CopyOnWrite:
+				return Frozen.Thaw(self.Values[branch])
+
+			return copy.deepcopy(self.Values[branch])
+
 		def Get (self, branch: str) -> typing.Any:
+			if self.CopyOnWrite:
+				return self.Values.get(branch, self.Default)
+
+			value = self.Values.get(branch, self.Default)  # type: typing.Any
+
+			if Frozen.IsImmutable(value):
+				return value
+
+			return copy.deepcopy(value)
+
+		def GetFrozen (self, branch: str) -> typing.Any:
+			# Get a frozen version of a branch's value that can be shared. Values not stored in copy on write mode are frozen once and then reused until they change.
+
+			if self.CopyOnWrite:
+				return self.Values.get(branch, self.Default)
+
 			if not branch in self.Values:
-				return copy.deepcopy(self.Default)
+				if self._frozenDefault is None:
+					self._frozenDefault = Frozen.Freeze(self.Default)
 
-			return copy.deepcopy(self.Values[branch])
+				return self._frozenDefault
+
+			branchGeneration = self.BranchGenerations.get(branch)  # type: typing.Optional[int]
+			frozenValue = self._frozenValues.get(branch)  # type: typing.Optional[typing.Tuple[int, typing.Any]]
+
+			if frozenValue is not None and frozenValue[0] == branchGeneration:
+				return frozenValue[1]
+
+			frozenValue = (branchGeneration, Frozen.Freeze(self.Values[branch]))
+			self._frozenValues[branch] = frozenValue
+			return frozenValue[1]
+
+		def GetMutable (self, branch: str) -> typing.Any:
+			if not self.CopyOnWrite:
+				return self.Get(branch)
+
+			return Frozen.Thaw(self.Values.get(branch, self.Default))
 
 		def GetAllBranches (self) -> typing.Dict[str, typing.Any]:
+			if self.CopyOnWrite:
+				return dict(self.Values)
+
 			return copy.deepcopy(self.Values)
 
 		def GetAllBranchIdentifiers (self) -> typing.Set[str]:
 			return set(self.Values.keys())
 
-		def Set (self, branch: str, value: typing.Any, version: Version.Version, verify: bool = True) -> None:
-			if verify:
-				copiedValue = copy.deepcopy(self.Verify(value, version))  # type: typing.Any
-			else:
-				copiedValue = copy.deepcopy(value)  # type: typing.Any
+		def Set (self, branch: str, value: typing.Any, version: Version.Version, verify: bool = True) -> bool:
+			# Returns whether or not the stored value is now different.
+
+			copiedValue = self._CopyVerified(value, version, verify)  # type: typing.Any
+			changed = branch not in self.Values or copiedValue != self.Values[branch]  # type: bool
+
+			if branch not in self.Values:
+				self._IndexBranch(branch)
 
 			self.Values[branch] = copiedValue
+			self.PendingVerification.pop(branch, None)
 
-		def SetAllBranches (self, value: typing.Any, version: Version.Version, verify: bool = True) -> None:
-			if verify:
-				copiedValue = copy.deepcopy(self.Verify(value, version))  # type: typing.Any
-			else:
-				copiedValue = copy.deepcopy(value)  # type: typing.Any
+			self.Generation += 1
+			self.BranchGenerations[branch] = self.Generation
+
+			return changed
+
+		def SetAllBranches (self, value: typing.Any, version: Version.Version, verify: bool = True) -> bool:
+			# Returns whether or not any of the stored values are now different.
+
+			copiedValue = self._CopyVerified(value, version, verify)  # type: typing.Any
+			changed = any(copiedValue != branchValue for branchValue in self.Values.values())  # type: bool
+
+			self.Generation += 1
 
 			for branch in self.Values.keys():  # type: str
 				self.Values[branch] = copiedValue
+				self.BranchGenerations[branch] = self.Generation
+
+			self.PendingVerification = dict()
+
+			return changed
+
+		def _CopyVerified (self, value: typing.Any, version: Version.Version, verify: bool) -> typing.Any:
+			if verify:
+				value = self.Verify(value, version)  # type: typing.Any
+
+			if self.CopyOnWrite:
+				return Frozen.Freeze(value)
+
+			return copy.deepcopy(value)
+
+		def Reset (self, branch: str = None) -> bool:
+			# Returns whether or not any of the stored values are now different.
 
-		def Reset (self, branch: str = None) -> None:
 			if branch is None:
+				changed = len(self.Values) != 0  # type: bool
+
+				for resettingBranch in self.Values.keys():  # type: str
+					self._UnindexBranch(resettingBranch)
+
 				self.Values = dict()
+				self.BranchGenerations = dict()
+				self.PendingVerification = dict()
+				self._frozenValues = dict()
 			else:
+				changed = branch in self.Values  # type: bool
+
+				if changed:
+					self._UnindexBranch(branch)
+
 				self.Values.pop(branch, None)
+				self.BranchGenerations.pop(branch, None)
+				self.PendingVerification.pop(branch, None)
+				self._frozenValues.pop(branch, None)
+
+			self.Generation += 1
+
+			return changed
+
+		def Restore (self, values: typing.Dict[str, typing.Any]) -> None:
+			# Put back values previously taken from this object, the values are expected to have already been copied or frozen.
+
+			for branch in self.Values.keys():  # type: str
+				if branch not in values:
+					self._UnindexBranch(branch)
+
+			for branch in values.keys():  # type: str
+				if branch not in self.Values:
+					self._IndexBranch(branch)
+
+			self.Generation += 1
+			self.Values = values
+			self.BranchGenerations = dict.fromkeys(values.keys(), self.Generation)
+			self.PendingVerification = dict()
+
+		def MarkUnverified (self, branch: str, version: Version.Version) -> None:
+			# Mark a branch's stored value as being loaded without verification, it will need to be verified against this version before it is used.
+			self.PendingVerification[branch] = version
+
+		def _IndexBranch (self, branch: str) -> None:
+			if self.BranchIndex is None:
+				return
+
+			branchKeys = self.BranchIndex.get(branch)  # type: typing.Optional[typing.Set[str]]
+
+			if branchKeys is None:
+				branchKeys = set()
+				self.BranchIndex[branch] = branchKeys
+
+			branchKeys.add(self.Key)
+
+		def _UnindexBranch (self, branch: str) -> None:
+			if self.BranchIndex is None:
+				return
+
+			branchKeys = self.BranchIndex.get(branch)  # type: typing.Optional[typing.Set[str]]
+
+			if branchKeys is None:
+				return
+
+			branchKeys.discard(self.Key)
+
+			if len(branchKeys) == 0:
+				self.BranchIndex.pop(branch, None)
+
+	class BranchMapping(collections.abc.Mapping):
+		def __init__ (self, persistence: PersistentBranched, branch: str):
+			"""
+			A read-only view of every value set in a branch, keyed by the values' persistent data keys. Values are fetched from the persistence object only when they
+			are looked up and are handed out frozen instead of being copied, nothing is copied when the view is created. The view reflects later changes made to the
+			branch.
+			"""
+
+			self.Persistence = persistence  # type: PersistentBranched
+			self.Branch = branch  # type: str
+
+		def __getitem__ (self, key: str) -> typing.Any:
+			# noinspection PyProtectedMember
+			self.Persistence._LoadPending(self.Branch)
+
+			# noinspection PyProtectedMember
+			if key not in self.Persistence._branchIndex.get(self.Branch, ()):
+				raise KeyError(key)
+
+			# noinspection PyProtectedMember
+			return self.Persistence._GetFrozen(self.Branch, key)
+
+		def __iter__ (self) -> typing.Iterator[str]:
+			# noinspection PyProtectedMember
+			self.Persistence._LoadPending(self.Branch)
+
+			# noinspection PyProtectedMember
+			return iter(list(self.Persistence._branchIndex.get(self.Branch, ())))
+
+		def __len__ (self) -> int:
+			# noinspection PyProtectedMember
+			self.Persistence._LoadPending(self.Branch)
+
+			# noinspection PyProtectedMember
+			return len(self.Persistence._branchIndex.get(self.Branch, ()))
+
+		def __contains__ (self, key: typing.Any) -> bool:
+			# noinspection PyProtectedMember
+			self.Persistence._LoadPending(self.Branch)
+
+			# noinspection PyProtectedMember
+			return key in self.Persistence._branchIndex.get(self.Branch, ())
 
 	def __init__ (self, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace):
 		"""
@@ -90,12 +306,24 @@ class PersistentBranched(abc.ABC):
 		self.OnLoad = Events.EventHandler()  # type: Events.EventHandler  # An event that is triggered when new data is loaded.
 
 		self._loadedData = dict()  # type: typing.Dict[str, typing.Any]
+		self._loadedDataGeneration = 0  # type: int  # Incremented every time new data is loaded.
 		self._loadedLastVersion = None  # type: typing.Optional[Version.Version]
 
 		self._storage = dict()  # type: typing.Dict[str, PersistentBranched.Value]
+		self._branchIndex = dict()  # type: typing.Dict[str, typing.Set[str]]  # The keys of every value set in each branch, kept in sync by the value storage objects.
 		self._managedBranches = list()  # type: typing.List[str]
 
 		self._updateStorage = list()  # type: list
+		self._changedKeys = set()  # type: typing.Set[str]  # The keys of values that have changed in any branch since the last update event.
+		self._changedKeysLock = threading.Lock()  # type: threading.Lock  # Values verified on the prewarm thread can be marked as changed while an update is taking the changed keys.
+
+		self._verificationLock = threading.RLock()  # type: threading.RLock
+		self._prewarmTimer = None  # type: typing.Optional[threading.Timer]
+
+		self._batchSnapshots = list()  # type: typing.List[typing.Dict[str, typing.Dict[str, typing.Any]]]  # One entry for each active batch, the innermost batch is last.
+		self._batchUnverifiedValues = list()  # type: typing.List[typing.Set[typing.Tuple[str, str]]]
+		self._batchSaveRequested = False  # type: bool
+		self._batchUpdateRequested = False  # type: bool
 
 	@property
 	def LoadedLastVersion (self) -> typing.Optional[Version.Version]:
@@ -117,7 +345,7 @@ class PersistentBranched(abc.ABC):
 	def Save (self, *args, **kwargs) -> typing.Any:
 		raise NotImplementedError()
 
-	def Setup (self, key: str, valueType: type, default, verify: typing.Callable) -> None:
+	def Setup (self, key: str, valueType: type, default, verify: typing.Callable, copyOnWrite: bool = False, lazyVerification: bool = False) -> None:
 		"""
 		Setup persistent data for this persistence object. All persistent data must be setup before it can be used. Persistent data can be loaded before being
 		setup but will remain dormant until setup. Persistent data also cannot be setup twice, an exception will be raised if this is tried.
@@ -138,6 +366,15 @@ class PersistentBranched(abc.ABC):
 					   If the value cannot be corrected the verify function should raise an exception, the persistent data may then revert to its default if necessary.
 		:type verify: typing.Callable
 
+		:param copyOnWrite: If true, this persistent data's values will be frozen into immutable objects when set and will be handed out by the get methods without
+		being copied. Dictionaries, lists and sets will be returned as read-only versions of themselves, use the get mutable method to get a copy that can be changed.
+		This should only be used for values made of python's basic types.
+		:type copyOnWrite: bool
+
+		:param lazyVerification: If true, loaded values for this persistent data will not be verified until they are first retrieved or saved. Values that are not used
+		soon after being loaded will be verified on a background thread, the verify callback must be safe to call from another thread if this is enabled.
+		:type lazyVerification: bool
+
 		:rtype: None
 		"""
 
@@ -156,6 +393,12 @@ class PersistentBranched(abc.ABC):
 		if not isinstance(verify, typing.Callable):
 			raise Exceptions.IncorrectTypeException(verify, "verify", ("Callable",))
 
+		if not isinstance(copyOnWrite, bool):
+			raise Exceptions.IncorrectTypeException(copyOnWrite, "copyOnWrite", (bool,))
+
+		if not isinstance(lazyVerification, bool):
+			raise Exceptions.IncorrectTypeException(lazyVerification, "lazyVerification", (bool,))
+
 		try:
 			verifiedDefault = verify(default)
 		except Exception as e:
@@ -174,14 +417,23 @@ class PersistentBranched(abc.ABC):
 		for branchKey in list(self._loadedData.keys()):  # type: str
 			branchValues = self._loadedData[branchKey]  # type: typing.Dict[str, typing.Any]
 
-			if key in branchValues:
+			if key in branchValues and lazyVerification:
+				values[branchKey] = branchValues[key]
+			elif key in branchValues:
 				try:
 					values[branchKey] = verify(branchValues[key], version)
 				except Exception:
 					Debug.Log("Verify callback found fault with the value that was stored for persistent data '" + key + "'.", self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 
-		valueStorage = self.Value(values, valueType, default, verify)  # type: PersistentBranched.Value
+		valueStorage = self.Value(values, valueType, default, verify, copyOnWrite = copyOnWrite, key = key, branchIndex = self._branchIndex, lazyVerification = lazyVerification)  # type: PersistentBranched.Value
 		self._storage[key] = valueStorage
+		self._MarkChanged(key)
+
+		if lazyVerification and len(values) != 0:
+			for branchKey in values.keys():  # type: str
+				valueStorage.MarkUnverified(branchKey, version)
+
+			self._SchedulePrewarm()
 
 	def IsSetup (self, key: str) -> bool:
 		"""
@@ -197,7 +449,8 @@ class PersistentBranched(abc.ABC):
 	def Get (self, branch: str, key: str):
 		"""
 		Gets the value of the persistent data specified by the key and branch. The value returned will be a deep copy of what is stored, modifying it should never change
-		anything unless you set it with the set function.
+		anything unless you set it with the set function. If the persistent data was setup in copy on write mode, the stored value will be returned without being
+		copied, it will have been frozen so it cannot be modified. Immutable values such as strings, numbers and tuples are never copied.
 
 		:param branch: The name of the branch to get the value from.
 		:type branch: str
@@ -215,8 +468,35 @@ class PersistentBranched(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending(branch)
+		self._VerifyPending(key, branch = branch)
 		return self._storage[key].Get(branch)
 
+	def GetMutable (self, branch: str, key: str):
+		"""
+		Gets a copy of the value of the persistent data specified by the key and branch that can be freely modified. Modifying it should never change anything
+		unless you set it with the set function.
+
+		:param branch: The name of the branch to get the value from.
+		:type branch: str
+		:param key: The name of the persistent data, is case sensitive.
+		:type key: str
+		:return: The return object will always be of the type specified for the target persistent data during setup.
+		"""
+
+		if not isinstance(branch, str):
+			raise Exceptions.IncorrectTypeException(branch, "branch", (str,))
+
+		if not isinstance(key, str):
+			raise Exceptions.IncorrectTypeException(key, "key", (str,))
+
+		if not self.IsSetup(key):
+			raise Exception("Persistent data '" + key + "' is not setup.")
+
+		self._LoadPending(branch)
+		self._VerifyPending(key, branch = branch)
+		return self._storage[key].GetMutable(branch)
+
 	def GetAllBranches (self, key: str) -> typing.Dict[str, typing.Any]:
 		"""
 		Gets a dictionary of every branch's value for the persistent data specified by the key. The value returned will be a deep copy of what is stored, modifying it
@@ -232,6 +512,8 @@ class PersistentBranched(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending()
+		self._VerifyPending(key)
 		return self._storage[key].GetAllBranches()
 
 	def GetAllBranchIdentifiers (self, key: str) -> typing.Set[str]:
@@ -245,8 +527,51 @@ class PersistentBranched(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending()
+
 		return self._storage[key].GetAllBranchIdentifiers()
 
+	def GetBranch (self, branch: str) -> typing.Mapping[str, typing.Any]:
+		"""
+		Gets a read-only mapping of every value set in the branch, keyed by the name of the persistent data. Values looked up through the mapping are frozen so they
+		cannot be modified, use the get mutable method to get a copy that can be changed. Each value is only frozen once until it changes, values set up in copy on
+		write mode are handed out as they are stored. The mapping will reflect changes made to the branch after it was created.
+
+		:param branch: The name of the branch to get the values from.
+		:type branch: str
+		"""
+
+		if not isinstance(branch, str):
+			raise Exceptions.IncorrectTypeException(branch, "branch", (str,))
+
+		self._LoadPending(branch)
+
+		return self.BranchMapping(self, branch)
+
+	def GetBranchKeys (self, branch: str) -> typing.Set[str]:
+		"""
+		Gets a set of the name of every persistent data that has a value set in this branch.
+
+		:param branch: The name of the branch to get the keys of.
+		:type branch: str
+		"""
+
+		if not isinstance(branch, str):
+			raise Exceptions.IncorrectTypeException(branch, "branch", (str,))
+
+		self._LoadPending(branch)
+
+		return set(self._branchIndex.get(branch, ()))
+
+	def GetBranchIdentifiers (self) -> typing.Set[str]:
+		"""
+		Gets a set of the identifier of every branch that has at least one value set in it.
+		"""
+
+		self._LoadPending()
+
+		return set(self._branchIndex.keys())
+
 	def Set (self, branch: str, key: str, value, autoSave: bool = True, autoUpdate: bool = True) -> None:
 		"""
 		Set the value of the persistent data specified by the key and branch. The value is deep copied before being but into storage, modifying the value after setting
@@ -275,6 +600,8 @@ class PersistentBranched(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending(branch)
+
 		valueStorage = self._storage[key]
 
 		if not isinstance(value, valueStorage.ValueType):
@@ -286,7 +613,22 @@ class PersistentBranched(abc.ABC):
 		if not isinstance(autoUpdate, bool):
 			raise Exceptions.IncorrectTypeException(autoUpdate, "autoUpdate", (bool,))
 
-		valueStorage.Set(branch, value, self.CurrentVersion)
+		if self.InBatch:
+			self._BatchTakeSnapshot(key)
+
+			with self._verificationLock:
+				valueStorage.Set(branch, value, self.CurrentVersion, verify = False)
+
+			self._batchUnverifiedValues[-1].add((key, branch))
+			self._batchSaveRequested = self._batchSaveRequested or autoSave
+			self._batchUpdateRequested = self._batchUpdateRequested or autoUpdate
+			return
+
+		with self._verificationLock:
+			valueChanged = valueStorage.Set(branch, value, self.CurrentVersion)  # type: bool
+
+		if valueChanged:
+			self._MarkChanged(key)
 
 		if autoSave:
 			self.Save()
@@ -317,6 +659,8 @@ class PersistentBranched(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending()
+
 		valueStorage = self._storage[key]
 
 		if not isinstance(value, valueStorage.ValueType):
@@ -328,7 +672,22 @@ class PersistentBranched(abc.ABC):
 		if not isinstance(autoUpdate, bool):
 			raise Exceptions.IncorrectTypeException(autoUpdate, "autoUpdate", (bool,))
 
-		valueStorage.SetAllBranches(value, self.CurrentVersion)
+		if self.InBatch:
+			self._BatchTakeSnapshot(key)
+
+			with self._verificationLock:
+				valueStorage.SetAllBranches(value, self.CurrentVersion, verify = False)
+
+			self._batchUnverifiedValues[-1].update((key, branch) for branch in valueStorage.GetAllBranchIdentifiers())
+			self._batchSaveRequested = self._batchSaveRequested or autoSave
+			self._batchUpdateRequested = self._batchUpdateRequested or autoUpdate
+			return
+
+		with self._verificationLock:
+			valueChanged = valueStorage.SetAllBranches(value, self.CurrentVersion)  # type: bool
+
+		if valueChanged:
+			self._MarkChanged(key)
 
 		if autoSave:
 			self.Save()
@@ -351,6 +710,8 @@ class PersistentBranched(abc.ABC):
 		if not self.IsSetup(key):
 			raise Exception("Persistent data '" + key + "' is not setup.")
 
+		self._LoadPending(branch)
+
 		valueStorage = self._storage[key]  # type: PersistentBranched.Value
 		return valueStorage.IsSet(branch)
 
@@ -375,15 +736,34 @@ class PersistentBranched(abc.ABC):
 		if not isinstance(key, str) and key is not None:
 			raise Exceptions.IncorrectTypeException(key, "key", (str,))
 
-		if key is None:
-			for valueStorage in self._storage.values():  # type: str, PersistentBranched.Value
-				valueStorage.Reset(branch)
+		if key is not None and not self.IsSetup(key):
+			raise Exception("Persistent data '" + key + "' is not setup.")
+
+		self._LoadPending(branch)
+
+		if key is not None:
+			resettingKeys = [key]  # type: typing.List[str]
+		elif branch is not None:
+			resettingKeys = list(self._branchIndex.get(branch, ()))  # type: typing.List[str]  # Only the values set in this branch need to be touched.
 		else:
-			if not self.IsSetup(key):
-				raise Exception("Persistent data '" + key + "' is not setup.")
+			resettingKeys = list(self._storage.keys())  # type: typing.List[str]
+
+		for resettingKey in resettingKeys:  # type: str
+			if self.InBatch:
+				self._BatchTakeSnapshot(resettingKey)
+
+			valueStorage = self._storage[resettingKey]  # type: PersistentBranched.Value
+
+			with self._verificationLock:
+				valueChanged = valueStorage.Reset(branch)  # type: bool
 
-			valueStorage = self._storage[key]  # type: PersistentBranched.Value
-			valueStorage.Reset(branch)
+			if valueChanged and not self.InBatch:
+				self._MarkChanged(resettingKey)
+
+		if self.InBatch:
+			self._batchSaveRequested = self._batchSaveRequested or autoSave
+			self._batchUpdateRequested = self._batchUpdateRequested or autoUpdate
+			return
 
 		if autoSave:
 			self.Save()
@@ -394,12 +774,126 @@ class PersistentBranched(abc.ABC):
 	def Update (self) -> None:
 		"""
 		Triggers the 'OnUpdate' event.
-		This should be called after any persistent data change where you elected not to allow for auto-updating.
+		This should be called after any persistent data change where you elected not to allow for auto-updating. If a batch is active the event will be triggered
+		once the batch ends. The event arguments will list the keys of every value that has changed in any branch since the last update.
 
 		:rtype: None
 		"""
 
-		self._InvokeOnUpdateEvent()
+		if self.InBatch:
+			self._batchUpdateRequested = True
+			return
+
+		with self._changedKeysLock:
+			changedKeys = self._changedKeys  # type: typing.Set[str]
+			self._changedKeys = set()
+
+		self._InvokeOnUpdateEvent(changedKeys = changedKeys)
+
+	@property
+	def InBatch (self) -> bool:
+		"""
+		Whether or not a batch is currently active in this persistence object.
+		"""
+
+		return len(self._batchSnapshots) > 0
+
+	@contextlib.contextmanager
+	def Batch (self):
+		"""
+		Get a context manager that groups changes to multiple values together. Inside the 'with' block, values set through this object will not be verified,
+		saved or cause update events. When the block exits, every changed value will be verified, then the data will be saved and the 'OnUpdate' event triggered
+		once, with the event arguments listing every changed key. Saving or updating only happens if at least one of the changes in the batch asked for it.
+
+		If an exception escapes the block, or a value fails verification, every change made in the batch will be rolled back and the exception will be raised
+		again. Batches can be nested, each nested batch keeps its own snapshot. If an exception escapes a nested batch only the changes made inside it will be
+		rolled back, otherwise its changes are handed to the enclosing batch. Only the outermost batch will verify, save or update.
+		"""
+
+		self._batchSnapshots.append(dict())
+		self._batchUnverifiedValues.append(set())
+
+		try:
+			yield self
+		except BaseException:
+			self._BatchRollback()
+			raise
+
+		if len(self._batchSnapshots) == 1:
+			self._BatchCommit()
+		else:
+			self._BatchMerge()
+
+	def _BatchTakeSnapshot (self, key: str) -> None:
+		levelSnapshots = self._batchSnapshots[-1]  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
+
+		if key in levelSnapshots:
+			return
+
+		self._VerifyPending(key)
+		valueStorage = self._storage[key]  # type: PersistentBranched.Value
+		levelSnapshots[key] = dict(valueStorage.Values)
+
+	def _BatchMerge (self) -> None:
+		# Hand the changes of the innermost batch to the batch enclosing it. The enclosing batch's snapshots are older, so they are kept where both exist.
+
+		levelSnapshots = self._batchSnapshots.pop()  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
+		levelUnverifiedValues = self._batchUnverifiedValues.pop()  # type: typing.Set[typing.Tuple[str, str]]
+
+		for snapshotKey, snapshotValues in levelSnapshots.items():  # type: str, typing.Dict[str, typing.Any]
+			self._batchSnapshots[-1].setdefault(snapshotKey, snapshotValues)
+
+		self._batchUnverifiedValues[-1].update(levelUnverifiedValues)
+
+	def _BatchCommit (self) -> None:
+		try:
+			for unverifiedKey, unverifiedBranch in self._batchUnverifiedValues[-1]:  # type: str, str
+				valueStorage = self._storage[unverifiedKey]  # type: PersistentBranched.Value
+
+				if not valueStorage.IsSet(unverifiedBranch):
+					continue  # The value was reset after being set.
+
+				verifiedValue = valueStorage.Verify(valueStorage.GetMutable(unverifiedBranch), self.CurrentVersion)  # type: typing.Any
+				valueStorage.Set(unverifiedBranch, verifiedValue, self.CurrentVersion, verify = False)
+		except:
+			self._BatchRollback()
+			raise
+
+		for snapshotKey, snapshotValues in self._batchSnapshots[-1].items():  # type: str, typing.Dict[str, typing.Any]
+			valueStorage = self._storage[snapshotKey]  # type: PersistentBranched.Value
+
+			if snapshotValues != valueStorage.Values:
+				self._MarkChanged(snapshotKey)
+
+		saveRequested = self._batchSaveRequested  # type: bool
+		updateRequested = self._batchUpdateRequested  # type: bool
+
+		self._BatchClear()
+
+		if saveRequested:
+			self.Save()
+
+		if updateRequested:
+			self.Update()
+
+	def _BatchRollback (self) -> None:
+		# Only the changes made in the innermost batch are rolled back, the batches enclosing it are left alone.
+
+		levelSnapshots = self._batchSnapshots.pop()  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
+		self._batchUnverifiedValues.pop()
+
+		for snapshotKey, snapshotValues in levelSnapshots.items():  # type: str, typing.Dict[str, typing.Any]
+			valueStorage = self._storage[snapshotKey]  # type: PersistentBranched.Value
+			valueStorage.Restore(snapshotValues)
+
+		if not self.InBatch:
+			self._BatchClear()
+
+	def _BatchClear (self) -> None:
+		self._batchSnapshots = list()
+		self._batchUnverifiedValues = list()
+		self._batchSaveRequested = False
+		self._batchUpdateRequested = False
 
 	def _LoadSetData (self, persistentDataBranches: dict, lastVersion: typing.Optional[Version.Version] = None) -> bool:
 		"""
@@ -411,6 +905,23 @@ class PersistentBranched(abc.ABC):
 		:rtype: bool
 		"""
 
+		operationSuccess, changed = self._LoadSetBranches(persistentDataBranches, lastVersion = lastVersion)  # type: bool, bool
+
+		self._loadedData = persistentDataBranches
+		self._loadedDataGeneration += 1
+		self._loadedLastVersion = lastVersion
+
+		if changed:
+			self.Save()
+
+		self.Update()
+
+		return operationSuccess
+
+	def _LoadSetBranches (self, persistentDataBranches: dict, lastVersion: typing.Optional[Version.Version] = None) -> typing.Tuple[bool, bool]:
+		# Set the values stored in these branches. Invalid entries are removed from the branch dictionaries, the first value returned indicates if this completed
+		# without incident, the second indicates whether or not anything was removed.
+
 		operationSuccess = True  # type: bool
 
 		changed = False  # type: bool
@@ -454,8 +965,19 @@ class PersistentBranched(abc.ABC):
 					operationSuccess = False
 					continue
 
+				if valueStorage.LazyVerification:
+					with self._verificationLock:
+						if valueStorage.Set(persistentBranchKey, persistentValue, lastVersion, verify = False):
+							self._MarkChanged(persistentKey)
+
+						valueStorage.MarkUnverified(persistentBranchKey, lastVersion if lastVersion is not None else self.CurrentVersion)
+
+					self._SchedulePrewarm()
+					continue
+
 				try:
-					valueStorage.Set(persistentBranchKey, persistentValue, lastVersion)
+					if valueStorage.Set(persistentBranchKey, persistentValue, lastVersion):
+						self._MarkChanged(persistentKey)
 				except Exception:
 					Debug.Log("Cannot set value '" + str(persistentValue) + "' for persistent data '" + persistentKey + "'.", self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
 					persistentBranchValues.pop(persistentKey, None)
@@ -463,24 +985,23 @@ class PersistentBranched(abc.ABC):
 					operationSuccess = False
 					continue
 
-		self._loadedData = persistentDataBranches
-		self._loadedLastVersion = lastVersion
-
-		if changed:
-			self.Save()
-
-		self.Update()
-
-		return operationSuccess
+		return operationSuccess, changed
 
-	def _SaveGetData (self) -> typing.Tuple[bool, dict]:
+	def _SaveGetData (self, includePending: bool = True) -> typing.Tuple[bool, dict]:
 		"""
+		:param includePending: Whether or not branches that haven't been loaded yet should be loaded and included in the save data.
+		:type includePending: bool
 		:return: The first value indicates if this method completed without incident. The second is the save data.
 		:rtype: typing.Tuple[bool, dict]
 		"""
 
 		operationSuccess = True  # type: bool
 
+		if includePending:
+			self._LoadPending()
+
+		self._VerifyAllPending()
+
 		persistentData = copy.deepcopy(self._loadedData)  # type: typing.Dict[str, typing.Any]
 
 		for persistentKey, persistentValueStorage in self._storage.items():  # type: str, PersistentBranched.Value
@@ -497,8 +1018,87 @@ class PersistentBranched(abc.ABC):
 
 		return operationSuccess, persistentData
 
-	def _InvokeOnUpdateEvent (self) -> Events.EventArguments:
-		eventArguments = Events.EventArguments()  # type: Events.EventArguments
+	def _VerifyPending (self, key: str, branch: typing.Optional[str] = None) -> None:
+		valueStorage = self._storage[key]  # type: PersistentBranched.Value
+
+		if len(valueStorage.PendingVerification) == 0:
+			return
+
+		if branch is not None and branch not in valueStorage.PendingVerification:
+			return
+
+		with self._verificationLock:
+			if branch is None:
+				verifyingBranches = list(valueStorage.PendingVerification.keys())  # type: typing.List[str]
+			else:
+				verifyingBranches = [branch]  # type: typing.List[str]
+
+			for verifyingBranch in verifyingBranches:  # type: str
+				verificationVersion = valueStorage.PendingVerification.get(verifyingBranch)  # type: typing.Optional[Version.Version]
+
+				if verificationVersion is None:
+					continue  # Another thread got to this value first.
+
+				try:
+					verifiedValue = valueStorage.Verify(valueStorage.GetMutable(verifyingBranch), verificationVersion)  # type: typing.Any
+
+					if verifyingBranch not in valueStorage.PendingVerification:
+						continue  # The value was replaced while it was being verified.
+
+					valueChanged = valueStorage.Set(verifyingBranch, verifiedValue, verificationVersion, verify = False)  # type: bool
+				except Exception:
+					Debug.Log("Verify callback found fault with the value that was stored for persistent data '" + key + "' in the branch '" + verifyingBranch + "'.", self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+					valueChanged = valueStorage.Reset(verifyingBranch)  # type: bool
+
+					loadedBranchValues = self._loadedData.get(verifyingBranch)  # type: typing.Optional[typing.Dict[str, typing.Any]]
+
+					if isinstance(loadedBranchValues, dict) and key in loadedBranchValues:
+						loadedBranchValues.pop(key, None)  # Don't let the faulty value be saved again.
+						self._loadedDataGeneration += 1
+
+				if valueChanged:
+					self._MarkChanged(key)
+
+	def _GetFrozen (self, branch: str, key: str) -> typing.Any:
+		self._LoadPending(branch)
+		self._VerifyPending(key, branch = branch)
+		return self._storage[key].GetFrozen(branch)
+
+	def _LoadPending (self, branch: typing.Optional[str] = None) -> None:
+		# Persistence objects that are given their data lazily should load it here, this is called before any value is used. Only the data for the branch given
+		# is needed, or the data for every branch if the branch is None.
+		pass
+
+	def _MarkChanged (self, key: str) -> None:
+		with self._changedKeysLock:
+			self._changedKeys.add(key)
+
+	def _GetStorageState (self) -> tuple:
+		# Get a value that will only be equal to a previous state if no value has been setup, set, reset or loaded since then.
+		return self._loadedDataGeneration, tuple((storageKey, valueStorage.Generation) for storageKey, valueStorage in self._storage.items())
+
+	def _VerifyAllPending (self) -> None:
+		for key in list(self._storage.keys()):  # type: str
+			self._VerifyPending(key)
+
+	def _SchedulePrewarm (self) -> None:
+		if self._prewarmTimer is not None:
+			return
+
+		self._prewarmTimer = threading.Timer(self.PrewarmDelay, self._PrewarmTimerCallback)
+		self._prewarmTimer.daemon = True
+		self._prewarmTimer.start()
+
+	def _PrewarmTimerCallback (self) -> None:
+		self._prewarmTimer = None
+
+		try:
+			self._VerifyAllPending()
+		except Exception:
+			Debug.Log("Failed to verify lazily loaded values in the background.", self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+
+	def _InvokeOnUpdateEvent (self, changedKeys: typing.Optional[typing.Set[str]] = None) -> Persistence.UpdateEventArguments:
+		eventArguments = Persistence.UpdateEventArguments(changedKeys = changedKeys)  # type: Persistence.UpdateEventArguments
 
 		for updateCallback in self.OnUpdate:  # type: typing.Callable[[PersistentBranched, Events.EventArguments], None]
 			try:
@@ -631,9 +1231,23 @@ class PersistentBranchedJson(PersistentBranchedDirect):
 
 		return operationSuccess
 
+	def __init__ (self, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace):
+		"""
+		:param currentVersion: The current version of what ever will be controlling this persistence object.
+							   This value can allow you to correct outdated persistent data.
+		:type currentVersion: Version.Version
+		:param hostNamespace: Errors made by this persistent object will show up under this namespace.
+		:type hostNamespace: str
+		"""
+
+		super().__init__(currentVersion, hostNamespace = hostNamespace)
+
+		self._encodedFragments = dict()  # type: typing.Dict[typing.Tuple[str, str], typing.Tuple[tuple, str]]
+
 	def Save (self) -> typing.Tuple[bool, str]:
 		"""
 		Encodes the persistent data container to a json string. This method can handle cases in which any persistent data's key or value cannot be encoded.
+		The encoded text of each value is kept between saves, values will only be encoded again if they have changed since the last save.
 
 		:return: The first value indicates if this method completed without incident. The second is the save data.
 		:rtype: typing.Tuple[bool, dict]
@@ -641,21 +1255,45 @@ class PersistentBranchedJson(PersistentBranchedDirect):
 
 		operationSuccess = True  # type: bool
 
-		saveSuccess, persistentDataContainer = super().Save()  # type: bool, dict
+		self._VerifyAllPending()
 
-		persistentDataBranches = persistentDataContainer[self._branchesKey]  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
-		persistentDataBranchesValuesString = ""  # type: str
+		encodedFragments = dict()  # type: typing.Dict[typing.Tuple[str, str], typing.Tuple[tuple, str]]
+		persistentDataBranchStrings = list()  # type: typing.List[str]
 
-		for branchKey, branchValue in persistentDataBranches.items():  # type: str, dict
+		for branchKey, branchSources in self._SaveGetSources().items():  # type: str, typing.Dict[str, typing.Optional[PersistentBranched.Value]]
 			branchInformation = "Branch: " + branchKey
-			persistentDataValuesString = ""
+			persistentDataValueStrings = list()  # type: typing.List[str]
+
+			for persistentKey, persistentValueStorage in branchSources.items():  # type: str, typing.Optional[PersistentBranched.Value]
+				fragmentKey = (branchKey, persistentKey)  # type: typing.Tuple[str, str]
+
+				if persistentValueStorage is None:
+					fragmentToken = (None, self._loadedDataGeneration)  # type: tuple
+				else:
+					fragmentToken = (persistentValueStorage, persistentValueStorage.BranchGenerations.get(branchKey))  # type: tuple
+
+				cachedFragment = self._encodedFragments.get(fragmentKey)  # type: typing.Optional[typing.Tuple[tuple, str]]
+
+				if cachedFragment is not None and cachedFragment[0] == fragmentToken:
+					encodedFragments[fragmentKey] = cachedFragment
+					persistentDataValueStrings.append(cachedFragment[1])
+					continue
+
+				if persistentValueStorage is None:
+					persistentValue = self._loadedData[branchKey][persistentKey]  # type: typing.Any
+				else:
+					try:
+						persistentValue = persistentValueStorage.SaveBranch(branchKey)  # type: typing.Any
+					except Exception:
+						Debug.Log("Failed to save value of '" + persistentKey + "'. This entry may be reset the next time this persistent data is loaded.", self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+						operationSuccess = False
+						continue
 
-			for persistentKey, persistentValue in branchValue.items():  # type: str, typing.Any
 				keyInformation = "Key: " + persistentKey  # type: str
 
 				try:
 					assert isinstance(persistentKey, str)
-					persistentKeyString = json.JSONEncoder(indent = "\t").encode(persistentKey)  # type: str
+					persistentKeyString = _jsonEncoder.encode(persistentKey)  # type: str
 					assert "\n" not in persistentKeyString and "\r" not in persistentKeyString
 				except Exception:
 					Debug.Log("Failed to encode a persistence key to a json string.\n" + branchInformation + "\n" + keyInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
@@ -665,40 +1303,24 @@ class PersistentBranchedJson(PersistentBranchedDirect):
 				valueInformation = "Value Type: " + Types.GetFullName(persistentKey) + "\nValue Value: " + persistentKey  # type: str
 
 				try:
-					persistentValueString = json.JSONEncoder(indent = "\t").encode(persistentValue)  # type: str
+					persistentValueString = _jsonEncoder.encode(persistentValue)  # type: str
 				except Exception:
 					Debug.Log("Failed to encode a persistence value to a json string.\n" + branchInformation + "\n" + keyInformation + "\n" + valueInformation, self.HostNamespace, Debug.LogLevels.Exception, group = self.HostNamespace, owner = __name__)
 					operationSuccess = False
 					continue
 
-				persistentValueString = persistentValueString.replace("\n", "\n\t\t\t")
+				encodedFragment = (fragmentToken, "\t\t\t" + persistentKeyString + ": " + persistentValueString.replace("\n", "\n\t\t\t"))  # type: typing.Tuple[tuple, str]
+				encodedFragments[fragmentKey] = encodedFragment
+				persistentDataValueStrings.append(encodedFragment[1])
 
-				if persistentDataValuesString != "":
-					persistentDataValuesString += ",\n"
+			persistentDataBranchStrings.append("\t\t\"" + branchKey + "\": {\n" + ",\n".join(persistentDataValueStrings) + "\n\t\t}")
 
-				persistentDataValuesString += "\t\t\t" + persistentKeyString + ": " + persistentValueString
+		self._encodedFragments = encodedFragments
 
-			if persistentDataBranchesValuesString != "":
-				persistentDataBranchesValuesString += ",\n"
-
-			persistentDataBranchesValuesString += "\t\t\"" + branchKey + "\": {"
-
-			if persistentDataBranchesValuesString != "":
-				persistentDataBranchesValuesString += "\n" + persistentDataValuesString + "\n\t\t}"
-			else:
-				persistentDataBranchesValuesString += "}"
-
-		persistentDataBranchesString = "\t\"" + self._branchesKey + "\": {"  # type: str
-
-		if persistentDataBranchesString != "":
-			persistentDataBranchesString += "\n" + persistentDataBranchesValuesString + "\n\t}"
-		else:
-			persistentDataBranchesString += "}"
-
-		lastVersion = persistentDataContainer[self._lastVersionKey]  # type: str
+		persistentDataBranchesString = "\t\"" + self._branchesKey + "\": {\n" + ",\n".join(persistentDataBranchStrings) + "\n\t}"  # type: str
 
 		try:
-			lastVersionString = json.JSONEncoder(indent = "\t").encode(lastVersion)  # type: str
+			lastVersionString = _jsonEncoder.encode(str(self.CurrentVersion))  # type: str
 		except Exception as e:
 			raise Exception("Failed to encode a persistence last version to a json string.") from e
 
@@ -706,17 +1328,37 @@ class PersistentBranchedJson(PersistentBranchedDirect):
 
 		persistentDataContainerString = "{\n" + persistentDataBranchesString + ",\n" + lastVersionString + "\n}"  # type: str
 
-		if not saveSuccess:
-			return False, persistentDataContainerString
-
 		return operationSuccess, persistentDataContainerString
 
+	def _SaveGetSources (self) -> typing.Dict[str, typing.Dict[str, typing.Optional[PersistentBranched.Value]]]:
+		"""
+		Get every branch and key that would be written by a save, in the order they would be written. Each key is paired with the value storage object it will be
+		saved from or None if it will be saved straight from the loaded data.
+		"""
+
+		persistentSources = dict()  # type: typing.Dict[str, typing.Dict[str, typing.Optional[PersistentBranched.Value]]]
+
+		for branchKey, branchValues in self._loadedData.items():  # type: str, typing.Dict[str, typing.Any]
+			persistentSources[branchKey] = dict.fromkeys(branchValues.keys())
+
+		for persistentKey, persistentValueStorage in self._storage.items():  # type: str, PersistentBranched.Value
+			for branchKey in persistentValueStorage.Values.keys():  # type: str
+				branchSources = persistentSources.get(branchKey)  # type: typing.Optional[typing.Dict[str, typing.Optional[PersistentBranched.Value]]]
+
+				if branchSources is None:
+					branchSources = dict()
+					persistentSources[branchKey] = branchSources
+
+				branchSources[persistentKey] = persistentValueStorage
+
+		return persistentSources
+
 class PersistentBranchedFile(PersistentBranchedJson):
 	"""
 	A class for handling persistent data. This version will read and write the data to a file through the load and save methods.
 	"""
 
-	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace):
+	def __init__ (self, filePath: str, currentVersion: Version.Version, hostNamespace: str = This.Mod.Namespace, serializer: typing.Optional[Serialization.Serializer] = None):
 		"""
 		:param filePath: The file path this persistence object will be written to and read from.
 		:type filePath: str
@@ -725,14 +1367,21 @@ class PersistentBranchedFile(PersistentBranchedJson):
 		:type currentVersion: Version.Version
 		:param hostNamespace: Errors made by this persistent object will show up under this namespace.
 		:type hostNamespace: str
+		:param serializer: The serializer used to write the file. If this is None the file will be written as json text. Files written by any registered serializer
+		can be loaded no matter which serializer is selected.
+		:type serializer: Serialization.Serializer | None
 		"""
 
 		if not isinstance(filePath, str):
 			raise Exceptions.IncorrectTypeException(filePath, "path", (str,))
 
+		if not isinstance(serializer, Serialization.Serializer) and serializer is not None:
+			raise Exceptions.IncorrectTypeException(serializer, "serializer", (Serialization.Serializer, None))
+
 		super().__init__(currentVersion, hostNamespace = hostNamespace)
 
 		self.FilePath = filePath  # type: str
+		self.Serializer = serializer  # type: typing.Optional[Serialization.Serializer]
 
 	def Load (self, *args) -> bool:
 		"""
@@ -745,16 +1394,31 @@ class PersistentBranchedFile(PersistentBranchedJson):
 		operationSuccess = True  # type: bool
 
 		persistentDataContainerString = "{}"  # type: str
+		persistentDataContainer = None  # type: typing.Optional[dict]
 
 		if os.path.exists(self.FilePath):
 			try:
-				with open(self.FilePath) as persistentFile:
-					persistentDataContainerString = persistentFile.read()
+				fileSerializer = Serialization.DetectFileSerializer(self.FilePath)  # type: typing.Optional[Serialization.Serializer]
+
+				if fileSerializer is None:
+					with open(self.FilePath) as persistentFile:
+						persistentDataContainerString = persistentFile.read()
+				else:
+					with open(self.FilePath, "rb") as persistentFile:
+						persistentDataContainer = fileSerializer.Decode(persistentFile.read())
+
+					if not isinstance(persistentDataContainer, dict):
+						Debug.Log("Could not convert persistent data container to a dictionary.", self.HostNamespace, Debug.LogLevels.Warning, group = self.HostNamespace, owner = __name__)
+						persistentDataContainer = dict()
 			except Exception:
 				Debug.Log("Failed to read from '" + Paths.StripUserDataPath(self.FilePath) + "'.", self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
+				persistentDataContainer = None
 				operationSuccess = False
 
-		loadSuccessful = super().Load(persistentDataContainerString)  # type: bool
+		if persistentDataContainer is not None:
+			loadSuccessful = PersistentBranchedDirect.Load(self, persistentDataContainer)  # type: bool
+		else:
+			loadSuccessful = super().Load(persistentDataContainerString)  # type: bool
 
 		if not loadSuccessful:
 			return False
@@ -772,14 +1436,14 @@ class PersistentBranchedFile(PersistentBranchedJson):
 
 		operationSuccess = True  # type: bool
 
-		saveSuccessful, persistentDataContainerString = super().Save()  # type: bool, str
+		if self.Serializer is None:
+			saveSuccessful, persistentDataContainerString = super().Save()  # type: bool, typing.Union[str, bytes]
+		else:
+			saveSuccessful, persistentDataContainer = PersistentBranchedDirect.Save(self)  # type: bool, dict
+			persistentDataContainerString = self.Serializer.Encode(persistentDataContainer)  # type: typing.Union[str, bytes]
 
 		try:
-			if not os.path.exists(os.path.dirname(self.FilePath)):
-				os.makedirs(os.path.dirname(self.FilePath))
-
-			with open(self.FilePath, mode = "w+") as persistentFile:
-				persistentFile.write(persistentDataContainerString)
+			FileSystem.WriteFileAtomically(self.FilePath, persistentDataContainerString)
 		except Exception:
 			Debug.Log("Failed to write to '" + Paths.StripUserDataPath(self.FilePath) + "'.", self.HostNamespace, Debug.LogLevels.Error, group = self.HostNamespace, owner = __name__)
 			operationSuccess = False
@@ -809,8 +1473,15 @@ class PersistentBranchedSection(PersistentBranchedDirect):
 
 		self._linkedSection = linkedSection
 		self._sectionKey = sectionKey
+		self._sectionStorageState = None  # type: typing.Optional[tuple]  # The state of the stored values and the section's generation when the values were last written to the section.
 
-		self._linkedSection.RegisterLoadCallback(self._SectionLoadCallback)
+		# Branches of sharded sections are read from the section the first time they are used, reading them all would read every shard.
+		self._sectionBranchesPending = False  # type: bool
+		self._sectionBranchesReadLazily = False  # type: bool  # Whether or not the data currently being loaded came from a sharded section.
+		self._sectionReadBranches = set()  # type: typing.Set[str]
+		self._sectionLastVersion = None  # type: typing.Optional[Version.Version]
+
+		self._linkedSection.RegisterLoadCallback(self._SectionLoadCallback, lazy = True)
 		self._linkedSection.RegisterSaveCallback(self._SectionSaveCallback)
 		self._linkedSection.RegisterResetCallback(self._SectionResetCallback)
 
@@ -824,28 +1495,83 @@ class PersistentBranchedSection(PersistentBranchedDirect):
 	def SectionKey (self) -> str:
 		return self._sectionKey
 
-	def _SectionLoadCallback (self, section: SectionBranched.SectionBranched) -> bool:
+	def _LoadPending (self, branch: typing.Optional[str] = None) -> None:
+		# The load callback is lazy, the section will only decode its data and call it once the data is asked for.
+		self.LinkedSection.LoadPendingData()
+
+		if not self._sectionBranchesPending:
+			return
+
+		if branch is None:
+			self._sectionBranchesPending = False
+			self._ReadSectionBranches(self.LinkedSection.GetAllValues(self.SectionKey))
+		elif branch not in self._sectionReadBranches:
+			branchValue = self.LinkedSection.GetValue(branch, self.SectionKey)  # type: typing.Any
+			self._ReadSectionBranches({branch: branchValue} if branchValue is not None else dict())
+			self._sectionReadBranches.add(branch)
+
+	def _LoadSetData (self, persistentDataBranches: dict, lastVersion: typing.Optional[Version.Version] = None) -> bool:
+		# Loading new data replaces any branches that were still waiting to be read. Nothing is read from the section while the old values are reset, which
+		# happens before this is called.
+		self._sectionBranchesPending = self._sectionBranchesReadLazily
+		self._sectionBranchesReadLazily = False
+		self._sectionReadBranches = set(persistentDataBranches.keys())
+		self._sectionLastVersion = lastVersion
+
+		return super()._LoadSetData(persistentDataBranches, lastVersion = lastVersion)
+
+	def _ReadSectionBranches (self, sectionBranches: typing.Dict[str, typing.Any]) -> None:
+		readingBranches = {branchKey: branchValue for branchKey, branchValue in sectionBranches.items() if branchKey not in self._sectionReadBranches}  # type: typing.Dict[str, typing.Any]
+		self._sectionReadBranches.update(readingBranches.keys())
+
+		if len(readingBranches) == 0:
+			return
+
+		_, changed = self._LoadSetBranches(readingBranches, lastVersion = self._sectionLastVersion)  # type: bool, bool
+
+		self._loadedData.update(readingBranches)
+
+		if changed:
+			self._loadedDataGeneration += 1
+
+		for levelSnapshots in self._batchSnapshots:  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
+			for snapshotKey, snapshotValues in levelSnapshots.items():  # type: str, typing.Dict[str, typing.Any]
+				# A batch rolling back shouldn't throw away branches that were read after it started.
+				valueStorage = self._storage[snapshotKey]  # type: PersistentBranched.Value
+
+				for branchKey in readingBranches.keys():  # type: str
+					if branchKey in valueStorage.Values and branchKey not in snapshotValues:
+						self._VerifyPending(snapshotKey, branch = branchKey)
+						snapshotValues[branchKey] = valueStorage.Values[branchKey]
+
+	def _LoadFromSection (self, section: SectionBranched.SectionBranched) -> bool:
 		persistentDataContainer = {
-			self._branchesKey: section.GetAllValues(self.SectionKey),
+			self._branchesKey: section.GetAllValues(self.SectionKey) if not section.Sharded else dict(),
 			self._lastVersionKey: section.SavingObject.DataHostVersion
 		}  # type: dict
 
+		self._sectionStorageState = None
+		self._sectionBranchesPending = False
+		self._sectionBranchesReadLazily = section.Sharded
+
 		loadSuccessful = self.Load(persistentDataContainer = persistentDataContainer)  # type: bool
 		return loadSuccessful
 
+	def _SectionLoadCallback (self, section: SectionBranched.SectionBranched) -> bool:
+		return self._LoadFromSection(section)
+
 	def _SectionSaveCallback (self, section: SectionBranched.SectionBranched) -> bool:
-		saveSuccessful, persistentDataContainer = self.Save()  # type: bool, dict
+		if self._sectionStorageState is not None and self._sectionStorageState == (self._GetStorageState(), section.Generation):
+			return True  # Nothing has changed in this object or the section since the values were last written to it.
 
-		for branchKey, branchValue in persistentDataContainer[self._branchesKey].items():
+		# Branches that were never read are still in the section as they were loaded, they don't need to be read just to be written back.
+		saveSuccessful, persistentDataBranches = self._SaveGetData(includePending = False)  # type: bool, dict
+
+		for branchKey, branchValue in persistentDataBranches.items():
 			section.Set(branchKey, self.SectionKey, branchValue)
 
+		self._sectionStorageState = (self._GetStorageState(), section.Generation) if saveSuccessful else None
 		return saveSuccessful
 
 	def _SectionResetCallback (self, section: SectionBranched.SectionBranched) -> bool:
-		persistentDataContainer = {
-			self._branchesKey: section.GetAllValues(self.SectionKey),
-			self._lastVersionKey: section.SavingObject.DataHostVersion
-		}
-
-		loadSuccessful = self.Load(persistentDataContainer = persistentDataContainer)  # type: bool
-		return loadSuccessful
+		return self._LoadFromSection(section)
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import atexit
 import datetime
 import os
 import sys
 import threading
-import traceback
 import shutil
 import types
 import typing
@@ -28,6 +28,11 @@ class Logger(DebugShared.Logger):
 		if not hasattr(self.DebugGlobal, self._globalLoggingNamespaceCounts):
 			setattr(self.DebugGlobal, self._globalLoggingNamespaceCounts, dict())
 
+		self._logFiles = dict()  # type: typing.Dict[typing.Optional[str], _LogFile]
+
+		self._defaultStackCaptureLevel = LogLevels.Error  # type: typing.Optional[LogLevels]
+		self._namespaceStackCaptureLevels = dict()  # type: typing.Dict[typing.Optional[str], typing.Optional[LogLevels]]
+
 		self._lockHandler = _Locking()  # type: _Locking
 		self._lockHandlerLock = threading.Lock()  # type: threading.Lock
 
@@ -56,8 +61,8 @@ class Logger(DebugShared.Logger):
 			 retryOnError: bool = True) -> None:
 		"""
 		Logs a message even if no mod has enabled the game's logging system. It will also report the log to the module 'sims4.log' by default.
-		Logs will be writen to '<Sims4 user data path>/NeonOcean/Debug/Mods/<Namespace>/<Game start time>/Log.xml'. This system is not recommended for
-		logging in high volume.
+		Logs will be writen to '<Sims4 user data path>/NeonOcean/Debug/Mods/<Namespace>/<Game start time>/Log.xml' by a separate writer thread, call the flush
+		method if you need the report to be written before continuing. This system is not recommended for logging in high volume.
 		:param message: The message is converted to a string with str(message) if it isn't one already.
 		:param namespace: The namespace or mod the log is coming from, it can Be None. Logs will be separated in to their own directory named with this value.
 						  This parameter will not be passed to the module 'sims4.log' in any way.
@@ -68,7 +73,8 @@ class Logger(DebugShared.Logger):
 		:param exception: The 'exception' argument is not necessary as it will automatically find it for you. This argument is only required if the
 		level is set to 'exception' and you are calling this function from where the exception won't be found by sys.exc_info().
 		:type exception: BaseException
-		:param logStack: Forces a stacktrace to be logged even if the level is not an error or exception.
+		:param logStack: Forces a stacktrace to be logged even if the stack capture level for this namespace would skip it. By default stacktraces are only
+		logged for errors and exceptions.
 		:type logStack: bool
 		:param frame: If this is not none the function will use it to get a stacktrace. The parameter not be used if the function is not logging a stacktrace.
 		:type frame: types.FrameType | None
@@ -158,13 +164,17 @@ class Logger(DebugShared.Logger):
 
 		lockable = True if lockIdentifier is not None else False  # type: bool
 
+		stackFrames = None  # type: typing.Optional[typing.List[typing.Tuple[types.CodeType, int]]]
+
+		if logStack or self.ShouldCaptureStack(namespace, level):
+			stackFrames = DebugShared.CaptureStack(frame if frame is not None else sys._getframe())
+
 		report = Report(namespace, logCount + 1, datetime.datetime.now().isoformat(),
 						str(message), level = level, group = str(group),
 						owner = owner, exception = exception, logStack = logStack,
-						stacktrace = str.join("", traceback.format_stack(f = frame)), lockable = lockable, retryOnError = retryOnError)  # type: Report
+						lockable = lockable, retryOnError = retryOnError, stackFrames = stackFrames)  # type: Report
 
-		self._reportStorage.append(report)
-		self.Flush()
+		self._QueueReport(report)
 
 	def IsLocked (self, lockIdentifier: str, lockReference: typing.Any = None) -> bool:
 		"""
@@ -196,6 +206,63 @@ class Logger(DebugShared.Logger):
 		self._LockHandlerClearLockingPoints(lockIdentifier, lockReference)
 		self._LockHandlerAddUnlockingPoints(lockIdentifier, lockReference, unlockIncrement, unlockThreshold)
 
+	def GetStackCaptureLevel (self, namespace: typing.Optional[str]) -> typing.Optional[LogLevels]:
+		"""
+		Get the least severe level stacktraces will be captured for in this namespace. None means stacktraces are only captured for reports that request one.
+		"""
+
+		return self._namespaceStackCaptureLevels.get(namespace, self._defaultStackCaptureLevel)
+
+	def SetDefaultStackCaptureLevel (self, level: typing.Optional[LogLevels]) -> None:
+		"""
+		Set the least severe level stacktraces will be captured for in namespaces without their own stack capture level.
+		:param level: Reports at this level or a more severe one will have their stacktrace captured. If this is None, stacktraces are only captured for
+		reports that request one.
+		:type level: LogLevels | None
+		"""
+
+		if not isinstance(level, LogLevels) and level is not None:
+			raise Exceptions.IncorrectTypeException(level, "level", (LogLevels, None))
+
+		self._defaultStackCaptureLevel = level
+
+	def SetNamespaceStackCaptureLevel (self, namespace: typing.Optional[str], level: typing.Optional[LogLevels]) -> None:
+		"""
+		Set the least severe level stacktraces will be captured for in this namespace, overriding the default stack capture level.
+		:param namespace: The namespace reports are logged to.
+		:type namespace: str | None
+		:param level: Reports at this level or a more severe one will have their stacktrace captured. If this is None, stacktraces are only captured for
+		reports that request one.
+		:type level: LogLevels | None
+		"""
+
+		if not isinstance(namespace, str) and namespace is not None:
+			raise Exceptions.IncorrectTypeException(namespace, "namespace", (str, None))
+
+		if not isinstance(level, LogLevels) and level is not None:
+			raise Exceptions.IncorrectTypeException(level, "level", (LogLevels, None))
+
+		self._namespaceStackCaptureLevels[namespace] = level
+
+	def ResetNamespaceStackCaptureLevel (self, namespace: typing.Optional[str]) -> None:
+		"""
+		Make this namespace use the default stack capture level again.
+		"""
+
+		self._namespaceStackCaptureLevels.pop(namespace, None)
+
+	def ShouldCaptureStack (self, namespace: typing.Optional[str], level: LogLevels) -> bool:
+		"""
+		Get whether or not a report at this level and in this namespace should have its stacktrace captured, if the report didn't request one.
+		"""
+
+		captureLevel = self._namespaceStackCaptureLevels.get(namespace, self._defaultStackCaptureLevel)  # type: typing.Optional[LogLevels]
+
+		if captureLevel is None:
+			return False
+
+		return level <= captureLevel
+
 	def GetNextLogNumber (self, namespace: typing.Optional[str]) -> int:
 		if not isinstance(namespace, str):
 			raise Exceptions.IncorrectTypeException(namespace, "namespace", (str, "None"))
@@ -283,83 +350,32 @@ class Logger(DebugShared.Logger):
 				namespaceTextBytes[report.Namespace] = reportTextBytes
 
 		for namespace, namespaceBytes in namespaceTextBytes.items():  # type: str, bytes
-			namespaceDirectory = os.path.join(self.GetLoggingRootPath(), str(namespace))  # type: str
-			namespaceLoggingDirectory = os.path.join(namespaceDirectory, self.GetLoggingDirectoryName())  # type: str
-
-			namespaceFilePath = os.path.join(namespaceLoggingDirectory, "Log.xml")  # type: str
-			namespaceLatestFilePath = os.path.join(namespaceDirectory, "Latest.xml")  # type: str
-			namespaceFirstWrite = False  # type: bool
-
-			namespaceSessionFilePath = os.path.join(namespaceLoggingDirectory, "Session.json")  # type: str
-			namespaceModsDirectoryFilePath = os.path.join(namespaceLoggingDirectory, "Mods.txt")  # type: str
-
 			logSizeLimit = self.GetLogSizeLimit()  # type: int
 			logSizeLimitReachedBytes = "<!--Log file size limit reached-->".encode("utf-8")  # type: bytes
 
-			logStartBytes = self.GetLogStartBytes()  # type: bytes
 			logEndBytes = self.GetLogEndBytes()  # type: bytes
 
 			lineSeparatorBytes = (os.linesep + os.linesep).encode("utf-8")  # type: bytes
 
 			try:
-				if not os.path.exists(namespaceFilePath):
-					namespaceFirstWrite = True
-
-					if not os.path.exists(namespaceLoggingDirectory):
-						os.makedirs(namespaceLoggingDirectory)
-				else:
-					self._VerifyLogFile(namespaceFilePath)
+				logFile = self._GetLogFile(namespace)  # type: _LogFile
 
-				if not os.path.exists(namespaceSessionFilePath):
-					with open(namespaceSessionFilePath, mode = "w+") as sessionFile:
-						sessionFile.write(self._sessionInformation)
-
-				if not os.path.exists(namespaceModsDirectoryFilePath):
-					with open(namespaceModsDirectoryFilePath, mode = "w+") as modsDirectoryFile:
-						modsDirectoryFile.write(self._modsDirectoryInformation)
-
-				if namespaceFirstWrite:
-					if len(logStartBytes) + len(namespaceBytes) + len(logEndBytes) >= logSizeLimit:
+				if logFile.Size == 0:
+					if len(self.GetLogStartBytes()) + len(namespaceBytes) + len(logEndBytes) >= logSizeLimit:
 						namespaceBytes += logSizeLimitReachedBytes
 
-					with open(namespaceFilePath, mode = "wb+") as namespaceFile:
-						namespaceFile.write(logStartBytes)
-						namespaceFile.write(namespaceBytes)
-						namespaceFile.write(logEndBytes)
-
-					if os.path.exists(namespaceLatestFilePath):
-						os.remove(namespaceLatestFilePath)
-
-					with open(namespaceLatestFilePath, mode = "wb+") as namespaceLatestFile:
-						namespaceLatestFile.write(logStartBytes)
-						namespaceLatestFile.write(namespaceBytes)
-						namespaceLatestFile.write(logEndBytes)
+					self._WriteLogFile(logFile, namespaceBytes)
 				else:
-					logSize = os.path.getsize(namespaceFilePath)  # type: int
-
-					if logSize >= logSizeLimit:
+					if logFile.Size >= logSizeLimit:
 						continue
 
-					if logSize + len(lineSeparatorBytes) + len(namespaceBytes) + len(logEndBytes) >= logSizeLimit:
+					if logFile.Size + len(lineSeparatorBytes) + len(namespaceBytes) + len(logEndBytes) >= logSizeLimit:
 						namespaceBytes += logSizeLimitReachedBytes
 
-					with open(namespaceFilePath, "r+b") as namespaceFile:
-						namespaceFile.seek(-len(logEndBytes), os.SEEK_END)
-						namespaceFile.write(lineSeparatorBytes)
-						namespaceFile.write(namespaceBytes)
-						namespaceFile.write(logEndBytes)
-
-					try:
-						self._VerifyLogFile(namespaceLatestFilePath)
-
-						with open(namespaceLatestFilePath, "r+b") as namespaceLatestFile:
-							namespaceLatestFile.seek(-len(logEndBytes), os.SEEK_END)
-							namespaceLatestFile.write(lineSeparatorBytes)
-							namespaceLatestFile.write(namespaceBytes)
-							namespaceLatestFile.write(logEndBytes)
-					except:
-						shutil.copy(namespaceFilePath, namespaceLatestFilePath)
+					self._WriteLogFile(logFile, namespaceBytes)
 			except Exception as e:
+				self._CloseLogFile(namespace)
+
 				self._writeFailureCount += 1
 
 				if not getattr(self.DebugGlobal, self._globalShownWriteFailureNotification):
@@ -382,6 +398,118 @@ class Logger(DebugShared.Logger):
 
 				return
 
+	def _LogDroppedReports (self, droppedReportCount: int) -> None:
+		Log("The report queue was full, " + str(droppedReportCount) + " reports where dropped to make room for newer reports.", self.HostNamespace, LogLevels.Warning, group = self.HostNamespace, owner = __name__, logToGame = False)
+
+	def _GetLogFile (self, namespace: typing.Optional[str]) -> _LogFile:
+		"""
+		Get the open log file for this namespace, opening it if the logging directory has changed or it was not opened yet. Opening an existing log file will verify it.
+		"""
+
+		namespaceDirectory = os.path.join(self.GetLoggingRootPath(), str(namespace))  # type: str
+		namespaceLoggingDirectory = os.path.join(namespaceDirectory, self.GetLoggingDirectoryName())  # type: str
+
+		namespaceFilePath = os.path.join(namespaceLoggingDirectory, "Log.xml")  # type: str
+		namespaceLatestFilePath = os.path.join(namespaceDirectory, "Latest.xml")  # type: str
+
+		logFile = self._logFiles.get(namespace, None)  # type: typing.Optional[_LogFile]
+
+		if logFile is not None:
+			if logFile.FilePath == namespaceFilePath:
+				return logFile
+
+			self._CloseLogFile(namespace)
+
+		namespaceSessionFilePath = os.path.join(namespaceLoggingDirectory, "Session.json")  # type: str
+		namespaceModsDirectoryFilePath = os.path.join(namespaceLoggingDirectory, "Mods.txt")  # type: str
+
+		logFile = _LogFile(namespaceFilePath, namespaceLatestFilePath)
+
+		if not os.path.exists(namespaceFilePath):
+			if not os.path.exists(namespaceLoggingDirectory):
+				os.makedirs(namespaceLoggingDirectory)
+
+			logFile.File = open(namespaceFilePath, mode = "wb+")
+		else:
+			self._VerifyLogFile(namespaceFilePath)
+
+			logFile.File = open(namespaceFilePath, mode = "r+b")
+			logFile.Size = logFile.File.seek(0, os.SEEK_END)
+
+		if not os.path.exists(namespaceSessionFilePath):
+			with open(namespaceSessionFilePath, mode = "w+") as sessionFile:
+				sessionFile.write(self._sessionInformation)
+
+		if not os.path.exists(namespaceModsDirectoryFilePath):
+			with open(namespaceModsDirectoryFilePath, mode = "w+") as modsDirectoryFile:
+				modsDirectoryFile.write(self._modsDirectoryInformation)
+
+		self._logFiles[namespace] = logFile
+		return logFile
+
+	def _WriteLogFile (self, logFile: _LogFile, namespaceBytes: bytes) -> None:
+		"""
+		Write reports to the end of a log file and its latest log file, the latest log file will be replaced with a copy of the log file if it cannot be written to.
+		"""
+
+		logEndBytes = self.GetLogEndBytes()  # type: bytes
+		firstWrite = logFile.Size == 0  # type: bool
+
+		if firstWrite:
+			writingBytes = self.GetLogStartBytes() + namespaceBytes + logEndBytes  # type: bytes
+		else:
+			writingBytes = (os.linesep + os.linesep).encode("utf-8") + namespaceBytes + logEndBytes  # type: bytes
+
+		logFile.Size = self._AppendLogBytes(logFile.File, logFile.Size, writingBytes)
+
+		try:
+			if firstWrite:
+				if logFile.LatestFile is not None:
+					logFile.LatestFile.close()
+
+				logFile.LatestFile = open(logFile.LatestFilePath, mode = "wb+")
+				logFile.LatestSize = 0
+			elif logFile.LatestFile is None:
+				self._VerifyLogFile(logFile.LatestFilePath)
+
+				logFile.LatestFile = open(logFile.LatestFilePath, mode = "r+b")
+				logFile.LatestSize = logFile.LatestFile.seek(0, os.SEEK_END)
+
+			logFile.LatestSize = self._AppendLogBytes(logFile.LatestFile, logFile.LatestSize, writingBytes)
+		except:
+			if logFile.LatestFile is not None:
+				logFile.LatestFile.close()
+				logFile.LatestFile = None
+
+			shutil.copy(logFile.FilePath, logFile.LatestFilePath)
+
+	def _AppendLogBytes (self, file: typing.BinaryIO, fileSize: int, writingBytes: bytes) -> int:
+		"""
+		Write bytes over the closing tag at the end of an open log file, the bytes should end with a new closing tag. Empty files have no closing tag to write over.
+		:return: The new size of the file.
+		:rtype: int
+		"""
+
+		if fileSize != 0:
+			file.seek(fileSize - len(self.GetLogEndBytes()))
+		else:
+			file.seek(0)
+
+		file.write(writingBytes)
+		file.flush()
+
+		return file.tell()
+
+	def _CloseLogFile (self, namespace: typing.Optional[str]) -> None:
+		logFile = self._logFiles.pop(namespace, None)  # type: typing.Optional[_LogFile]
+
+		if logFile is not None:
+			logFile.Close()
+
+	def _CloseLogFiles (self) -> None:
+		for namespace in list(self._logFiles.keys()):  # type: typing.Optional[str]
+			self._CloseLogFile(namespace)
+
 	def _LockHandlerLock (self, identifier: str, reference: typing.Any) -> None:
 		self._lockHandlerLock.acquire()
 		self._lockHandler.Lock(identifier, reference)
@@ -419,6 +547,30 @@ class Logger(DebugShared.Logger):
 		self._lockHandler.ClearUnlockingPoints(identifier, reference)
 		self._lockHandlerLock.release()
 
+class _LogFile:
+	def __init__ (self, filePath: str, latestFilePath: str):
+		self.FilePath = filePath  # type: str
+		self.LatestFilePath = latestFilePath  # type: str
+
+		self.File = None  # type: typing.Optional[typing.BinaryIO]
+		self.Size = 0  # type: int
+
+		self.LatestFile = None  # type: typing.Optional[typing.BinaryIO]
+		self.LatestSize = 0  # type: int
+
+	def Close (self) -> None:
+		for file in (self.File, self.LatestFile):  # type: typing.Optional[typing.BinaryIO]
+			if file is None:
+				continue
+
+			try:
+				file.close()
+			except Exception:
+				pass
+
+		self.File = None
+		self.LatestFile = None
+
 class _Locking:
 	def __init__ (self):
 		self._locked = dict()    # type: typing.Dict[str, typing.Set[typing.Any]]
@@ -531,10 +683,14 @@ def _Setup () -> None:
 
 	_activeLogger = Logger(os.path.join(Paths.DebugPath, "Mods"), hostNamespace = This.Mod.Namespace)  # type: Logger
 
+	# Registered before anything that logs while exiting, so this will be called after them.
+	atexit.register(_activeLogger.Shutdown)
+
 _Setup()
 
 Log = ActiveLogger().Log
 IsLocked = ActiveLogger().IsLocked
 Unlock = ActiveLogger().Unlock
 GetNextLogNumber = ActiveLogger().GetNextLogNumber
-ChangeLogFile = ActiveLogger().ChangeLogFile
\ No newline at end of file
+ChangeLogFile = ActiveLogger().ChangeLogFile
+Flush = ActiveLogger().Flush
\ No newline at end of file
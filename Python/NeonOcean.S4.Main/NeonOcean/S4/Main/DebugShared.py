@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import collections
 import datetime
 import enum_lib
 import json
@@ -7,13 +8,14 @@ import os
 import platform
 import threading
 import traceback
+import types
 import typing
 import uuid
 from xml.sax import saxutils
 
 from NeonOcean.S4.Main import Language, Paths, This
 from NeonOcean.S4.Main.Data import Global
-from NeonOcean.S4.Main.Tools import Exceptions, Threading as ToolsThreading
+from NeonOcean.S4.Main.Tools import Exceptions
 from NeonOcean.S4.Main.UI import Notifications
 from sims4 import common, log
 from ui import ui_dialog_notification
@@ -25,11 +27,16 @@ class LogLevels(enum_lib.IntEnum):
 	Info = 3  # type: LogLevels
 	Debug = 4  # type: LogLevels
 
+class QueueFullPolicies(enum_lib.IntEnum):
+	Block = 0  # type: QueueFullPolicies
+	DropOldest = 1  # type: QueueFullPolicies
+
 class Report:
 	def __init__ (self, namespace: typing.Optional[str], logNumber: int, logTime: str,
 				  message: str, level: LogLevels, group: str = None,
 				  owner: str = None, exception: BaseException = None, logStack: bool = False,
-				  stacktrace: str = None, lockable: bool = False, retryOnError: bool = False):
+				  stacktrace: str = None, lockable: bool = False, retryOnError: bool = False,
+				  stackFrames: typing.Sequence[typing.Tuple[types.CodeType, int]] = None):
 		self.Namespace = namespace  # type: typing.Optional[str]
 		self.LogNumber = logNumber  # type: int
 		self.LogTime = logTime  # type: str
@@ -39,10 +46,31 @@ class Report:
 		self.Owner = owner  # type: typing.Optional[str]
 		self.Exception = exception  # type: typing.Optional[BaseException]
 		self.LogStack = logStack  # type: bool
-		self.Stacktrace = stacktrace  # type: typing.Optional[str]
+		self.StackFrames = stackFrames  # type: typing.Optional[typing.Sequence[typing.Tuple[types.CodeType, int]]]
 		self.Lockable = lockable  # type: bool
 		self.RetryOnError = retryOnError  # type: bool
 
+		self._stacktrace = stacktrace  # type: typing.Optional[str]
+
+	@property
+	def Stacktrace (self) -> typing.Optional[str]:
+		"""
+		The stacktrace text for this report. If only the stack's frames were captured, the text will be formatted the first time this is called.
+		"""
+
+		if self._stacktrace is None and self.StackFrames is not None:
+			self._stacktrace = FormatStack(self.StackFrames)
+
+		return self._stacktrace
+
+	@Stacktrace.setter
+	def Stacktrace (self, value: typing.Optional[str]) -> None:
+		self._stacktrace = value
+
+	@property
+	def HasStacktrace (self) -> bool:
+		return self._stacktrace is not None or self.StackFrames is not None
+
 	def GetBytes (self, writeTime: str = None) -> bytes:
 		return self.GetText(writeTime).encode("utf-8")
 
@@ -90,7 +118,7 @@ class Report:
 			exceptionText = saxutils.escape(exceptionText).replace("\n", "\n<!--\t\t-->")
 			logFormatting.append(exceptionText)
 
-		if self.Level <= LogLevels.Error or self.LogStack:
+		if self.HasStacktrace:
 			logTemplate += "\t\t<Stacktrace><!--\n" \
 						   "\t\t\t-->{}<!--\n" \
 						   "\t\t--></Stacktrace>\n"
@@ -146,8 +174,18 @@ class Logger:
 
 		self.HostNamespace = hostNamespace  # type: str
 
-		self._reportStorage = list()  # type: typing.List[Report]
-		self._flushThread = None  # type: typing.Optional[threading.Thread]
+		self._reportQueue = collections.deque()  # type: typing.Deque[Report]
+		self._reportQueueCondition = threading.Condition()  # type: threading.Condition
+		self._reportQueueLimit = 5000  # type: int
+		self._queueFullPolicy = QueueFullPolicies.Block  # type: QueueFullPolicies
+		self._queuedReportCount = 0  # type: int
+		self._writtenReportCount = 0  # type: int
+		self._droppedReportCount = 0  # type: int
+
+		self._writerThread = None  # type: typing.Optional[threading.Thread]
+		self._writerStopped = False  # type: bool
+		self._writeLock = threading.Lock()  # type: threading.Lock
+		self._writingThread = None  # type: typing.Optional[threading.Thread]
 
 		self._loggingRootPath = loggingRootPath  # type: str
 		self._loggingDirectoryName = GetDateTimePathString(getattr(self.DebugGlobal, self._globalSessionStartTime))  # type: str
@@ -198,91 +236,194 @@ class Logger:
 		self._sessionInformation = self._CreateSessionInformation()
 		self._modsDirectoryInformation = self._CreateModsDirectoryInformation()
 
-	def Flush (self) -> None:
-		mainThread = threading.main_thread()  # type: threading.Thread
-		mainThreadAlive = mainThread.is_alive()  # type: bool
-
-		currentThreadIsMain = mainThread == threading.current_thread()  # type: bool
-
-		if not mainThreadAlive and not currentThreadIsMain:
-			# Unfortunately any daemonic thread's reports will not be written unless they are logged before the last reports from the main thread are written.
-			# At this point, any flush thread started will not finish in time before it all comes to an end. Though the flush thread is not daemonic, Python will
-			# not stop for it while a shutdown is already in progress. The best way of getting any more reports out during this time would be to co-opt the
-			# main thread and make it wait while we write the stored reports.
-			return
-
-		if self._flushThread is not None:
-			if not mainThreadAlive:
-				if self._flushThread.is_alive():
-					self._flushThread.join(1)
-
-					if self._flushThread.is_alive():
-						return
-				else:
-					self._flushThread = None
-			else:
-				return
+	def GetReportQueueLimit (self) -> int:
+		"""
+		Get the number of reports that can wait to be written before the queue full policy is applied.
+		"""
 
-		if not mainThreadAlive:
-			flushThread = self._CreateFlushThread()  # type: threading.Thread
-			self._SetFlushThreadUnsafe(flushThread)
+		return self._reportQueueLimit
 
-			flushThread.start()
-			flushThread.join(1)
-		else:
-			flushThread = self._CreateFlushThread()  # type: threading.Thread
+	def SetReportQueueLimit (self, limit: int) -> None:
+		"""
+		Set the number of reports that can wait to be written before the queue full policy is applied.
+		"""
 
-			try:
-				self._SetFlushThread(flushThread)
-			except ToolsThreading.SimultaneousCallException:
+		if not isinstance(limit, int):
+			raise Exceptions.IncorrectTypeException(limit, "limit", (int,))
+
+		if limit < 1:
+			raise ValueError("The report queue limit must be at least one.")
+
+		with self._reportQueueCondition:
+			self._reportQueueLimit = limit
+			self._reportQueueCondition.notify_all()
+
+	def GetQueueFullPolicy (self) -> QueueFullPolicies:
+		"""
+		Get what happens to new reports while the report queue is full.
+		"""
+
+		return self._queueFullPolicy
+
+	def SetQueueFullPolicy (self, policy: QueueFullPolicies) -> None:
+		"""
+		Set what happens to new reports while the report queue is full. The block policy makes logging threads wait until the writer thread catches up, the drop oldest
+		policy throws away the oldest waiting reports to make room, a warning with the number of dropped reports will be written afterwards.
+		"""
+
+		if not isinstance(policy, QueueFullPolicies):
+			raise Exceptions.IncorrectTypeException(policy, "policy", (QueueFullPolicies,))
+
+		with self._reportQueueCondition:
+			self._queueFullPolicy = policy
+			self._reportQueueCondition.notify_all()
+
+	def Flush (self, timeout: typing.Optional[float] = None) -> bool:
+		"""
+		Wait for every report queued before this call to be written.
+		:param timeout: The maximum number of seconds to wait for the writer thread, or None to wait as long as it takes.
+		:type timeout: float | None
+		:return: Whether or not every report queued before this call was written.
+		:rtype: bool
+		"""
+
+		if not isinstance(timeout, (float, int)) and timeout is not None:
+			raise Exceptions.IncorrectTypeException(timeout, "timeout", (float, int, None))
+
+		if self._writingThread is threading.current_thread():
+			return False
+
+		with self._reportQueueCondition:
+			targetCount = self._queuedReportCount  # type: int
+			self._reportQueueCondition.wait_for(lambda: self._writtenReportCount >= targetCount or not self._WriterRunning(), timeout = timeout)
+
+		if not self._WriterRunning():
+			self._WriteQueuedReports()
+
+		with self._reportQueueCondition:
+			return self._writtenReportCount >= targetCount
+
+	def Shutdown (self, timeout: float = 5) -> None:
+		"""
+		Stop the writer thread once it has written every queued report and close any open log files. Reports logged afterwards will be written by the thread that
+		logged them.
+		:param timeout: The maximum number of seconds to wait for the writer thread to finish.
+		:type timeout: float
+		"""
+
+		if not isinstance(timeout, (float, int)):
+			raise Exceptions.IncorrectTypeException(timeout, "timeout", (float, int))
+
+		with self._reportQueueCondition:
+			self._writerStopped = True
+			self._reportQueueCondition.notify_all()
+
+		writerThread = self._writerThread  # type: typing.Optional[threading.Thread]
+
+		if writerThread is not None and writerThread is not threading.current_thread():
+			writerThread.join(timeout)
+
+			if writerThread.is_alive():
 				return
 
-			mainThreadStateChanged = not mainThread.is_alive()  # type: bool
+		self._WriteQueuedReports()
 
-			if mainThreadStateChanged:
-				self.Flush()
+		with self._writeLock:
+			self._CloseLogFiles()
+
+	def _QueueReport (self, report: Report) -> None:
+		currentThread = threading.current_thread()  # type: threading.Thread
+
+		with self._reportQueueCondition:
+			if self._writingThread is not currentThread:
+				# The writer thread may log its own problems, it would never get out of this loop if it had to wait on itself.
+				while len(self._reportQueue) >= self._reportQueueLimit and self._queueFullPolicy == QueueFullPolicies.Block and self._WriterRunning():
+					self._reportQueueCondition.wait()
+
+				if self._queueFullPolicy == QueueFullPolicies.DropOldest:
+					while len(self._reportQueue) >= self._reportQueueLimit:
+						self._reportQueue.popleft()
+						self._droppedReportCount += 1
+						self._writtenReportCount += 1
+
+			self._reportQueue.append(report)
+			self._queuedReportCount += 1
+
+			if self._WriterRunning() or self._StartWriterThread():
+				self._reportQueueCondition.notify_all()
 				return
 
-			flushThread.start()
+		if self._writingThread is not currentThread:
+			self._WriteQueuedReports()
+
+	def _WriterRunning (self) -> bool:
+		return not self._writerStopped and self._writerThread is not None and self._writerThread.is_alive()
+
+	def _StartWriterThread (self) -> bool:
+		if self._writerStopped or not threading.main_thread().is_alive():
+			# New threads can not be relied on to finish once the game is shutting down, the logging thread will need to write its own reports.
+			return False
+
+		writerThread = threading.Thread(target = self._WriterThread, name = self.HostNamespace + ".LogWriter", daemon = True)  # type: threading.Thread
+		self._writerThread = writerThread
 
-	def _CreateFlushThread (self) -> threading.Thread:
-		mainThread = threading.main_thread()  # type: threading.Thread
-		mainThreadAlive = mainThread.is_alive()  # type: bool
+		try:
+			writerThread.start()
+		except RuntimeError:
+			self._writerThread = None
+			return False
+
+		return True
 
-		def _FlushThread () -> None:
-			nonlocal mainThreadAlive
+	def _WriterThread (self) -> None:
+		while True:
+			with self._reportQueueCondition:
+				while len(self._reportQueue) == 0 and not self._writerStopped:
+					self._reportQueueCondition.wait()
 
-			mainThreadAlive = mainThread.is_alive()
+				writerStopped = self._writerStopped  # type: bool
 
 			try:
-				while len(self._reportStorage) != 0:
-					reportStorageLength = len(self._reportStorage)  # type: int
-					targetReports = self._reportStorage[:reportStorageLength]
-					self._reportStorage = self._reportStorage[reportStorageLength:]
+				self._WriteQueuedReports()
+			except Exception:
+				# Write errors are handled while writing, there is nowhere left to report anything else without risking a loop.
+				pass
 
-					filteredReports = self._FilterReports(targetReports)
+			if writerStopped:
+				with self._reportQueueCondition:
+					self._reportQueueCondition.notify_all()
 
-					self._LogAllReports(filteredReports)
+				return
 
-					mainThreadAlive = mainThread.is_alive()
+	def _WriteQueuedReports (self) -> None:
+		with self._writeLock:
+			self._writingThread = threading.current_thread()
 
-					if not mainThreadAlive:
-						break
-			finally:
-				self._flushThread = None
+			try:
+				while True:
+					with self._reportQueueCondition:
+						if len(self._reportQueue) == 0:
+							break
+
+						targetReports = list(self._reportQueue)  # type: typing.List[Report]
+						self._reportQueue.clear()
 
-			if mainThreadAlive:
-				if len(self._reportStorage) != 0:
-					self.Flush()
+						droppedReportCount = self._droppedReportCount  # type: int
+						self._droppedReportCount = 0
 
-		return threading.Thread(target = _FlushThread, daemon = False)
+						self._reportQueueCondition.notify_all()
 
-	@ToolsThreading.NotThreadSafe(raiseException = True)
-	def _SetFlushThread (self, flushThread: threading.Thread) -> None:
-		self._SetFlushThreadUnsafe(flushThread)
+					try:
+						self._LogAllReports(self._FilterReports(targetReports))
+					finally:
+						with self._reportQueueCondition:
+							self._writtenReportCount += len(targetReports)
+							self._reportQueueCondition.notify_all()
 
-	def _SetFlushThreadUnsafe (self, flushThread: threading.Thread) -> None:
-		self._flushThread = flushThread
+					if droppedReportCount != 0:
+						self._LogDroppedReports(droppedReportCount)
+			finally:
+				self._writingThread = None
 
 	def _FilterReports (self, reports: typing.List[Report]) -> typing.List[Report]:
 		return list(reports)
@@ -290,6 +431,12 @@ class Logger:
 	def _LogAllReports (self, reports: typing.List[Report]) -> None:
 		raise NotImplementedError()
 
+	def _LogDroppedReports (self, droppedReportCount: int) -> None:
+		pass
+
+	def _CloseLogFiles (self) -> None:
+		pass
+
 	def _CreateSessionInformation (self) -> str:
 		try:
 			installedPacks = list()  # type: typing.List[str]
@@ -382,6 +529,32 @@ def FormatException (exception: BaseException) -> str:
 
 	return str.join("", traceback.format_exception(type(exception), exception, exception.__traceback__))
 
+def CaptureStack (frame: types.FrameType) -> typing.List[typing.Tuple[types.CodeType, int]]:
+	"""
+	Get the code object and line number of a frame and every frame that called it, oldest first. This is much quicker than formatting the stack, use FormatStack
+	to turn it into text later. Only code objects are kept so that nothing the frames reference is kept alive.
+	"""
+
+	if not isinstance(frame, types.FrameType):
+		raise Exceptions.IncorrectTypeException(frame, "frame", (types.FrameType,))
+
+	stackFrames = list()  # type: typing.List[typing.Tuple[types.CodeType, int]]
+
+	while frame is not None:
+		stackFrames.append((frame.f_code, frame.f_lineno))
+		frame = frame.f_back
+
+	stackFrames.reverse()
+	return stackFrames
+
+def FormatStack (stackFrames: typing.Sequence[typing.Tuple[types.CodeType, int]]) -> str:
+	"""
+	Format a stack captured by CaptureStack the same way as 'traceback.format_stack'.
+	"""
+
+	stackSummary = traceback.StackSummary.from_list([(code.co_filename, lineNumber, code.co_name, None) for code, lineNumber in stackFrames])  # type: traceback.StackSummary
+	return str.join("", stackSummary.format())
+
 def ConvertEALevelToLogLevel (level: int) -> LogLevels:
 	if not isinstance(level, int):
 		raise Exceptions.IncorrectTypeException(level, "level", (int,))
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import typing
+
+from NeonOcean.S4.Main import Debug, Paths, This
+from NeonOcean.S4.Main.Tools import Exceptions, FileSystem
+
+"""
+A content addressed store for mod save backups. Every backed up file is stored once as an object named after the hash of its contents, no matter how many
+backups contain it. Each backup is then only a small manifest listing the directory tree it was made from, and which object holds each file's contents.
+
+The store keeps a count of how many manifest entries point to each object, objects are deleted as soon as the last manifest pointing to them is removed.
+Counts are always increased before a manifest is written and decreased after one is removed, so an interruption can only ever leave an object that is no
+longer needed, never remove one that is. Rebuilding the references will clean up any such objects.
+"""
+
+ManifestFormatVersion = 1  # type: int
+
+_fileEntryType = "File"  # type: str
+_directoryEntryType = "Directory"  # type: str
+
+_hashBlockSize = 1048576  # type: int
+
+_storeLock = threading.RLock()  # type: threading.RLock
+
+def GetStoreDirectoryPath () -> str:
+	"""
+	Get the path of the directory the backup store is kept in.
+	"""
+
+	return os.path.join(Paths.SavesPath, "NO_Backup_Store")
+
+def GetObjectsDirectoryPath () -> str:
+	return os.path.join(GetStoreDirectoryPath(), "Objects")
+
+def GetManifestsDirectoryPath () -> str:
+	return os.path.join(GetStoreDirectoryPath(), "Manifests")
+
+def GetReferencesFilePath () -> str:
+	return os.path.join(GetStoreDirectoryPath(), "References.json")
+
+def GetObjectFilePath (objectHash: str) -> str:
+	"""
+	Get the path of the object holding the contents with this hash. The object may not exist.
+	"""
+
+	if not isinstance(objectHash, str):
+		raise Exceptions.IncorrectTypeException(objectHash, "objectHash", (str,))
+
+	return os.path.join(GetObjectsDirectoryPath(), objectHash[:2], objectHash)
+
+def StoreDirectory (directoryPath: str, manifestFilePath: str, previousManifestFilePath: typing.Optional[str] = None) -> None:
+	"""
+	Back up a directory. Every file in it will be hashed, files with contents the store doesn't have yet will be added to it and a manifest of the directory
+	will be written to the manifest file path. The directory itself will not be changed. If a manifest already exists at that path it will be replaced.
+
+	:param directoryPath: The path of the directory to be backed up.
+	:type directoryPath: str
+	:param manifestFilePath: The path the manifest file will be written to, this should be in the manifests directory.
+	:type manifestFilePath: str
+	:param previousManifestFilePath: The manifest of an earlier backup of this directory. Files that have the same size and modification time as they did in
+	the previous backup will not be read again, the hash in the previous manifest will be used instead.
+	:type previousManifestFilePath: str | None
+	"""
+
+	if not isinstance(directoryPath, str):
+		raise Exceptions.IncorrectTypeException(directoryPath, "directoryPath", (str,))
+
+	if not isinstance(manifestFilePath, str):
+		raise Exceptions.IncorrectTypeException(manifestFilePath, "manifestFilePath", (str,))
+
+	if not isinstance(previousManifestFilePath, str) and previousManifestFilePath is not None:
+		raise Exceptions.IncorrectTypeException(previousManifestFilePath, "previousManifestFilePath", (str, None))
+
+	with _storeLock:
+		previousFileEntries = dict()  # type: typing.Dict[str, dict]
+
+		if previousManifestFilePath is not None and os.path.exists(previousManifestFilePath):
+			try:
+				previousFileEntries = GetManifestFileEntries(ReadManifest(previousManifestFilePath))
+			except Exception:
+				Debug.Log("Failed to read the previous backup manifest at '" + Paths.StripUserDataPath(previousManifestFilePath) + "', every file will be hashed.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+		directoryStatus = os.stat(directoryPath)  # type: os.stat_result
+		manifestEntries = list()  # type: typing.List[dict]
+
+		_StoreEntries(directoryPath, "", manifestEntries, previousFileEntries)
+
+		manifest = {
+			"FormatVersion": ManifestFormatVersion,
+			"ModifiedTime": directoryStatus.st_mtime_ns,
+			"Entries": manifestEntries
+		}  # type: dict
+
+		references = _ReadReferences()  # type: typing.Dict[str, int]
+
+		for objectHash in _GetManifestObjects(manifest):  # type: str
+			references[objectHash] = references.get(objectHash, 0) + 1
+
+		_WriteReferences(references)
+
+		if os.path.exists(manifestFilePath):
+			RemoveManifest(manifestFilePath)
+
+		FileSystem.WriteFileAtomically(manifestFilePath, json.JSONEncoder(indent = "\t").encode(manifest))
+
+def RestoreDirectory (manifestFilePath: str, directoryPath: str) -> None:
+	"""
+	Recreate the directory a manifest was made from. The restored directory will have the same tree, file contents and modification times as the directory
+	did when it was backed up. Files are copied out of the store, never linked, so they can be changed freely.
+
+	:param manifestFilePath: The path of the manifest to be restored.
+	:type manifestFilePath: str
+	:param directoryPath: The path the directory should be restored to, nothing can exist at this path yet.
+	:type directoryPath: str
+	"""
+
+	if not isinstance(manifestFilePath, str):
+		raise Exceptions.IncorrectTypeException(manifestFilePath, "manifestFilePath", (str,))
+
+	if not isinstance(directoryPath, str):
+		raise Exceptions.IncorrectTypeException(directoryPath, "directoryPath", (str,))
+
+	if os.path.exists(directoryPath):
+		raise Exception("Cannot restore a backup to '" + Paths.StripUserDataPath(directoryPath) + "' as something already exists there.")
+
+	with _storeLock:
+		manifest = ReadManifest(manifestFilePath)  # type: dict
+
+		os.makedirs(directoryPath)
+
+		directoryModifiedTimes = [(directoryPath, manifest["ModifiedTime"])]  # type: typing.List[typing.Tuple[str, int]]
+
+		for manifestEntry in manifest["Entries"]:  # type: dict
+			entryPath = os.path.join(directoryPath, *manifestEntry["Path"].split("/"))  # type: str
+
+			if manifestEntry["Type"] == _directoryEntryType:
+				if not os.path.exists(entryPath):
+					os.makedirs(entryPath)
+
+				directoryModifiedTimes.append((entryPath, manifestEntry["ModifiedTime"]))
+			else:
+				objectFilePath = GetObjectFilePath(manifestEntry["Object"])  # type: str
+
+				if not os.path.exists(objectFilePath):
+					raise Exception("The backup object for the file '" + manifestEntry["Path"] + "' is missing from the store.")
+
+				entryParentPath = os.path.dirname(entryPath)  # type: str
+
+				if not os.path.exists(entryParentPath):
+					os.makedirs(entryParentPath)
+
+				shutil.copyfile(objectFilePath, entryPath)
+				os.utime(entryPath, ns = (manifestEntry["ModifiedTime"], manifestEntry["ModifiedTime"]))
+
+		for restoredDirectoryPath, restoredDirectoryModifiedTime in reversed(directoryModifiedTimes):  # type: str, int
+			os.utime(restoredDirectoryPath, ns = (restoredDirectoryModifiedTime, restoredDirectoryModifiedTime))
+
+def MoveManifest (currentManifestFilePath: str, targetManifestFilePath: str) -> None:
+	"""
+	Move a manifest to another path, replacing any manifest already there.
+	"""
+
+	if not isinstance(currentManifestFilePath, str):
+		raise Exceptions.IncorrectTypeException(currentManifestFilePath, "currentManifestFilePath", (str,))
+
+	if not isinstance(targetManifestFilePath, str):
+		raise Exceptions.IncorrectTypeException(targetManifestFilePath, "targetManifestFilePath", (str,))
+
+	with _storeLock:
+		if os.path.exists(targetManifestFilePath):
+			RemoveManifest(targetManifestFilePath)
+
+		os.replace(currentManifestFilePath, targetManifestFilePath)
+
+def RemoveManifest (manifestFilePath: str) -> None:
+	"""
+	Remove a backup's manifest and delete any object no other manifest needs. Nothing will happen if the manifest doesn't exist.
+	"""
+
+	if not isinstance(manifestFilePath, str):
+		raise Exceptions.IncorrectTypeException(manifestFilePath, "manifestFilePath", (str,))
+
+	with _storeLock:
+		if not os.path.exists(manifestFilePath):
+			return
+
+		try:
+			manifest = ReadManifest(manifestFilePath)  # type: typing.Optional[dict]
+		except Exception:
+			Debug.Log("Failed to read the backup manifest at '" + Paths.StripUserDataPath(manifestFilePath) + "', the store's references will be rebuilt.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+			manifest = None
+
+		os.remove(manifestFilePath)
+
+		if manifest is None:
+			RebuildReferences()
+			return
+
+		references = _ReadReferences()  # type: typing.Dict[str, int]
+
+		for objectHash in _GetManifestObjects(manifest):  # type: str
+			references[objectHash] = references.get(objectHash, 0) - 1
+
+			if references[objectHash] <= 0:
+				references.pop(objectHash)
+				_RemoveObject(objectHash)
+
+		_WriteReferences(references)
+
+def RebuildReferences () -> None:
+	"""
+	Recount the references to every object from the manifests that exist, and delete every object that no manifest points to.
+	"""
+
+	with _storeLock:
+		references = _CountReferences()  # type: typing.Dict[str, int]
+		objectsDirectoryPath = GetObjectsDirectoryPath()  # type: str
+
+		if os.path.exists(objectsDirectoryPath):
+			for objectGroupName in os.listdir(objectsDirectoryPath):  # type: str
+				objectGroupPath = os.path.join(objectsDirectoryPath, objectGroupName)  # type: str
+
+				if not os.path.isdir(objectGroupPath):
+					continue
+
+				for objectName in os.listdir(objectGroupPath):  # type: str
+					if not objectName in references:
+						os.remove(os.path.join(objectGroupPath, objectName))
+
+				FileSystem.CloseDirectory(objectGroupPath, ignoreErrors = True)
+
+		_WriteReferences(references)
+
+def ReadManifest (manifestFilePath: str) -> dict:
+	"""
+	Read and check a manifest file.
+	"""
+
+	if not isinstance(manifestFilePath, str):
+		raise Exceptions.IncorrectTypeException(manifestFilePath, "manifestFilePath", (str,))
+
+	with open(manifestFilePath) as manifestFile:
+		manifest = json.JSONDecoder().decode(manifestFile.read())
+
+	if not isinstance(manifest, dict):
+		raise Exceptions.IncorrectTypeException(manifest, "Root", (dict,))
+
+	if not isinstance(manifest.get("FormatVersion"), int) or manifest["FormatVersion"] > ManifestFormatVersion:
+		raise Exception("The backup manifest at '" + Paths.StripUserDataPath(manifestFilePath) + "' has an unknown format version.")
+
+	if not isinstance(manifest.get("ModifiedTime"), int):
+		raise Exceptions.IncorrectTypeException(manifest.get("ModifiedTime"), "Root[ModifiedTime]", (int,))
+
+	if not isinstance(manifest.get("Entries"), list):
+		raise Exceptions.IncorrectTypeException(manifest.get("Entries"), "Root[Entries]", (list,))
+
+	for manifestEntry in manifest["Entries"]:  # type: dict
+		if not isinstance(manifestEntry, dict):
+			raise Exceptions.IncorrectTypeException(manifestEntry, "Root[Entries][n]", (dict,))
+
+		entryPath = manifestEntry.get("Path")  # type: str
+
+		if not isinstance(entryPath, str):
+			raise Exceptions.IncorrectTypeException(entryPath, "Root[Entries][n][Path]", (str,))
+
+		if entryPath == "" or entryPath.startswith("/") or ":" in entryPath or "\\" in entryPath or ".." in entryPath.split("/"):
+			raise Exception("The backup manifest at '" + Paths.StripUserDataPath(manifestFilePath) + "' has an invalid path '" + entryPath + "'.")
+
+		if not isinstance(manifestEntry.get("ModifiedTime"), int):
+			raise Exceptions.IncorrectTypeException(manifestEntry.get("ModifiedTime"), "Root[Entries][n][ModifiedTime]", (int,))
+
+		if manifestEntry.get("Type") == _fileEntryType:
+			if not isinstance(manifestEntry.get("Object"), str):
+				raise Exceptions.IncorrectTypeException(manifestEntry.get("Object"), "Root[Entries][n][Object]", (str,))
+
+			if not isinstance(manifestEntry.get("Size"), int):
+				raise Exceptions.IncorrectTypeException(manifestEntry.get("Size"), "Root[Entries][n][Size]", (int,))
+		elif manifestEntry.get("Type") != _directoryEntryType:
+			raise Exception("The backup manifest at '" + Paths.StripUserDataPath(manifestFilePath) + "' has an entry with an unknown type.")
+
+	return manifest
+
+def GetManifestFileEntries (manifest: dict) -> typing.Dict[str, dict]:
+	"""
+	Get the file entries of a manifest, keyed by their relative path. Paths always use forward slashes.
+	"""
+
+	return { manifestEntry["Path"]: manifestEntry for manifestEntry in manifest["Entries"] if manifestEntry["Type"] == _fileEntryType }
+
+def LinkObject (manifestEntry: dict, targetFilePath: str) -> bool:
+	"""
+	Put the object of a manifest's file entry at the target path with the entry's modification time. The object is hard linked if its modification time already
+	matches the entry's, otherwise it is copied. Changing the modification time of a hard link would change it for the object and every other file linked to it.
+	A linked target must not be written to in place afterwards, as that would change the object too.
+
+	:return: True if the object was linked or copied, False if it doesn't exist or could not be copied.
+	:rtype: bool
+	"""
+
+	objectFilePath = GetObjectFilePath(manifestEntry["Object"])  # type: str
+
+	try:
+		objectStatus = os.stat(objectFilePath)  # type: os.stat_result
+	except OSError:
+		return False
+
+	if objectStatus.st_mtime_ns == manifestEntry["ModifiedTime"]:
+		try:
+			os.link(objectFilePath, targetFilePath)
+			return True
+		except (OSError, NotImplementedError):
+			pass
+
+	try:
+		shutil.copy2(objectFilePath, targetFilePath)
+		os.utime(targetFilePath, ns = (manifestEntry["ModifiedTime"], manifestEntry["ModifiedTime"]))
+	except OSError:
+		return False
+
+	return True
+
+def HashFile (filePath: str) -> str:
+	"""
+	Get the sha256 hash of a file's contents, the file is read in blocks so it never needs to be held in memory all at once. Object files in the store are named
+	after this hash.
+	:param filePath: The path of the file to hash.
+	:type filePath: str
+	:return: The file's hash as a hexadecimal string.
+	:rtype: str
+	"""
+
+	fileHash = hashlib.sha256()
+
+	with open(filePath, "rb") as hashingFile:
+		for fileBlock in iter(lambda: hashingFile.read(_hashBlockSize), b""):  # type: bytes
+			fileHash.update(fileBlock)
+
+	return fileHash.hexdigest()
+
+def _StoreEntries (directoryPath: str, relativePath: str, manifestEntries: typing.List[dict], previousFileEntries: typing.Dict[str, dict]) -> None:
+	for directoryEntry in sorted(os.scandir(directoryPath), key = lambda sortingEntry: sortingEntry.name):  # type: os.DirEntry
+		entryRelativePath = relativePath + "/" + directoryEntry.name if relativePath != "" else directoryEntry.name  # type: str
+		entryStatus = directoryEntry.stat()  # type: os.stat_result
+
+		if directoryEntry.is_dir():
+			manifestEntries.append({
+				"Path": entryRelativePath,
+				"Type": _directoryEntryType,
+				"ModifiedTime": entryStatus.st_mtime_ns
+			})
+
+			_StoreEntries(directoryEntry.path, entryRelativePath, manifestEntries, previousFileEntries)
+			continue
+
+		previousFileEntry = previousFileEntries.get(entryRelativePath)  # type: typing.Optional[dict]
+
+		if previousFileEntry is not None and previousFileEntry["Size"] == entryStatus.st_size and previousFileEntry["ModifiedTime"] == entryStatus.st_mtime_ns and \
+				os.path.exists(GetObjectFilePath(previousFileEntry["Object"])):
+			objectHash = previousFileEntry["Object"]  # type: str
+		else:
+			objectHash = _StoreFile(directoryEntry.path)  # type: str
+
+		manifestEntries.append({
+			"Path": entryRelativePath,
+			"Type": _fileEntryType,
+			"Object": objectHash,
+			"Size": entryStatus.st_size,
+			"ModifiedTime": entryStatus.st_mtime_ns
+		})
+
+def _StoreFile (filePath: str) -> str:
+	objectHash = HashFile(filePath)  # type: str
+	objectFilePath = GetObjectFilePath(objectHash)  # type: str
+
+	if os.path.exists(objectFilePath):
+		return objectHash
+
+	objectDirectoryPath = os.path.dirname(objectFilePath)  # type: str
+
+	if not os.path.exists(objectDirectoryPath):
+		os.makedirs(objectDirectoryPath)
+
+	temporaryObjectFilePath = objectFilePath + ".tmp"  # type: str
+
+	if os.path.exists(temporaryObjectFilePath):
+		os.remove(temporaryObjectFilePath)
+
+	try:
+		os.link(filePath, temporaryObjectFilePath)
+	except (OSError, NotImplementedError):
+		shutil.copyfile(filePath, temporaryObjectFilePath)
+
+	os.replace(temporaryObjectFilePath, objectFilePath)
+	return objectHash
+
+def _RemoveObject (objectHash: str) -> None:
+	objectFilePath = GetObjectFilePath(objectHash)  # type: str
+
+	if os.path.exists(objectFilePath):
+		os.remove(objectFilePath)
+
+	FileSystem.CloseDirectory(os.path.dirname(objectFilePath), ignoreErrors = True)
+
+def _GetManifestObjects (manifest: dict) -> typing.List[str]:
+	return [manifestEntry["Object"] for manifestEntry in manifest["Entries"] if manifestEntry["Type"] == _fileEntryType]
+
+def _CountReferences () -> typing.Dict[str, int]:
+	references = dict()  # type: typing.Dict[str, int]
+	manifestsDirectoryPath = GetManifestsDirectoryPath()  # type: str
+
+	if not os.path.exists(manifestsDirectoryPath):
+		return references
+
+	for manifestFileName in os.listdir(manifestsDirectoryPath):  # type: str
+		manifestFilePath = os.path.join(manifestsDirectoryPath, manifestFileName)  # type: str
+
+		if not manifestFileName.endswith(".json") or not os.path.isfile(manifestFilePath):
+			continue
+
+		try:
+			manifest = ReadManifest(manifestFilePath)  # type: dict
+		except Exception:
+			Debug.Log("Failed to read the backup manifest at '" + Paths.StripUserDataPath(manifestFilePath) + "', it will be ignored.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+			continue
+
+		for objectHash in _GetManifestObjects(manifest):  # type: str
+			references[objectHash] = references.get(objectHash, 0) + 1
+
+	return references
+
+def _ReadReferences () -> typing.Dict[str, int]:
+	referencesFilePath = GetReferencesFilePath()  # type: str
+
+	if os.path.exists(referencesFilePath):
+		try:
+			with open(referencesFilePath) as referencesFile:
+				references = json.JSONDecoder().decode(referencesFile.read())
+
+			if not isinstance(references, dict):
+				raise Exceptions.IncorrectTypeException(references, "Root", (dict,))
+
+			for objectHash, objectReferences in references.items():  # type: str, int
+				if not isinstance(objectReferences, int):
+					raise Exceptions.IncorrectTypeException(objectReferences, "Root[" + objectHash + "]", (int,))
+
+			return references
+		except Exception:
+			Debug.Log("Failed to read the backup store's references, they will be rebuilt.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+	return _CountReferences()
+
+def _WriteReferences (references: typing.Dict[str, int]) -> None:
+	FileSystem.WriteFileAtomically(GetReferencesFilePath(), json.JSONEncoder(indent = "\t", sort_keys = True).encode(references))
@@ -7,13 +7,15 @@ import os
 import pathlib
 import re
 import shutil
+import threading
+import time
 import typing
-import uuid
+from concurrent import futures
 
 import services
 from NeonOcean.S4.Main import Debug, Language, Mods, Paths, Saving, This
-from NeonOcean.S4.Main.Saving import SaveShared
-from NeonOcean.S4.Main.Tools import Exceptions, FileSystem
+from NeonOcean.S4.Main.Saving import BackupStore, SaveProfiler, SaveShared
+from NeonOcean.S4.Main.Tools import Exceptions, FileSystem, Serialization
 from NeonOcean.S4.Main.UI import Notifications
 from ui import ui_dialog_notification
 
@@ -33,12 +35,28 @@ WarningNotificationsMismatchGameTickText = Language.String(This.Mod.Namespace +
 
 _registeredSavingObjects = list()  # type: typing.List[Saving.SaveBase]
 _maximumBackups = 5  # type: int
+_maximumParallelWorkers = 4  # type: int
 
 _loadedSlotID = None  # type: typing.Optional[int]
 _loadedDirectoryPath = None  # type: typing.Optional[str]
 
 _activeSlotID = None  # type: typing.Optional[int]
 
+_commitExecutor = None  # type: typing.Optional[futures.ThreadPoolExecutor]
+_commitFuture = None  # type: typing.Optional[futures.Future]
+_commitSlotID = None  # type: typing.Optional[int]  # The slot the background commit is committing to, it becomes the loaded slot once the commit succeeds.
+
+_commitStagingSuffix = "_Staging"  # type: str
+_commitStagedSuffix = "_Staged"  # type: str
+_commitReplacedSuffix = "_Replaced"  # type: str
+
+MetaDataIndexFormatVersion = 1  # type: int
+ChecksumsFormatVersion = 1  # type: int
+
+_metaDataIndexLock = threading.RLock()
+_metaDataIndex = None  # type: typing.Optional[typing.Dict[str, dict]]
+_metaDataIndexFileState = None  # type: typing.Optional[typing.Tuple[int, int]]
+
 class ModSaveMatchTypes(enum_lib.IntFlag):
 	"""
 	Types to show how well a game save matches mod save folders based on their meta data.
@@ -108,16 +126,22 @@ def UnregisterSavingObject (savingObject: Saving.SaveBase) -> None:
 
 def GetLoadedSlotID () -> typing.Optional[int]:
 	"""
-	Get the loaded slot id, the slot id that the loaded mod data was first gotten from or last saved to. This will be None if nothing is loaded.
+	Get the loaded slot id, the slot id that the loaded mod data was first gotten from or last saved to. This will be None if nothing is loaded. This will wait
+	for a background commit to finish first.
 	"""
 
+	WaitForCommit()
+
 	return _loadedSlotID
 
 def GetLoadedDirectoryPath () -> typing.Optional[str]:
 	"""
-	Get the loaded directory path, the directory that the loaded mod data was first gotten from or last saved to. This will be None if nothing is loaded.
+	Get the loaded directory path, the directory that the loaded mod data was first gotten from or last saved to. This will be None if nothing is loaded. This
+	will wait for a background commit to finish first.
 	"""
 
+	WaitForCommit()
+
 	return _loadedDirectoryPath
 
 def GetActiveSlotID () -> typing.Optional[int]:
@@ -154,6 +178,10 @@ def Load (loadSlotID: int, loadingDirectoryPath: typing.Optional[str] = None, ch
 	if not isinstance(changingSave, bool):
 		raise Exceptions.IncorrectTypeException(changingSave, "changingSave", (bool,))
 
+	WaitForCommit()
+
+	operationStartTime = time.perf_counter()  # type: float
+
 	if loadingDirectoryPath is not None:
 		Debug.Log("Loading the directory '" + Paths.StripUserDataPath(loadingDirectoryPath) + "' in save slot %s for %s saving object(s)." % (loadSlotID, len(_registeredSavingObjects)), This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 	else:
@@ -172,6 +200,7 @@ def Load (loadSlotID: int, loadingDirectoryPath: typing.Optional[str] = None, ch
 		changingSave = True
 
 		try:
+			_ReportFailedChecksums(loadingDirectoryPath)
 			ActivateDirectoryToSlot(loadingDirectoryPath, loadSlotID)
 		except:
 			Debug.Log("Failed to activate the directory at %s in save slot %s" % (Paths.StripUserDataPath(loadingDirectoryPath), loadSlotID), This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
@@ -181,7 +210,7 @@ def Load (loadSlotID: int, loadingDirectoryPath: typing.Optional[str] = None, ch
 
 		if _activeSlotID != loadSlotID:
 			try:
-				ActivateDirectoryToSlot(loadingDirectoryPath, loadSlotID)
+				_ActivateVerifiedSaveDirectory(loadSlotID)
 			except:
 				Debug.Log("Failed to activate save slot %s" % (loadSlotID,), This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
 				loadingFailure = True
@@ -189,6 +218,9 @@ def Load (loadSlotID: int, loadingDirectoryPath: typing.Optional[str] = None, ch
 	loadingActiveDirectoryPath = GetModSaveActiveDirectoryPath(loadSlotID)  # type: str
 
 	modSaveMetaDataFileName = GetModSaveMetaDataFileName()  # type: str
+	modSaveChecksumsFileName = GetModSaveChecksumsFileName()  # type: str
+
+	loadingTargets = list()  # type: typing.List[typing.Tuple[Saving.SaveBase, typing.Optional[str]]]
 
 	for savingObject in _registeredSavingObjects:  # type: Saving.SaveBase
 		try:
@@ -197,38 +229,65 @@ def Load (loadSlotID: int, loadingDirectoryPath: typing.Optional[str] = None, ch
 
 			savingObjectFileName = savingObject.GetSaveFileName()  # type: str
 
-			if savingObjectFileName == modSaveMetaDataFileName:
-				Debug.Log("Had to skip a saving object with the identifier '" + savingObject.Identifier + "' because its file name was '" + modSaveMetaDataFileName + "' which conflicts with an important file.", This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
+			if savingObjectFileName == modSaveMetaDataFileName or savingObjectFileName == modSaveChecksumsFileName:
+				Debug.Log("Had to skip a saving object with the identifier '" + savingObject.Identifier + "' because its file name was '" + savingObjectFileName + "' which conflicts with an important file.", This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
 				continue
 
-			loadingFilePath = os.path.abspath(os.path.join(loadingActiveDirectoryPath, savingObject.GetSaveFileName()))  # type: str
-
-			modLoadSuccessful = savingObject.Load(loadingFilePath)  # type: bool
+			loadingFilePath = os.path.abspath(os.path.join(loadingActiveDirectoryPath, savingObject.GetSaveFileName()))  # type: typing.Optional[str]
 		except Exception:
 			Debug.Log("Encountered an unhandled exception upon loading a saving object with the identifier '" + savingObject.Identifier + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
-			modLoadSuccessful = False
+			loadingFilePath = None
 
-		if not modLoadSuccessful:
-			failedSavingIdentifiers.append(savingObject.Identifier)
+		loadingTargets.append((savingObject, loadingFilePath))
 
-		if modLoadSuccessful:
-			savingObjectGUID = savingObject.DataGUID  # type: typing.Optional[int]
-
-			if savingObjectGUID is not None:
-				gameSaveGUID = services.get_persistence_service().get_save_slot_proto_guid()  # type: int
-
-				if savingObjectGUID != gameSaveGUID:
-					mismatchGUIDSavingIdentifiers.append(savingObject.Identifier)
-					continue
+	parallelExecutor = _CreateParallelExecutor([savingObject for savingObject, loadingFilePath in loadingTargets if loadingFilePath is not None])  # type: typing.Optional[futures.ThreadPoolExecutor]
 
-			savingObjectGameTick = savingObject.DataGameTick  # type: typing.Optional[int]
-
-			if savingObjectGameTick is not None:
-				gameplaySaveSlotData = services.get_persistence_service().get_save_slot_proto_buff().gameplay_data
-
-				if savingObjectGameTick != gameplaySaveSlotData.world_game_time:
-					mismatchGameTickSavingIdentifiers.append(savingObject.Identifier)
-					continue
+	try:
+		parallelReads = list()  # type: typing.List[typing.Optional[futures.Future]]
+
+		for savingObject, loadingFilePath in loadingTargets:  # type: Saving.SaveBase, typing.Optional[str]
+			if parallelExecutor is not None and loadingFilePath is not None and _CanRunInParallel(savingObject):
+				parallelReads.append(parallelExecutor.submit(savingObject.ReadFile, loadingFilePath))
+			else:
+				parallelReads.append(None)
+
+		for (savingObject, loadingFilePath), parallelRead in zip(loadingTargets, parallelReads):  # type: typing.Tuple[Saving.SaveBase, typing.Optional[str]], typing.Optional[futures.Future]
+			if loadingFilePath is None:
+				modLoadSuccessful = False  # type: bool
+			else:
+				try:
+					if parallelRead is not None:
+						modLoadSuccessful = savingObject.Load(loadingFilePath, preparedFile = parallelRead.result())
+					else:
+						modLoadSuccessful = savingObject.Load(loadingFilePath)
+				except Exception:
+					Debug.Log("Encountered an unhandled exception upon loading a saving object with the identifier '" + savingObject.Identifier + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+					modLoadSuccessful = False
+
+			if not modLoadSuccessful:
+				failedSavingIdentifiers.append(savingObject.Identifier)
+
+			if modLoadSuccessful:
+				savingObjectGUID = savingObject.DataGUID  # type: typing.Optional[int]
+
+				if savingObjectGUID is not None:
+					gameSaveGUID = services.get_persistence_service().get_save_slot_proto_guid()  # type: int
+
+					if savingObjectGUID != gameSaveGUID:
+						mismatchGUIDSavingIdentifiers.append(savingObject.Identifier)
+						continue
+
+				savingObjectGameTick = savingObject.DataGameTick  # type: typing.Optional[int]
+
+				if savingObjectGameTick is not None:
+					gameplaySaveSlotData = services.get_persistence_service().get_save_slot_proto_buff().gameplay_data
+
+					if savingObjectGameTick != gameplaySaveSlotData.world_game_time:
+						mismatchGameTickSavingIdentifiers.append(savingObject.Identifier)
+						continue
+	finally:
+		if parallelExecutor is not None:
+			parallelExecutor.shutdown(wait = True)
 
 	if changingSave:
 		_loadedSlotID = loadSlotID
@@ -246,6 +305,8 @@ def Load (loadSlotID: int, loadingDirectoryPath: typing.Optional[str] = None, ch
 	if len(mismatchGameTickSavingIdentifiers) != 0:
 		_ShowMismatchGameTickWarningDialog(mismatchGameTickSavingIdentifiers)
 
+	SaveProfiler.Record("Load", "Slot %s" % loadSlotID, time.perf_counter() - operationStartTime)
+
 	Debug.Log("Finished loading %s saving object(s) with %s failing." % (len(_registeredSavingObjects), str(len(failedSavingIdentifiers))), This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
 def Save (saveSlotID: int, commitSave: bool = False) -> None:
@@ -269,9 +330,13 @@ def Save (saveSlotID: int, commitSave: bool = False) -> None:
 	if saveSlotID < 0:
 		raise Exception("saveSlotID values must be greater than or equal to 0.")
 
+	WaitForCommit()
+
 	if not isinstance(commitSave, bool):
 		raise Exceptions.IncorrectTypeException(commitSave, "commitSave", (bool,))
 
+	operationStartTime = time.perf_counter()  # type: float
+
 	if commitSave:
 		Debug.Log("Saving and committing %s saving object(s) to save slot %s." % (len(_registeredSavingObjects), saveSlotID), This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 	else:
@@ -282,6 +347,11 @@ def Save (saveSlotID: int, commitSave: bool = False) -> None:
 
 	try:
 		if _activeSlotID != saveSlotID:
+			# Sharded sections may not have read everything they loaded from the active directory yet, it will be gone once it's deactivated.
+			for savingObject in _registeredSavingObjects:  # type: Saving.SaveBase
+				if isinstance(savingObject, SaveShared.Save) and savingObject.Loaded:
+					savingObject.ReadShards()
+
 			DeactivateActiveSlot()
 	except:
 		Debug.Log("Failed to deactivate the active save directory.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
@@ -292,6 +362,9 @@ def Save (saveSlotID: int, commitSave: bool = False) -> None:
 	savingDirectoryPath = GetModSaveActiveDirectoryPath(saveSlotID)  # type: str
 
 	modSaveMetaDataFileName = GetModSaveMetaDataFileName()  # type: str
+	modSaveChecksumsFileName = GetModSaveChecksumsFileName()  # type: str
+
+	savingTargets = list()  # type: typing.List[typing.Tuple[Saving.SaveBase, typing.Optional[str]]]
 
 	for savingObject in _registeredSavingObjects:  # type: Saving.SaveBase
 		try:
@@ -304,25 +377,65 @@ def Save (saveSlotID: int, commitSave: bool = False) -> None:
 
 			savingObjectFileName = savingObject.GetSaveFileName()  # type: str
 
-			if savingObjectFileName == modSaveMetaDataFileName:
-				Debug.Log("Had to skip a saving object with the identifier '" + savingObject.Identifier + "' because its file name was '" + modSaveMetaDataFileName + "' which conflicts with an important file.", This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
+			if savingObjectFileName == modSaveMetaDataFileName or savingObjectFileName == modSaveChecksumsFileName:
+				Debug.Log("Had to skip a saving object with the identifier '" + savingObject.Identifier + "' because its file name was '" + savingObjectFileName + "' which conflicts with an important file.", This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
 				continue
 
-			savingFilePath = os.path.abspath(os.path.join(savingDirectoryPath, savingObject.GetSaveFileName()))  # type: str
-
-			modSaveSuccessful = savingObject.Save(savingFilePath)  # type: bool
+			savingFilePath = os.path.abspath(os.path.join(savingDirectoryPath, savingObject.GetSaveFileName()))  # type: typing.Optional[str]
 		except Exception:
 			Debug.Log("Encountered an unhandled exception upon saving a saving object with the identifier '" + savingObject.Identifier + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
-			modSaveSuccessful = False  # type: bool
+			savingFilePath = None
 
-		if not modSaveSuccessful:
-			failedSavingIdentifiers.append(savingObject.Identifier)
+		savingTargets.append((savingObject, savingFilePath))
+
+	parallelExecutor = _CreateParallelExecutor([savingObject for savingObject, savingFilePath in savingTargets if savingFilePath is not None])  # type: typing.Optional[futures.ThreadPoolExecutor]
+
+	try:
+		savingResults = list()  # type: typing.List[typing.Tuple[Saving.SaveBase, typing.Union[bool, futures.Future]]]
+
+		for savingObject, savingFilePath in savingTargets:  # type: Saving.SaveBase, typing.Optional[str]
+			if savingFilePath is None:
+				savingResults.append((savingObject, False))
+				continue
+
+			try:
+				if parallelExecutor is not None and _CanRunInParallel(savingObject):
+					preparedFile = savingObject.PrepareSave(savingFilePath)  # type: SaveShared.PreparedFile
+					savingResults.append((savingObject, parallelExecutor.submit(_WritePreparedFile, savingObject, preparedFile)))
+				else:
+					savingResults.append((savingObject, savingObject.Save(savingFilePath)))
+			except Exception:
+				Debug.Log("Encountered an unhandled exception upon saving a saving object with the identifier '" + savingObject.Identifier + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+				savingResults.append((savingObject, False))
+
+		for savingObject, savingResult in savingResults:  # type: Saving.SaveBase, typing.Union[bool, futures.Future]
+			if isinstance(savingResult, futures.Future):
+				try:
+					modSaveSuccessful = savingObject.FinishSave(savingResult.result())  # type: bool
+				except Exception:
+					Debug.Log("Encountered an unhandled exception upon saving a saving object with the identifier '" + savingObject.Identifier + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+					modSaveSuccessful = False  # type: bool
+			else:
+				modSaveSuccessful = savingResult  # type: bool
+
+			if not modSaveSuccessful:
+				failedSavingIdentifiers.append(savingObject.Identifier)
+	finally:
+		if parallelExecutor is not None:
+			parallelExecutor.shutdown(wait = True)
 
 	try:
 		_CreateSaveMetaDataFile(savingDirectoryPath)
 	except:
 		Debug.Log("Failed to write a save meta file into the slot %s" % saveSlotID, This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
 
+	try:
+		_CreateChecksumsFile(savingDirectoryPath)
+	except:
+		Debug.Log("Failed to write a save checksums file into the slot %s" % saveSlotID, This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+	SaveProfiler.Record("Save", "Slot %s" % saveSlotID, time.perf_counter() - operationStartTime)
+
 	if commitSave:
 		Commit(savingDirectoryPath, saveSlotID)
 
@@ -334,16 +447,21 @@ def Save (saveSlotID: int, commitSave: bool = False) -> None:
 
 	Debug.Log("Finished saving %s saving object(s) with %s failing." % (len(_registeredSavingObjects), str(len(failedSavingIdentifiers))), This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
-def Commit (sourceDirectoryPath: str, commitSlotID: int) -> None:
+def Commit (sourceDirectoryPath: str, commitSlotID: int, background: bool = True) -> None:
 	"""
 	Copy the active directory in this slot to its actual save directory and backup old save directories. If the active directory doesn't exist nothing will happen.
+	The copy is made in a staging directory next to the save directory and is swapped in once complete, so an interrupted commit never leaves a partially copied
+	save directory behind. Functions in this module that read or change mod save directories will wait for a background commit to finish first.
 	:param sourceDirectoryPath: The path of the mod save folder that will be copied to the slot.
 	:type sourceDirectoryPath: str
 	:param commitSlotID: The save slot id suppose to be committed. This must be greater than or equal to 0.
 	:type commitSlotID: int
+	:param background: Whether or not the commit should be done on a background thread. Failures of background commits are reported when they are waited on,
+	see WaitForCommit.
+	:type background: bool
 	"""
 
-	global _loadedSlotID, _loadedDirectoryPath
+	global _loadedSlotID, _loadedDirectoryPath, _commitFuture, _commitSlotID
 
 	if not isinstance(sourceDirectoryPath, str):
 		raise Exceptions.IncorrectTypeException(sourceDirectoryPath, "sourceDirectoryPath", (str,))
@@ -354,28 +472,93 @@ def Commit (sourceDirectoryPath: str, commitSlotID: int) -> None:
 	if commitSlotID < 0:
 		raise Exception("commitSlotID values must be greater than or equal to 0.")
 
+	if not isinstance(background, bool):
+		raise Exceptions.IncorrectTypeException(background, "background", (bool,))
+
+	WaitForCommit()
+
 	Debug.Log("Committing the directory '%s' to the slot %s." % (Paths.StripUserDataPath(sourceDirectoryPath), commitSlotID), This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
-	committingDirectoryPath = GetModSaveDirectoryPath(commitSlotID)  # type: str
 	currentTimestamp = datetime.datetime.now().timestamp()  # type: float
 
-	try:
-		_ShiftBackupDirectories(commitSlotID)
+	if background:
+		# The slot becomes the loaded slot once the commit is waited on and found to have succeeded, see WaitForCommit.
+		_commitFuture = _GetCommitExecutor().submit(_CommitInternal, sourceDirectoryPath, commitSlotID, currentTimestamp)
+		_commitSlotID = commitSlotID
+		return
 
-		if os.path.exists(sourceDirectoryPath):
-			shutil.copytree(sourceDirectoryPath, committingDirectoryPath)
-			os.utime(committingDirectoryPath, (currentTimestamp, currentTimestamp))
-		else:
-			Debug.Log("The commit source directory at '%s' does not exist." % Paths.StripUserDataPath(sourceDirectoryPath), This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+	try:
+		_CommitInternal(sourceDirectoryPath, commitSlotID, currentTimestamp)
 	except:
 		Debug.Log("Failed to commit to save slot '" + str(commitSlotID) + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
 		_ShowCommitFailureDialog()
 		return
 
 	_loadedSlotID = commitSlotID
-	_loadedDirectoryPath = committingDirectoryPath
+	_loadedDirectoryPath = GetModSaveDirectoryPath(commitSlotID)
 
-	Debug.Log("Finished committing to save slot %s." % commitSlotID, This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+def WaitForCommit () -> bool:
+	"""
+	Wait for the commit running in the background to finish, if there is one. If that commit failed, it will be reported to the player now, otherwise its slot
+	becomes the loaded slot. This should only be called from the game's thread.
+	:return: False if a background commit failed, otherwise True.
+	:rtype: bool
+	"""
+
+	global _loadedSlotID, _loadedDirectoryPath, _commitFuture, _commitSlotID
+
+	commitFuture = _commitFuture  # type: typing.Optional[futures.Future]
+	commitSlotID = _commitSlotID  # type: typing.Optional[int]
+
+	if commitFuture is None:
+		return True
+
+	_commitFuture = None
+	_commitSlotID = None
+
+	try:
+		commitFuture.result()
+	except Exception as e:
+		Debug.Log("Failed to commit to a save slot in the background.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__, exception = e)
+		_ShowCommitFailureDialog()
+		return False
+
+	_loadedSlotID = commitSlotID
+	_loadedDirectoryPath = GetModSaveDirectoryPath(commitSlotID)
+
+	return True
+
+def RecoverInterruptedCommits () -> None:
+	"""
+	Finish any commit that was interrupted before it could complete, such as by the game closing. Commits that were still copying or shifting backups are thrown
+	away, leaving the slot's last complete save directory in place. Commits that finished copying and shifting backups are swapped in.
+	"""
+
+	WaitForCommit()
+
+	if not os.path.exists(Paths.SavesPath):
+		return
+
+	interruptedSlotIDs = set()  # type: typing.Set[int]
+
+	for directoryName in os.listdir(Paths.SavesPath):  # type: str
+		commitDirectoryMatch = re.match("^Slot_([0-9A-F]{8})_NO(" + _commitStagingSuffix + "|" + _commitStagedSuffix + "|" + _commitReplacedSuffix + ")$", directoryName, re.IGNORECASE)
+
+		if commitDirectoryMatch is not None:
+			interruptedSlotIDs.add(int(commitDirectoryMatch.group(1), 16))
+
+	for slotID in sorted(interruptedSlotIDs):  # type: int
+		Debug.Log("Found an interrupted commit in save slot %s, recovering it." % slotID, This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+		try:
+			stagingDirectoryPath = GetModSaveDirectoryPath(slotID) + _commitStagingSuffix  # type: str
+
+			if os.path.exists(stagingDirectoryPath):
+				FileSystem.RemoveDirectoryTree(stagingDirectoryPath, directoryRemovalRequired = True)
+
+			_SwapCommittedDirectory(slotID)
+		except:
+			Debug.Log("Failed to recover an interrupted commit in save slot %s." % slotID, This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
 
 def DoOverrideBackupCommit (slotID: int) -> None:
 	"""
@@ -394,29 +577,13 @@ def DoOverrideBackupCommit (slotID: int) -> None:
 	if slotID < 0:
 		raise Exception("slotID values must be greater than or equal to 0.")
 
-	Debug.Log("Doing an override backup commit for save slot %s." % slotID, This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+	WaitForCommit()
 
-	saveDirectoryPath = GetModSaveDirectoryPath(slotID)  # type: str
+	Debug.Log("Doing an override backup commit for save slot %s." % slotID, This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
 
 	try:
-		if not os.path.exists(saveDirectoryPath):
-			_ShiftBackupDirectories(slotID)
-			return
-
-		saveTemporaryDirectoryParentPath = os.path.join(Paths.TemporaryPath, "Saves", str(uuid.uuid4()))  # type: str
-		saveTemporaryDirectoryPath = os.path.join(saveTemporaryDirectoryParentPath, os.path.split(saveDirectoryPath)[1])  # type: str
-
-		if not os.path.exists(saveTemporaryDirectoryParentPath):
-			os.makedirs(saveTemporaryDirectoryParentPath)
-
-		shutil.copytree(saveDirectoryPath, saveTemporaryDirectoryPath)
-
-		_ShiftBackupDirectories(slotID)
-
-		_MoveDirectory(saveTemporaryDirectoryPath, saveDirectoryPath)
-
-		FileSystem.RemoveDirectoryTree(saveTemporaryDirectoryParentPath, directoryRemovalRequired = True)
-		FileSystem.CloseDirectory(Paths.TemporaryPath, ignoreErrors = True)
+		# The save directory is backed up, but it is still this slot's save, so it needs to stay where it is.
+		_ShiftBackupDirectories(slotID, keepSaveDirectory = True)
 	except:
 		Debug.Log("Failed to do an override backup commit for save slot %s" % slotID, This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
 		return
@@ -484,6 +651,8 @@ def PrepareForSaveChange () -> None:
 
 	global _loadedSlotID, _loadedDirectoryPath
 
+	WaitForCommit()
+
 	try:
 		DeactivateActiveSlot()
 	except:
@@ -492,6 +661,40 @@ def PrepareForSaveChange () -> None:
 	_loadedSlotID = None
 	_loadedDirectoryPath = None
 
+def ConvertSlot (slotID: int, serializer: typing.Optional[Serialization.Serializer] = None, includeBackups: bool = True) -> typing.List[str]:
+	"""
+	Rewrite the files of every registered saving object in a slot's mod save directory, and optionally its backup directories, with a different serializer.
+	The files are rewritten in place and can be in any format a registered serializer can read.
+	:param slotID: The slot id of the targeted mod saves folder. This must be greater than or equal to 0.
+	:type slotID: int
+	:param serializer: The serializer to rewrite the files with. If this is None, each file will be rewritten with the serializer its saving object has selected.
+	:type serializer: Serialization.Serializer | None
+	:param includeBackups: Whether or not the slot's backups should be converted as well. Backups are restored to a temporary directory, converted and then
+	stored again.
+	:type includeBackups: bool
+	:return: The paths of every file that was rewritten. Files in backups are given as the paths they would have if the backup was restored.
+	:rtype: typing.List[str]
+	"""
+
+	if not isinstance(slotID, int):
+		raise Exceptions.IncorrectTypeException(slotID, "slotID", (int,))
+
+	if not isinstance(serializer, Serialization.Serializer) and serializer is not None:
+		raise Exceptions.IncorrectTypeException(serializer, "serializer", (Serialization.Serializer, None))
+
+	if not isinstance(includeBackups, bool):
+		raise Exceptions.IncorrectTypeException(includeBackups, "includeBackups", (bool,))
+
+	WaitForCommit()
+
+	convertedFilePaths = _ConvertDirectory(GetModSaveDirectoryPath(slotID), serializer)  # type: typing.List[str]
+
+	if includeBackups:
+		for backupIndex in range(_maximumBackups):  # type: int
+			convertedFilePaths.extend(_ConvertBackup(slotID, backupIndex, serializer))
+
+	return convertedFilePaths
+
 def GetSaveMetaData (saveDirectoryPath: str) -> typing.Optional[ModSaveMetaData]:
 	"""
 	Get a meta data object for this mod save directory.
@@ -502,34 +705,66 @@ def GetSaveMetaData (saveDirectoryPath: str) -> typing.Optional[ModSaveMetaData]
 	if not isinstance(saveDirectoryPath, str):
 		raise Exceptions.IncorrectTypeException(saveDirectoryPath, "saveDirectoryPath", (str,))
 
-	metaDataFilePath = os.path.join(saveDirectoryPath, GetModSaveMetaDataFileName())  # type: str
+	WaitForCommit()
 
-	if not os.path.exists(metaDataFilePath):
-		return None
+	if pathlib.Path(os.path.dirname(os.path.abspath(saveDirectoryPath))) != pathlib.Path(os.path.abspath(Paths.SavesPath)):
+		return _CreateMetaDataObject(saveDirectoryPath, _ReadSaveMetaDataFile(os.path.join(saveDirectoryPath, GetModSaveMetaDataFileName())))
 
-	try:
-		with open(metaDataFilePath) as metaDataFile:
-			metaData = json.JSONDecoder().decode(metaDataFile.read())  # type: typing.Dict[str, typing.Any]
+	with _metaDataIndexLock:
+		metaDataIndex = _ReadMetaDataIndex()  # type: typing.Dict[str, dict]
 
-		if not isinstance(metaData, dict):
-			raise Exceptions.IncorrectTypeException(metaData, "Root", (dict,))
+		if _UpdateMetaDataIndexEntry(metaDataIndex, os.path.basename(saveDirectoryPath)):
+			_WriteMetaDataIndexSafely(metaDataIndex)
 
-		name = metaData["Name"]  # type: str
-		guid = metaData["GUID"]  # type: int
-		gameTick = metaData["GameTick"]  # type: int
+		return _GetIndexedMetaData(metaDataIndex, saveDirectoryPath)
 
-		if not isinstance(name, str):
-			raise Exceptions.IncorrectTypeException(name, "Root[Name]", (str,))
+def GetAllSaveMetaData () -> typing.Dict[str, typing.Optional[ModSaveMetaData]]:
+	"""
+	Get a meta data object for every directory in the mod saves folder. Meta data is read from the meta data index, only the meta data files that have changed
+	since they were indexed will be read.
+	:return: A dictionary of every directory path in the mod saves folder and its meta data. Directories without readable meta data are paired with None.
+	:rtype: typing.Dict[str, typing.Optional[ModSaveMetaData]]
+	"""
 
-		if not isinstance(guid, int):
-			raise Exceptions.IncorrectTypeException(guid, "Root[GUID]", (int,))
+	WaitForCommit()
 
-		if not isinstance(gameTick, int):
-			raise Exceptions.IncorrectTypeException(gameTick, "Root[GameTick]", (int,))
+	allMetaData = dict()  # type: typing.Dict[str, typing.Optional[ModSaveMetaData]]
 
-		return ModSaveMetaData(saveDirectoryPath, name, guid, gameTick)
-	except:
-		return None
+	if not os.path.exists(Paths.SavesPath):
+		return allMetaData
+
+	backupStoreDirectoryPath = pathlib.Path(BackupStore.GetStoreDirectoryPath())  # type: pathlib.Path
+
+	with _metaDataIndexLock:
+		metaDataIndex = _ReadMetaDataIndex()  # type: typing.Dict[str, dict]
+		metaDataIndexChanged = False  # type: bool
+
+		saveDirectoryNames = list()  # type: typing.List[str]
+
+		for saveDirectoryName in os.listdir(Paths.SavesPath):  # type: str
+			saveDirectoryPath = os.path.join(Paths.SavesPath, saveDirectoryName)  # type: str
+
+			if not os.path.isdir(saveDirectoryPath) or pathlib.Path(saveDirectoryPath) == backupStoreDirectoryPath:
+				continue
+
+			saveDirectoryNames.append(saveDirectoryName)
+
+			if _UpdateMetaDataIndexEntry(metaDataIndex, saveDirectoryName):
+				metaDataIndexChanged = True
+
+		for indexedDirectoryName in list(metaDataIndex.keys()):  # type: str
+			if indexedDirectoryName not in saveDirectoryNames:
+				metaDataIndex.pop(indexedDirectoryName)
+				metaDataIndexChanged = True
+
+		if metaDataIndexChanged:
+			_WriteMetaDataIndexSafely(metaDataIndex)
+
+		for saveDirectoryName in saveDirectoryNames:  # type: str
+			saveDirectoryPath = os.path.join(Paths.SavesPath, saveDirectoryName)  # type: str
+			allMetaData[saveDirectoryPath] = _GetIndexedMetaData(metaDataIndex, saveDirectoryPath)
+
+	return allMetaData
 
 def ActivateSaveSlot (slotID: int) -> None:
 	"""
@@ -617,6 +852,8 @@ def DeactivateActiveSlot () -> None:
 
 	global _activeSlotID
 
+	WaitForCommit()
+
 	activeSlotID = _activeSlotID  # type: typing.Optional[int]
 
 	if activeSlotID is not None:
@@ -661,8 +898,8 @@ def GetModSaveActiveDirectoryPath (slotID: int) -> str:
 
 def GetModSaveBackupDirectoryPath (slotID: int, backupIndex: int) -> str:
 	"""
-	Get a mod save backup directory. All backup directories should correspond with a game's backup save file.
-	Saving objects that don't use these directories shouldn't use the built in handler as it moves save files by moving the entire directory.
+	Get the path a mod save backup directory is restored to. All backups should correspond with a game's backup save file. Backups are kept in the backup
+	store and will only exist as a directory after being restored, see RestoreBackup.
 	:param slotID: The slot id of the targeted mod saves folder. This must be greater than or equal to 0.
 	:type slotID: int
 	:param backupIndex: The index of the target backup mod saves folder. The game's save backup files go up to the index of 4 and mod save folders do the same.
@@ -683,6 +920,56 @@ def GetModSaveBackupDirectoryPath (slotID: int, backupIndex: int) -> str:
 
 	return os.path.join(Paths.SavesPath, "Slot_" + SaveShared.GetSlotIDString(slotID) + "_NO.ver" + str(backupIndex))
 
+def GetModSaveBackupManifestFilePath (slotID: int, backupIndex: int) -> str:
+	"""
+	Get the path of a mod save backup's manifest in the backup store.
+	:param slotID: The slot id of the targeted mod saves folder. This must be greater than or equal to 0.
+	:type slotID: int
+	:param backupIndex: The index of the target backup. The game's save backup files go up to the index of 4 and mod save backups do the same.
+	:type backupIndex: int
+	"""
+
+	backupDirectoryPath = GetModSaveBackupDirectoryPath(slotID, backupIndex)  # type: str
+	return os.path.join(BackupStore.GetManifestsDirectoryPath(), os.path.basename(backupDirectoryPath) + ".json")
+
+def RestoreBackup (slotID: int, backupIndex: int, restoreDirectoryPath: typing.Optional[str] = None) -> bool:
+	"""
+	Restore a mod save backup from the backup store to a directory. The restored directory will be exactly the same as the save directory that was backed up.
+	:param slotID: The slot id of the targeted backup. This must be greater than or equal to 0.
+	:type slotID: int
+	:param backupIndex: The index of the target backup.
+	:type backupIndex: int
+	:param restoreDirectoryPath: The path the backup should be restored to, nothing can exist at this path yet. If this is None, the backup will be restored
+	to its backup directory path. Backup directories left in the saves folder will be taken back into the store the next time the slot's backups shift.
+	:type restoreDirectoryPath: str | None
+	:return: True if the backup was restored, False if the backup doesn't exist.
+	:rtype: bool
+	"""
+
+	if not isinstance(restoreDirectoryPath, str) and restoreDirectoryPath is not None:
+		raise Exceptions.IncorrectTypeException(restoreDirectoryPath, "restoreDirectoryPath", (str, None))
+
+	WaitForCommit()
+
+	backupManifestFilePath = GetModSaveBackupManifestFilePath(slotID, backupIndex)  # type: str
+
+	if restoreDirectoryPath is None:
+		restoreDirectoryPath = GetModSaveBackupDirectoryPath(slotID, backupIndex)
+
+	if not os.path.exists(backupManifestFilePath):
+		return False
+
+	BackupStore.RestoreDirectory(backupManifestFilePath, restoreDirectoryPath)
+	return True
+
+def GetSaveMetaDataIndexFilePath () -> str:
+	"""
+	Get the path of the meta data index file. This file holds the meta data of every directory in the mod saves folder so that it doesn't need to be read
+	from each directory.
+	"""
+
+	return os.path.join(Paths.SavesPath, "Meta_Data_Index.json")
+
 def GetModSaveMetaDataFileName () -> str:
 	"""
 	Get the file name of every mod save meta data file.
@@ -690,6 +977,14 @@ def GetModSaveMetaDataFileName () -> str:
 
 	return "Meta_Data.json"
 
+def GetModSaveChecksumsFileName () -> str:
+	"""
+	Get the file name of every mod save checksums file. These files hold the hash of every other file in a mod save directory, so that damaged files can be
+	found before they are loaded.
+	"""
+
+	return "Checksums.json"
+
 def IsSaveDirectory (saveDirectory: str) -> bool:
 	"""
 	Get whether or not the specified save directory is a one that could be saved to or loaded from by this module.
@@ -726,55 +1021,157 @@ def GetSaveDirectorySlot (saveDirectory: str) -> typing.Optional[int]:
 
 	return saveDirectorySlotID
 
-def _ShiftBackupDirectories (slotID: int) -> None:
+def _CanRunInParallel (savingObject: Saving.SaveBase) -> bool:
+	"""
+	Whether or not this saving object's file can be read or written on a worker thread. Only shared saving objects can split their file operations from their
+	section callbacks, and those can opt out through their parallel property.
 	"""
-	Shift the backup directories in this slot to follow the game's save backups. After this is called, the most recent save directory will have been either moved to the
-	backup or deleted. If the maximum amount of backup save directories exist, the oldest backup will be deleted.
+
+	return isinstance(savingObject, SaveShared.Save) and savingObject.Parallel
+
+def _CreateParallelExecutor (savingObjects: typing.List[Saving.SaveBase]) -> typing.Optional[futures.ThreadPoolExecutor]:
+	"""
+	Create a worker pool to read or write the files of these saving objects. None will be returned if fewer than two of them can run in parallel, as there would
+	be nothing to gain from the extra threads.
+	"""
+
+	parallelObjectCount = sum(1 for savingObject in savingObjects if _CanRunInParallel(savingObject))  # type: int
+
+	if parallelObjectCount < 2 or _maximumParallelWorkers < 2:
+		return None
+
+	return futures.ThreadPoolExecutor(max_workers = min(parallelObjectCount, _maximumParallelWorkers), thread_name_prefix = This.Mod.Namespace + ".Saving")
+
+def _WritePreparedFile (savingObject: SaveShared.Save, preparedFile: SaveShared.PreparedFile) -> SaveShared.PreparedFile:
+	savingObject.WriteFile(preparedFile)
+	return preparedFile
+
+def _GetCommitExecutor () -> futures.ThreadPoolExecutor:
+	global _commitExecutor
+
+	if _commitExecutor is None:
+		# Only one worker, commits to the same slot can't be allowed to overlap.
+		_commitExecutor = futures.ThreadPoolExecutor(max_workers = 1, thread_name_prefix = This.Mod.Namespace + ".Commit")
+
+	return _commitExecutor
+
+def _CommitInternal (sourceDirectoryPath: str, commitSlotID: int, commitTimestamp: float) -> None:
+	# Each step of a commit leaves something recovery can finish or undo if the commit is interrupted, see RecoverInterruptedCommits.
+	# - Interrupted while copying to the staging directory or shifting the backups: the staging directory is thrown away and the slot keeps its last save
+	# directory. If the shift had finished, that save directory is also the first backup, the game had already moved its own backups along.
+	# - Interrupted after the staging directory was renamed to the staged directory: the backups were already shifted, the staged directory is swapped in.
+	# - Interrupted while swapping: the swap is run again, it can be resumed from any point.
+
+	operationStartTime = time.perf_counter()  # type: float
+
+	committingDirectoryPath = GetModSaveDirectoryPath(commitSlotID)  # type: str
+	stagingDirectoryPath = committingDirectoryPath + _commitStagingSuffix  # type: str
+	stagedDirectoryPath = committingDirectoryPath + _commitStagedSuffix  # type: str
+	firstBackupManifestFilePath = GetModSaveBackupManifestFilePath(commitSlotID, 0)  # type: str
+
+	for leftoverDirectoryPath in (stagingDirectoryPath, stagedDirectoryPath):  # type: str
+		if os.path.exists(leftoverDirectoryPath):
+			FileSystem.RemoveDirectoryTree(leftoverDirectoryPath, directoryRemovalRequired = True)
+
+	if os.path.exists(sourceDirectoryPath):
+		# The backups haven't been shifted yet, the save directory holds the files committed last time.
+		_CopyDirectory(sourceDirectoryPath, stagingDirectoryPath, unchangedManifestFilePath = firstBackupManifestFilePath, unchangedDirectoryPath = committingDirectoryPath)
+		os.utime(stagingDirectoryPath, (commitTimestamp, commitTimestamp))
+
+		# The backups are only shifted once the new save directory is ready, a failed copy leaves them untouched. The save directory stays where it is until
+		# the new one is swapped in.
+		_ShiftBackupDirectories(commitSlotID, keepSaveDirectory = True)
+
+		# The staged directory only exists once the copy is complete and the backups are shifted, recovery relies on this.
+		os.rename(stagingDirectoryPath, stagedDirectoryPath)
+
+		_SwapCommittedDirectory(commitSlotID)
+
+		with _metaDataIndexLock:
+			metaDataIndex = _ReadMetaDataIndex()  # type: typing.Dict[str, dict]
+
+			if _UpdateMetaDataIndexEntry(metaDataIndex, os.path.basename(committingDirectoryPath)):
+				_WriteMetaDataIndexSafely(metaDataIndex)
+	else:
+		Debug.Log("The commit source directory at '%s' does not exist." % Paths.StripUserDataPath(sourceDirectoryPath), This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+		# There is nothing to replace the save directory with, it is backed up and removed.
+		_ShiftBackupDirectories(commitSlotID)
+
+	SaveProfiler.Record("Commit", "Slot %s" % commitSlotID, time.perf_counter() - operationStartTime)
+
+	Debug.Log("Finished committing to save slot %s." % commitSlotID, This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+
+def _SwapCommittedDirectory (slotID: int) -> None:
+	# Replace the slot's save directory with its staged directory. Directories can't be replaced in one step on every platform, so the old save directory is
+	# renamed out of the way first. This can be run again after being interrupted at any point.
+
+	committingDirectoryPath = GetModSaveDirectoryPath(slotID)  # type: str
+	stagedDirectoryPath = committingDirectoryPath + _commitStagedSuffix  # type: str
+	replacedDirectoryPath = committingDirectoryPath + _commitReplacedSuffix  # type: str
+
+	if os.path.exists(stagedDirectoryPath):
+		if os.path.exists(committingDirectoryPath):
+			if os.path.exists(replacedDirectoryPath):
+				FileSystem.RemoveDirectoryTree(replacedDirectoryPath, directoryRemovalRequired = True)
+
+			os.rename(committingDirectoryPath, replacedDirectoryPath)
+
+		os.rename(stagedDirectoryPath, committingDirectoryPath)
+	elif os.path.exists(replacedDirectoryPath) and not os.path.exists(committingDirectoryPath):
+		# Nothing can replace the old save directory anymore, so it needs to be put back.
+		os.rename(replacedDirectoryPath, committingDirectoryPath)
+
+	if os.path.exists(replacedDirectoryPath):
+		FileSystem.RemoveDirectoryTree(replacedDirectoryPath, directoryRemovalRequired = True)
+
+def _ShiftBackupDirectories (slotID: int, keepSaveDirectory: bool = False) -> None:
+	"""
+	Shift the backups in this slot to follow the game's save backups. After this is called, the most recent save directory will have been either stored as the
+	first backup or deleted. If the maximum amount of backups exist, the oldest backup will be deleted.
 	:param slotID: The slot id of the targeted save directories.
 	:type slotID: int
+	:param keepSaveDirectory: Whether or not the save directory should be left in place after it has been backed up.
+	:type keepSaveDirectory: bool
 	"""
 
 	_VerifyBackupDirectories(slotID)
+	_StoreBackupDirectories(slotID)
 
 	saveDirectoryPath = GetModSaveDirectoryPath(slotID)  # type: str
 
 	if _maximumBackups <= 0:
-		if os.path.exists(saveDirectoryPath):
+		if os.path.exists(saveDirectoryPath) and not keepSaveDirectory:
 			FileSystem.RemoveDirectoryTree(saveDirectoryPath, directoryRemovalRequired = True)
 
 		return
 
 	for backupIndex in reversed(range(_maximumBackups)):  # type: int
-		currentBackupDirectoryPath = GetModSaveBackupDirectoryPath(slotID, backupIndex)  # type: str
+		currentBackupManifestFilePath = GetModSaveBackupManifestFilePath(slotID, backupIndex)  # type: str
 
-		if not os.path.exists(currentBackupDirectoryPath):
+		if not os.path.exists(currentBackupManifestFilePath):
 			continue
 
 		if backupIndex == _maximumBackups - 1:
-			FileSystem.RemoveDirectoryTree(currentBackupDirectoryPath, directoryRemovalRequired = True)
+			BackupStore.RemoveManifest(currentBackupManifestFilePath)
 			continue
 
-		nextBackupDirectoryPath = GetModSaveBackupDirectoryPath(slotID, backupIndex + 1)  # type: str
-		nextBackupDirectoryParentPath = os.path.dirname(nextBackupDirectoryPath)  # type: str
-
-		if os.path.exists(nextBackupDirectoryPath):
-			FileSystem.RemoveDirectoryTree(nextBackupDirectoryPath, directoryRemovalRequired = True)
-
-		if not os.path.exists(nextBackupDirectoryParentPath):
-			os.makedirs(nextBackupDirectoryParentPath)
-
-		_MoveDirectory(currentBackupDirectoryPath, nextBackupDirectoryPath)
+		BackupStore.MoveManifest(currentBackupManifestFilePath, GetModSaveBackupManifestFilePath(slotID, backupIndex + 1))
 
 	if os.path.exists(saveDirectoryPath):
-		firstBackupDirectoryPath = GetModSaveBackupDirectoryPath(slotID, 0)  # type: str
-		firstBackupDirectoryParentPath = os.path.dirname(firstBackupDirectoryPath)  # type: str
+		firstBackupManifestFilePath = GetModSaveBackupManifestFilePath(slotID, 0)  # type: str
+		firstBackupManifestParentPath = os.path.dirname(firstBackupManifestFilePath)  # type: str
 
-		assert not os.path.exists(firstBackupDirectoryPath)
+		assert not os.path.exists(firstBackupManifestFilePath)
 
-		if not os.path.exists(firstBackupDirectoryParentPath):
-			os.makedirs(firstBackupDirectoryParentPath)
+		if not os.path.exists(firstBackupManifestParentPath):
+			os.makedirs(firstBackupManifestParentPath)
 
-		_MoveDirectory(saveDirectoryPath, firstBackupDirectoryPath)
+		# The previous backup was made from this slot's last save directory, files that haven't changed since then don't need to be read again.
+		BackupStore.StoreDirectory(saveDirectoryPath, firstBackupManifestFilePath, previousManifestFilePath = GetModSaveBackupManifestFilePath(slotID, 1) if _maximumBackups > 1 else None)
+
+		if not keepSaveDirectory:
+			FileSystem.RemoveDirectoryTree(saveDirectoryPath, directoryRemovalRequired = True)
 
 	saveDirectoryParentPath = os.path.dirname(saveDirectoryPath)  # type: str
 	FileSystem.CloseDirectory(saveDirectoryParentPath, ignoreErrors = True)
@@ -789,13 +1186,42 @@ def _VerifyBackupDirectories (slotID: int) -> None:
 
 	for backupIndex in range(_maximumBackups):  # type: int
 		gameBackupFilePath = SaveShared.GetGameSaveBackupFilePath(slotID, backupIndex)  # type: str
+
+		if os.path.exists(gameBackupFilePath):
+			continue
+
+		backupManifestFilePath = GetModSaveBackupManifestFilePath(slotID, backupIndex)  # type: str
 		backupDirectoryPath = GetModSaveBackupDirectoryPath(slotID, backupIndex)  # type: str
 		backupDirectoryParentPath = os.path.dirname(backupDirectoryPath)  # type: str
 
-		if not os.path.exists(gameBackupFilePath) and os.path.exists(backupDirectoryPath):
+		BackupStore.RemoveManifest(backupManifestFilePath)
+
+		if os.path.exists(backupDirectoryPath):
 			FileSystem.RemoveDirectoryTree(backupDirectoryPath, directoryRemovalRequired = True)
 			FileSystem.CloseDirectory(backupDirectoryParentPath, ignoreErrors = True)
 
+def _StoreBackupDirectories (slotID: int) -> None:
+	"""
+	Take any backup directories in this slot into the backup store. These are either backups made before the store existed or backups that were restored.
+	:param slotID: The slot id of the targeted save file.
+	:type slotID: int
+	"""
+
+	for backupIndex in range(_maximumBackups):  # type: int
+		backupDirectoryPath = GetModSaveBackupDirectoryPath(slotID, backupIndex)  # type: str
+
+		if not os.path.isdir(backupDirectoryPath):
+			continue
+
+		backupManifestFilePath = GetModSaveBackupManifestFilePath(slotID, backupIndex)  # type: str
+		backupManifestParentPath = os.path.dirname(backupManifestFilePath)  # type: str
+
+		if not os.path.exists(backupManifestParentPath):
+			os.makedirs(backupManifestParentPath)
+
+		BackupStore.StoreDirectory(backupDirectoryPath, backupManifestFilePath, previousManifestFilePath = backupManifestFilePath)
+		FileSystem.RemoveDirectoryTree(backupDirectoryPath, directoryRemovalRequired = True)
+
 def _CreateSaveMetaDataFile (metaDataDirectoryPath: str) -> None:
 	metaDataFilePath = os.path.join(metaDataDirectoryPath, GetModSaveMetaDataFileName())  # type: str
 
@@ -809,40 +1235,481 @@ def _CreateSaveMetaDataFile (metaDataDirectoryPath: str) -> None:
 		"GameTick": gameTick
 	}
 
+	metaDataString = json.JSONEncoder(indent = "\t").encode(metaData)  # type: str
+
 	if not os.path.exists(metaDataDirectoryPath):
 		os.makedirs(metaDataDirectoryPath)
 
+	if os.path.exists(metaDataFilePath):
+		try:
+			with open(metaDataFilePath) as metaDataFile:
+				if metaDataFile.read() == metaDataString:
+					# Leaving the file alone keeps its modification time, so committing can link it instead of copying it.
+					return
+		except Exception:
+			pass
+
 	with open(metaDataFilePath, "w+") as metaDataFile:
-		metaDataFile.write(json.JSONEncoder(indent = "\t").encode(metaData))
+		metaDataFile.write(metaDataString)
+
+def _ReadSaveMetaDataFile (metaDataFilePath: str) -> typing.Optional[dict]:
+	if not os.path.exists(metaDataFilePath):
+		return None
+
+	try:
+		with open(metaDataFilePath) as metaDataFile:
+			metaData = json.JSONDecoder().decode(metaDataFile.read())  # type: typing.Dict[str, typing.Any]
+
+		if not isinstance(metaData, dict):
+			raise Exceptions.IncorrectTypeException(metaData, "Root", (dict,))
+
+		name = metaData["Name"]  # type: str
+		guid = metaData["GUID"]  # type: int
+		gameTick = metaData["GameTick"]  # type: int
+
+		if not isinstance(name, str):
+			raise Exceptions.IncorrectTypeException(name, "Root[Name]", (str,))
+
+		if not isinstance(guid, int):
+			raise Exceptions.IncorrectTypeException(guid, "Root[GUID]", (int,))
+
+		if not isinstance(gameTick, int):
+			raise Exceptions.IncorrectTypeException(gameTick, "Root[GameTick]", (int,))
+
+		return {
+			"Name": name,
+			"GUID": guid,
+			"GameTick": gameTick
+		}
+	except:
+		return None
+
+def _CreateMetaDataObject (saveDirectoryPath: str, metaData: typing.Optional[dict]) -> typing.Optional[ModSaveMetaData]:
+	if metaData is None:
+		return None
+
+	return ModSaveMetaData(saveDirectoryPath, metaData["Name"], metaData["GUID"], metaData["GameTick"])
+
+def _GetIndexedMetaData (metaDataIndex: typing.Dict[str, dict], saveDirectoryPath: str) -> typing.Optional[ModSaveMetaData]:
+	indexEntry = metaDataIndex.get(os.path.basename(saveDirectoryPath))  # type: typing.Optional[dict]
+
+	if indexEntry is None:
+		return None
+
+	return _CreateMetaDataObject(saveDirectoryPath, indexEntry["MetaData"])
+
+def _ReadMetaDataIndex () -> typing.Dict[str, dict]:
+	"""
+	Get the meta data index, it is only read again if the index file has changed since it was last read or written. An empty index is returned if the file doesn't
+	exist or can't be read, this will cause the index to be rebuilt.
+	"""
+
+	global _metaDataIndex, _metaDataIndexFileState
+
+	metaDataIndexFilePath = GetSaveMetaDataIndexFilePath()  # type: str
+
+	try:
+		metaDataIndexFileStat = os.stat(metaDataIndexFilePath)
+	except FileNotFoundError:
+		_metaDataIndex = dict()
+		_metaDataIndexFileState = None
+		return _metaDataIndex
+
+	metaDataIndexFileState = (metaDataIndexFileStat.st_size, metaDataIndexFileStat.st_mtime_ns)  # type: typing.Tuple[int, int]
+
+	if _metaDataIndex is not None and _metaDataIndexFileState == metaDataIndexFileState:
+		return _metaDataIndex
+
+	metaDataIndex = dict()  # type: typing.Dict[str, dict]
+
+	try:
+		with open(metaDataIndexFilePath) as metaDataIndexFile:
+			metaDataIndexData = json.JSONDecoder().decode(metaDataIndexFile.read())  # type: typing.Dict[str, typing.Any]
+
+		if not isinstance(metaDataIndexData, dict):
+			raise Exceptions.IncorrectTypeException(metaDataIndexData, "Root", (dict,))
+
+		if metaDataIndexData.get("FormatVersion") != MetaDataIndexFormatVersion:
+			raise Exception("Unsupported meta data index format version '" + str(metaDataIndexData.get("FormatVersion")) + "'.")
+
+		indexEntries = metaDataIndexData["Directories"]  # type: typing.Dict[str, dict]
+
+		if not isinstance(indexEntries, dict):
+			raise Exceptions.IncorrectTypeException(indexEntries, "Root[Directories]", (dict,))
+
+		for saveDirectoryName, indexEntry in indexEntries.items():  # type: str, dict
+			if not isinstance(indexEntry, dict):
+				continue
+
+			if not isinstance(indexEntry.get("ModifiedTime"), int) or not isinstance(indexEntry.get("Size"), int):
+				continue
+
+			entryMetaData = indexEntry.get("MetaData")  # type: typing.Optional[dict]
+
+			if entryMetaData is not None:
+				if not isinstance(entryMetaData, dict) or not isinstance(entryMetaData.get("Name"), str) or \
+						not isinstance(entryMetaData.get("GUID"), int) or not isinstance(entryMetaData.get("GameTick"), int):
+					continue
+
+			metaDataIndex[saveDirectoryName] = indexEntry
+	except:
+		Debug.Log("Failed to read the meta data index, it will be rebuilt.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+		metaDataIndex = dict()
+
+	_metaDataIndex = metaDataIndex
+	_metaDataIndexFileState = metaDataIndexFileState
+	return _metaDataIndex
+
+def _UpdateMetaDataIndexEntry (metaDataIndex: typing.Dict[str, dict], saveDirectoryName: str) -> bool:
+	"""
+	Read a save directory's meta data file into the index, if it was changed since it was indexed.
+	:return: Whether or not the index was changed.
+	:rtype: bool
+	"""
+
+	metaDataFilePath = os.path.join(Paths.SavesPath, saveDirectoryName, GetModSaveMetaDataFileName())  # type: str
+
+	try:
+		metaDataFileStat = os.stat(metaDataFilePath)
+	except OSError:
+		return metaDataIndex.pop(saveDirectoryName, None) is not None
+
+	indexEntry = metaDataIndex.get(saveDirectoryName)  # type: typing.Optional[dict]
+
+	if indexEntry is not None:
+		if indexEntry["ModifiedTime"] == metaDataFileStat.st_mtime_ns and indexEntry["Size"] == metaDataFileStat.st_size:
+			return False
+
+	metaDataIndex[saveDirectoryName] = {
+		"ModifiedTime": metaDataFileStat.st_mtime_ns,
+		"Size": metaDataFileStat.st_size,
+		"MetaData": _ReadSaveMetaDataFile(metaDataFilePath)
+	}
+
+	return True
+
+def _WriteMetaDataIndexSafely (metaDataIndex: typing.Dict[str, dict]) -> None:
+	# The index is only a cache of the meta data files, failing to write it should never stop anything else from working.
+
+	global _metaDataIndexFileState
+
+	metaDataIndexFilePath = GetSaveMetaDataIndexFilePath()  # type: str
+
+	metaDataIndexData = {
+		"FormatVersion": MetaDataIndexFormatVersion,
+		"Directories": metaDataIndex
+	}
+
+	try:
+		FileSystem.WriteFileAtomically(metaDataIndexFilePath, json.JSONEncoder(indent = "\t").encode(metaDataIndexData))
+
+		metaDataIndexFileStat = os.stat(metaDataIndexFilePath)
+		_metaDataIndexFileState = (metaDataIndexFileStat.st_size, metaDataIndexFileStat.st_mtime_ns)
+	except:
+		Debug.Log("Failed to write the meta data index.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+def _CreateChecksumsFile (checksumsDirectoryPath: str) -> None:
+	checksumsFilePath = os.path.join(checksumsDirectoryPath, GetModSaveChecksumsFileName())  # type: str
+
+	previousFileEntries = dict()  # type: typing.Dict[str, dict]
+
+	try:
+		previousFileEntries = _ReadChecksumsFile(checksumsFilePath) or dict()
+	except Exception:
+		pass
+
+	fileEntries = dict()  # type: typing.Dict[str, dict]
+
+	for relativeFilePath in _GetChecksummedFiles(checksumsDirectoryPath):  # type: str
+		fileStatus = os.stat(os.path.join(checksumsDirectoryPath, relativeFilePath))
+		previousFileEntry = previousFileEntries.get(relativeFilePath)  # type: typing.Optional[dict]
+
+		# Files that haven't been written to since the last checksums file was created don't need to be hashed again.
+		if previousFileEntry is not None and previousFileEntry["Size"] == fileStatus.st_size and previousFileEntry["ModifiedTime"] == fileStatus.st_mtime_ns:
+			fileEntries[relativeFilePath] = previousFileEntry
+			continue
+
+		fileEntries[relativeFilePath] = {
+			"Hash": BackupStore.HashFile(os.path.join(checksumsDirectoryPath, relativeFilePath)),
+			"Size": fileStatus.st_size,
+			"ModifiedTime": fileStatus.st_mtime_ns
+		}
+
+	if fileEntries == previousFileEntries:
+		return
+
+	checksums = {
+		"FormatVersion": ChecksumsFormatVersion,
+		"Files": fileEntries
+	}
+
+	FileSystem.WriteFileAtomically(checksumsFilePath, json.JSONEncoder(indent = "\t").encode(checksums))
 
-def _MoveDirectory (currentDirectoryPath: str, targetDirectoryPath: str) -> None:
-	if not os.path.exists(currentDirectoryPath):
+def _ReadChecksumsFile (checksumsFilePath: str) -> typing.Optional[typing.Dict[str, dict]]:
+	"""
+	Read the file entries of a checksums file. None will be returned if the file doesn't exist and an exception will be raised if it cannot be read.
+	"""
+
+	if not os.path.exists(checksumsFilePath):
+		return None
+
+	with open(checksumsFilePath) as checksumsFile:
+		checksums = json.JSONDecoder().decode(checksumsFile.read())  # type: typing.Dict[str, typing.Any]
+
+	if not isinstance(checksums, dict):
+		raise Exceptions.IncorrectTypeException(checksums, "Root", (dict,))
+
+	if checksums.get("FormatVersion") != ChecksumsFormatVersion:
+		raise Exception("Unsupported checksums format version '" + str(checksums.get("FormatVersion")) + "'.")
+
+	fileEntries = checksums["Files"]  # type: typing.Dict[str, dict]
+
+	if not isinstance(fileEntries, dict):
+		raise Exceptions.IncorrectTypeException(fileEntries, "Root[Files]", (dict,))
+
+	for relativeFilePath, fileEntry in fileEntries.items():  # type: str, dict
+		if not isinstance(fileEntry, dict):
+			raise Exceptions.IncorrectTypeException(fileEntry, "Root[Files][" + relativeFilePath + "]", (dict,))
+
+		if not isinstance(fileEntry.get("Hash"), str) or not isinstance(fileEntry.get("Size"), int) or not isinstance(fileEntry.get("ModifiedTime"), int):
+			raise Exception("The checksums entry for '" + relativeFilePath + "' is missing a value or has a value of the wrong type.")
+
+	return fileEntries
+
+def _GetChecksummedFiles (directoryPath: str) -> typing.List[str]:
+	checksumsFileName = GetModSaveChecksumsFileName()  # type: str
+	checksummedFiles = list()  # type: typing.List[str]
+
+	for currentDirectoryPath, directoryNames, fileNames in os.walk(directoryPath):  # type: str, typing.List[str], typing.List[str]
+		for fileName in fileNames:  # type: str
+			relativeFilePath = os.path.relpath(os.path.join(currentDirectoryPath, fileName), directoryPath).replace(os.path.sep, "/")  # type: str
+
+			if relativeFilePath == checksumsFileName:
+				continue
+
+			checksummedFiles.append(relativeFilePath)
+
+	checksummedFiles.sort()
+	return checksummedFiles
+
+def _VerifyChecksums (directoryPath: str) -> typing.Optional[typing.List[str]]:
+	"""
+	Check every file in a mod save directory against the directory's checksums file.
+	:return: The relative paths of files that are missing or don't match their checksum. Files without a checksum are ignored. None will be returned if the
+	directory has no checksums file, such as directories saved before checksums were written. A damaged checksums file is reported as a failure of the
+	checksums file itself.
+	:rtype: typing.Optional[typing.List[str]]
+	"""
+
+	checksumsFileName = GetModSaveChecksumsFileName()  # type: str
+
+	try:
+		fileEntries = _ReadChecksumsFile(os.path.join(directoryPath, checksumsFileName))  # type: typing.Optional[typing.Dict[str, dict]]
+	except Exception:
+		return [checksumsFileName]
+
+	if fileEntries is None:
+		return None
+
+	failedFiles = list()  # type: typing.List[str]
+
+	for relativeFilePath, fileEntry in sorted(fileEntries.items()):  # type: str, dict
+		filePath = os.path.join(directoryPath, relativeFilePath)  # type: str
+
+		if not os.path.isfile(filePath):
+			failedFiles.append(relativeFilePath)
+			continue
+
+		# A size mismatch is enough to know the file is damaged without reading it.
+		if os.path.getsize(filePath) != fileEntry["Size"] or BackupStore.HashFile(filePath) != fileEntry["Hash"]:
+			failedFiles.append(relativeFilePath)
+
+	return failedFiles
+
+def _ReportFailedChecksums (directoryPath: str) -> bool:
+	"""
+	Verify a directory and log the outcome.
+	:return: False if any file failed verification, otherwise True.
+	:rtype: bool
+	"""
+
+	failedFiles = _VerifyChecksums(directoryPath)  # type: typing.Optional[typing.List[str]]
+
+	if failedFiles is None:
+		Debug.Log("The directory at '" + Paths.StripUserDataPath(directoryPath) + "' has no checksums file, its files cannot be verified.", This.Mod.Namespace, Debug.LogLevels.Info, group = This.Mod.Namespace, owner = __name__)
+		return True
+
+	if len(failedFiles) != 0:
+		Debug.Log("The directory at '" + Paths.StripUserDataPath(directoryPath) + "' failed verification, these files are missing or damaged:\n" + "\n".join(failedFiles),
+				  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+		return False
+
+	return True
+
+def _ActivateVerifiedSaveDirectory (slotID: int) -> None:
+	"""
+	Activate a slot's save directory if it passes verification, otherwise activate the newest backup that does. The save directory is activated anyway if no
+	backup passes verification.
+	"""
+
+	saveDirectoryPath = GetModSaveDirectoryPath(slotID)  # type: str
+
+	if not os.path.exists(saveDirectoryPath) or _ReportFailedChecksums(saveDirectoryPath):
+		ActivateDirectoryToSlot(saveDirectoryPath, slotID)
 		return
 
-	if os.path.isfile(currentDirectoryPath):
+	for backupIndex in range(_maximumBackups):  # type: int
+		restoringDirectoryPath = os.path.join(Paths.TemporaryPath, "Restoring_" + os.path.basename(GetModSaveBackupDirectoryPath(slotID, backupIndex)))  # type: str
+
+		try:
+			if os.path.exists(restoringDirectoryPath):
+				FileSystem.RemoveDirectoryTree(restoringDirectoryPath, directoryRemovalRequired = True)
+
+			if not RestoreBackup(slotID, backupIndex, restoreDirectoryPath = restoringDirectoryPath):
+				continue
+
+			if not _ReportFailedChecksums(restoringDirectoryPath):
+				continue
+
+			ActivateDirectoryToSlot(restoringDirectoryPath, slotID)
+		except Exception:
+			Debug.Log("Failed to restore backup %s of save slot %s." % (backupIndex, slotID), This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+			continue
+		finally:
+			if os.path.exists(restoringDirectoryPath):
+				FileSystem.RemoveDirectoryTree(restoringDirectoryPath, directoryRemovalRequired = True)
+
+		Debug.Log("Save slot %s failed verification, loaded its backup %s instead." % (slotID, backupIndex), This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
 		return
 
-	currentDirectoryModifiedTime = os.path.getmtime(currentDirectoryPath)  # type: float
-	currentDirectoryAccessedTime = os.path.getatime(currentDirectoryPath)  # type: float
+	Debug.Log("Save slot %s failed verification and none of its backups could replace it, it will be loaded anyway." % slotID, This.Mod.Namespace, Debug.LogLevels.Error, group = This.Mod.Namespace, owner = __name__)
+	ActivateDirectoryToSlot(saveDirectoryPath, slotID)
+
+def _CopyDirectory (sourceDirectoryPath: str, targetDirectoryPath: str, unchangedManifestFilePath: typing.Optional[str] = None, unchangedDirectoryPath: typing.Optional[str] = None) -> None:
+	"""
+	Copy a directory that doesn't exist yet, hard linking files into it from the unchanged directory or the backup store instead of copying them wherever possible.
+	A file is linked if the unchanged directory or manifest has a file at the same relative path with the same size and modification time, which is the case for
+	any file that hasn't been rewritten since it was last committed, as copying keeps modification times. Files will be copied if hard links are not supported.
+	Linked files must never be written to in place, mod save directories are only ever moved, deleted or have their files replaced.
+	"""
+
+	unchangedFileEntries = dict()  # type: typing.Dict[str, dict]
+
+	if unchangedManifestFilePath is not None and os.path.exists(unchangedManifestFilePath):
+		try:
+			unchangedFileEntries = BackupStore.GetManifestFileEntries(BackupStore.ReadManifest(unchangedManifestFilePath))
+		except Exception:
+			Debug.Log("Failed to read the backup manifest at '" + Paths.StripUserDataPath(unchangedManifestFilePath) + "', every file will be copied.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+	_CopyDirectoryEntries(sourceDirectoryPath, targetDirectoryPath, "", unchangedFileEntries, unchangedDirectoryPath)
+
+def _CopyDirectoryEntries (sourceDirectoryPath: str, targetDirectoryPath: str, relativePath: str, unchangedFileEntries: typing.Dict[str, dict], unchangedDirectoryPath: typing.Optional[str]) -> None:
+	os.makedirs(targetDirectoryPath)
 
-	if not os.path.exists(targetDirectoryPath):
-		os.makedirs(targetDirectoryPath)
-		shutil.copystat(currentDirectoryPath, targetDirectoryPath)
+	for sourceEntry in os.scandir(sourceDirectoryPath):  # type: os.DirEntry
+		targetEntryPath = os.path.join(targetDirectoryPath, sourceEntry.name)  # type: str
+		entryRelativePath = relativePath + "/" + sourceEntry.name if relativePath != "" else sourceEntry.name  # type: str
 
-	for currentFileName in os.listdir(currentDirectoryPath):  # type: str
-		currentFilePath = os.path.join(currentDirectoryPath, currentFileName)  # type: str
-		targetFilePath = os.path.join(targetDirectoryPath, currentFileName)  # type: str
+		if sourceEntry.is_dir():
+			_CopyDirectoryEntries(sourceEntry.path, targetEntryPath, entryRelativePath, unchangedFileEntries, unchangedDirectoryPath)
+			continue
+
+		if unchangedDirectoryPath is not None and _LinkUnchangedDirectoryFile(sourceEntry, os.path.join(unchangedDirectoryPath, *entryRelativePath.split("/")), targetEntryPath):
+			continue
+
+		unchangedFileEntry = unchangedFileEntries.get(entryRelativePath)  # type: typing.Optional[dict]
+
+		if unchangedFileEntry is not None and _LinkUnchangedFile(sourceEntry, unchangedFileEntry, targetEntryPath):
+			continue
+
+		shutil.copy2(sourceEntry.path, targetEntryPath)
+
+	shutil.copystat(sourceDirectoryPath, targetDirectoryPath)
+
+def _LinkUnchangedFile (sourceEntry: os.DirEntry, unchangedFileEntry: dict, targetFilePath: str) -> bool:
+	try:
+		sourceStatus = sourceEntry.stat()  # type: os.stat_result
+	except OSError:
+		return False
+
+	if sourceStatus.st_size != unchangedFileEntry["Size"] or sourceStatus.st_mtime_ns != unchangedFileEntry["ModifiedTime"]:
+		return False
 
-		if os.path.isfile(currentFilePath):
-			if os.path.exists(targetFilePath):
-				os.remove(targetFilePath)
+	return BackupStore.LinkObject(unchangedFileEntry, targetFilePath)
 
-			os.rename(currentFilePath, targetFilePath)
+def _LinkUnchangedDirectoryFile (sourceEntry: os.DirEntry, unchangedFilePath: str, targetFilePath: str) -> bool:
+	try:
+		sourceStatus = sourceEntry.stat()  # type: os.stat_result
+		unchangedStatus = os.stat(unchangedFilePath)  # type: os.stat_result
+	except OSError:
+		return False
+
+	if sourceStatus.st_size != unchangedStatus.st_size or sourceStatus.st_mtime_ns != unchangedStatus.st_mtime_ns:
+		return False
+
+	try:
+		os.link(unchangedFilePath, targetFilePath)
+	except (OSError, NotImplementedError):
+		return False
+
+	return True
+
+def _ConvertDirectory (convertingDirectoryPath: str, serializer: typing.Optional[Serialization.Serializer]) -> typing.List[str]:
+	convertedFilePaths = list()  # type: typing.List[str]
+
+	for savingObject in _registeredSavingObjects:  # type: Saving.SaveBase
+		if serializer is not None:
+			savingObjectSerializer = serializer  # type: Serialization.Serializer
+		elif isinstance(savingObject, SaveShared.Save):
+			savingObjectSerializer = savingObject.Serializer  # type: Serialization.Serializer
 		else:
-			_MoveDirectory(currentFilePath, targetFilePath)
+			continue
 
-	os.utime(targetDirectoryPath, (currentDirectoryAccessedTime, currentDirectoryModifiedTime))
-	FileSystem.CloseDirectory(currentDirectoryPath, ignoreErrors = True)
+		convertingFilePath = os.path.join(convertingDirectoryPath, savingObject.GetSaveFileName())  # type: str
+
+		try:
+			if SaveShared.ConvertSaveFile(convertingFilePath, savingObjectSerializer):
+				convertedFilePaths.append(convertingFilePath)
+
+			convertedFilePaths.extend(SaveShared.ConvertShardFiles(convertingFilePath, savingObjectSerializer))
+		except Exception:
+			Debug.Log("Failed to convert the save file at '" + Paths.StripUserDataPath(convertingFilePath) + "'.", savingObject.Host.Namespace, Debug.LogLevels.Exception, group = savingObject.Host.Namespace, owner = __name__)
+
+	# The converted files were rewritten, their old checksums would make the directory fail verification.
+	if len(convertedFilePaths) != 0 and os.path.exists(os.path.join(convertingDirectoryPath, GetModSaveChecksumsFileName())):
+		try:
+			_CreateChecksumsFile(convertingDirectoryPath)
+		except Exception:
+			Debug.Log("Failed to update the checksums file in '" + Paths.StripUserDataPath(convertingDirectoryPath) + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+	return convertedFilePaths
+
+def _ConvertBackup (slotID: int, backupIndex: int, serializer: typing.Optional[Serialization.Serializer]) -> typing.List[str]:
+	backupManifestFilePath = GetModSaveBackupManifestFilePath(slotID, backupIndex)  # type: str
+	backupDirectoryPath = GetModSaveBackupDirectoryPath(slotID, backupIndex)  # type: str
+
+	if not os.path.exists(backupManifestFilePath):
+		return list()
+
+	convertingDirectoryPath = os.path.join(Paths.TemporaryPath, "Converting_" + os.path.basename(backupDirectoryPath))  # type: str
+
+	try:
+		if os.path.exists(convertingDirectoryPath):
+			FileSystem.RemoveDirectoryTree(convertingDirectoryPath, directoryRemovalRequired = True)
+
+		BackupStore.RestoreDirectory(backupManifestFilePath, convertingDirectoryPath)
+		convertedFilePaths = _ConvertDirectory(convertingDirectoryPath, serializer)  # type: typing.List[str]
+
+		if len(convertedFilePaths) != 0:
+			BackupStore.StoreDirectory(convertingDirectoryPath, backupManifestFilePath, previousManifestFilePath = backupManifestFilePath)
+	except Exception:
+		Debug.Log("Failed to convert the backup at '" + Paths.StripUserDataPath(backupManifestFilePath) + "'.", This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+		return list()
+	finally:
+		if os.path.exists(convertingDirectoryPath):
+			FileSystem.RemoveDirectoryTree(convertingDirectoryPath, directoryRemovalRequired = True)
+
+	return [os.path.join(backupDirectoryPath, os.path.relpath(convertedFilePath, convertingDirectoryPath)) for convertedFilePath in convertedFilePaths]
 
 def _ShowLoadFailureDialog () -> None:
 	notificationArguments = {
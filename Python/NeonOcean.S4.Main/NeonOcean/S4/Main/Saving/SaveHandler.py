@@ -68,6 +68,8 @@ class _Announcer(Director.Announcer):
 def _Setup () -> None:
 	LoadingEvents.ModUnloadedEvent += _OnModUnloaded
 
+	Save.RecoverInterruptedCommits()
+
 # noinspection PyUnusedLocal
 def _OnStop (cause: LoadingShared.LoadingCauses) -> None:
 	Save.PrepareForSaveChange()
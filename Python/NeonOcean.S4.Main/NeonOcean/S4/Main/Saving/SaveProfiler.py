@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import collections
+import threading
+import time
+import typing
+
+from NeonOcean.S4.Main.Tools import Exceptions
+
+_enabled = False  # type: bool
+_maximumRecords = 1000  # type: int
+
+_records = collections.deque(maxlen = _maximumRecords)  # type: typing.Deque[TimingRecord]
+_recordsLock = threading.Lock()  # type: threading.Lock
+
+class TimingRecord:
+	def __init__ (self, phase: str, component: str, wallTime: float, byteCount: typing.Optional[int] = None,
+				  encodeTime: typing.Optional[float] = None, decodeTime: typing.Optional[float] = None):
+		"""
+		The timing of one phase of a load, save or commit for one component, such as a saving object or a section.
+
+		:param phase: The phase that was timed, such as 'Load', 'Save' or 'Commit'.
+		:type phase: str
+		:param component: The name of the timed component.
+		:type component: str
+		:param wallTime: The number of seconds the phase took.
+		:type wallTime: float
+		:param byteCount: The number of bytes read or written, if this component read or wrote anything.
+		:type byteCount: int | None
+		:param encodeTime: The number of seconds of the wall time spent encoding data.
+		:type encodeTime: float | None
+		:param decodeTime: The number of seconds of the wall time spent decoding data.
+		:type decodeTime: float | None
+		"""
+
+		self.Phase = phase  # type: str
+		self.Component = component  # type: str
+		self.WallTime = wallTime  # type: float
+		self.ByteCount = byteCount  # type: typing.Optional[int]
+		self.EncodeTime = encodeTime  # type: typing.Optional[float]
+		self.DecodeTime = decodeTime  # type: typing.Optional[float]
+		self.RecordedTime = time.time()  # type: float
+
+class ComponentSummary:
+	def __init__ (self, phase: str, component: str):
+		"""
+		The combined timings of every record of a phase for one component.
+		"""
+
+		self.Phase = phase  # type: str
+		self.Component = component  # type: str
+
+		self.Count = 0  # type: int
+		self.TotalWallTime = 0  # type: float
+		self.MaximumWallTime = 0  # type: float
+		self.TotalByteCount = 0  # type: int
+		self.TotalEncodeTime = 0  # type: float
+		self.TotalDecodeTime = 0  # type: float
+
+	@property
+	def AverageWallTime (self) -> float:
+		return self.TotalWallTime / self.Count if self.Count != 0 else 0
+
+	def Add (self, record: TimingRecord) -> None:
+		self.Count += 1
+		self.TotalWallTime += record.WallTime
+		self.MaximumWallTime = max(self.MaximumWallTime, record.WallTime)
+
+		if record.ByteCount is not None:
+			self.TotalByteCount += record.ByteCount
+
+		if record.EncodeTime is not None:
+			self.TotalEncodeTime += record.EncodeTime
+
+		if record.DecodeTime is not None:
+			self.TotalDecodeTime += record.DecodeTime
+
+def IsEnabled () -> bool:
+	"""
+	Get whether or not load, save and commit timings are being recorded.
+	"""
+
+	return _enabled
+
+def SetEnabled (enabled: bool) -> None:
+	"""
+	Start or stop recording load, save and commit timings. Timings are only kept in memory, only the newest records are kept.
+	"""
+
+	global _enabled
+
+	if not isinstance(enabled, bool):
+		raise Exceptions.IncorrectTypeException(enabled, "enabled", (bool,))
+
+	_enabled = enabled
+
+def Record (phase: str, component: str, wallTime: float, byteCount: typing.Optional[int] = None,
+			encodeTime: typing.Optional[float] = None, decodeTime: typing.Optional[float] = None) -> None:
+	"""
+	Add a timing to the timing log, nothing will happen if the profiler is disabled. This can be called from any thread. Callers that need to do any work to
+	measure a timing should check 'IsEnabled' first so that nothing is measured while the profiler is disabled.
+	"""
+
+	if not _enabled:
+		return
+
+	with _recordsLock:
+		_records.append(TimingRecord(phase, component, wallTime, byteCount = byteCount, encodeTime = encodeTime, decodeTime = decodeTime))
+
+def GetRecords () -> typing.List[TimingRecord]:
+	"""
+	Get every record in the timing log, oldest first.
+	"""
+
+	with _recordsLock:
+		return list(_records)
+
+def ClearRecords () -> None:
+	"""
+	Remove every record from the timing log.
+	"""
+
+	with _recordsLock:
+		_records.clear()
+
+def GetSlowestComponents (count: int = 10) -> typing.List[ComponentSummary]:
+	"""
+	Combine the timing log's records by phase and component and get the components that took the longest.
+	:param count: The maximum number of components to get.
+	:type count: int
+	:return: Component summaries, sorted by their longest wall time, slowest first.
+	:rtype: typing.List[ComponentSummary]
+	"""
+
+	if not isinstance(count, int):
+		raise Exceptions.IncorrectTypeException(count, "count", (int,))
+
+	summaries = dict()  # type: typing.Dict[typing.Tuple[str, str], ComponentSummary]
+
+	for record in GetRecords():  # type: TimingRecord
+		summaryKey = (record.Phase, record.Component)  # type: typing.Tuple[str, str]
+		summary = summaries.get(summaryKey)  # type: typing.Optional[ComponentSummary]
+
+		if summary is None:
+			summary = ComponentSummary(record.Phase, record.Component)
+			summaries[summaryKey] = summary
+
+		summary.Add(record)
+
+	return sorted(summaries.values(), key = lambda summary: summary.MaximumWallTime, reverse = True)[:max(count, 0)]
+
+def FormatSlowestComponents (count: int = 10) -> str:
+	"""
+	Get a readable table of the components that took the longest.
+	"""
+
+	slowestComponents = GetSlowestComponents(count)  # type: typing.List[ComponentSummary]
+
+	if len(slowestComponents) == 0:
+		return "No timings have been recorded." + ("" if _enabled else " The save profiler is disabled.")
+
+	reportLines = ["Phase | Component | Count | Maximum | Average | Bytes | Encoding | Decoding"]  # type: typing.List[str]
+
+	for summary in slowestComponents:  # type: ComponentSummary
+		reportLines.append("%s | %s | %d | %.4fs | %.4fs | %d | %.4fs | %.4fs" % (
+			summary.Phase, summary.Component, summary.Count, summary.MaximumWallTime, summary.AverageWallTime,
+			summary.TotalByteCount, summary.TotalEncodeTime, summary.TotalDecodeTime))
+
+	return "\n".join(reportLines)
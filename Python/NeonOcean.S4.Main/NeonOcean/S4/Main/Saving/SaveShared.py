@@ -8,7 +8,8 @@ import typing
 
 import services
 from NeonOcean.S4.Main import Debug, Mods, Paths, S4, Saving
-from NeonOcean.S4.Main.Tools import Exceptions
+from NeonOcean.S4.Main.Saving import SaveProfiler
+from NeonOcean.S4.Main.Tools import Exceptions, FileSystem, Serialization
 
 """
 Game Systems Notes
@@ -26,15 +27,56 @@ twice, this will create an extra backup.
 The information above has not been tested to be true for Mac computers.
 """
 
+DefaultSerializer = Serialization.JsonSerializer(indent = "\t", sortKeys = True)  # type: Serialization.Serializer
+
+_jsonSerializer = Serialization.JsonSerializer()  # type: Serialization.JsonSerializer
+
+class PreparedFile:
+	def __init__ (self, filePath: str):
+		"""
+		A saving object's file data, read before being loaded or gathered before being written. Reading and writing a prepared file never touches the game or any
+		section, so it can be done on another thread while sections are only ever called on the thread that started the load or save.
+
+		:param filePath: The path of the file being read or written.
+		:type filePath: str
+		"""
+
+		self.FilePath = filePath  # type: str
+		self.FileExisted = None  # type: typing.Optional[bool]
+
+		self.Data = None  # type: typing.Optional[dict]
+		self.SectionsSuccessful = True  # type: bool
+
+		self.SectionGenerations = list()  # type: typing.List[typing.Tuple[Saving.SectionAbstract, typing.Optional[int]]]
+		self.FileState = None  # type: typing.Optional[tuple]
+		self.Unchanged = False  # type: bool
+		self.EncodedSections = dict()  # type: typing.Dict[str, Serialization.EncodedValue]  # Each section's data as it was written, if the serializer can give it.
+
+		self.ShardFiles = list()  # type: typing.List[typing.Tuple[Saving.SectionBase, int, typing.Dict[str, typing.Any]]]
+
+		self.ByteCount = None  # type: typing.Optional[int]
+		self.EncodeTime = None  # type: typing.Optional[float]
+		self.DecodeTime = None  # type: typing.Optional[float]
+
+		self.Error = None  # type: typing.Optional[BaseException]
+		self.StartTime = time.time()  # type: float
+
 class Save(Saving.SaveBase):
 	MaximumBackups = 5  # type: int
+	WriteChunkSize = 65536  # type: int
 
-	def __init__ (self, host: Mods.Mod, identifier: str):
+	def __init__ (self, host: Mods.Mod, identifier: str, serializer: typing.Optional[Serialization.Serializer] = None, parallel: bool = True):
 		"""
 		:param host: The host mod of this saving object. Debug logs made by this saving object will have the host's namespace attached.
 		:type host: Mods.Mod
 		:param identifier: This save object's identifier. This value is used the name the files that the data is saved and loaded to, this needs to be unique.
 		:type identifier: str
+		:param serializer: The serializer used to write this saving object's files. If this is None the default, json, serializer will be used. Files written by
+		any registered serializer can be loaded no matter which serializer is selected.
+		:type serializer: Serialization.Serializer | None
+		:param parallel: Whether or not this saving object's file may be read, decoded, encoded and written on a worker thread when every saving object is loaded
+		or saved at once. Section callbacks are always called on the thread that started the load or save either way.
+		:type parallel: bool
 		"""
 
 		if not isinstance(host, Mods.Mod):
@@ -43,10 +85,18 @@ class Save(Saving.SaveBase):
 		if not isinstance(identifier, str):
 			raise Exceptions.IncorrectTypeException(identifier, "identifier", (str,))
 
+		if not isinstance(serializer, Serialization.Serializer) and serializer is not None:
+			raise Exceptions.IncorrectTypeException(serializer, "serializer", (Serialization.Serializer, None))
+
+		if not isinstance(parallel, bool):
+			raise Exceptions.IncorrectTypeException(parallel, "parallel", (bool,))
+
 		super().__init__()
 
 		self._host = host  # type: Mods.Mod
 		self._identifier = identifier  # type: str
+		self._serializer = serializer  # type: typing.Optional[Serialization.Serializer]
+		self._parallel = parallel  # type: bool
 
 		self._loaded = False  # type: bool
 
@@ -59,10 +109,51 @@ class Save(Saving.SaveBase):
 		self._saveData = dict()  # type: typing.Dict[str, typing.Any]
 		self._saveSectionsData = dict()  # type: typing.Dict[str, typing.Any]
 
+		self._writtenFileState = None  # type: typing.Optional[tuple]
+		self._writtenFileStatus = None  # type: typing.Optional[typing.Tuple[int, int]]
+		self._sectionPayloads = dict()  # type: typing.Dict[str, typing.Tuple[Saving.SectionAbstract, int, Serialization.EncodedValue]]  # The last data written for each section, paired with the section's generation at the time.
+
+		self._shardFilePath = None  # type: typing.Optional[str]
+
 	@property
 	def Host (self) -> Mods.Mod:
 		return self._host
 
+	@property
+	def Serializer (self) -> Serialization.Serializer:
+		"""
+		The serializer this saving object writes its files with.
+		"""
+
+		if self._serializer is None:
+			return DefaultSerializer
+
+		return self._serializer
+
+	@Serializer.setter
+	def Serializer (self, value: typing.Optional[Serialization.Serializer]) -> None:
+		if not isinstance(value, Serialization.Serializer) and value is not None:
+			raise Exceptions.IncorrectTypeException(value, "Serializer", (Serialization.Serializer, None))
+
+		self._serializer = value
+
+	@property
+	def Parallel (self) -> bool:
+		"""
+		Whether or not this saving object's file may be read and written on a worker thread when every saving object is loaded or saved at once. The data
+		gathered from the sections is encoded while other saving objects are still being saved, saving objects whose section data can be changed by another
+		saving object's callbacks should turn this off.
+		"""
+
+		return self._parallel
+
+	@Parallel.setter
+	def Parallel (self, value: bool) -> None:
+		if not isinstance(value, bool):
+			raise Exceptions.IncorrectTypeException(value, "Parallel", (bool,))
+
+		self._parallel = value
+
 	@property
 	def Identifier (self) -> str:
 		return self._identifier
@@ -189,12 +280,14 @@ class Save(Saving.SaveBase):
 
 		return dataGameTick
 
-	def Load (self, saveFilePath: str) -> bool:
+	def Load (self, saveFilePath: str, preparedFile: typing.Optional[PreparedFile] = None) -> bool:
 		"""
 		Load a save file. If any data is already loaded it will be unloaded first.
 
 		:param saveFilePath: The path of the save file to be loaded. If this doesn't exist the method 'LoadDefault' will be used instead.
 		:type saveFilePath: str
+		:param preparedFile: The save file, already read by the 'ReadFile' method. If this is None or was read from another path the file will be read now.
+		:type preparedFile: PreparedFile | None
 		:return: This method will return False if an error occurred. Otherwise this method will return True if it behaved as expected.
 		:rtype: bool
 		"""
@@ -202,6 +295,12 @@ class Save(Saving.SaveBase):
 		if not isinstance(saveFilePath, str):
 			raise Exceptions.IncorrectTypeException(saveFilePath, "saveFilePath", (str,))
 
+		if not isinstance(preparedFile, PreparedFile) and preparedFile is not None:
+			raise Exceptions.IncorrectTypeException(preparedFile, "preparedFile", (PreparedFile, None))
+
+		if preparedFile is not None and preparedFile.FilePath != saveFilePath:
+			preparedFile = None
+
 		operationInformation = "Save Identifier: %s" % (self.Identifier,)
 		operationStartTime = time.time()  # type: float
 
@@ -213,7 +312,13 @@ class Save(Saving.SaveBase):
 		if self.Loaded:
 			self.Unload()
 
-		if not os.path.exists(saveFilePath):
+		self._ForgetWrittenFile()
+
+		self._shardFilePath = saveFilePath
+
+		saveFileExists = preparedFile.FileExisted if preparedFile is not None else os.path.exists(saveFilePath)  # type: bool
+
+		if not saveFileExists:
 			self.LoadDefault()
 			loadSuccessful = True
 
@@ -221,7 +326,10 @@ class Save(Saving.SaveBase):
 			self._currentFilePath = saveFilePath
 		else:
 			try:
-				loadSuccessful = self._LoadInternal(saveFilePath)
+				if preparedFile is None:
+					preparedFile = self.ReadFile(saveFilePath)
+
+				loadSuccessful = self._LoadInternal(saveFilePath, preparedFile = preparedFile)
 
 				self._loadedFileExisted = True
 				self._currentFilePath = saveFilePath
@@ -237,6 +345,12 @@ class Save(Saving.SaveBase):
 
 		operationTime = time.time() - operationStartTime  # type: float
 
+		if SaveProfiler.IsEnabled():
+			if preparedFile is not None:
+				SaveProfiler.Record("Load", self.Identifier, operationTime, byteCount = preparedFile.ByteCount, decodeTime = preparedFile.DecodeTime)
+			else:
+				SaveProfiler.Record("Load", self.Identifier, operationTime)
+
 		if loadSuccessful:
 			Debug.Log("Load operation in a saving object finished without issue. (Operation took " + str(operationTime) + " seconds)\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Info, group = self.Host.Namespace, owner = __name__)
 		else:
@@ -280,11 +394,52 @@ class Save(Saving.SaveBase):
 		:rtype: bool
 		"""
 
+		preparedFile = self.PrepareSave(saveFilePath)  # type: PreparedFile
+		self.WriteFile(preparedFile)
+		return self.FinishSave(preparedFile)
+
+	def ReadFile (self, saveFilePath: str) -> PreparedFile:
+		"""
+		Read and decode a save file so it can be given to the load method. This will not touch the sections or the game and can be called from any thread.
+		Errors are stored in the prepared file and will be raised once it is loaded.
+
+		:param saveFilePath: The path of the save file to be read.
+		:type saveFilePath: str
+		:rtype: PreparedFile
+		"""
+
+		if not isinstance(saveFilePath, str):
+			raise Exceptions.IncorrectTypeException(saveFilePath, "saveFilePath", (str,))
+
+		preparedFile = PreparedFile(saveFilePath)  # type: PreparedFile
+
+		try:
+			preparedFile.FileExisted = os.path.exists(saveFilePath)
+
+			if preparedFile.FileExisted:
+				preparedFile.Data = self._ReadSaveData(saveFilePath, preparedFile = preparedFile)
+		except Exception as e:
+			preparedFile.Error = e
+
+		return preparedFile
+
+	def PrepareSave (self, saveFilePath: str) -> PreparedFile:
+		"""
+		Start saving by gathering the data from every section. This must be called on the same thread as any other method that touches the sections. The prepared
+		file then needs to be written with the 'WriteFile' method and finished with the 'FinishSave' method. If no section has changed since this saving object
+		last wrote the same file, and the file hasn't been touched since, the prepared file will be marked as unchanged and will not be written again. Sections that
+		haven't changed since their data was last written will have that data written again as it is, without being encoded again.
+
+		:param saveFilePath: The path to save the data to.
+		:type saveFilePath: str
+		:rtype: PreparedFile
+		"""
+
 		if not isinstance(saveFilePath, str):
 			raise Exceptions.IncorrectTypeException(saveFilePath, "saveFilePath", (str,))
 
 		operationInformation = "Save Identifier: %s" % (self.Identifier,)
-		operationStartTime = time.time()  # type: float
+		preparedFile = PreparedFile(saveFilePath)  # type: PreparedFile
 
 		Debug.Log("Save operation starting in a saving object.\nTarget File: %s\n" % Paths.StripUserDataPath(saveFilePath) + operationInformation, self.Host.Namespace, Debug.LogLevels.Info, group = self.Host.Namespace, owner = __name__)
 
@@ -292,22 +447,88 @@ class Save(Saving.SaveBase):
 			Debug.Log("Triggered save operation in a disabled saving object.\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Warning, group = self.Host.Namespace, owner = __name__)
 
 		try:
-			saveSuccessful = self._SaveInternal(saveFilePath)
-			self._currentFilePath = saveFilePath
-		except:
-			self._currentFilePath = saveFilePath
-			operationTime = time.time() - operationStartTime  # type: float
-			Debug.Log("Save operation in a saving object aborted. (Operation took " + str(operationTime) + " seconds)\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Warning, group = self.Host.Namespace, owner = __name__)
+			preparedFile.SectionsSuccessful, preparedFile.Data = self._SaveGetData()
+			preparedFile.ShardFiles = self._SaveGetShardFiles(preparedFile)
+			preparedFile.SectionGenerations = self._GetSectionGenerations()
+			preparedFile.FileState = self._GetFileState(preparedFile)
+			preparedFile.Unchanged = self._IsFileUnchanged(preparedFile.FileState)
+		except Exception as e:
+			preparedFile.Error = e
+
+		return preparedFile
+
+	def WriteFile (self, preparedFile: PreparedFile) -> None:
+		"""
+		Encode and write a file prepared by the 'PrepareSave' method. This will not touch the sections or the game and can be called from any thread. Errors are
+		stored in the prepared file.
+
+		:type preparedFile: PreparedFile
+		"""
+
+		if not isinstance(preparedFile, PreparedFile):
+			raise Exceptions.IncorrectTypeException(preparedFile, "preparedFile", (PreparedFile,))
+
+		if preparedFile.Error is not None:
+			return
+
+		try:
+			# Shards are written before the file that lists them and removed after, so the file never lists a shard that doesn't exist.
+			self._SaveWriteShardFiles(preparedFile)
+
+			if not preparedFile.Unchanged:
+				self._SaveWriteData(preparedFile.FilePath, preparedFile.Data, preparedFile = preparedFile)
+
+			self._SaveRemoveShardFiles(preparedFile)
+		except Exception as e:
+			preparedFile.Error = e
+
+	def FinishSave (self, preparedFile: PreparedFile) -> bool:
+		"""
+		Finish a save once its prepared file has been written.
+
+		:type preparedFile: PreparedFile
+		:return: This method will return False if an error in saving any section occurred. Otherwise this method will return True if it behaved as expected.
+		:rtype: bool
+		"""
+
+		if not isinstance(preparedFile, PreparedFile):
+			raise Exceptions.IncorrectTypeException(preparedFile, "preparedFile", (PreparedFile,))
+
+		operationInformation = "Save Identifier: %s" % (self.Identifier,)
+		operationTime = time.time() - preparedFile.StartTime  # type: float
+
+		self._currentFilePath = preparedFile.FilePath
+
+		if preparedFile.Error is not None:
+			self._ForgetWrittenFile()
+			Debug.Log("Save operation in a saving object aborted. (Operation took " + str(operationTime) + " seconds)\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Warning, group = self.Host.Namespace, owner = __name__, exception = preparedFile.Error)
 			return False
 
-		operationTime = time.time() - operationStartTime  # type: float
+		if not preparedFile.Unchanged:
+			self._RememberWrittenFile(preparedFile)
+			self._RememberSectionPayloads(preparedFile)
 
-		if saveSuccessful:
+		for sectionHandler, sectionGeneration in preparedFile.SectionGenerations:  # type: Saving.SectionBase, typing.Optional[int]
+			if sectionGeneration is not None:
+				sectionHandler.MarkSaved(sectionGeneration)
+
+		for sectionHandler, shardGeneration, sectionShardFiles in preparedFile.ShardFiles:  # type: Saving.SectionBase, int, typing.Dict[str, typing.Any]
+			sectionHandler.MarkShardsSaved(shardGeneration)
+
+		self._shardFilePath = preparedFile.FilePath
+
+		if SaveProfiler.IsEnabled():
+			SaveProfiler.Record("Save", self.Identifier, operationTime,
+								byteCount = preparedFile.ByteCount if not preparedFile.Unchanged else 0, encodeTime = preparedFile.EncodeTime)
+
+		if preparedFile.Unchanged and len(preparedFile.ShardFiles) == 0:
+			Debug.Log("Save operation in a saving object finished without issue, nothing changed so the save file was not rewritten. (Operation took " + str(operationTime) + " seconds)\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Info, group = self.Host.Namespace, owner = __name__)
+		elif preparedFile.SectionsSuccessful:
 			Debug.Log("Save operation in a saving object finished without issue. (Operation took " + str(operationTime) + " seconds)\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Info, group = self.Host.Namespace, owner = __name__)
 		else:
 			Debug.Log("Save operation in a saving object at least partially failed. (Operation took " + str(operationTime) + " seconds)\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Warning, group = self.Host.Namespace, owner = __name__)
 
-		return saveSuccessful
+		return preparedFile.SectionsSuccessful
 
 	def Unload (self) -> None:
 		"""
@@ -328,6 +549,11 @@ class Save(Saving.SaveBase):
 		self._saveData = dict()
 		self._saveSectionsData = dict()
 
+		self._ForgetWrittenFile()
+		self._sectionPayloads = dict()
+
+		self._shardFilePath = None
+
 		self._loaded = False
 
 		self._loadedDefault = None
@@ -337,6 +563,21 @@ class Save(Saving.SaveBase):
 		operationTime = time.time() - operationStartTime  # type: float
 		Debug.Log("Unload operation in a saving object finished without issue. (Operation took " + str(operationTime) + " seconds)\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Info, group = self.Host.Namespace, owner = __name__)
 
+	def ReadShards (self) -> None:
+		"""
+		Have every section read the shards they have yet to read. This needs to be called before the shards' files are removed or moved, while this saving object
+		is still loaded.
+		"""
+
+		for sectionHandler in self.Sections:  # type: Saving.SectionAbstract
+			if not isinstance(sectionHandler, Saving.SectionBase):
+				continue
+
+			try:
+				sectionHandler.ReadShards()
+			except Exception:
+				Debug.Log("Failed to read the shards for the section '" + sectionHandler.Identifier + "'.\nSave Identifier: %s" % (self.Identifier,), self.Host.Namespace, Debug.LogLevels.Exception, group = self.Host.Namespace, owner = __name__)
+
 	def GetSectionData (self, sectionIdentifier: str) -> typing.Optional[typing.Any]:
 		"""
 		Get the section data from the loaded save. Any returned data will not be verified by a section handler to be accurate, the value will also be deep copied before
@@ -355,7 +596,10 @@ class Save(Saving.SaveBase):
 		if sectionData is None:
 			return sectionData
 
-		return copy.deepcopy(self._saveSectionsData.get(sectionIdentifier))
+		if isinstance(sectionData, Serialization.EncodedValue):
+			return sectionData.Decode()
+
+		return copy.deepcopy(sectionData)
 
 	def GetSaveFileName (self) -> str:
 		"""
@@ -365,22 +609,52 @@ class Save(Saving.SaveBase):
 
 		return self.Identifier + ".json"  # type: str
 
-	def _LoadInternal (self, saveFilePath: str) -> bool:
+	def _LoadInternal (self, saveFilePath: str, preparedFile: typing.Optional[PreparedFile] = None) -> bool:
+		if preparedFile is None:
+			saveData = self._ReadSaveData(saveFilePath)  # type: typing.Dict[str, typing.Any]
+		else:
+			if preparedFile.Error is not None:
+				raise preparedFile.Error
+
+			saveData = preparedFile.Data  # type: typing.Dict[str, typing.Any]
+
+		return self._LoadSetValue(saveData)
+
+	def _ReadSaveData (self, saveFilePath: str, preparedFile: typing.Optional[PreparedFile] = None) -> typing.Dict[str, typing.Any]:
+		profiling = preparedFile is not None and SaveProfiler.IsEnabled()  # type: bool
+
 		try:
-			with open(saveFilePath) as saveFile:
-				saveDataString = saveFile.read()
+			saveFileSerializer = Serialization.DetectFileSerializer(saveFilePath)  # type: typing.Optional[Serialization.Serializer]
+
+			if saveFileSerializer is None:
+				with open(saveFilePath) as saveFile:
+					saveDataString = saveFile.read()  # type: typing.Union[str, bytes]
+			else:
+				with open(saveFilePath, "rb") as saveFile:
+					saveDataString = saveFile.read()  # type: typing.Union[str, bytes]
 		except Exception as e:
 			raise Exception("Failed to read the target save file's text.") from e
 
+		decodeStartTime = time.perf_counter() if profiling else 0  # type: float
+
 		try:
-			saveData = json.JSONDecoder().decode(saveDataString)  # type: typing.Dict[str, typing.Any]
+			# Sections are left encoded, if the file has an index for them, until they are first needed.
+			if saveFileSerializer is None:
+				saveData = _jsonSerializer.DecodeIndexed(saveDataString, "Sections")  # type: typing.Dict[str, typing.Any]
+			else:
+				saveData = saveFileSerializer.DecodeIndexed(saveDataString, "Sections")  # type: typing.Dict[str, typing.Any]
 		except Exception as e:
 			raise Exception("Failed to the target decode save data.") from e
 
+		if profiling:
+			preparedFile.DecodeTime = time.perf_counter() - decodeStartTime
+			preparedFile.ByteCount = len(saveDataString)
+
 		if not isinstance(saveData, dict):
 			raise Exceptions.IncorrectTypeException(saveData, "Root", (dict,), "The save file's root is not a dictionary.")
 
-		return self._LoadSetValue(saveData)
+		saveData.pop(Serialization.GetIndexKey("Sections"), None)
+		return saveData
 
 	def _LoadSetValue (self, saveData: dict) -> bool:
 		operationInformation = "Save Identifier: %s" % (self.Identifier,)
@@ -396,14 +670,25 @@ class Save(Saving.SaveBase):
 
 		self._loaded = True
 
+		profiling = SaveProfiler.IsEnabled()  # type: bool
+
 		for sectionHandler in self.Sections:  # type: Saving.SectionBase
 			try:
-				sectionData = self.GetSectionData(sectionHandler.Identifier)  # type: typing.Any
+				if isinstance(sectionHandler, Saving.SectionBase):
+					sectionHandler.SetShardReader(self._GetShardReader(sectionHandler.Identifier))
 
-				if sectionData is None:
+				if self._saveSectionsData.get(sectionHandler.Identifier) is None:
 					continue
 
-				sectionSuccess = sectionHandler.Load(sectionData)  # type: bool
+				sectionStartTime = time.perf_counter() if profiling else 0  # type: float
+
+				if isinstance(sectionHandler, Saving.SectionBase):
+					sectionSuccess = sectionHandler.LoadLazily(self._GetSectionDataLoader(sectionHandler.Identifier))  # type: bool
+				else:
+					sectionSuccess = sectionHandler.Load(self.GetSectionData(sectionHandler.Identifier))  # type: bool
+
+				if profiling:
+					SaveProfiler.Record("Load", self._GetSectionComponentName(sectionHandler.Identifier), time.perf_counter() - sectionStartTime)
 
 				if not sectionSuccess:
 					operationSuccess = False
@@ -426,17 +711,56 @@ class Save(Saving.SaveBase):
 
 		return operationSuccess
 
-	def _LoadDefaultInternal (self) -> None:
-		self._loaded = True
+	def _GetSectionDataLoader (self, sectionIdentifier: str) -> typing.Callable[[], typing.Any]:
+		sectionData = self._saveSectionsData.get(sectionIdentifier)
 
-	def _SaveInternal (self, saveFilePath: str) -> bool:
-		success, saveData = self._SaveGetData()  # type: bool, dict
+		if isinstance(sectionData, Serialization.EncodedValue):
+			if not SaveProfiler.IsEnabled():
+				return sectionData.Decode
 
-		try:
-			saveDataString = json.JSONEncoder(indent = "\t", sort_keys = True).encode(saveData)  # type: str
-		except Exception as e:
-			raise Exception("Failed to encode save data with Python's json encoder.") from e
+			sectionComponentName = self._GetSectionComponentName(sectionIdentifier)  # type: str
+
+			def ProfiledDecode () -> typing.Any:
+				decodeStartTime = time.perf_counter()  # type: float
+				decodedData = sectionData.Decode()
+				decodeTime = time.perf_counter() - decodeStartTime  # type: float
+
+				SaveProfiler.Record("Decode", sectionComponentName, decodeTime, byteCount = len(sectionData.Data), decodeTime = decodeTime)
+				return decodedData
+
+			return ProfiledDecode
+
+		return lambda: copy.deepcopy(sectionData)
+
+	def _GetSectionComponentName (self, sectionIdentifier: str) -> str:
+		return self.Identifier + "/" + sectionIdentifier
+
+	def _GetShardReader (self, sectionIdentifier: str) -> typing.Callable[[str], typing.Any]:
+		def ReadShard (shardName: str) -> typing.Any:
+			# Shards are read from next to the file they were last loaded from or written next to, saving somewhere new writes every shard again.
+			if self._shardFilePath is None:
+				return None
+
+			shardFilePath = GetShardFilePath(self._shardFilePath, sectionIdentifier, shardName)  # type: str
+
+			if not os.path.exists(shardFilePath):
+				return None
+
+			readStartTime = time.perf_counter()  # type: float
+			shardData = Serialization.ReadFile(shardFilePath)  # type: typing.Any
+
+			if SaveProfiler.IsEnabled():
+				SaveProfiler.Record("Load", self._GetSectionComponentName(sectionIdentifier) + "/Shards", time.perf_counter() - readStartTime,
+									byteCount = os.path.getsize(shardFilePath))
+
+			return shardData
+
+		return ReadShard
 
+	def _LoadDefaultInternal (self) -> None:
+		self._loaded = True
+
+	def _SaveWriteData (self, saveFilePath: str, saveData: dict, preparedFile: typing.Optional[PreparedFile] = None) -> None:
 		saveFileDirectoryPath = os.path.dirname(saveFilePath)  # type: str
 
 		try:
@@ -446,12 +770,79 @@ class Save(Saving.SaveBase):
 			raise Exception("Failed to create a save file's directory.") from e
 
 		try:
-			with open(saveFilePath, "w+") as saveFile:
-				saveFile.write(saveDataString)
+			encodedSections = preparedFile.EncodedSections if preparedFile is not None else None  # type: typing.Optional[typing.Dict[str, Serialization.EncodedValue]]
+			saveDataChunks = self.Serializer.EncodeIndexedChunks(saveData, "Sections", chunkSize = self.WriteChunkSize, encodedItems = encodedSections)  # type: typing.Iterator[typing.Union[str, bytes]]
+
+			if preparedFile is not None and SaveProfiler.IsEnabled():
+				saveDataChunks = _MeasureChunks(saveDataChunks, preparedFile)
+
+			FileSystem.WriteFileChunksAtomically(saveFilePath, saveDataChunks, synchronize = False)
 		except Exception as e:
-			raise Exception("Failed to write the save data to the save file.") from e
+			raise Exception("Failed to encode and write the save data to the save file with the serializer '" + str(self.Serializer.Identifier) + "'.") from e
+
+	def _SaveWriteShardFiles (self, preparedFile: PreparedFile) -> None:
+		for sectionHandler, shardGeneration, sectionShardFiles in preparedFile.ShardFiles:  # type: Saving.SectionBase, int, typing.Dict[str, typing.Any]
+			for shardFilePath, shardData in sectionShardFiles.items():  # type: str, typing.Any
+				if shardData is None:
+					continue
+
+				try:
+					shardDirectoryPath = os.path.dirname(shardFilePath)  # type: str
 
-		return success
+					if not os.path.exists(shardDirectoryPath):
+						os.makedirs(shardDirectoryPath)
+
+					FileSystem.WriteFileChunksAtomically(shardFilePath, self.Serializer.EncodeChunks(shardData, chunkSize = self.WriteChunkSize), synchronize = False)
+				except Exception as e:
+					raise Exception("Failed to encode and write the shard file '" + Paths.StripUserDataPath(shardFilePath) + "' with the serializer '" + str(self.Serializer.Identifier) + "'.") from e
+
+	def _SaveRemoveShardFiles (self, preparedFile: PreparedFile) -> None:
+		for sectionHandler, shardGeneration, sectionShardFiles in preparedFile.ShardFiles:  # type: Saving.SectionBase, int, typing.Dict[str, typing.Any]
+			for shardFilePath, shardData in sectionShardFiles.items():  # type: str, typing.Any
+				if shardData is not None:
+					continue
+
+				try:
+					if os.path.exists(shardFilePath):
+						os.remove(shardFilePath)
+
+					shardDirectoryPath = os.path.dirname(shardFilePath)  # type: str
+
+					if os.path.exists(shardDirectoryPath) and len(os.listdir(shardDirectoryPath)) == 0:
+						os.rmdir(shardDirectoryPath)
+				except Exception as e:
+					raise Exception("Failed to remove the shard file '" + Paths.StripUserDataPath(shardFilePath) + "'.") from e
+
+	def _SaveGetShardFiles (self, preparedFile: PreparedFile) -> typing.List[typing.Tuple[Saving.SectionBase, int, typing.Dict[str, typing.Any]]]:
+		operationInformation = "Save Identifier: %s" % (self.Identifier,)
+
+		# Shards that haven't changed are only left alone if they are already next to the file being saved to.
+		includeUnchanged = preparedFile.FilePath != self._shardFilePath  # type: bool
+
+		shardFiles = list()  # type: typing.List[typing.Tuple[Saving.SectionBase, int, typing.Dict[str, typing.Any]]]
+
+		for sectionHandler in self.Sections:  # type: Saving.SectionAbstract
+			if not isinstance(sectionHandler, Saving.SectionBase):
+				continue
+
+			try:
+				shardGeneration, shardChanges = sectionHandler.GetShardChanges(includeUnchanged = includeUnchanged)  # type: int, typing.Dict[str, typing.Any]
+			except Exception:
+				Debug.Log("Failed to get the shards for the section '" + sectionHandler.Identifier + "'.\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Exception, group = self.Host.Namespace, owner = __name__)
+				preparedFile.SectionsSuccessful = False
+				continue
+
+			if len(shardChanges) == 0:
+				continue
+
+			sectionShardFiles = dict()  # type: typing.Dict[str, typing.Any]
+
+			for shardName, shardData in shardChanges.items():  # type: str, typing.Any
+				sectionShardFiles[GetShardFilePath(preparedFile.FilePath, sectionHandler.Identifier, shardName)] = shardData
+
+			shardFiles.append((sectionHandler, shardGeneration, sectionShardFiles))
+
+		return shardFiles
 
 	def _SaveGetData (self) -> typing.Tuple[bool, dict]:
 		operationInformation = "Save Identifier: %s" % (self.Identifier,)
@@ -459,12 +850,25 @@ class Save(Saving.SaveBase):
 
 		sectionsSaveData = dict()  # type: typing.Dict[str, typing.Any]
 
+		profiling = SaveProfiler.IsEnabled()  # type: bool
+
 		for sectionHandler in self.Sections:  # type: Saving.SectionBase
 			try:
+				sectionStartTime = time.perf_counter() if profiling else 0  # type: float
+
 				sectionSuccess, sectionsSaveData[sectionHandler.Identifier] = sectionHandler.Save()  # type: bool
 
+				if profiling:
+					SaveProfiler.Record("Save", self._GetSectionComponentName(sectionHandler.Identifier), time.perf_counter() - sectionStartTime)
+
 				if not sectionSuccess:
 					operationSuccess = False
+				else:
+					sectionPayload = self._GetSectionPayload(sectionHandler)  # type: typing.Optional[Serialization.EncodedValue]
+
+					if sectionPayload is not None:
+						# The section hasn't changed since its data was last written, the data written then can be used again without being encoded.
+						sectionsSaveData[sectionHandler.Identifier] = sectionPayload
 			except Exception:
 				Debug.Log("Failed to get section data for the section '" + sectionHandler.Identifier + "'.\n" + operationInformation, self.Host.Namespace, Debug.LogLevels.Exception, group = self.Host.Namespace, owner = __name__)
 				operationSuccess = False
@@ -483,6 +887,194 @@ class Save(Saving.SaveBase):
 
 		return operationSuccess, saveData
 
+	def _GetSectionGenerations (self) -> typing.List[typing.Tuple[Saving.SectionAbstract, typing.Optional[int]]]:
+		sectionGenerations = list()  # type: typing.List[typing.Tuple[Saving.SectionAbstract, typing.Optional[int]]]
+
+		for sectionHandler in self.Sections:  # type: Saving.SectionAbstract
+			if isinstance(sectionHandler, Saving.SectionBase):
+				sectionGenerations.append((sectionHandler, sectionHandler.Generation))
+			else:
+				sectionGenerations.append((sectionHandler, None))
+
+		return sectionGenerations
+
+	def _GetFileState (self, preparedFile: PreparedFile) -> typing.Optional[tuple]:
+		"""
+		Get a value that will only be equal to the state of a previously written file if this prepared file would write exactly the same thing to the same path.
+		None will be returned if any section doesn't track its changes.
+		"""
+
+		for sectionHandler, sectionGeneration in preparedFile.SectionGenerations:  # type: Saving.SectionAbstract, typing.Optional[int]
+			if sectionGeneration is None:
+				return None
+
+		saveDataHeader = tuple((dataKey, dataValue) for dataKey, dataValue in sorted(preparedFile.Data.items()) if dataKey != "Sections")  # type: tuple
+		return preparedFile.FilePath, self.Serializer, saveDataHeader, tuple(preparedFile.SectionGenerations)
+
+	def _IsFileUnchanged (self, fileState: typing.Optional[tuple]) -> bool:
+		if fileState is None or self._writtenFileState is None:
+			return False
+
+		if fileState != self._writtenFileState:
+			return False
+
+		try:
+			fileStatus = os.stat(fileState[0])  # type: os.stat_result
+		except OSError:
+			return False
+
+		return (fileStatus.st_size, fileStatus.st_mtime_ns) == self._writtenFileStatus
+
+	def _RememberWrittenFile (self, preparedFile: PreparedFile) -> None:
+		if preparedFile.FileState is None or not preparedFile.SectionsSuccessful:
+			self._ForgetWrittenFile()
+			return
+
+		try:
+			fileStatus = os.stat(preparedFile.FilePath)  # type: os.stat_result
+		except OSError:
+			self._ForgetWrittenFile()
+			return
+
+		self._writtenFileState = preparedFile.FileState
+		self._writtenFileStatus = (fileStatus.st_size, fileStatus.st_mtime_ns)
+
+	def _ForgetWrittenFile (self) -> None:
+		self._writtenFileState = None
+		self._writtenFileStatus = None
+
+	def _GetSectionPayload (self, sectionHandler: Saving.SectionAbstract) -> typing.Optional[Serialization.EncodedValue]:
+		sectionPayload = self._sectionPayloads.get(sectionHandler.Identifier)  # type: typing.Optional[typing.Tuple[Saving.SectionAbstract, int, Serialization.EncodedValue]]
+
+		if sectionPayload is None or sectionPayload[0] is not sectionHandler or sectionPayload[2].Serializer is not self.Serializer:
+			return None
+
+		if not isinstance(sectionHandler, Saving.SectionBase) or sectionHandler.Generation is None or sectionHandler.Generation != sectionPayload[1]:
+			return None
+
+		return sectionPayload[2]
+
+	def _RememberSectionPayloads (self, preparedFile: PreparedFile) -> None:
+		if not preparedFile.SectionsSuccessful:
+			self._sectionPayloads = dict()
+			return
+
+		sectionPayloads = dict()  # type: typing.Dict[str, typing.Tuple[Saving.SectionAbstract, int, Serialization.EncodedValue]]
+
+		for sectionHandler, sectionGeneration in preparedFile.SectionGenerations:  # type: Saving.SectionAbstract, typing.Optional[int]
+			encodedSection = preparedFile.EncodedSections.get(sectionHandler.Identifier)  # type: typing.Optional[Serialization.EncodedValue]
+
+			if sectionGeneration is None or encodedSection is None:
+				continue
+
+			sectionPayloads[sectionHandler.Identifier] = (sectionHandler, sectionGeneration, encodedSection)
+
+		self._sectionPayloads = sectionPayloads
+
+def _MeasureChunks (saveDataChunks: typing.Iterator[typing.Union[str, bytes]], preparedFile: PreparedFile) -> typing.Iterator[typing.Union[str, bytes]]:
+	# Encoding happens while the chunks are pulled, so the time spent getting each chunk is the encoding time.
+
+	preparedFile.ByteCount = 0
+	preparedFile.EncodeTime = 0
+
+	while True:
+		encodeStartTime = time.perf_counter()  # type: float
+		saveDataChunk = next(saveDataChunks, None)  # type: typing.Union[str, bytes, None]
+		preparedFile.EncodeTime += time.perf_counter() - encodeStartTime
+
+		if saveDataChunk is None:
+			return
+
+		preparedFile.ByteCount += len(saveDataChunk)
+		yield saveDataChunk
+
+def ConvertSaveFile (saveFilePath: str, serializer: Serialization.Serializer) -> bool:
+	"""
+	Rewrite a saving object's file in place with a different serializer. The file can be in any format a registered serializer can read.
+	:param saveFilePath: The path of the file to convert.
+	:type saveFilePath: str
+	:param serializer: The serializer to rewrite the file with.
+	:type serializer: Serialization.Serializer
+	:return: True if the file was rewritten, False if it doesn't exist or was already written by this kind of serializer with the same settings.
+	:rtype: bool
+	"""
+
+	if not isinstance(saveFilePath, str):
+		raise Exceptions.IncorrectTypeException(saveFilePath, "saveFilePath", (str,))
+
+	if not isinstance(serializer, Serialization.Serializer):
+		raise Exceptions.IncorrectTypeException(serializer, "serializer", (Serialization.Serializer,))
+
+	if not os.path.exists(saveFilePath):
+		return False
+
+	if Serialization.FileMatchesSerializer(saveFilePath, serializer):
+		return False
+
+	saveData = Serialization.ReadFile(saveFilePath)  # type: typing.Any
+
+	if isinstance(saveData, dict):
+		saveData.pop(Serialization.GetIndexKey("Sections"), None)
+
+	FileSystem.WriteFileChunksAtomically(saveFilePath, serializer.EncodeIndexedChunks(saveData, "Sections"))
+
+	return True
+
+def ConvertShardFiles (saveFilePath: str, serializer: Serialization.Serializer) -> typing.List[str]:
+	"""
+	Rewrite the shard files of a saving object's file in place with a different serializer.
+	:param saveFilePath: The path of the saving object's file the shards belong to.
+	:type saveFilePath: str
+	:param serializer: The serializer to rewrite the shard files with.
+	:type serializer: Serialization.Serializer
+	:return: The paths of every shard file that was rewritten.
+	:rtype: typing.List[str]
+	"""
+
+	if not isinstance(saveFilePath, str):
+		raise Exceptions.IncorrectTypeException(saveFilePath, "saveFilePath", (str,))
+
+	if not isinstance(serializer, Serialization.Serializer):
+		raise Exceptions.IncorrectTypeException(serializer, "serializer", (Serialization.Serializer,))
+
+	convertedFilePaths = list()  # type: typing.List[str]
+
+	for shardDirectoryPath, shardDirectoryNames, shardFileNames in os.walk(GetShardDirectoryPath(saveFilePath)):  # type: str, typing.List[str], typing.List[str]
+		for shardFileName in shardFileNames:  # type: str
+			shardFilePath = os.path.join(shardDirectoryPath, shardFileName)  # type: str
+
+			if Serialization.FileMatchesSerializer(shardFilePath, serializer):
+				continue
+
+			FileSystem.WriteFileChunksAtomically(shardFilePath, serializer.EncodeChunks(Serialization.ReadFile(shardFilePath)))
+			convertedFilePaths.append(shardFilePath)
+
+	return convertedFilePaths
+
+def GetShardDirectoryPath (saveFilePath: str) -> str:
+	"""
+	Get the directory the shard files of a saving object's file are written to. Shard files are kept next to the saving object's file, in a directory named
+	after it.
+	"""
+
+	if not isinstance(saveFilePath, str):
+		raise Exceptions.IncorrectTypeException(saveFilePath, "saveFilePath", (str,))
+
+	return os.path.splitext(saveFilePath)[0] + "_Shards"
+
+def GetShardFilePath (saveFilePath: str, sectionIdentifier: str, shardName: str) -> str:
+	"""
+	Get the path of a shard file of a saving object's file. Each section's shards are kept in a directory named after the section.
+	"""
+
+	if not isinstance(sectionIdentifier, str):
+		raise Exceptions.IncorrectTypeException(sectionIdentifier, "sectionIdentifier", (str,))
+
+	if not isinstance(shardName, str):
+		raise Exceptions.IncorrectTypeException(shardName, "shardName", (str,))
+
+	return os.path.join(GetShardDirectoryPath(saveFilePath), sectionIdentifier, shardName + os.path.splitext(saveFilePath)[1])
+
 def GetSlotIDString (slotID: int) -> str:
 	if not isinstance(slotID, int):
 		raise Exceptions.IncorrectTypeException(slotID, "slotID", (int,))
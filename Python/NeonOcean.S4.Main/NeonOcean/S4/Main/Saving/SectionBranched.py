@@ -1,60 +1,183 @@
 from __future__ import annotations
 
 import copy
-import json
 import typing
 
 from NeonOcean.S4.Main import Debug, Saving
-from NeonOcean.S4.Main.Tools import Exceptions, Types
+from NeonOcean.S4.Main.Tools import Exceptions, Hashing, Types
+
+_shardsKey = "--Shards"  # type: str
+_shardBucketsKey = "--ShardBuckets"  # type: str
 
 class SectionBranched(Saving.SectionBase):
-	def __init__ (self, identifier: str, savingObject: Saving.SaveAbstract):
+	def __init__ (self, identifier: str, savingObject: Saving.SaveAbstract, shardBuckets: typing.Optional[int] = None):
+		"""
+		:param identifier: This section's identifier, sections are saved under this name.
+		:type identifier: str
+		:param savingObject: The saving object this section belongs to.
+		:type savingObject: Saving.SaveAbstract
+		:param shardBuckets: If this is not None, each branch will be saved to a shard, a separate file next to the saving object's file, rather than in
+		the saving object's file. Only shards with changed branches are rewritten on save and a shard is only read once a branch in it is first needed. If this
+		is 0 every branch gets its own shard, otherwise branches are divided by their hash among this many shards.
+		:type shardBuckets: int | None
+		"""
+
+		if not isinstance(shardBuckets, int) and shardBuckets is not None:
+			raise Exceptions.IncorrectTypeException(shardBuckets, "shardBuckets", (int, None))
+
+		if shardBuckets is not None and shardBuckets < 0:
+			raise ValueError("The parameter 'shardBuckets' cannot be less than zero.")
+
 		self._identifier = identifier  # type: str
+		self._shardBuckets = shardBuckets  # type: typing.Optional[int]
 
 		self._loadedData = dict()  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
 
 		self._loadCallbacks = list()  # type: typing.List[typing.Callable]
+		self._lazyLoadCallbacks = list()  # type: typing.List[typing.Callable]  # Load callbacks that don't need to be called until the data is first asked for.
 		self._saveCallbacks = list()  # type: typing.List[typing.Callable]
 		self._resetCallbacks = list()  # type: typing.List[typing.Callable]
 
+		self._generation = 0  # type: int
+		self._savedGeneration = 0  # type: int
+
+		self._pendingDataLoader = None  # type: typing.Optional[typing.Callable[[], typing.Any]]
+
+		self._unverifiedValues = set()  # type: typing.Set[typing.Tuple[str, str]]
+
+		self._shardReader = None  # type: typing.Optional[typing.Callable[[str], typing.Any]]
+		self._shardNames = set()  # type: typing.Set[str]
+		self._pendingShardNames = set()  # type: typing.Set[str]
+		self._shardBranches = dict()  # type: typing.Dict[str, typing.Set[str]]
+		self._branchShardNames = dict()  # type: typing.Dict[str, str]
+		self._shardChanges = dict()  # type: typing.Dict[str, int]
+		self._shardGeneration = 0  # type: int
+		self._savedShardGeneration = 0  # type: int
+
 		super().__init__(savingObject)
 
 	@property
 	def Identifier (self) -> str:
 		return self._identifier
 
+	@property
+	def ShardBuckets (self) -> typing.Optional[int]:
+		"""
+		The number of shards branches are divided among, 0 if every branch has its own shard or None if this section's data isn't sharded.
+		"""
+
+		return self._shardBuckets
+
+	@property
+	def Sharded (self) -> bool:
+		"""
+		Whether or not this section's branches are saved to shards instead of the saving object's file.
+		"""
+
+		return self._shardBuckets is not None
+
+	@property
+	def Generation (self) -> int:
+		return self._generation
+
+	@property
+	def Dirty (self) -> bool:
+		return self._generation != self._savedGeneration or self._shardGeneration != self._savedShardGeneration
+
+	def MarkSaved (self, generation: int) -> None:
+		if not isinstance(generation, int):
+			raise Exceptions.IncorrectTypeException(generation, "generation", (int,))
+
+		self._savedGeneration = generation
+
+	def SetShardReader (self, shardReader: typing.Optional[typing.Callable[[str], typing.Any]]) -> None:
+		self._shardReader = shardReader
+
+	def GetShardChanges (self, includeUnchanged: bool = False) -> typing.Tuple[int, typing.Dict[str, typing.Any]]:
+		self._LoadPendingData()
+
+		if includeUnchanged:
+			self.ReadShards()
+
+		changedShardNames = set(shardName for shardName, shardGeneration in self._shardChanges.items() if shardGeneration > self._savedShardGeneration)  # type: typing.Set[str]
+
+		if includeUnchanged:
+			changedShardNames.update(self._shardNames)
+
+		shardChanges = dict()  # type: typing.Dict[str, typing.Any]
+
+		for shardName in changedShardNames:  # type: str
+			if shardName in self._shardNames:
+				shardChanges[shardName] = {branchKey: self._loadedData[branchKey] for branchKey in self._shardBranches.get(shardName, ())}
+			else:
+				shardChanges[shardName] = None
+
+		return self._shardGeneration, shardChanges
+
+	def MarkShardsSaved (self, shardGeneration: int) -> None:
+		if not isinstance(shardGeneration, int):
+			raise Exceptions.IncorrectTypeException(shardGeneration, "shardGeneration", (int,))
+
+		self._savedShardGeneration = shardGeneration
+
+		for shardName in [shardName for shardName, changeGeneration in self._shardChanges.items() if changeGeneration <= shardGeneration]:  # type: str
+			self._shardChanges.pop(shardName)
+
+	def ReadShards (self) -> None:
+		self._LoadPendingData()
+
+		for shardName in list(self._pendingShardNames):  # type: str
+			self._ReadShard(shardName)
+
+	def GetShardName (self, branch: str) -> typing.Optional[str]:
+		"""
+		Get the name of the shard this branch is saved to, or None if this section's data isn't sharded.
+		"""
+
+		if self._shardBuckets is None:
+			return None
+
+		shardName = self._branchShardNames.get(branch)  # type: typing.Optional[str]
+
+		if shardName is None:
+			if self._shardBuckets == 0:
+				shardName = "%016x" % Hashing.FNV64HashString(branch)
+			else:
+				shardName = str(Hashing.FNV64HashString(branch) % self._shardBuckets)
+
+			self._branchShardNames[branch] = shardName
+
+		return shardName
+
 	def Load (self, sectionData: dict) -> bool:
 		operationInformation = "Save Identifier: %s | Section Identifier: %s" % (self.SavingObject.Identifier, self.Identifier,)
 		operationSuccessful = True  # type: bool
 
+		self._pendingDataLoader = None
+		self._unverifiedValues = set()
+
+		self._ResetShards()
+
+		if isinstance(sectionData, dict) and isinstance(sectionData.get(_shardsKey), list):
+			return self._LoadShardList(sectionData)
+
 		if not isinstance(sectionData, dict):
 			Debug.Log("Incorrect type in section data.\n" + Exceptions.GetIncorrectTypeExceptionText(sectionData, "SectionData", (dict,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
 			sectionData = dict()
 			operationSuccessful = False
 
-		for branchKey in list(sectionData.keys()):  # type: str, dict
-			if not isinstance(branchKey, str):
-				Debug.Log("Incorrect type in section data.\n" + Exceptions.GetIncorrectTypeExceptionText(sectionData, "SectionData<Key>", (str,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
-				sectionData.pop(branchKey, None)
-				operationSuccessful = False
-				continue
-
-			branchDictionary = sectionData[branchKey]  # type: dict
+		if not self._VerifyBranches(sectionData, operationInformation):
+			operationSuccessful = False
 
-			if not isinstance(branchDictionary, dict):
-				Debug.Log("Incorrect type in section data.\n" + Exceptions.GetIncorrectTypeExceptionText(sectionData, "SectionData[%s]" % branchKey, (str,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
-				sectionData.pop(branchKey, None)
-				operationSuccessful = False
-				continue
+		self._loadedData = sectionData
 
-			for valueKey in list(branchDictionary.keys()):  # type: str
-				if not isinstance(valueKey, str):
-					Debug.Log("Incorrect type in section data.\n" + Exceptions.GetIncorrectTypeExceptionText(sectionData, "SectionData[%s]<Key>" % branchKey, (str,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
-					branchDictionary.pop(valueKey, None)
-					operationSuccessful = False
-					continue
+		self._generation += 1
+		self._savedGeneration = self._generation
 
-		self._loadedData = sectionData
+		if self.Sharded:
+			# This data was saved before this section was sharded, every branch needs to be written to its shard.
+			for branchKey in self._loadedData.keys():  # type: str
+				self._MarkBranchChanged(branchKey)
 
 		callbackSuccessful = self._ActivateLoadCallbacks()  # type: bool
 
@@ -63,12 +186,36 @@ class SectionBranched(Saving.SectionBase):
 
 		return operationSuccessful
 
+	def LoadLazily (self, sectionDataLoader: typing.Callable[[], typing.Any]) -> bool:
+		if any(loadCallback not in self._lazyLoadCallbacks for loadCallback in self._loadCallbacks):
+			# Load callbacks that aren't lazy expect to be given the data as soon as it's loaded.
+			return super().LoadLazily(sectionDataLoader)
+
+		self._loadedData = dict()
+		self._pendingDataLoader = sectionDataLoader
+		self._unverifiedValues = set()
+
+		self._ResetShards()
+
+		self._generation += 1
+		self._savedGeneration = self._generation
+
+		return True
+
 	def Save (self) -> typing.Tuple[bool, dict]:
+		self._LoadPendingData()
+
 		callbackSuccessful = self._ActivateSaveCallbacks()  # type: bool
-		return callbackSuccessful, self._loadedData
+		verificationSuccessful = self._VerifyValues()  # type: bool
+		return callbackSuccessful and verificationSuccessful, self._GetSaveData()
 
 	def Reset (self) -> None:
 		self._loadedData = dict()
+		self._pendingDataLoader = None
+		self._unverifiedValues = set()
+		self._shardReader = None
+		self._ResetShards()
+		self._generation += 1
 		self._ActivateResetCallbacks()
 
 	def GetValue (self, branch: str, key: str, default: typing.Any = None) -> typing.Any:
@@ -90,6 +237,8 @@ class SectionBranched(Saving.SectionBase):
 		if not isinstance(key, str):
 			raise Exceptions.IncorrectTypeException(key, "key", (str,))
 
+		self._LoadBranch(branch)
+
 		if not branch in self._loadedData:
 			return default
 
@@ -107,6 +256,8 @@ class SectionBranched(Saving.SectionBase):
 		:type key: str
 		"""
 
+		self.ReadShards()
+
 		allValues = dict()  # type: typing.Dict[str, typing.Any]
 
 		for branchKey, branchDictionary in self._loadedData.items():  # type: str, dict
@@ -120,6 +271,8 @@ class SectionBranched(Saving.SectionBase):
 		Get whether or not a value exists under this branch and key pair.
 		"""
 
+		self._LoadBranch(branch)
+
 		if branch in self._loadedData:
 			return False
 
@@ -130,12 +283,15 @@ class SectionBranched(Saving.SectionBase):
 		Get whether or not any data exists in this branch.
 		"""
 
+		self._LoadBranch(branch)
+
 		return branch in self._loadedData
 
 	def Set (self, branch: str, key: str, value) -> None:
 		"""
 		Set the value of the section data specified by the key and branch. The value is deep copied before being but into storage, modifying the value after setting
-		it will not change the stored version. All values must be able to be encoded by python's json modules.
+		it will not change the stored version. All values must be able to be encoded by python's json modules. Unless strict validation is turned on, values are
+		only checked once they are saved, values that can't be saved are then logged and removed.
 
 		:param branch: The name of the branch to set the value to.
 		:type branch: str
@@ -151,10 +307,12 @@ class SectionBranched(Saving.SectionBase):
 		if not isinstance(key, str):
 			raise Exceptions.IncorrectTypeException(key, "key", (str,))
 
-		copiedValue = copy.deepcopy(value)
+		self._LoadBranch(branch)
+
+		strictValidation = Saving.GetStrictValidation()  # type: bool
 
 		try:
-			json.dumps(copiedValue)
+			copiedValue = Saving.CopyValue(value, verify = strictValidation)
 		except Exception as e:
 			raise Exception("Target value cannot be encoded. Branch: " + branch + " Key: " + key + ".") from e
 
@@ -163,12 +321,23 @@ class SectionBranched(Saving.SectionBase):
 
 		branchDictionary = self._loadedData[branch]  # type: dict
 		assert isinstance(branchDictionary, dict)
-		branchDictionary[key] = value
+
+		if key in branchDictionary and Saving.ValuesEqual(branchDictionary[key], copiedValue):
+			return
+
+		branchDictionary[key] = copiedValue
+		self._MarkBranchChanged(branch)
+
+		if strictValidation:
+			self._unverifiedValues.discard((branch, key))
+		else:
+			self._unverifiedValues.add((branch, key))
 
 	def SetAllBranches (self, key: str, value) -> None:
 		"""
 		Set the value of the section data specified by the key in all branches. The value is deep copied before being but into storage, modifying the value after
-		setting it will not change the stored version. All values must be able to be encoded by python's json modules.
+		setting it will not change the stored version. All values must be able to be encoded by python's json modules. Unless strict validation is turned on, values are
+		only checked once they are saved, values that can't be saved are then logged and removed.
 
 		:param key: The name of the section data, is case sensitive.
 		:type key: str
@@ -179,22 +348,37 @@ class SectionBranched(Saving.SectionBase):
 		if not isinstance(key, str):
 			raise Exceptions.IncorrectTypeException(key, "key", (str,))
 
-		copiedValue = copy.deepcopy(value)
+		self.ReadShards()
+
+		strictValidation = Saving.GetStrictValidation()  # type: bool
 
 		try:
-			json.dumps(copiedValue)
+			copiedValue = Saving.CopyValue(value, verify = strictValidation)
 		except Exception as e:
 			raise Exception("Target value cannot be encoded. Key: " + key + ".") from e
 
-		for branchDictionary in self._loadedData.values():  # type: str, dict
+		for branchKey, branchDictionary in self._loadedData.items():  # type: str, dict
 			assert isinstance(branchDictionary, dict)
+
+			if key in branchDictionary and Saving.ValuesEqual(branchDictionary[key], copiedValue):
+				continue
+
 			branchDictionary[key] = copiedValue
+			self._MarkBranchChanged(branchKey)
+
+			if strictValidation:
+				self._unverifiedValues.discard((branchKey, key))
+			else:
+				self._unverifiedValues.add((branchKey, key))
 
-	def RegisterLoadCallback (self, callback: typing.Callable) -> None:
+	def RegisterLoadCallback (self, callback: typing.Callable, lazy: bool = False) -> None:
 		"""
 		Register a callback to be called after the data has been loaded.
 		:param callback: The callback should take a single argument, the section object, and return a boolean indicating whether or not it was completely successful.
 		:type callback: typing.Callable
+		:param lazy: Whether or not the callback can wait to be called until the data is first asked for. Data loaded lazily is only decoded right away if a load
+		callback that isn't lazy is registered. Objects registering lazy callbacks should call the 'LoadPendingData' method before using what they were given.
+		:type lazy: bool
 		"""
 
 		if callback in self._loadCallbacks:
@@ -202,6 +386,9 @@ class SectionBranched(Saving.SectionBase):
 
 		self._loadCallbacks.append(callback)
 
+		if lazy:
+			self._lazyLoadCallbacks.append(callback)
+
 	def UnregisterLoadCallback (self, callback: typing.Callable) -> None:
 		"""
 		Unregister a load callback.
@@ -210,6 +397,9 @@ class SectionBranched(Saving.SectionBase):
 		if callback in self._loadCallbacks:
 			self._loadCallbacks.remove(callback)
 
+		if callback in self._lazyLoadCallbacks:
+			self._lazyLoadCallbacks.remove(callback)
+
 	def RegisterSaveCallback (self, callback: typing.Callable) -> None:
 		"""
 		Register a callback to be called before the data is sent off to be saved.
@@ -250,6 +440,184 @@ class SectionBranched(Saving.SectionBase):
 		if callback in self._resetCallbacks:
 			self._resetCallbacks.remove(callback)
 
+	def LoadPendingData (self) -> None:
+		self._LoadPendingData()
+
+	def _LoadPendingData (self) -> None:
+		if self._pendingDataLoader is None:
+			return
+
+		sectionDataLoader = self._pendingDataLoader  # type: typing.Callable[[], typing.Any]
+		self._pendingDataLoader = None
+
+		try:
+			sectionData = sectionDataLoader()  # type: typing.Any
+		except Exception:
+			operationInformation = "Save Identifier: %s | Section Identifier: %s" % (self.SavingObject.Identifier, self.Identifier,)
+			Debug.Log("Failed to decode this section's data.\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Exception, group = self.SavingObject.Host.Namespace, owner = __name__)
+			return
+
+		if sectionData is None:
+			return
+
+		self.Load(sectionData)
+
+	def _VerifyValues (self) -> bool:
+		operationInformation = "Save Identifier: %s | Section Identifier: %s" % (self.SavingObject.Identifier, self.Identifier,)
+		operationSuccessful = True  # type: bool
+
+		for branchKey, valueKey in self._unverifiedValues:  # type: str, str
+			branchDictionary = self._loadedData.get(branchKey)  # type: typing.Optional[dict]
+
+			if branchDictionary is None or not valueKey in branchDictionary:
+				continue
+
+			try:
+				Saving.VerifyValue(branchDictionary[valueKey])
+			except Exception as e:
+				Debug.Log("The value under the branch '" + branchKey + "' and key '" + valueKey + "' cannot be saved, it has been removed.\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Error, group = self.SavingObject.Host.Namespace, owner = __name__, exception = e)
+				branchDictionary.pop(valueKey)
+				self._MarkBranchChanged(branchKey)
+				operationSuccessful = False
+
+		self._unverifiedValues = set()
+		return operationSuccessful
+
+	def _LoadBranch (self, branch: str) -> None:
+		self._LoadPendingData()
+
+		if len(self._pendingShardNames) == 0:
+			return
+
+		shardName = self.GetShardName(branch)  # type: typing.Optional[str]
+
+		if shardName in self._pendingShardNames:
+			self._ReadShard(shardName)
+
+	def _LoadShardList (self, shardList: dict) -> bool:
+		self._loadedData = dict()
+
+		self._shardNames = set(shardName for shardName in shardList[_shardsKey] if isinstance(shardName, str))
+		self._pendingShardNames = set(self._shardNames)
+
+		self._generation += 1
+		self._savedGeneration = self._generation
+
+		if shardList.get(_shardBucketsKey) != self._shardBuckets:
+			# The branches were divided differently when they were saved. Reading every shard now moves each branch to where it needs to be saved to now.
+			self.ReadShards()
+
+		return self._ActivateLoadCallbacks()
+
+	def _ReadShard (self, shardName: str) -> None:
+		self._pendingShardNames.discard(shardName)
+
+		if self._shardReader is None:
+			return
+
+		operationInformation = "Save Identifier: %s | Section Identifier: %s | Shard: %s" % (self.SavingObject.Identifier, self.Identifier, shardName)
+
+		try:
+			shardData = self._shardReader(shardName)  # type: typing.Any
+		except Exception:
+			Debug.Log("Failed to read a shard of this section's data.\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Exception, group = self.SavingObject.Host.Namespace, owner = __name__)
+			return
+
+		if shardData is None:
+			return
+
+		if not isinstance(shardData, dict):
+			Debug.Log("Incorrect type in shard data.\n" + Exceptions.GetIncorrectTypeExceptionText(shardData, "ShardData", (dict,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
+			return
+
+		self._VerifyBranches(shardData, operationInformation)
+
+		branchesMoved = False  # type: bool
+
+		for branchKey, branchDictionary in shardData.items():  # type: str, dict
+			if branchKey in self._loadedData:
+				continue
+
+			self._loadedData[branchKey] = branchDictionary
+
+			if self.GetShardName(branchKey) == shardName:
+				self._shardBranches.setdefault(shardName, set()).add(branchKey)
+			else:
+				self._MarkBranchChanged(branchKey)
+				branchesMoved = True
+
+		if branchesMoved:
+			# The branches that moved out of this shard are still written in it, it needs to be saved without them.
+			self._MarkShardChanged(shardName)
+
+			if len(self._shardBranches.get(shardName, ())) == 0:
+				# Every branch in this shard now belongs to another shard, or to the saving object's file, so the shard is no longer needed.
+				self._shardNames.discard(shardName)
+				self._generation += 1
+
+	def _MarkBranchChanged (self, branch: str) -> None:
+		shardName = self.GetShardName(branch)  # type: typing.Optional[str]
+
+		if shardName is None:
+			self._generation += 1
+			return
+
+		self._shardBranches.setdefault(shardName, set()).add(branch)
+
+		if not shardName in self._shardNames:
+			# Only the list of shards is saved to the saving object's file, this section's generation only needs to change when the list does.
+			self._shardNames.add(shardName)
+			self._generation += 1
+
+		self._MarkShardChanged(shardName)
+
+	def _MarkShardChanged (self, shardName: str) -> None:
+		self._shardGeneration += 1
+		self._shardChanges[shardName] = self._shardGeneration
+
+	def _ResetShards (self) -> None:
+		self._shardNames = set()
+		self._pendingShardNames = set()
+		self._shardBranches = dict()
+		self._shardChanges = dict()
+		self._savedShardGeneration = self._shardGeneration
+
+	def _GetSaveData (self) -> dict:
+		if not self.Sharded:
+			return self._loadedData
+
+		return {
+			_shardsKey: sorted(self._shardNames),
+			_shardBucketsKey: self._shardBuckets
+		}
+
+	def _VerifyBranches (self, sectionData: dict, operationInformation: str) -> bool:
+		verificationSuccessful = True  # type: bool
+
+		for branchKey in list(sectionData.keys()):  # type: str
+			if not isinstance(branchKey, str):
+				Debug.Log("Incorrect type in section data.\n" + Exceptions.GetIncorrectTypeExceptionText(sectionData, "SectionData<Key>", (str,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
+				sectionData.pop(branchKey, None)
+				verificationSuccessful = False
+				continue
+
+			branchDictionary = sectionData[branchKey]  # type: dict
+
+			if not isinstance(branchDictionary, dict):
+				Debug.Log("Incorrect type in section data.\n" + Exceptions.GetIncorrectTypeExceptionText(sectionData, "SectionData[%s]" % branchKey, (str,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
+				sectionData.pop(branchKey, None)
+				verificationSuccessful = False
+				continue
+
+			for valueKey in list(branchDictionary.keys()):  # type: str
+				if not isinstance(valueKey, str):
+					Debug.Log("Incorrect type in section data.\n" + Exceptions.GetIncorrectTypeExceptionText(sectionData, "SectionData[%s]<Key>" % branchKey, (str,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
+					branchDictionary.pop(valueKey, None)
+					verificationSuccessful = False
+					continue
+
+		return verificationSuccessful
+
 	def _ActivateLoadCallbacks (self) -> bool:
 		operationInformation = "Save Identifier: %s | Section Identifier: %s" % (self.SavingObject.Identifier, self.Identifier,)
 		operationSuccessful = True  # type: bool
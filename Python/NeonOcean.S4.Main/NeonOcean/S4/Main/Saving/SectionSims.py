@@ -1,11 +1,24 @@
 from __future__ import annotations
 
+import inspect
 import typing
 
 import services
+import zone
+from NeonOcean.S4.Main import Debug, Director, This
 from NeonOcean.S4.Main.Saving import SectionBranched
-from NeonOcean.S4.Main.Tools import Sims as ToolsSims
-from sims import sim, sim_info
+from NeonOcean.S4.Main.Tools import Patcher, Sims as ToolsSims
+from sims import sim_info
+
+_simNames = dict()  # type: typing.Dict[int, str]
+_missingSimIDs = set()  # type: typing.Set[int]
+
+class _Announcer(Director.Announcer):
+	Host = This.Mod
+
+	@classmethod
+	def ZoneLoad (cls, zoneReference: zone.Zone) -> None:
+		RefreshSimNames()
 
 class SectionSims(SectionBranched.SectionBranched):
 	@property
@@ -13,19 +26,27 @@ class SectionSims(SectionBranched.SectionBranched):
 		return "--Name"
 
 	def Save (self) -> typing.Tuple[bool, dict]:
+		self._LoadPendingData()
+
 		callbackSuccessful = self._ActivateSaveCallbacks()  # type: bool
+		verificationSuccessful = self._VerifyValues()  # type: bool
 
+		# Branches in shards that have not been read yet are left alone, their names are updated once they are read and saved again.
 		for branchKey, branchDictionary in self._loadedData.items():
 			try:
-				branchSimID = int(branchKey)  # type: int
-				branchSim = services.sim_info_manager().get(branchSimID)  # type: sim.Sim
-				branchSimInfo = branchSim.sim_info  # type: sim_info.SimInfo
+				branchSimName = GetSimName(int(branchKey))  # type: typing.Optional[str]
 
-				branchDictionary[self.NameKey] = ToolsSims.GetFullName(branchSimInfo)
+				# Sims we can't find keep the last name they were saved with.
+				if branchSimName is None:
+					continue
+
+				if branchDictionary.get(self.NameKey) != branchSimName:
+					branchDictionary[self.NameKey] = branchSimName
+					self._MarkBranchChanged(branchKey)
 			except:
 				continue
 
-		return callbackSuccessful, self._loadedData
+		return callbackSuccessful and verificationSuccessful, self._GetSaveData()
 
 	def Set (self, branch: str, key: str, value) -> None:
 		"""
@@ -64,3 +85,84 @@ class SectionSims(SectionBranched.SectionBranched):
 			raise ValueError("The parameter 'key' may not have the value '" + self.NameKey + "'.")
 
 		super().SetAllBranches(key, value)
+
+def GetSimName (simID: int) -> typing.Optional[str]:
+	"""
+	Get the full name of the sim with this id from the name cache. Sims that are not in the cache are looked up once, sims that can't be found will not be
+	looked up again until the next zone load.
+	:param simID: The id of the sim.
+	:type simID: int
+	:return: The sim's full name, or None if the sim could not be found.
+	:rtype: str | None
+	"""
+
+	simName = _simNames.get(simID)  # type: typing.Optional[str]
+
+	if simName is not None or simID in _missingSimIDs:
+		return simName
+
+	simInfo = services.sim_info_manager().get(simID)  # type: typing.Optional[sim_info.SimInfo]
+
+	if simInfo is None:
+		_missingSimIDs.add(simID)
+		return None
+
+	return UpdateSimName(simInfo)
+
+def UpdateSimName (simInfo: sim_info.SimInfo) -> str:
+	"""
+	Update the name cache's entry for this sim.
+	:return: The sim's current full name.
+	:rtype: str
+	"""
+
+	simName = ToolsSims.GetFullName(simInfo)  # type: str
+
+	_simNames[simInfo.sim_id] = simName
+	_missingSimIDs.discard(simInfo.sim_id)
+
+	return simName
+
+def RefreshSimNames () -> None:
+	"""
+	Update the name cache's entry for every sim in the sim info manager. Cached names of sims that are no longer in the manager are kept.
+	"""
+
+	simInfoManager = services.sim_info_manager()
+
+	if simInfoManager is None:
+		return
+
+	_missingSimIDs.clear()
+
+	for simInfo in tuple(simInfoManager.values()):  # type: sim_info.SimInfo
+		try:
+			UpdateSimName(simInfo)
+		except:
+			Debug.Log("Failed to update the cached name of a sim.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+
+# noinspection PyUnusedLocal
+def _OnSimNameSet (simInfo: sim_info.SimInfo, value: typing.Any) -> None:
+	if isinstance(simInfo, sim_info.SimInfo):
+		UpdateSimName(simInfo)
+
+def _PatchNameProperty (propertyName: str) -> None:
+	# Patcher can only patch functions, so the property is rebuilt with a patched setter.
+	nameProperty = inspect.getattr_static(sim_info.SimInfo, propertyName)
+
+	if not isinstance(nameProperty, property) or nameProperty.fset is None:
+		Debug.Log("Cannot watch the sim info property '%s' for name changes, it is not a settable property. Sim names will only be refreshed when a zone loads." % propertyName,
+				  This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
+		return
+
+	patchedSetter = Patcher.PatchDirectly(nameProperty.fset, _OnSimNameSet, patchType = Patcher.PatchTypes.After)
+	setattr(sim_info.SimInfo, propertyName, property(nameProperty.fget, patchedSetter, nameProperty.fdel, nameProperty.__doc__))
+
+def _Setup () -> None:
+	for propertyName in ("first_name", "last_name"):  # type: str
+		try:
+			_PatchNameProperty(propertyName)
+		except:
+			Debug.Log("Failed to patch the sim info property '%s'." % propertyName, This.Mod.Namespace, Debug.LogLevels.Exception, group = This.Mod.Namespace, owner = __name__)
+
+_Setup()
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import copy
-import json
 import typing
 
 from NeonOcean.S4.Main import Debug, Saving
@@ -14,19 +13,44 @@ class SectionStandard(Saving.SectionBase):
 		self._loadedData = dict()  # type: typing.Dict[str, typing.Dict[str, typing.Any]]
 
 		self._loadCallbacks = list()  # type: typing.List[typing.Callable]
+		self._lazyLoadCallbacks = list()  # type: typing.List[typing.Callable]  # Load callbacks that don't need to be called until the data is first asked for.
 		self._saveCallbacks = list()  # type: typing.List[typing.Callable]
 		self._resetCallbacks = list()  # type: typing.List[typing.Callable]
 
+		self._generation = 0  # type: int
+		self._savedGeneration = 0  # type: int
+
+		self._pendingDataLoader = None  # type: typing.Optional[typing.Callable[[], typing.Any]]
+
+		self._unverifiedKeys = set()  # type: typing.Set[str]
+
 		super().__init__(savingObject)
 
 	@property
 	def Identifier (self) -> str:
 		return self._identifier
 
+	@property
+	def Generation (self) -> int:
+		return self._generation
+
+	@property
+	def Dirty (self) -> bool:
+		return self._generation != self._savedGeneration
+
+	def MarkSaved (self, generation: int) -> None:
+		if not isinstance(generation, int):
+			raise Exceptions.IncorrectTypeException(generation, "generation", (int,))
+
+		self._savedGeneration = generation
+
 	def Load (self, sectionData: dict) -> bool:
 		operationInformation = "Save Identifier: %s | Section Identifier: %s" % (self.SavingObject.Identifier, self.Identifier,)
 		operationSuccessful = True  # type: bool
 
+		self._pendingDataLoader = None
+		self._unverifiedKeys = set()
+
 		if not isinstance(sectionData, dict):
 			Debug.Log("Incorrect type in section data.\n" + Exceptions.GetIncorrectTypeExceptionText(sectionData, "SectionData", (dict,)) + "\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Warning, group = self.SavingObject.Host.Namespace, owner = __name__)
 			sectionData = dict()
@@ -41,6 +65,9 @@ class SectionStandard(Saving.SectionBase):
 
 		self._loadedData = sectionData
 
+		self._generation += 1
+		self._savedGeneration = self._generation
+
 		callbackSuccessful = self._ActivateLoadCallbacks()  # type: bool
 
 		if not callbackSuccessful:
@@ -48,12 +75,32 @@ class SectionStandard(Saving.SectionBase):
 
 		return operationSuccessful
 
+	def LoadLazily (self, sectionDataLoader: typing.Callable[[], typing.Any]) -> bool:
+		if any(loadCallback not in self._lazyLoadCallbacks for loadCallback in self._loadCallbacks):
+			# Load callbacks that aren't lazy expect to be given the data as soon as it's loaded.
+			return super().LoadLazily(sectionDataLoader)
+
+		self._loadedData = dict()
+		self._pendingDataLoader = sectionDataLoader
+		self._unverifiedKeys = set()
+
+		self._generation += 1
+		self._savedGeneration = self._generation
+
+		return True
+
 	def Save (self) -> typing.Tuple[bool, dict]:
+		self._LoadPendingData()
+
 		callbackSuccessful = self._ActivateSaveCallbacks()  # type: bool
-		return callbackSuccessful, self._loadedData
+		verificationSuccessful = self._VerifyValues()  # type: bool
+		return callbackSuccessful and verificationSuccessful, self._loadedData
 
 	def Reset (self) -> None:
 		self._loadedData = dict()
+		self._pendingDataLoader = None
+		self._unverifiedKeys = set()
+		self._generation += 1
 		self._ActivateResetCallbacks()
 
 	def GetValue (self, key: str, default: typing.Any = None) -> typing.Any:
@@ -67,6 +114,8 @@ class SectionStandard(Saving.SectionBase):
 		:return: The value in storage or the default argument.
 		"""
 
+		self._LoadPendingData()
+
 		if not isinstance(key, str):
 			raise Exceptions.IncorrectTypeException(key, "key", (str,))
 
@@ -78,7 +127,8 @@ class SectionStandard(Saving.SectionBase):
 	def SetValue (self, key: str, value) -> None:
 		"""
 		Set the value of the section data specified by the key and branch. The value is deep copied before being but into storage, modifying the value after setting
-		it will not change the stored version. All values must be able to be encoded by python's json modules.
+		it will not change the stored version. All values must be able to be encoded by python's json modules. Unless strict validation is turned on, values are
+		only checked once they are saved, values that can't be saved are then logged and removed.
 
 		:param key: The name of the section data, is case sensitive.
 		:type key: str
@@ -86,23 +136,37 @@ class SectionStandard(Saving.SectionBase):
 		:rtype: None
 		"""
 
+		self._LoadPendingData()
+
 		if not isinstance(key, str):
 			raise Exceptions.IncorrectTypeException(key, "key", (str,))
 
-		copiedValue = copy.deepcopy(value)
+		strictValidation = Saving.GetStrictValidation()  # type: bool
 
 		try:
-			json.dumps(copiedValue)
+			copiedValue = Saving.CopyValue(value, verify = strictValidation)
 		except Exception as e:
 			raise Exception("Target value cannot be encoded. Key: " + key + ".") from e
 
-		self._loadedData[key] = value
+		if key in self._loadedData and Saving.ValuesEqual(self._loadedData[key], copiedValue):
+			return
+
+		self._loadedData[key] = copiedValue
+		self._generation += 1
+
+		if strictValidation:
+			self._unverifiedKeys.discard(key)
+		else:
+			self._unverifiedKeys.add(key)
 
-	def RegisterLoadCallback (self, callback: typing.Callable) -> None:
+	def RegisterLoadCallback (self, callback: typing.Callable, lazy: bool = False) -> None:
 		"""
 		Register a callback to be called after the data has been loaded.
 		:param callback: The callback, this should take a single argument, the section object.
 		:type callback: typing.Callable
+		:param lazy: Whether or not the callback can wait to be called until the data is first asked for. Data loaded lazily is only decoded right away if a load
+		callback that isn't lazy is registered. Objects registering lazy callbacks should call the 'LoadPendingData' method before using what they were given.
+		:type lazy: bool
 		"""
 
 		if callback in self._loadCallbacks:
@@ -110,6 +174,9 @@ class SectionStandard(Saving.SectionBase):
 
 		self._loadCallbacks.append(callback)
 
+		if lazy:
+			self._lazyLoadCallbacks.append(callback)
+
 	def UnregisterLoadCallback (self, callback: typing.Callable) -> None:
 		"""
 		Unregister a load callback.
@@ -118,6 +185,9 @@ class SectionStandard(Saving.SectionBase):
 		if callback in self._loadCallbacks:
 			self._loadCallbacks.remove(callback)
 
+		if callback in self._lazyLoadCallbacks:
+			self._lazyLoadCallbacks.remove(callback)
+
 	def RegisterSaveCallback (self, callback: typing.Callable) -> None:
 		"""
 		Register a callback to be called before the data is sent off to be saved.
@@ -158,6 +228,47 @@ class SectionStandard(Saving.SectionBase):
 		if callback in self._resetCallbacks:
 			self._resetCallbacks.remove(callback)
 
+	def LoadPendingData (self) -> None:
+		self._LoadPendingData()
+
+	def _LoadPendingData (self) -> None:
+		if self._pendingDataLoader is None:
+			return
+
+		sectionDataLoader = self._pendingDataLoader  # type: typing.Callable[[], typing.Any]
+		self._pendingDataLoader = None
+
+		try:
+			sectionData = sectionDataLoader()  # type: typing.Any
+		except Exception:
+			operationInformation = "Save Identifier: %s | Section Identifier: %s" % (self.SavingObject.Identifier, self.Identifier,)
+			Debug.Log("Failed to decode this section's data.\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Exception, group = self.SavingObject.Host.Namespace, owner = __name__)
+			return
+
+		if sectionData is None:
+			return
+
+		self.Load(sectionData)
+
+	def _VerifyValues (self) -> bool:
+		operationInformation = "Save Identifier: %s | Section Identifier: %s" % (self.SavingObject.Identifier, self.Identifier,)
+		operationSuccessful = True  # type: bool
+
+		for valueKey in self._unverifiedKeys:  # type: str
+			if not valueKey in self._loadedData:
+				continue
+
+			try:
+				Saving.VerifyValue(self._loadedData[valueKey])
+			except Exception as e:
+				Debug.Log("The value under the key '" + valueKey + "' cannot be saved, it has been removed.\n" + operationInformation, self.SavingObject.Host.Namespace, Debug.LogLevels.Error, group = self.SavingObject.Host.Namespace, owner = __name__, exception = e)
+				self._loadedData.pop(valueKey)
+				self._generation += 1
+				operationSuccessful = False
+
+		self._unverifiedKeys = set()
+		return operationSuccessful
+
 	def _ActivateLoadCallbacks (self) -> bool:
 		operationInformation = "Save Identifier: %s | Section Identifier: %s" % (self.SavingObject.Identifier, self.Identifier,)
 		operationSuccessful = True  # type: bool
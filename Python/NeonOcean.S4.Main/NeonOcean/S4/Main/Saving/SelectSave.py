@@ -5,7 +5,7 @@ import pathlib
 import typing
 
 import services
-from NeonOcean.S4.Main import Debug, Language, Paths, This
+from NeonOcean.S4.Main import Debug, Language, This
 from NeonOcean.S4.Main.Saving import Save
 from NeonOcean.S4.Main.UI import Dialogs
 from ui import ui_dialog, ui_dialog_picker
@@ -37,46 +37,43 @@ def ShowSelectSaveDialog () -> None:
 	loadedSaveDirectoryPath = Save.GetLoadedDirectoryPath()  # type: typing.Optional[str]
 	loadedSaveDirectoryPathObject = pathlib.Path(Save.GetLoadedDirectoryPath()) if loadedSaveDirectoryPath is not None else None  # type: typing.Optional[pathlib.Path]
 
-	for saveDirectoryName in os.listdir(Paths.SavesPath):  # type: str
-		saveDirectoryPath = os.path.join(Paths.SavesPath, saveDirectoryName)  # type: str
+	for saveDirectoryPath, saveDirectoryMetaData in Save.GetAllSaveMetaData().items():  # type: str, typing.Optional[Save.ModSaveMetaData]
+		saveDirectoryName = os.path.basename(saveDirectoryPath)  # type: str
 
-		if os.path.isdir(saveDirectoryPath):
-			saveDirectoryPathObject = pathlib.Path(saveDirectoryPath)  # type: pathlib.Path
+		saveDirectoryPathObject = pathlib.Path(saveDirectoryPath)  # type: pathlib.Path
 
-			currentOptionID = 50000 + len(options)
-			options[currentOptionID] = saveDirectoryPath
+		currentOptionID = 50000 + len(options)
+		options[currentOptionID] = saveDirectoryPath
 
-			saveDirectoryMetaData = Save.GetSaveMetaData(saveDirectoryPath)  # type: typing.Optional[Save.ModSaveMetaData]
+		rowDescriptionTokens = (SelectSaveDialogDescriptionMatchUnknown.GetLocalizationString(),)
 
-			rowDescriptionTokens = (SelectSaveDialogDescriptionMatchUnknown.GetLocalizationString(),)
+		if saveDirectoryMetaData is not None:
+			saveDirectoryMatchType = saveDirectoryMetaData.MatchesGameSave()  # type: Save.ModSaveMatchTypes
 
-			if saveDirectoryMetaData is not None:
-				saveDirectoryMatchType = saveDirectoryMetaData.MatchesGameSave()  # type: Save.ModSaveMatchTypes
+			if saveDirectoryMatchType in Save.ModSaveMatchTypes.Match:
+				rowDescriptionTokens = (SelectSaveDialogDescriptionMatchMatches.GetLocalizationString(),)
+			elif saveDirectoryMatchType in Save.ModSaveMatchTypes.MismatchedGUID:
+				rowDescriptionTokens = (SelectSaveDialogDescriptionMatchMismatchGUID.GetLocalizationString(),)
+			elif saveDirectoryMatchType in Save.ModSaveMatchTypes.MismatchedGameTick:
+				rowDescriptionTokens = (SelectSaveDialogDescriptionMatchMismatchGameTick.GetLocalizationString(),)
 
-				if saveDirectoryMatchType in Save.ModSaveMatchTypes.Match:
-					rowDescriptionTokens = (SelectSaveDialogDescriptionMatchMatches.GetLocalizationString(),)
-				elif saveDirectoryMatchType in Save.ModSaveMatchTypes.MismatchedGUID:
-					rowDescriptionTokens = (SelectSaveDialogDescriptionMatchMismatchGUID.GetLocalizationString(),)
-				elif saveDirectoryMatchType in Save.ModSaveMatchTypes.MismatchedGameTick:
-					rowDescriptionTokens = (SelectSaveDialogDescriptionMatchMismatchGameTick.GetLocalizationString(),)
-
-			if loadedSaveDirectoryPathObject is not None:
-				if loadedSaveDirectoryPathObject == saveDirectoryPathObject:
-					rowDescription = SelectSaveDialogDescriptionCurrentlyLoaded.GetLocalizationString(*rowDescriptionTokens)
-				else:
-					rowDescription = SelectSaveDialogDescriptionNormal.GetLocalizationString(*rowDescriptionTokens)
+		if loadedSaveDirectoryPathObject is not None:
+			if loadedSaveDirectoryPathObject == saveDirectoryPathObject:
+				rowDescription = SelectSaveDialogDescriptionCurrentlyLoaded.GetLocalizationString(*rowDescriptionTokens)
 			else:
 				rowDescription = SelectSaveDialogDescriptionNormal.GetLocalizationString(*rowDescriptionTokens)
-
-			if saveDirectoryMetaData is None:
-				rowNameTokens = (saveDirectoryName,)
-			else:
-				rowNameTokens = (saveDirectoryName + " (" + saveDirectoryMetaData.Name + ")",)
-
-			dialogRows.append(ui_dialog_picker.ObjectPickerRow(
-				option_id = currentOptionID,
-				name = Language.CreateLocalizationString(*rowNameTokens),
-				row_description = rowDescription))
+		else:
+			rowDescription = SelectSaveDialogDescriptionNormal.GetLocalizationString(*rowDescriptionTokens)
+
+		if saveDirectoryMetaData is None:
+			rowNameTokens = (saveDirectoryName,)
+		else:
+			rowNameTokens = (saveDirectoryName + " (" + saveDirectoryMetaData.Name + ")",)
+
+		dialogRows.append(ui_dialog_picker.ObjectPickerRow(
+			option_id = currentOptionID,
+			name = Language.CreateLocalizationString(*rowNameTokens),
+			row_description = rowDescription))
 
 	def DialogCallback (dialogReference: ui_dialog_picker.UiObjectPicker) -> None:
 		try:
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import abc
+import copy
 import typing
 
 from NeonOcean.S4.Main import Debug, Mods
 from NeonOcean.S4.Main.Tools import Exceptions
 
+_strictValidation = False  # type: bool
+
 class SectionAbstract(abc.ABC):
 	@property
 	@abc.abstractmethod
@@ -100,6 +103,91 @@ class SectionBase(SectionAbstract, abc.ABC):
 	def SavingObject (self) -> SaveAbstract:
 		return self._savingObject
 
+	@property
+	def Generation (self) -> typing.Optional[int]:
+		"""
+		A number that changes every time this section's data changes, or None if this section doesn't track changes. Saving objects may skip rewriting their
+		file when none of their sections have changed since it was last written, sections that don't track changes are assumed to change every time they are saved.
+		"""
+
+		return None
+
+	@property
+	def Dirty (self) -> bool:
+		"""
+		Whether or not this section's data has changed since it was last loaded or saved.
+		"""
+
+		return True
+
+	def MarkSaved (self, generation: int) -> None:
+		"""
+		Notify this section that its data, as it was at this generation, has been saved.
+		"""
+
+		pass
+
+	def LoadLazily (self, sectionDataLoader: typing.Callable[[], typing.Any]) -> bool:
+		"""
+		Load this section's data from a function that decodes and returns it. Sections may wait to call the loader until their data is first needed, saving
+		objects use this so that data for sections nobody uses is never decoded. By default the data is loaded right away.
+		:param sectionDataLoader: A function that returns the section's data, or None if there is nothing to load. The data returned is never shared, so it
+		doesn't need to be copied.
+		:return: False if the data was loaded right away and an error occurred, otherwise True.
+		:rtype: bool
+		"""
+
+		sectionData = sectionDataLoader()  # type: typing.Any
+
+		if sectionData is None:
+			return True
+
+		return self.Load(sectionData)
+
+	def LoadPendingData (self) -> None:
+		"""
+		Load any data given to the 'LoadLazily' method that has yet to be loaded. Objects that are given this section's data through lazy load callbacks should
+		call this before they use anything they were given, their callbacks will be called then if the data hasn't been loaded yet.
+		"""
+
+		pass
+
+	def SetShardReader (self, shardReader: typing.Optional[typing.Callable[[str], typing.Any]]) -> None:
+		"""
+		Give this section a function that reads one of its shards. Sections that store parts of their data as shards, separate files next to their saving object's
+		file, use this to read those parts when they are first needed. Saving objects set the reader before loading the section.
+		:param shardReader: A function that takes the name of a shard and returns its data, or None if the shard doesn't exist. Data returned is never
+		shared, so it doesn't need to be copied.
+		"""
+
+		pass
+
+	def GetShardChanges (self, includeUnchanged: bool = False) -> typing.Tuple[int, typing.Dict[str, typing.Any]]:
+		"""
+		Get the data of every shard that has changed since this section's shards were last saved.
+		:param includeUnchanged: Whether or not to also get shards that have not changed. Saving objects use this when saving to a file other than the one the
+		shards were loaded from.
+		:return: A number to be given to the 'MarkShardsSaved' method once the shards have been written, and the data of each shard by its name. Shards that
+		should be deleted have the value None.
+		:rtype: typing.Tuple[int, typing.Dict[str, typing.Any]]
+		"""
+
+		return 0, dict()
+
+	def MarkShardsSaved (self, shardGeneration: int) -> None:
+		"""
+		Notify this section that the shards gathered by the 'GetShardChanges' method, which returned this number, have been written.
+		"""
+
+		pass
+
+	def ReadShards (self) -> None:
+		"""
+		Read every shard this section has yet to read. Saving objects call this before the files the shards would be read from are removed.
+		"""
+
+		pass
+
 class SaveBase(SaveAbstract, abc.ABC):
 	def __init__ (self):
 		self._sections = list()  # type: typing.List[SectionAbstract]
@@ -134,3 +222,168 @@ class SaveBase(SaveAbstract, abc.ABC):
 		"""
 
 		self._sections.remove(sectionHandler)
+
+def ValuesEqual (value: typing.Any, otherValue: typing.Any) -> bool:
+	"""
+	Get whether or not two save values are the same and would be saved the same way. Unlike python's equality operator this also compares types, so values
+	such as 1, 1.0 and True are not considered equal. Lists and tuples are treated as the same type as both are saved as lists.
+	"""
+
+	if type(value) is not type(otherValue):
+		if not isinstance(value, (list, tuple)) or not isinstance(otherValue, (list, tuple)):
+			return False
+
+	if isinstance(value, dict):
+		if len(value) != len(otherValue):
+			return False
+
+		otherKeyTypes = None  # type: typing.Optional[typing.Dict[typing.Any, type]]
+
+		for valueKey, valueItem in value.items():  # type: typing.Any, typing.Any
+			if not valueKey in otherValue or not ValuesEqual(valueItem, otherValue[valueKey]):
+				return False
+
+			if not isinstance(valueKey, str):
+				# Keys such as 1, 1.0 and True are the same key to a dictionary, but are not saved the same way.
+				if otherKeyTypes is None:
+					otherKeyTypes = {otherKey: type(otherKey) for otherKey in otherValue.keys()}
+
+				if otherKeyTypes[valueKey] is not type(valueKey):
+					return False
+
+		return True
+
+	if isinstance(value, (list, tuple)):
+		if len(value) != len(otherValue):
+			return False
+
+		for valueItem, otherValueItem in zip(value, otherValue):  # type: typing.Any, typing.Any
+			if not ValuesEqual(valueItem, otherValueItem):
+				return False
+
+		return True
+
+	if isinstance(value, float) and value != value:
+		return otherValue != otherValue
+
+	return value == otherValue
+
+def GetStrictValidation () -> bool:
+	"""
+	Get whether or not sections check that values can be saved as soon as they are set. Otherwise values are only checked when they are saved.
+	"""
+
+	return _strictValidation
+
+def SetStrictValidation (strictValidation: bool) -> None:
+	"""
+	Set whether or not sections check that values can be saved as soon as they are set. Checking right away means mistakes raise an exception where the value
+	was set, rather than being logged when the value is saved, but makes setting values slower. This should be turned on only when developing.
+	"""
+
+	global _strictValidation
+
+	if not isinstance(strictValidation, bool):
+		raise Exceptions.IncorrectTypeException(strictValidation, "strictValidation", (bool,))
+
+	_strictValidation = strictValidation
+
+def CopyValue (value: typing.Any, verify: bool = True) -> typing.Any:
+	"""
+	Copy a save value. Lists, tuples and dictionaries are copied, strings, numbers and None are immutable and are not.
+	:param value: The value to copy.
+	:param verify: Whether or not to check that the value can be saved while copying it. If this is False values that can't be saved are deep copied instead
+	and will need to be checked with the 'VerifyValue' function before they are saved.
+	:type verify: bool
+	:return: The copied value.
+	"""
+
+	return _CopyValue(value, verify, set())
+
+def VerifyValue (value: typing.Any) -> None:
+	"""
+	Check that a value can be saved by every serializer, that it is made only of dictionaries, lists, tuples, strings, numbers, booleans and None. Dictionary
+	keys can be strings, numbers, booleans or None, the same keys json accepts. Saving objects sort keys, so the keys of a dictionary must be able to be sorted
+	together, strings, numbers and None can't be mixed. Json writes every key as a string, keys that aren't strings will be strings once they are loaded from a
+	json file. An exception will be raised if the value can't be saved.
+	"""
+
+	_VerifyValue(value, set())
+
+def _CopyValue (value: typing.Any, verify: bool, containerIDs: typing.Set[int]) -> typing.Any:
+	if isinstance(value, (str, int, float)) or value is None:
+		return value
+
+	if not isinstance(value, (dict, list, tuple)):
+		if verify:
+			raise TypeError("Values of the type '" + type(value).__name__ + "' cannot be saved.")
+
+		return copy.deepcopy(value)
+
+	valueID = id(value)  # type: int
+
+	if valueID in containerIDs:
+		raise ValueError("Save values cannot contain themselves.")
+
+	containerIDs.add(valueID)
+
+	try:
+		if isinstance(value, dict):
+			copiedDictionary = dict()  # type: dict
+
+			if verify:
+				_VerifyDictionaryKeys(value)
+
+			for itemKey, itemValue in value.items():  # type: typing.Any, typing.Any
+				copiedDictionary[itemKey] = _CopyValue(itemValue, verify, containerIDs)
+
+			return copiedDictionary
+
+		copiedItems = [_CopyValue(itemValue, verify, containerIDs) for itemValue in value]  # type: list
+		return tuple(copiedItems) if isinstance(value, tuple) else copiedItems
+	finally:
+		containerIDs.discard(valueID)
+
+def _VerifyValue (value: typing.Any, containerIDs: typing.Set[int]) -> None:
+	if isinstance(value, (str, int, float)) or value is None:
+		return
+
+	if not isinstance(value, (dict, list, tuple)):
+		raise TypeError("Values of the type '" + type(value).__name__ + "' cannot be saved.")
+
+	valueID = id(value)  # type: int
+
+	if valueID in containerIDs:
+		raise ValueError("Save values cannot contain themselves.")
+
+	containerIDs.add(valueID)
+
+	try:
+		if isinstance(value, dict):
+			_VerifyDictionaryKeys(value)
+
+			for itemValue in value.values():  # type: typing.Any
+				_VerifyValue(itemValue, containerIDs)
+		else:
+			for itemValue in value:  # type: typing.Any
+				_VerifyValue(itemValue, containerIDs)
+	finally:
+		containerIDs.discard(valueID)
+
+def _VerifyDictionaryKeys (value: dict) -> None:
+	hasStringKeys = False  # type: bool
+	hasNumberKeys = False  # type: bool
+	hasNoneKey = False  # type: bool
+
+	for itemKey in value.keys():  # type: typing.Any
+		if isinstance(itemKey, str):
+			hasStringKeys = True
+		elif isinstance(itemKey, (int, float)):
+			hasNumberKeys = True
+		elif itemKey is None:
+			hasNoneKey = True
+		else:
+			raise TypeError("Dictionary keys of the type '" + type(itemKey).__name__ + "' cannot be saved.")
+
+	if hasStringKeys + hasNumberKeys + hasNoneKey > 1:
+		raise TypeError("Dictionary keys that are strings, numbers or None cannot be saved in the same dictionary, they cannot be sorted together.")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 import os
 import sys
 import types
@@ -17,8 +18,6 @@ SettingsFilePath = os.path.join(This.Mod.PersistentPath, "Settings.json")  # typ
 SettingsPersistence = None  # type: typing.Optional[Persistence.PersistentFile]
 AllSettings = list()  # type: typing.List[typing.Type[Setting]]
 
-_previousValues = dict()  # type: typing.Dict[str, typing.Any]
-
 _onUpdateWrapper = Events.EventHandler()  # type: Events.EventHandler
 _onLoadWrapper = Events.EventHandler()  # type: Events.EventHandler
 
@@ -45,6 +44,9 @@ class Setting(AbstractSettings.SettingAbstract):
 	ListPath = "Root"  # type: str
 	ListPriority = 0  # type: typing.Union[float, int]
 
+	# Whether or not this setting's value should be stored frozen and returned without being copied. Only enable this for settings whose callers never modify the value they get.
+	CopyOnWrite = False  # type: bool
+
 	_overrides = None  # type: typing.Optional[typing.List[_SettingOverride]]
 
 	def __init_subclass__ (cls, **kwargs):
@@ -63,7 +65,8 @@ class Setting(AbstractSettings.SettingAbstract):
 		_Setup(cls.Key,
 			   cls.Type,
 			   cls.Default,
-			   cls.Verify)
+			   cls.Verify,
+			   copyOnWrite = cls.CopyOnWrite)
 
 	@classmethod
 	def IsSetup (cls) -> bool:
@@ -99,6 +102,29 @@ class Setting(AbstractSettings.SettingAbstract):
 		activeOverrideValue = cls.GetOverrideValue(activeOverrideIdentifier)  # type: typing.Any
 		return activeOverrideValue
 
+	@classmethod
+	def GetMutable (cls, ignoreOverride: bool = False) -> typing.Any:
+		"""
+		Get a copy of the setting's value that can be freely modified. Use this instead of the get method for settings in copy on write mode
+		if you intend to change the value before setting it again.
+		:param ignoreOverride: If true we will ignore any value overrides will be ignored when retrieving the value.
+		:type ignoreOverride: bool
+		:return: A copy of the setting's value.
+		"""
+
+		if not isinstance(ignoreOverride, bool):
+			raise Exceptions.IncorrectTypeException(ignoreOverride, "ignoreOverride", (bool,))
+
+		if ignoreOverride:
+			return _GetMutable(cls.Key)
+
+		if not cls.IsOverridden():
+			return _GetMutable(cls.Key)
+
+		activeOverrideIdentifier = cls.GetActiveOverrideIdentifier()  # type: str
+		activeOverrideValue = cls.GetOverrideValue(activeOverrideIdentifier)  # type: typing.Any
+		return copy.deepcopy(activeOverrideValue)
+
 	@classmethod
 	def Set (cls, value: typing.Any, autoSave: bool = True, autoUpdate: bool = True) -> None:
 		"""
@@ -171,6 +197,7 @@ class Setting(AbstractSettings.SettingAbstract):
 			raise Exception("Cannot override the non setup setting '%s'." % cls.Key)
 
 		value = cls.Verify(value)
+		previousValue = cls.Get()  # type: typing.Any
 
 		if cls._overrides is None:
 			cls._overrides = list()
@@ -180,7 +207,7 @@ class Setting(AbstractSettings.SettingAbstract):
 
 		cls._overrides.append(_SettingOverride(value, overrideIdentifier, overridePriority, overrideReasonText))
 		cls._overrides.sort(key = lambda sortingOverride: sortingOverride.Priority, reverse = True)
-		Update()
+		Update(changedSettings = { cls.Key } if cls.Get() != previousValue else None)
 
 	@classmethod
 	def RemoveOverride (cls, overrideIdentifier: str) -> None:
@@ -202,10 +229,12 @@ class Setting(AbstractSettings.SettingAbstract):
 		if len(cls._overrides) == 0:
 			return
 
+		previousValue = cls.Get()  # type: typing.Any
+
 		for overrideIndex in range(len(cls._overrides)):
 			if cls._overrides[overrideIndex].Identifier == overrideIdentifier:
 				cls._overrides.pop(overrideIndex)
-				Update()
+				Update(changedSettings = { cls.Key } if cls.Get() != previousValue else None)
 				return
 
 	@classmethod
@@ -412,8 +441,22 @@ def Load () -> None:
 def Save () -> None:
 	SettingsPersistence.Save()
 
-def Update () -> None:
-	SettingsPersistence.Update()
+def Update (changedSettings: typing.Optional[typing.Set[str]] = None) -> None:
+	"""
+	Trigger the settings update callbacks.
+	:param changedSettings: The keys of settings whose effective value changed without their stored value changing, such as when an override is added.
+	:type changedSettings: typing.Set[str] | None
+	"""
+
+	SettingsPersistence.Update(changedKeys = changedSettings)
+
+def Batch () -> typing.ContextManager:
+	"""
+	Get a context manager that groups changes to multiple settings together. The settings will be verified, saved and the update callbacks called only once
+	the 'with' block exits. If an exception escapes the block every setting changed inside it will be returned to its previous value.
+	"""
+
+	return SettingsPersistence.Batch()
 
 def RegisterOnUpdateCallback (updateCallback: typing.Callable[[types.ModuleType, UpdateEventArguments], None]) -> None:
 	global _onUpdateWrapper
@@ -438,11 +481,14 @@ def _OnInitiate (cause: LoadingShared.LoadingCauses) -> None:
 		pass
 
 	if SettingsPersistence is None:
-		SettingsPersistence = Persistence.PersistentFile(SettingsFilePath, This.Mod.Version, hostNamespace = This.Mod.Namespace, alwaysSaveValues = True)
+		SettingsPersistence = Persistence.PersistentFile(SettingsFilePath, This.Mod.Version, hostNamespace = This.Mod.Namespace, alwaysSaveValues = True, writeBehind = True)
 
 		for setting in AllSettings:
 			setting.Setup()
 
+		# Setting up a value marks it as changed, but nothing has been reported before the first update, only changes made by loading should be listed.
+		SettingsPersistence.ClearChangedKeys()
+
 		SettingsPersistence.OnUpdate += _OnUpdateCallback
 		SettingsPersistence.OnLoad += _OnLoadCallback
 
@@ -454,19 +500,22 @@ def _OnUnload (cause: LoadingShared.UnloadingCauses) -> None:
 
 	try:
 		Save()
+		SettingsPersistence.Flush()
 	except Exception:
 		Debug.Log("Failed to save settings.", This.Mod.Namespace, Debug.LogLevels.Warning, group = This.Mod.Namespace, owner = __name__)
 
 def _OnReset () -> None:
-	for setting in GetAllSettings():  # type: Setting
-		setting.Reset()
+	with Batch():
+		for setting in GetAllSettings():  # type: Setting
+			setting.Reset()
 
 def _OnResetSettings () -> None:
-	for setting in GetAllSettings():  # type: Setting
-		setting.Reset()
+	with Batch():
+		for setting in GetAllSettings():  # type: Setting
+			setting.Reset()
 
-def _Setup (key: str, valueType: type, default, verify: typing.Callable) -> None:
-	SettingsPersistence.Setup(key, valueType, default, verify)
+def _Setup (key: str, valueType: type, default, verify: typing.Callable, copyOnWrite: bool = False) -> None:
+	SettingsPersistence.Setup(key, valueType, default, verify, copyOnWrite = copyOnWrite)
 
 def _isSetup (key: str) -> bool:
 	if SettingsPersistence is None:
@@ -477,6 +526,9 @@ def _isSetup (key: str) -> bool:
 def _Get (key: str) -> typing.Any:
 	return SettingsPersistence.Get(key)
 
+def _GetMutable (key: str) -> typing.Any:
+	return SettingsPersistence.GetMutable(key)
+
 def _Set (key: str, value: typing.Any, autoSave: bool = True, autoUpdate: bool = True) -> None:
 	SettingsPersistence.Set(key, value, autoSave = autoSave, autoUpdate = autoUpdate)
 
@@ -506,26 +558,11 @@ def _InvokeOnLoadWrapperEvent () -> Events.EventArguments:
 	return eventArguments
 
 # noinspection PyUnusedLocal
-def _OnUpdateCallback (owner: Persistence.Persistent, eventArguments: Events.EventArguments) -> None:
-	global _previousValues
-
-	allSettings = GetAllSettings()  # type: typing.List[typing.Type[Setting]]
-
-	currentValues = dict()  # type: typing.Dict[str, typing.Any]
-	changedSettings = set()  # type: typing.Set[str]
-
-	for setting in allSettings:  # type: typing.Type[Setting]
-		settingValue = setting.Get()  # type: typing.Any
-		currentValues[setting.Key] = settingValue
-
-		if not setting.Key in _previousValues:
-			changedSettings.add(setting.Key)
-			continue
-
-		if _previousValues[setting.Key] != settingValue:
-			changedSettings.add(setting.Key)
-
-	_previousValues = currentValues
+def _OnUpdateCallback (owner: Persistence.Persistent, eventArguments: Persistence.UpdateEventArguments) -> None:
+	if eventArguments.ChangedKeys is None:
+		changedSettings = set(setting.Key for setting in AllSettings)  # type: typing.Set[str]
+	else:
+		changedSettings = set(eventArguments.ChangedKeys)  # type: typing.Set[str]
 
 	_InvokeOnUpdateWrapperEvent(changedSettings)
 
@@ -249,12 +249,9 @@ class CheckForUpdatesValueDialog(UISettings.DictionaryDialog):
 
 				# noinspection PyUnusedLocal
 				def ModButtonCallback (dialog: ui_dialog.UiDialog) -> None:
-					if lastValue:
-						currentValue[mod.Namespace] = False
-						self._ShowDialogInternal(setting, currentValue, showDialogArguments, returnCallback = returnCallback)
-					else:
-						currentValue[mod.Namespace] = True
-						self._ShowDialogInternal(setting, currentValue, showDialogArguments, returnCallback = returnCallback)
+					changedValue = dict(currentValue)  # type: typing.Dict[str, bool]
+					changedValue[mod.Namespace] = not lastValue
+					self._ShowDialogInternal(setting, changedValue, showDialogArguments, returnCallback = returnCallback)
 
 				return ModButtonCallback
 
@@ -57,6 +57,7 @@ class BooleanYesNoDialogSetting(BooleanYesNoSetting):
 
 class CheckForUpdatesSetting(SettingsBase.Setting):
 	Type = dict
+	CopyOnWrite = True  # type: bool
 
 	DefaultSetting: typing.Type[SettingsBase.Setting]
 
@@ -123,7 +124,7 @@ class CheckForUpdatesSetting(SettingsBase.Setting):
 
 	@classmethod
 	def _OnLoad (cls) -> None:
-		currentValue = cls.Get()  # type: typing.Dict[str, bool]
+		currentValue = cls.GetMutable()  # type: typing.Dict[str, bool]
 		defaultValue = cls.DefaultSetting.Get()  # type: bool
 
 		currentValueChanged = False  # type: bool
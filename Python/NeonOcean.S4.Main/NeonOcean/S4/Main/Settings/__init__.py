@@ -30,7 +30,7 @@ class CheckForUpdatesDefault(SettingsTypes.BooleanEnabledDisabledDialogSetting):
 		updatesSetting = CheckForUpdates  # type: typing.Type[SettingsBase.Setting]
 
 		if cls.IsSetup() and updatesSetting.IsSetup():
-			updatesValue = updatesSetting.Get()  # type: typing.Dict[str, bool]
+			updatesValue = updatesSetting.GetMutable()  # type: typing.Dict[str, bool]
 			updatesValueChanged = False  # type: bool
 
 			for mod in Mods.GetAllMods():  # type: Mods.Mod
@@ -62,7 +62,7 @@ class CheckForUpdates(SettingsTypes.CheckForUpdatesDialogSetting):
 	def _OnLoad (cls) -> None:
 		defaultSetting = cls.DefaultSetting  # type: typing.Type[SettingsBase.Setting]
 
-		currentValue = cls.Get()  # type: typing.Dict[str, bool]
+		currentValue = cls.GetMutable()  # type: typing.Dict[str, bool]
 		defaultValue = defaultSetting.Get()  # type: bool
 
 		currentValueChanged = False  # type: bool
@@ -101,7 +101,7 @@ class CheckForPreviewUpdatesDefault(SettingsTypes.BooleanEnabledDisabledDialogSe
 		updatesSetting = CheckForPreviewUpdates  # type: typing.Type[SettingsBase.Setting]
 
 		if cls.IsSetup() and updatesSetting.IsSetup():
-			updatesValue = updatesSetting.Get()  # type: typing.Dict[str, bool]
+			updatesValue = updatesSetting.GetMutable()  # type: typing.Dict[str, bool]
 			updatesValueChanged = False  # type: bool
 
 			for mod in Mods.GetAllMods():  # type: Mods.Mod
@@ -133,7 +133,7 @@ class CheckForPreviewUpdates(SettingsTypes.CheckForUpdatesDialogSetting):
 	def _OnLoad (cls) -> None:
 		defaultSetting = cls.DefaultSetting  # type: typing.Type[SettingsBase.Setting]
 
-		currentValue = cls.Get()  # type: typing.Dict[str, bool]
+		currentValue = cls.GetMutable()  # type: typing.Dict[str, bool]
 		defaultValue = defaultSetting.Get()  # type: bool
 
 		currentValueChanged = False  # type: bool
@@ -170,6 +170,9 @@ def Save () -> None:
 def Update () -> None:
 	SettingsBase.Update()
 
+def Batch () -> typing.ContextManager:
+	return SettingsBase.Batch()
+
 def RegisterOnUpdateCallback (updateCallback: typing.Callable[[types.ModuleType, SettingsBase.UpdateEventArguments], None]) -> None:
 	SettingsBase.RegisterOnUpdateCallback(updateCallback)
 
@@ -106,3 +106,77 @@ def CloseDirectory (directoryPath: typing.Union[str, pathlib.Path], ignoreErrors
 			os.rmdir(directoryPath)
 		except Exception if not ignoreErrors else Exceptions.DummyException:
 			return
+
+def WriteFileAtomically (filePath: typing.Union[str, pathlib.Path], fileContents: typing.Union[str, bytes]) -> None:
+	"""
+	Write to a file by first writing to a temporary file next to it, flushing that file to the disk, then replacing the target file with it. The target file will
+	either hold its old contents or the new contents, never a partially written mix, even if the game crashes in the middle of writing. If the directory the file
+	is in doesn't exist one will be created.
+	:param filePath: The path of the file to be written.
+	:type filePath: str
+	:param fileContents: The contents to be written. Strings will be written in text mode and bytes will be written in binary mode.
+	:type fileContents: str | bytes
+	"""
+
+	if not isinstance(fileContents, (str, bytes)):
+		raise Exceptions.IncorrectTypeException(fileContents, "fileContents", (str, bytes))
+
+	WriteFileChunksAtomically(filePath, (fileContents,))
+
+def WriteFileChunksAtomically (filePath: typing.Union[str, pathlib.Path], fileChunks: typing.Iterable[typing.Union[str, bytes]], synchronize: bool = True) -> None:
+	"""
+	Write a file one chunk at a time, the same way as the 'WriteFileAtomically' function. Chunks are written as soon as they are produced, so the whole file
+	never needs to be held in memory. If producing a chunk raises an exception the target file will be left untouched.
+	:param filePath: The path of the file to be written.
+	:type filePath: str
+	:param fileChunks: The chunks to be written. The first chunk decides whether the file is written in text or binary mode, every other chunk must be of the
+	same type. If there are no chunks an empty text file will be written.
+	:type fileChunks: typing.Iterable[str | bytes]
+	:param synchronize: Whether or not the temporary file should be flushed all the way to the disk before it replaces the target file. Turning this off makes
+	writing faster but the file could still be lost if the computer, not just the game, stops in the middle of writing.
+	:type synchronize: bool
+	"""
+
+	if not isinstance(filePath, str) and not isinstance(filePath, pathlib.Path):
+		raise Exceptions.IncorrectTypeException(filePath, "filePath", (str, pathlib.Path))
+
+	if isinstance(filePath, pathlib.Path):
+		filePath = str(filePath)
+
+	if not isinstance(synchronize, bool):
+		raise Exceptions.IncorrectTypeException(synchronize, "synchronize", (bool,))
+
+	fileDirectoryPath = os.path.dirname(filePath)  # type: str
+
+	if fileDirectoryPath != "" and not os.path.exists(fileDirectoryPath):
+		os.makedirs(fileDirectoryPath)
+
+	temporaryFilePath = filePath + ".tmp"  # type: str
+	fileChunkIterator = iter(fileChunks)  # type: typing.Iterator[typing.Union[str, bytes]]
+
+	try:
+		firstChunk = next(fileChunkIterator, "")  # type: typing.Union[str, bytes]
+
+		if not isinstance(firstChunk, (str, bytes)):
+			raise Exceptions.IncorrectTypeException(firstChunk, "fileChunks[0]", (str, bytes))
+
+		with open(temporaryFilePath, mode = "wb" if isinstance(firstChunk, bytes) else "w") as temporaryFile:
+			temporaryFile.write(firstChunk)
+
+			for fileChunk in fileChunkIterator:  # type: typing.Union[str, bytes]
+				temporaryFile.write(fileChunk)
+
+			temporaryFile.flush()
+
+			if synchronize:
+				os.fsync(temporaryFile.fileno())
+
+		os.replace(temporaryFilePath, filePath)
+	except:
+		try:
+			if os.path.exists(temporaryFilePath):
+				os.remove(temporaryFilePath)
+		except Exception:
+			pass
+
+		raise
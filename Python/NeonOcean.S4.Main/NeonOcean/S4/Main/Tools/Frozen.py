@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import copy
+import typing
+
+ImmutableTypes = (str, int, float, bool, bytes, type(None))  # type: typing.Tuple[type, ...]
+
+class FrozenMutationException(TypeError):
+	def __init__ (self, frozenObject: typing.Any):
+		self.FrozenObject = frozenObject  # type: typing.Any
+
+	def __str__ (self):
+		return "Cannot modify a frozen '" + type(self.FrozenObject).__name__ + "' object, get a mutable copy with the 'Thaw' function first."
+
+class FrozenDict(dict):
+	"""
+	A read-only dictionary. This still passes dictionary type checks and can be encoded by python's json modules, but any attempt to change it will raise an exception.
+	Copying this object through the copy module will produce a normal, mutable, dictionary.
+	"""
+
+	def _Blocked (self, *args, **kwargs) -> None:
+		raise FrozenMutationException(self)
+
+	__setitem__ = _Blocked
+	__delitem__ = _Blocked
+	__ior__ = _Blocked
+	clear = _Blocked
+	pop = _Blocked
+	popitem = _Blocked
+	setdefault = _Blocked
+	update = _Blocked
+
+	def __copy__ (self) -> dict:
+		return Thaw(self)
+
+	def __deepcopy__ (self, memo: dict) -> dict:
+		return Thaw(self)
+
+	def __reduce__ (self):
+		return dict, (Thaw(self),)
+
+	def __hash__ (self) -> int:
+		return hash(frozenset(self.items()))
+
+class FrozenList(list):
+	"""
+	A read-only list. This still passes list type checks and can be encoded by python's json modules, but any attempt to change it will raise an exception.
+	Copying this object through the copy module will produce a normal, mutable, list.
+	"""
+
+	def _Blocked (self, *args, **kwargs) -> None:
+		raise FrozenMutationException(self)
+
+	__setitem__ = _Blocked
+	__delitem__ = _Blocked
+	__iadd__ = _Blocked
+	__imul__ = _Blocked
+	append = _Blocked
+	clear = _Blocked
+	extend = _Blocked
+	insert = _Blocked
+	pop = _Blocked
+	remove = _Blocked
+	reverse = _Blocked
+	sort = _Blocked
+
+	def __copy__ (self) -> list:
+		return Thaw(self)
+
+	def __deepcopy__ (self, memo: dict) -> list:
+		return Thaw(self)
+
+	def __reduce__ (self):
+		return list, (Thaw(self),)
+
+	def __hash__ (self) -> int:
+		return hash(tuple(self))
+
+class FrozenSet(set):
+	"""
+	A read-only set. This still passes set type checks, but any attempt to change it will raise an exception. Copying this object through the copy module will
+	produce a normal, mutable, set.
+	"""
+
+	def _Blocked (self, *args, **kwargs) -> None:
+		raise FrozenMutationException(self)
+
+	__iand__ = _Blocked
+	__ior__ = _Blocked
+	__isub__ = _Blocked
+	__ixor__ = _Blocked
+	add = _Blocked
+	clear = _Blocked
+	difference_update = _Blocked
+	discard = _Blocked
+	intersection_update = _Blocked
+	pop = _Blocked
+	remove = _Blocked
+	symmetric_difference_update = _Blocked
+	update = _Blocked
+
+	def __copy__ (self) -> set:
+		return Thaw(self)
+
+	def __deepcopy__ (self, memo: dict) -> set:
+		return Thaw(self)
+
+	def __reduce__ (self):
+		return set, (Thaw(self),)
+
+	def __hash__ (self) -> int:
+		return hash(frozenset(self))
+
+def IsImmutable (value: typing.Any) -> bool:
+	"""
+	Get whether or not this value can never be changed after its creation, meaning it can safely be shared without being copied.
+	"""
+
+	if isinstance(value, ImmutableTypes):
+		return True
+
+	if isinstance(value, (FrozenDict, FrozenList, FrozenSet)):
+		return True
+
+	if isinstance(value, (tuple, frozenset)):
+		return all(IsImmutable(item) for item in value)
+
+	return False
+
+def Freeze (value: typing.Any) -> typing.Any:
+	"""
+	Get an immutable version of a value. Immutable values are returned as is, dictionaries, lists and sets are copied into their frozen counterparts, and tuples and
+	frozen sets are rebuilt only if they hold mutable values. The input will never be modified and the output will never share a mutable object with the input.
+	Objects of any other type cannot be frozen, they are deep copied instead so that they are at least not shared with the input.
+	"""
+
+	if isinstance(value, ImmutableTypes):
+		return value
+
+	if isinstance(value, (FrozenDict, FrozenList, FrozenSet)):
+		return value
+
+	if isinstance(value, dict):
+		frozenDict = FrozenDict()
+
+		for itemKey, itemValue in value.items():
+			dict.__setitem__(frozenDict, itemKey, Freeze(itemValue))
+
+		return frozenDict
+
+	if isinstance(value, list):
+		frozenList = FrozenList()
+		list.extend(frozenList, [Freeze(item) for item in value])
+		return frozenList
+
+	if isinstance(value, set):
+		frozenSet = FrozenSet()
+		set.update(frozenSet, [Freeze(item) for item in value])
+		return frozenSet
+
+	if isinstance(value, tuple):
+		if IsImmutable(value):
+			return value
+
+		return tuple(Freeze(item) for item in value)
+
+	if isinstance(value, frozenset):
+		if IsImmutable(value):
+			return value
+
+		return frozenset(Freeze(item) for item in value)
+
+	return copy.deepcopy(value)
+
+def Thaw (value: typing.Any) -> typing.Any:
+	"""
+	Get a normal, mutable, deep copy of a value produced by the 'Freeze' function. Immutable values are returned as is, objects the 'Freeze' function could not
+	freeze are deep copied.
+	"""
+
+	if isinstance(value, ImmutableTypes):
+		return value
+
+	if isinstance(value, dict):
+		return { itemKey: Thaw(itemValue) for itemKey, itemValue in value.items() }
+
+	if isinstance(value, list):
+		return [Thaw(item) for item in value]
+
+	if isinstance(value, set):
+		return { Thaw(item) for item in value }
+
+	if isinstance(value, tuple):
+		if all(isinstance(item, ImmutableTypes) for item in value):
+			return value
+
+		# Frozen objects count as immutable, so tuples holding them need to be rebuilt even though IsImmutable would say they can be shared.
+		return tuple(Thaw(item) for item in value)
+
+	if isinstance(value, frozenset):
+		if all(isinstance(item, ImmutableTypes) for item in value):
+			return value
+
+		return frozenset(Thaw(item) for item in value)
+
+	return copy.deepcopy(value)
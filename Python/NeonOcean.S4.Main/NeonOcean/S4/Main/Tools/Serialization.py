@@ -0,0 +1,682 @@
+from __future__ import annotations
+
+import abc
+import json
+import struct
+import typing
+import zlib
+
+from NeonOcean.S4.Main.Tools import Exceptions
+
+_registeredSerializers = list()  # type: typing.List[Serializer]
+
+_lengthStruct = struct.Struct(">I")  # type: struct.Struct
+_floatStruct = struct.Struct(">d")  # type: struct.Struct
+
+_indexKeySuffix = "Index"  # type: str
+_indexPlaceholderPrefix = "\0IndexedValue:"  # type: str
+
+class EncodedValue:
+	def __init__ (self, serializer: Serializer, data: typing.Union[str, bytes]):
+		"""
+		A value that has been read but not decoded yet, as returned by a serializer's 'DecodeIndexed' method.
+
+		:param serializer: The serializer that can decode the data.
+		:type serializer: Serializer
+		:param data: The value's encoded data.
+		:type data: str | bytes
+		"""
+
+		self.Serializer = serializer  # type: Serializer
+		self.Data = data  # type: typing.Union[str, bytes]
+
+	def Decode (self) -> typing.Any:
+		"""
+		Decode the value. A new copy of the value is decoded every time this is called.
+		"""
+
+		return self.Serializer.Decode(self.Data)
+
+class Serializer(abc.ABC):
+	"""
+	A way of turning basic python values into data that can be written to a file, and back again. Serializers should be able to handle dictionaries, lists,
+	strings, integers, floats, booleans and None.
+	"""
+
+	Identifier = None  # type: str
+
+	@abc.abstractmethod
+	def Encode (self, value: typing.Any) -> typing.Union[str, bytes]:
+		"""
+		Encode a value. Text based formats return a string that should be written in text mode, binary formats return bytes.
+		"""
+
+		...
+
+	@abc.abstractmethod
+	def Decode (self, data: typing.Union[str, bytes]) -> typing.Any:
+		"""
+		Decode data produced by this serializer's encode method.
+		"""
+
+		...
+
+	def EncodeChunks (self, value: typing.Any, chunkSize: int = 65536) -> typing.Iterator[typing.Union[str, bytes]]:
+		"""
+		Encode a value in pieces, so it can be written out without ever holding the whole encoded value in memory. Joining the chunks together will give the same
+		result as the encode method. Chunks should be no longer than the chunk size, unless a single indivisible part of the value is longer. Serializers that
+		cannot encode in pieces will give the whole encoded value as one chunk.
+		"""
+
+		yield self.Encode(value)
+
+	def EncodeIndexedChunks (self, value: dict, indexedKey: str, chunkSize: int = 65536,
+							 encodedItems: typing.Optional[typing.Dict[str, EncodedValue]] = None) -> typing.Iterator[typing.Union[str, bytes]]:
+		"""
+		Encode a dictionary in pieces, like the encode chunks method, along with an index that lets each item of the dictionary under the indexed key be decoded
+		on its own by the 'DecodeIndexed' method. Serializers that cannot write an index will encode the value normally.
+
+		Items under the indexed key may be EncodedValue objects. Serializers that can write an index will write ones they encoded themselves as they are, without
+		encoding them again, any others are decoded first. If the encoded items dictionary is given, serializers that can write an index will fill it with an
+		EncodedValue for each item, as it was written, once every chunk has been taken.
+		"""
+
+		return self.EncodeChunks(_DecodeIndexedItems(value, indexedKey), chunkSize = chunkSize)
+
+	def DecodeIndexed (self, data: typing.Union[str, bytes], indexedKey: str) -> typing.Any:
+		"""
+		Decode data produced by this serializer. If the data was written with an index for the indexed key, every item of the dictionary under that key will be
+		left as an EncodedValue to be decoded when it's needed. Otherwise, or if the serializer cannot read an index, the data is decoded normally.
+		"""
+
+		return self.Decode(data)
+
+	def Matches (self, header: bytes) -> bool:
+		"""
+		Get whether or not data starting with these bytes looks like it was produced by this serializer. Only serializers with a recognizable header need to
+		implement this, anything that is not matched by a registered serializer will be assumed to be json.
+		"""
+
+		return False
+
+	def MatchesSettings (self, header: bytes) -> bool:
+		"""
+		Get whether or not data produced by this kind of serializer, starting with these bytes, was written with the same settings as this serializer. Only
+		settings that are recorded in the data can be compared, serializers that don't record any will always return True.
+		"""
+
+		return True
+
+class JsonSerializer(Serializer):
+	Identifier = "Json"  # type: str
+
+	def __init__ (self, indent: typing.Optional[str] = "\t", sortKeys: bool = False):
+		"""
+		A serializer that writes json text, the format every file was written in before serializers could be chosen.
+
+		:param indent: The indent passed to python's json encoder.
+		:type indent: str | None
+		:param sortKeys: Whether or not dictionaries should be written with their keys sorted.
+		:type sortKeys: bool
+		"""
+
+		if not isinstance(indent, str) and indent is not None:
+			raise Exceptions.IncorrectTypeException(indent, "indent", (str, None))
+
+		if not isinstance(sortKeys, bool):
+			raise Exceptions.IncorrectTypeException(sortKeys, "sortKeys", (bool,))
+
+		self.Indent = indent  # type: typing.Optional[str]
+		self.SortKeys = sortKeys  # type: bool
+
+		self._encoder = json.JSONEncoder(indent = indent, sort_keys = sortKeys)  # type: json.JSONEncoder
+
+	def Encode (self, value: typing.Any) -> str:
+		return self._encoder.encode(value)
+
+	def EncodeChunks (self, value: typing.Any, chunkSize: int = 65536) -> typing.Iterator[str]:
+		if not isinstance(chunkSize, int):
+			raise Exceptions.IncorrectTypeException(chunkSize, "chunkSize", (int,))
+
+		if chunkSize <= 0:
+			raise ValueError("Chunk size values must be greater than 0.")
+
+		chunkParts = list()  # type: typing.List[str]
+		chunkLength = 0  # type: int
+
+		for encodedPart in self._encoder.iterencode(value):  # type: str
+			if chunkLength + len(encodedPart) > chunkSize and chunkLength != 0:
+				yield "".join(chunkParts)
+
+				chunkParts = list()
+				chunkLength = 0
+
+			chunkParts.append(encodedPart)
+			chunkLength += len(encodedPart)
+
+		if chunkLength != 0:
+			yield "".join(chunkParts)
+
+	def EncodeIndexedChunks (self, value: dict, indexedKey: str, chunkSize: int = 65536,
+							 encodedItems: typing.Optional[typing.Dict[str, EncodedValue]] = None) -> typing.Iterator[str]:
+		"""
+		The text written is the same as what the encode method would write, with one more key added to the end of the root dictionary holding the
+		position of each indexed item in the text. The index key's name is the indexed key followed by 'Index'.
+		"""
+
+		if not isinstance(indexedKey, str):
+			raise Exceptions.IncorrectTypeException(indexedKey, "indexedKey", (str,))
+
+		if not isinstance(chunkSize, int):
+			raise Exceptions.IncorrectTypeException(chunkSize, "chunkSize", (int,))
+
+		if chunkSize <= 0:
+			raise ValueError("Chunk size values must be greater than 0.")
+
+		outlineParts = self._EncodeIndexedOutline(value, indexedKey)  # type: typing.Optional[typing.List[typing.Any]]
+
+		if outlineParts is None:
+			yield from self.EncodeChunks(_DecodeIndexedItems(value, indexedKey), chunkSize = chunkSize)
+			return
+
+		itemsIndentation = "\n" + self.Indent * 2 if self.Indent is not None else None  # type: typing.Optional[str]
+
+		chunkParts = list()  # type: typing.List[str]
+		chunkLength = 0  # type: int
+		position = 0  # type: int
+
+		itemsIndex = dict()  # type: typing.Dict[str, typing.List[int]]
+
+		for outlinePart in outlineParts:  # type: typing.Any
+			if isinstance(outlinePart, str):
+				encodedParts = (outlinePart,)  # type: typing.Iterable[str]
+			elif outlinePart is None:
+				# The index is only ever read by this serializer, it's kept on one line to keep it small.
+				encodedParts = (json.JSONEncoder().encode({ "Items": itemsIndex }),)
+			else:
+				itemKey, itemValue = outlinePart  # type: str, typing.Any
+				itemsIndex[itemKey] = [position, position]
+
+				if isinstance(itemValue, EncodedValue) and itemValue.Serializer is self:
+					# Items encoded by this serializer earlier were indented for this same position, so they can be written again as they are.
+					encodedParts = (itemValue.Data,)
+				else:
+					if isinstance(itemValue, EncodedValue):
+						itemValue = itemValue.Decode()
+
+					encodedParts = (self._IndentEncodedText(encodedPart, itemsIndentation) for encodedPart in self._encoder.iterencode(itemValue))
+
+			itemParts = list() if encodedItems is not None and isinstance(outlinePart, tuple) else None  # type: typing.Optional[typing.List[str]]
+
+			for encodedPart in encodedParts:  # type: str
+				if chunkLength + len(encodedPart) > chunkSize and chunkLength != 0:
+					yield "".join(chunkParts)
+
+					chunkParts = list()
+					chunkLength = 0
+
+				chunkParts.append(encodedPart)
+				chunkLength += len(encodedPart)
+				position += len(encodedPart)
+
+				if itemParts is not None:
+					itemParts.append(encodedPart)
+
+			if isinstance(outlinePart, tuple):
+				itemsIndex[outlinePart[0]][1] = position
+
+			if itemParts is not None:
+				encodedItems[outlinePart[0]] = EncodedValue(self, "".join(itemParts))
+
+		if chunkLength != 0:
+			yield "".join(chunkParts)
+
+	def Decode (self, data: typing.Union[str, bytes]) -> typing.Any:
+		if isinstance(data, bytes):
+			data = data.decode("utf-8")
+
+		return json.JSONDecoder().decode(data)
+
+	def DecodeIndexed (self, data: typing.Union[str, bytes], indexedKey: str) -> typing.Any:
+		if not isinstance(indexedKey, str):
+			raise Exceptions.IncorrectTypeException(indexedKey, "indexedKey", (str,))
+
+		if isinstance(data, bytes):
+			data = data.decode("utf-8")
+
+		indexedValue = self._DecodeIndexedText(data, indexedKey)  # type: typing.Optional[dict]
+
+		if indexedValue is None:
+			return self.Decode(data)
+
+		return indexedValue
+
+	def _EncodeIndexedOutline (self, value: typing.Any, indexedKey: str) -> typing.Optional[typing.List[typing.Any]]:
+		"""
+		Encode everything but the indexed items and the index, returning a list of encoded text with an (item key, item value) tuple wherever an item goes and
+		None where the index goes. None will be returned if the value cannot be indexed.
+		"""
+
+		indexKey = GetIndexKey(indexedKey)  # type: str
+
+		if not isinstance(value, dict) or indexKey in value or not isinstance(value.get(indexedKey), dict):
+			return None
+
+		if self.SortKeys and any(valueKey > indexKey for valueKey in value.keys()):
+			# The index needs to be the last thing in the text so it can be found without reading the rest.
+			return None
+
+		indexedItems = value[indexedKey]  # type: dict
+		itemPlaceholders = dict()  # type: typing.Dict[str, typing.Tuple[str, typing.Any]]
+
+		outlineItems = dict()  # type: dict
+
+		for itemKey, itemValue in indexedItems.items():  # type: typing.Any, typing.Any
+			if not isinstance(itemKey, str):
+				return None
+
+			itemPlaceholder = _indexPlaceholderPrefix + str(len(itemPlaceholders))  # type: str
+			outlineItems[itemKey] = itemPlaceholder
+			itemPlaceholders[self._encoder.encode(itemPlaceholder)] = (itemKey, itemValue)
+
+		indexPlaceholder = _indexPlaceholderPrefix + "Index"  # type: str
+
+		outline = dict(value)  # type: dict
+		outline[indexedKey] = outlineItems
+		outline[indexKey] = indexPlaceholder
+
+		outlineText = self._encoder.encode(outline)  # type: str
+		placeholderPositions = list()  # type: typing.List[typing.Tuple[int, str, typing.Optional[typing.Tuple[str, typing.Any]]]]
+
+		for encodedPlaceholder, outlinePart in list(itemPlaceholders.items()) + [(self._encoder.encode(indexPlaceholder), None)]:  # type: str, typing.Optional[typing.Tuple[str, typing.Any]]
+			placeholderPosition = outlineText.find(encodedPlaceholder)  # type: int
+
+			if placeholderPosition == -1 or outlineText.find(encodedPlaceholder, placeholderPosition + 1) != -1:
+				return None
+
+			placeholderPositions.append((placeholderPosition, encodedPlaceholder, outlinePart))
+
+		placeholderPositions.sort(key = lambda placeholder: placeholder[0])
+
+		if placeholderPositions[-1][2] is not None:
+			return None
+
+		outlineParts = list()  # type: typing.List[typing.Any]
+		outlinePosition = 0  # type: int
+
+		for placeholderPosition, encodedPlaceholder, outlinePart in placeholderPositions:  # type: int, str, typing.Optional[typing.Tuple[str, typing.Any]]
+			outlineParts.append(outlineText[outlinePosition:placeholderPosition])
+			outlineParts.append(outlinePart)
+			outlinePosition = placeholderPosition + len(encodedPlaceholder)
+
+		outlineParts.append(outlineText[outlinePosition:])
+		return outlineParts
+
+	def _DecodeIndexedText (self, data: str, indexedKey: str) -> typing.Optional[dict]:
+		decoder = json.JSONDecoder()  # type: json.JSONDecoder
+
+		indexKeyText = json.dumps(GetIndexKey(indexedKey)) + ": "  # type: str
+		indexKeyPosition = data.rfind(indexKeyText)  # type: int
+
+		if indexKeyPosition == -1:
+			return None
+
+		indexPosition = indexKeyPosition + len(indexKeyText)  # type: int
+
+		try:
+			index, indexEndPosition = decoder.raw_decode(data, indexPosition)  # type: typing.Any, int
+		except ValueError:
+			return None
+
+		if data[indexEndPosition:].strip() != "}" or not isinstance(index, dict) or not isinstance(index.get("Items"), dict):
+			return None
+
+		itemSpans = list()  # type: typing.List[typing.Tuple[int, int, str]]
+
+		for itemKey, itemSpan in index["Items"].items():  # type: str, typing.Any
+			if not isinstance(itemSpan, list) or len(itemSpan) != 2 or not all(type(spanPosition) is int for spanPosition in itemSpan):
+				return None
+
+			itemSpans.append((itemSpan[0], itemSpan[1], itemKey))
+
+		itemSpans.sort()
+
+		outlineParts = list()  # type: typing.List[str]
+		outlinePosition = 0  # type: int
+
+		for itemStartPosition, itemEndPosition, itemKey in itemSpans:  # type: int, int, str
+			if itemStartPosition < outlinePosition or itemEndPosition <= itemStartPosition or itemEndPosition > indexKeyPosition:
+				return None
+
+			outlineParts.append(data[outlinePosition:itemStartPosition])
+			outlineParts.append("null")
+			outlinePosition = itemEndPosition
+
+		outlineParts.append(data[outlinePosition:indexPosition])
+		outlineParts.append("null")
+		outlineParts.append(data[indexEndPosition:])
+
+		try:
+			outline = decoder.decode("".join(outlineParts))  # type: typing.Any
+		except ValueError:
+			return None
+
+		# Every span should have been replaced by exactly one of the indexed items, if anything else was replaced the index doesn't match the text.
+		if not isinstance(outline, dict) or not isinstance(outline.get(indexedKey), dict):
+			return None
+
+		outlineItems = outline[indexedKey]  # type: dict
+
+		if len(outlineItems) != len(itemSpans) or any(outlineItems.get(itemKey, False) is not None for itemStartPosition, itemEndPosition, itemKey in itemSpans):
+			return None
+
+		outline.pop(GetIndexKey(indexedKey))
+		outline[indexedKey] = { itemKey: EncodedValue(self, data[itemStartPosition:itemEndPosition]) for itemStartPosition, itemEndPosition, itemKey in itemSpans }
+		return outline
+
+	@staticmethod
+	def _IndentEncodedText (encodedText: str, indentation: typing.Optional[str]) -> str:
+		# Json strings never contain a raw line break, so every line break is one the encoder added and needs to be indented further.
+		if indentation is None:
+			return encodedText
+
+		return encodedText.replace("\n", indentation)
+
+class BinarySerializer(Serializer):
+	"""
+	A serializer for a compact binary format. Every value is written as a one byte type tag followed by its contents, strings, byte strings and integers are
+	prefixed with their length in bytes, lists and dictionaries with their number of items. Tuples will be decoded as lists, like they would be with json.
+	The encoded data can optionally be compressed with zlib, this is recorded in the header so the decoder will always know what to do.
+	"""
+
+	Identifier = "Binary"  # type: str
+
+	Magic = b"NOBS"  # type: bytes
+	FormatVersion = 1  # type: int
+
+	_compressedFlag = 1  # type: int
+
+	_noneTag = b"N"  # type: bytes
+	_trueTag = b"T"  # type: bytes
+	_falseTag = b"F"  # type: bytes
+	_integerTag = b"I"  # type: bytes
+	_floatTag = b"D"  # type: bytes
+	_stringTag = b"S"  # type: bytes
+	_bytesTag = b"Y"  # type: bytes
+	_listTag = b"L"  # type: bytes
+	_dictionaryTag = b"M"  # type: bytes
+
+	def __init__ (self, compress: bool = True, compressionLevel: int = 6):
+		"""
+		:param compress: Whether or not the encoded data should be compressed with zlib.
+		:type compress: bool
+		:param compressionLevel: The zlib compression level to use, from 0 to 9.
+		:type compressionLevel: int
+		"""
+
+		if not isinstance(compress, bool):
+			raise Exceptions.IncorrectTypeException(compress, "compress", (bool,))
+
+		if not isinstance(compressionLevel, int):
+			raise Exceptions.IncorrectTypeException(compressionLevel, "compressionLevel", (int,))
+
+		if compressionLevel < 0 or compressionLevel > 9:
+			raise ValueError("Compression level values must be between 0 and 9.")
+
+		self.Compress = compress  # type: bool
+		self.CompressionLevel = compressionLevel  # type: int
+
+	def Encode (self, value: typing.Any) -> bytes:
+		encodedParts = list()  # type: typing.List[bytes]
+		self._EncodeValue(value, encodedParts)
+		encodedBody = b"".join(encodedParts)  # type: bytes
+
+		flags = 0  # type: int
+
+		if self.Compress:
+			encodedBody = zlib.compress(encodedBody, self.CompressionLevel)
+			flags |= self._compressedFlag
+
+		return self.Magic + bytes((self.FormatVersion, flags)) + encodedBody
+
+	def Decode (self, data: typing.Union[str, bytes]) -> typing.Any:
+		if not isinstance(data, bytes):
+			raise Exceptions.IncorrectTypeException(data, "data", (bytes,))
+
+		if not self.Matches(data):
+			raise ValueError("The data is not in the binary serializer's format.")
+
+		headerLength = len(self.Magic) + 2  # type: int
+
+		if len(data) < headerLength:
+			raise ValueError("The data ends before the end of its header.")
+
+		formatVersion = data[len(self.Magic)]  # type: int
+		flags = data[len(self.Magic) + 1]  # type: int
+
+		if formatVersion > self.FormatVersion:
+			raise ValueError("The data was written in a newer version of the binary format (%s) than can be read (%s)." % (formatVersion, self.FormatVersion))
+
+		encodedBody = data[headerLength:]  # type: bytes
+
+		if flags & self._compressedFlag:
+			encodedBody = zlib.decompress(encodedBody)
+
+		value, position = self._DecodeValue(encodedBody, 0)  # type: typing.Any, int
+
+		if position != len(encodedBody):
+			raise ValueError("Found unexpected data after the end of the encoded value.")
+
+		return value
+
+	def Matches (self, header: bytes) -> bool:
+		return header[:len(self.Magic)] == self.Magic
+
+	def MatchesSettings (self, header: bytes) -> bool:
+		if len(header) < len(self.Magic) + 2:
+			return False
+
+		flags = header[len(self.Magic) + 1]  # type: int
+		return bool(flags & self._compressedFlag) == self.Compress
+
+	def _EncodeValue (self, value: typing.Any, encodedParts: typing.List[bytes]) -> None:
+		if value is None:
+			encodedParts.append(self._noneTag)
+		elif value is True:
+			encodedParts.append(self._trueTag)
+		elif value is False:
+			encodedParts.append(self._falseTag)
+		elif isinstance(value, int):
+			encodedInteger = value.to_bytes((value.bit_length() + 8) // 8, "big", signed = True)  # type: bytes
+			encodedParts.append(self._integerTag + _lengthStruct.pack(len(encodedInteger)) + encodedInteger)
+		elif isinstance(value, float):
+			encodedParts.append(self._floatTag + _floatStruct.pack(value))
+		elif isinstance(value, str):
+			encodedString = value.encode("utf-8")  # type: bytes
+			encodedParts.append(self._stringTag + _lengthStruct.pack(len(encodedString)) + encodedString)
+		elif isinstance(value, bytes):
+			encodedParts.append(self._bytesTag + _lengthStruct.pack(len(value)) + value)
+		elif isinstance(value, (list, tuple)):
+			encodedParts.append(self._listTag + _lengthStruct.pack(len(value)))
+
+			for item in value:
+				self._EncodeValue(item, encodedParts)
+		elif isinstance(value, dict):
+			encodedParts.append(self._dictionaryTag + _lengthStruct.pack(len(value)))
+
+			for itemKey, itemValue in value.items():
+				self._EncodeValue(itemKey, encodedParts)
+				self._EncodeValue(itemValue, encodedParts)
+		else:
+			raise TypeError("Values of the type '" + type(value).__name__ + "' cannot be encoded by the binary serializer.")
+
+	def _DecodeValue (self, data: bytes, position: int) -> typing.Tuple[typing.Any, int]:
+		tag = data[position:position + 1]  # type: bytes
+		position += 1
+
+		if tag == self._noneTag:
+			return None, position
+		elif tag == self._trueTag:
+			return True, position
+		elif tag == self._falseTag:
+			return False, position
+		elif tag == self._floatTag:
+			return _floatStruct.unpack_from(data, position)[0], position + _floatStruct.size
+
+		if tag in (self._integerTag, self._stringTag, self._bytesTag, self._listTag, self._dictionaryTag):
+			length = _lengthStruct.unpack_from(data, position)[0]  # type: int
+			position += _lengthStruct.size
+		else:
+			raise ValueError("Found an unknown type tag '" + repr(tag) + "' at position " + str(position - 1) + ".")
+
+		if tag == self._listTag:
+			decodedList = list()  # type: list
+
+			for _ in range(length):
+				item, position = self._DecodeValue(data, position)
+				decodedList.append(item)
+
+			return decodedList, position
+		elif tag == self._dictionaryTag:
+			decodedDictionary = dict()  # type: dict
+
+			for _ in range(length):
+				itemKey, position = self._DecodeValue(data, position)
+				itemValue, position = self._DecodeValue(data, position)
+				decodedDictionary[itemKey] = itemValue
+
+			return decodedDictionary, position
+
+		if position + length > len(data):
+			raise ValueError("The data ends before the end of a value at position " + str(position) + ".")
+
+		valueData = data[position:position + length]  # type: bytes
+		position += length
+
+		if tag == self._integerTag:
+			return int.from_bytes(valueData, "big", signed = True), position
+		elif tag == self._stringTag:
+			return valueData.decode("utf-8"), position
+		else:
+			return valueData, position
+
+def GetIndexKey (indexedKey: str) -> str:
+	"""
+	Get the key an index for this indexed key is written under by serializers that write their index into the encoded value itself.
+	"""
+
+	return indexedKey + _indexKeySuffix
+
+def RegisterSerializer (serializer: Serializer) -> None:
+	"""
+	Register a serializer so that its data can be recognized when files are loaded.
+	"""
+
+	if not isinstance(serializer, Serializer):
+		raise Exceptions.IncorrectTypeException(serializer, "serializer", (Serializer,))
+
+	if serializer in _registeredSerializers:
+		return
+
+	_registeredSerializers.append(serializer)
+
+def GetSerializer (identifier: str) -> typing.Optional[Serializer]:
+	"""
+	Get the first registered serializer with this identifier, or None if no such serializer has been registered.
+	"""
+
+	if not isinstance(identifier, str):
+		raise Exceptions.IncorrectTypeException(identifier, "identifier", (str,))
+
+	for serializer in _registeredSerializers:  # type: Serializer
+		if serializer.Identifier == identifier:
+			return serializer
+
+	return None
+
+def DetectSerializer (header: bytes) -> typing.Optional[Serializer]:
+	"""
+	Get the registered serializer that produced data starting with these bytes. None will be returned if no serializer recognizes the data, in which case the
+	data should be treated as json text.
+	"""
+
+	if not isinstance(header, bytes):
+		raise Exceptions.IncorrectTypeException(header, "header", (bytes,))
+
+	for serializer in _registeredSerializers:  # type: Serializer
+		if serializer.Matches(header):
+			return serializer
+
+	return None
+
+def DetectFileSerializer (filePath: str) -> typing.Optional[Serializer]:
+	"""
+	Get the registered serializer that produced this file by reading the start of it. None will be returned if no serializer recognizes the file, in which case
+	it should be treated as json text.
+	"""
+
+	if not isinstance(filePath, str):
+		raise Exceptions.IncorrectTypeException(filePath, "filePath", (str,))
+
+	with open(filePath, "rb") as detectingFile:
+		header = detectingFile.read(16)  # type: bytes
+
+	return DetectSerializer(header)
+
+def FileMatchesSerializer (filePath: str, serializer: Serializer) -> bool:
+	"""
+	Get whether or not this file was written by this kind of serializer with the same settings, meaning writing it again with the serializer would not change
+	its format.
+	"""
+
+	if not isinstance(filePath, str):
+		raise Exceptions.IncorrectTypeException(filePath, "filePath", (str,))
+
+	if not isinstance(serializer, Serializer):
+		raise Exceptions.IncorrectTypeException(serializer, "serializer", (Serializer,))
+
+	with open(filePath, "rb") as detectingFile:
+		header = detectingFile.read(16)  # type: bytes
+
+	currentSerializer = DetectSerializer(header)  # type: typing.Optional[Serializer]
+	currentSerializerIdentifier = currentSerializer.Identifier if currentSerializer is not None else JsonSerializer.Identifier  # type: str
+
+	if currentSerializerIdentifier != serializer.Identifier:
+		return False
+
+	return serializer.MatchesSettings(header)
+
+def ReadFile (filePath: str) -> typing.Any:
+	"""
+	Read and decode a file written by any registered serializer, or a json file.
+	"""
+
+	serializer = DetectFileSerializer(filePath)  # type: typing.Optional[Serializer]
+
+	if serializer is None:
+		with open(filePath) as readingFile:
+			return json.JSONDecoder().decode(readingFile.read())
+
+	with open(filePath, "rb") as readingFile:
+		return serializer.Decode(readingFile.read())
+
+def _DecodeIndexedItems (value: typing.Any, indexedKey: str) -> typing.Any:
+	# Get a version of the value that can be encoded normally, with any encoded values under the indexed key decoded.
+
+	if not isinstance(value, dict) or not isinstance(value.get(indexedKey), dict):
+		return value
+
+	indexedItems = value[indexedKey]  # type: dict
+
+	if not any(isinstance(itemValue, EncodedValue) for itemValue in indexedItems.values()):
+		return value
+
+	decodedValue = dict(value)  # type: dict
+	decodedValue[indexedKey] = { itemKey: itemValue.Decode() if isinstance(itemValue, EncodedValue) else itemValue for itemKey, itemValue in indexedItems.items() }
+	return decodedValue
+
+def _Setup () -> None:
+	RegisterSerializer(JsonSerializer())
+	RegisterSerializer(BinarySerializer())
+
+_Setup()